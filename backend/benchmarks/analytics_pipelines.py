@@ -0,0 +1,108 @@
+"""Compare the legacy find()+pydantic analytics path with the aggregation pipelines.
+
+    python -m benchmarks.analytics_pipelines --sizes 1000 10000 100000
+"""
+import asyncio
+import json
+
+from models.committee_member import CommitteeMember
+from services import analytics, member_queries, summary
+from services.committees import DEFAULT_COMMITTEE_ID
+from services.tiers import DEFAULT_TIERS
+from benchmarks.common import base_parser, get_database, seed_members, time_async
+
+async def legacy_members(collection):
+    """The per-request load every endpoint used to do"""
+    members = []
+    for member_data in await collection.find().to_list(None):
+        member_data["id"] = str(member_data["_id"])
+        del member_data["_id"]
+        member = CommitteeMember(**member_data)
+        member.calculate_total_tasks()
+        members.append(member)
+    return members
+
+async def legacy_overview(collection):
+    members = await legacy_members(collection)
+    total = len(members)
+    return {
+        "totalMembers": total,
+        "totalTasksCompleted": sum(m.tasksCompleted for m in members),
+        "totalTasksPending": sum(m.tasksPending for m in members),
+        "totalRegistrations": sum(m.registrationsBrought for m in members),
+        "avgEfficiency": round(sum(m.efficiency for m in members) / total) if total else 0,
+        "topPerformer": max(members, key=lambda m: m.efficiency) if members else None,
+    }
+
+async def legacy_tasks(collection):
+    members = await legacy_members(collection)
+    ranked = sorted(members, key=lambda m: m.efficiency, reverse=True)
+    return {
+        "totalTasks": sum(m.totalTasks for m in members),
+        "rankedMembers": [
+            {"id": m.id, "name": m.name, "efficiency": m.efficiency, "rank": idx + 1}
+            for idx, m in enumerate(ranked)
+        ],
+    }
+
+async def legacy_registrations(collection):
+    members = await legacy_members(collection)
+    total = sum(m.registrationsBrought for m in members)
+    rows = []
+    for m in sorted(members, key=lambda m: m.registrationsBrought, reverse=True):
+        tier = "Bronze"
+        if m.registrationsBrought >= 15:
+            tier = "Platinum"
+        elif m.registrationsBrought >= 12:
+            tier = "Gold"
+        elif m.registrationsBrought >= 8:
+            tier = "Silver"
+        rows.append({
+            "id": m.id,
+            "tier": tier,
+            "percentage": round((m.registrationsBrought / total) * 100, 1) if total else 0,
+        })
+    return rows
+
+async def overview(collection):
+    """GET /analytics/overview with snapshots and columns off: summary totals plus the top performer"""
+    totals, top_performer = await asyncio.gather(
+        summary.get_summary(collection.database, DEFAULT_COMMITTEE_ID),
+        member_queries.fetch_top_performer(collection.database, DEFAULT_COMMITTEE_ID),
+    )
+    return analytics.overview_from_totals(totals, top_performer)
+
+CASES = {
+    "overview": (legacy_overview, overview),
+    "tasks": (legacy_tasks, lambda collection: analytics.compute_task_analytics(collection, DEFAULT_COMMITTEE_ID)),
+    "registrations": (legacy_registrations, lambda collection: analytics.compute_registration_metrics(collection, DEFAULT_COMMITTEE_ID, [], DEFAULT_TIERS)),
+}
+
+async def main():
+    parser = base_parser(__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    args = parser.parse_args()
+    collection = get_database(args).committee_members
+
+    results = []
+    for size in args.sizes:
+        await seed_members(collection, size)
+        await collection.create_index([("committeeId", 1), ("efficiency", -1), ("_id", 1)])
+        await collection.create_index([("committeeId", 1), ("registrationsBrought", -1), ("_id", 1)])
+        await summary.rebuild_summary(collection.database, DEFAULT_COMMITTEE_ID)
+        for name, (legacy, pipeline) in CASES.items():
+            old = await time_async(lambda: legacy(collection), args.repeat)
+            new = await time_async(lambda: pipeline(collection), args.repeat)
+            results.append({
+                "members": size,
+                "endpoint": name,
+                "legacy": old,
+                "pipeline": new,
+                "speedup": round(old["median_ms"] / new["median_ms"], 2) if new["median_ms"] else None,
+            })
+            print(json.dumps(results[-1]))
+    await collection.drop()
+    await collection.database.analytics_summary.drop()
+
+if __name__ == "__main__":
+    asyncio.run(main())
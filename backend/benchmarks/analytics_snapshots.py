@@ -0,0 +1,106 @@
+"""Analytics endpoints computed per request versus served from snapshots.
+
+    python -m benchmarks.analytics_snapshots --members 10000 --requests 200 --burst 200
+
+``per_request`` times GET /analytics/overview, /tasks and /registrations
+with snapshots disabled, ``snapshot`` the same requests served from the
+latest snapshot. ``burst`` then updates ``--burst`` members as fast as the
+app accepts them and reports how many recomputes the burst caused and how
+long after the last write the served snapshot reflected it. The response
+cache is disabled. /analytics/registrations rolls history up with
+$dateTrunc, which mongomock lacks, so use a real mongod.
+"""
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+from statistics import median
+
+import httpx
+
+from benchmarks.common import base_parser, load_app, seed_members
+
+ENDPOINTS = ("overview", "tasks", "registrations")
+
+def percentiles(samples):
+    ordered = sorted(samples)
+    return {
+        "median_ms": round(median(ordered), 2),
+        "p95_ms": round(ordered[max(0, int(len(ordered) * 0.95) - 1)], 2),
+    }
+
+async def time_endpoints(client, requests: int):
+    results = {}
+    for endpoint in ENDPOINTS:
+        samples = []
+        for _ in range(requests):
+            start = time.perf_counter()
+            (await client.get(f"/api/analytics/{endpoint}")).raise_for_status()
+            samples.append((time.perf_counter() - start) * 1000)
+        results[endpoint] = percentiles(samples)
+    return results
+
+async def burst(client, snapshots, members: int, writes: int, rng: random.Random):
+    """Update members back to back, then wait for a snapshot counting every write"""
+    computes = snapshots.computes
+    expected = None
+    for _ in range(writes):
+        response = await client.put(f"/api/members/bench-{rng.randrange(members)}", json={"registrationsBrought": rng.randint(0, 25)})
+        response.raise_for_status()
+    last_write = time.perf_counter()
+    # The summary is updated in the write path, so it holds the expected totals
+    expected = (await client.get("/api/dashboard", params={"sections": "overview"})).json()["overview"]["totalRegistrations"]
+    while True:
+        overview = (await client.get("/api/analytics/overview")).json()
+        if overview["totalRegistrations"] == expected:
+            break
+        await asyncio.sleep(0.01)
+    return {
+        "writes": writes,
+        "recomputes": snapshots.computes - computes,
+        "fresh_after_ms": round((time.perf_counter() - last_write) * 1000, 1),
+    }
+
+async def main():
+    parser = base_parser(__doc__)
+    parser.add_argument("--members", type=int, default=10000)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--burst", type=int, default=200)
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    os.environ["RESPONSE_CACHE_ENABLED"] = "false"
+    app, db = load_app(args)
+    # Imported late: services pull in database, which load_app configures
+    from services.snapshots import SNAPSHOTS_COLLECTION, analytics_snapshots
+    from services.summary import rebuild_summary
+    from services.committees import DEFAULT_COMMITTEE_ID
+
+    await seed_members(db.committee_members, args.members)
+    await rebuild_summary(db, DEFAULT_COMMITTEE_ID)
+    await db[SNAPSHOTS_COLLECTION].delete_many({})
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        analytics_snapshots.enabled = False
+        per_request = await time_endpoints(client, args.requests)
+        analytics_snapshots.enabled = True
+        first = time.perf_counter()
+        (await client.get("/api/analytics/overview")).raise_for_status()
+        first_ms = (time.perf_counter() - first) * 1000
+        snapshot = await time_endpoints(client, args.requests)
+        write_burst = await burst(client, analytics_snapshots, args.members, args.burst, random.Random(42))
+        await analytics_snapshots.stop()
+    print(json.dumps({
+        "members": args.members,
+        "per_request": per_request,
+        "snapshot": snapshot,
+        "first_snapshot_ms": round(first_ms, 1),
+        "burst": write_burst,
+        "debounce_seconds": analytics_snapshots.debounce_seconds,
+    }))
+    await db.committee_members.drop()
+    await db[SNAPSHOTS_COLLECTION].drop()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,75 @@
+"""HTTP request count and wall time for N single requests versus one bulk request,
+for creates, updates and deletes.
+
+    python -m benchmarks.bulk_members --batch-sizes 1 10 100 1000
+"""
+import asyncio
+import json
+import random
+import time
+
+import httpx
+
+from benchmarks.common import base_parser, load_app, member_payload
+
+async def timed(requests):
+    """Seconds taken to send ``requests`` (zero-argument coroutine factories) one after another"""
+    start = time.perf_counter()
+    for request in requests:
+        (await request()).raise_for_status()
+    return time.perf_counter() - start
+
+async def create_members(client, payloads):
+    """Ids of ``payloads`` created through one bulk request"""
+    response = await client.post("/api/members/bulk", json={"operations": [{"op": "create", "data": payload} for payload in payloads]})
+    response.raise_for_status()
+    return [result["id"] for result in response.json()["results"]]
+
+def report(size, single_seconds, bulk_seconds):
+    return {
+        "single": {"requests": size, "seconds": round(single_seconds, 3)},
+        "bulk": {"requests": 1, "seconds": round(bulk_seconds, 3)},
+        "speedup": round(single_seconds / bulk_seconds, 1) if bulk_seconds else None,
+    }
+
+def bulk(client, operations):
+    """Request factory for one bulk request, failing when any of its operations failed"""
+    async def request():
+        response = await client.post("/api/members/bulk", json={"operations": operations})
+        if response.status_code == 200 and response.json()["failed"]:
+            raise RuntimeError(f"{response.json()['failed']} bulk operations failed")
+        return response
+    return request
+
+async def main():
+    parser = base_parser(__doc__)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 10, 100, 1000])
+    args = parser.parse_args()
+    app, db = load_app(args)
+    rng = random.Random(42)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for size in args.batch_sizes:
+            results = {"batch_size": size}
+            payloads = [member_payload(i, rng) for i in range(size)]
+
+            await db.committee_members.delete_many({})
+            single = await timed([lambda payload=payload: client.post("/api/members/", json=payload) for payload in payloads])
+            await db.committee_members.delete_many({})
+            results["create"] = report(size, single, await timed([bulk(client, [{"op": "create", "data": payload} for payload in payloads])]))
+
+            ids = await create_members(client, payloads)
+            updates = [{"registrationsBrought": rng.randint(0, 50), "efficiency": rng.randint(40, 100)} for _ in ids]
+            single = await timed([lambda member_id=member_id, data=data: client.put(f"/api/members/{member_id}", json=data) for member_id, data in zip(ids, updates)])
+            results["update"] = report(size, single, await timed([bulk(client, [{"op": "update", "id": member_id, "data": data} for member_id, data in zip(ids, updates)])]))
+
+            single = await timed([lambda member_id=member_id: client.delete(f"/api/members/{member_id}") for member_id in ids])
+            ids = await create_members(client, payloads)
+            results["delete"] = report(size, single, await timed([bulk(client, [{"op": "delete", "id": member_id} for member_id in ids])]))
+
+            print(json.dumps(results))
+    await db.committee_members.drop()
+
+if __name__ == "__main__":
+    asyncio.run(main())
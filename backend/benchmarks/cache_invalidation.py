@@ -0,0 +1,62 @@
+"""Propagation latency of MongoCacheBackend invalidations between workers.
+
+Simulates several uvicorn workers in one process, each with its own
+backend instance tailing the shared capped collection, against a local
+mongod (tailable cursors are not available in mongomock):
+
+    python -m benchmarks.cache_invalidation --workers 4 --rounds 50
+"""
+import asyncio
+import json
+import time
+from statistics import median
+
+from benchmarks.common import base_parser, get_database
+from services.committees import DEFAULT_COMMITTEE_ID
+from services.response_cache import CachedResponse, MongoCacheBackend
+
+async def main():
+    parser = base_parser(__doc__)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+    database = get_database(args)
+    await database.drop_collection("cache_invalidations")
+
+    workers = [MongoCacheBackend() for _ in range(args.workers)]
+    for worker in workers:
+        await worker.start(database)
+    await asyncio.sleep(1)
+
+    latencies = []
+    for round_number in range(args.rounds):
+        for worker in workers:
+            worker.set(
+                DEFAULT_COMMITTEE_ID,
+                "/api/analytics/overview?",
+                CachedResponse(200, [], b"{}", '"x"'),
+                worker.generation_of(DEFAULT_COMMITTEE_ID)
+            )
+
+        writer = workers[round_number % len(workers)]
+        start = time.perf_counter()
+        await writer.invalidate(DEFAULT_COMMITTEE_ID)
+        # Wait until every other worker has dropped its entry
+        while any(worker.get(DEFAULT_COMMITTEE_ID, "/api/analytics/overview?") for worker in workers):
+            await asyncio.sleep(0.001)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    for worker in workers:
+        await worker.stop()
+    await database.drop_collection("cache_invalidations")
+
+    latencies.sort()
+    print(json.dumps({
+        "workers": args.workers,
+        "rounds": args.rounds,
+        "median_ms": round(median(latencies), 2),
+        "p99_ms": round(latencies[max(0, int(len(latencies) * 0.99) - 1)], 2),
+    }))
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,105 @@
+"""The per-member Python loop of the tasks and registrations analytics against the columnar engine.
+
+    python -m benchmarks.columnar_analytics --sizes 100000 1000000
+
+Works on synthetic members held in memory, so no database is involved and
+the figures are CPU time only. ``per_object_ms`` shapes efficiency-ordered
+scan rows, as ``scan_members`` returns them, into the /analytics/tasks and
+/analytics/registrations payloads the way the sections do.
+``columnar_ms`` builds the same payloads from MemberColumns;
+``columnar_aggregates_ms`` is its vectorized part alone (totals, tier
+counts, top performer and both rankings), without building the member
+rows. ``load_ms`` is the one-off load of the columns from fetched
+documents and ``update_us`` one incremental member update. The Mongo scan
+the per-object path also needs is not included.
+"""
+import json
+import random
+import time
+from statistics import median
+
+from benchmarks.common import base_parser, synthetic_member
+from services import analytics
+from services.columnar import MemberColumns
+from services.committees import DEFAULT_COMMITTEE_ID
+from services.dashboard import SCAN_FIELDS
+from services.tiers import DEFAULT_TIERS
+
+def timed(func, repeat: int) -> float:
+    """Median milliseconds of ``repeat`` calls"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return round(median(samples), 2)
+
+def per_object(docs, totals):
+    """The mongo engine's tasks and registrations sections, after the scan"""
+    ranked = [analytics.scanned_row(doc) for doc in docs]
+    tasks = analytics.task_analytics_from(totals, ranked)
+    by_registrations = sorted(ranked, key=lambda row: (-row["registrationsBrought"], row["_id"]))
+    tier_rows = [analytics.registration_tier_row(row, DEFAULT_TIERS, totals["registrations"]) for row in by_registrations]
+    registrations = analytics.registration_metrics_from(totals, DEFAULT_TIERS, totals["tierCounts"], tier_rows, [])
+    return tasks, registrations
+
+def columnar(columns: MemberColumns):
+    totals = columns.totals(DEFAULT_TIERS)
+    tasks = analytics.task_analytics_from(totals, [])
+    tasks["rankedMembers"] = columns.ranked_rows()
+    tier_rows = columns.registration_tier_rows(DEFAULT_TIERS, totals["registrations"])
+    registrations = analytics.registration_metrics_from(totals, DEFAULT_TIERS, totals["tierCounts"], tier_rows, [])
+    return tasks, registrations
+
+def columnar_aggregates(columns: MemberColumns):
+    return (
+        columns.totals(DEFAULT_TIERS),
+        columns.top_id("efficiency"),
+        columns.order("efficiency"),
+        columns.order("registrationsBrought"),
+    )
+
+def run_size(size: int, repeat: int):
+    rng = random.Random(42)
+    docs = []
+    for i in range(size):
+        member = synthetic_member(i, rng)
+        docs.append({"_id": member["_id"], **{field: member[field] for field in SCAN_FIELDS}})
+    # In the order the (committeeId, efficiency desc, _id asc) index returns them
+    docs.sort(key=lambda doc: (-doc["efficiency"], doc["_id"]))
+
+    columns = MemberColumns(DEFAULT_COMMITTEE_ID)
+    load_ms = timed(lambda: columns.load(docs), 1)
+    # Summary totals, as the mongo engine reads them from analytics_summary
+    totals = columns.totals(DEFAULT_TIERS)
+    if per_object(docs, totals) != columnar(columns):
+        raise AssertionError("The engines disagree")
+
+    updates = [(docs[rng.randrange(size)]["_id"], {**docs[0], "efficiency": rng.randint(0, 100)}) for _ in range(1000)]
+    start = time.perf_counter()
+    for member_id, member in updates:
+        columns.apply_one(member_id, member)
+    update_us = (time.perf_counter() - start) / len(updates) * 1_000_000
+
+    per_object_ms = timed(lambda: per_object(docs, totals), repeat)
+    columnar_ms = timed(lambda: columnar(columns), repeat)
+    return {
+        "size": size,
+        "per_object_ms": per_object_ms,
+        "columnar_ms": columnar_ms,
+        "speedup": round(per_object_ms / columnar_ms, 1),
+        "columnar_aggregates_ms": timed(lambda: columnar_aggregates(columns), repeat),
+        "load_ms": load_ms,
+        "update_us": round(update_us, 2),
+        "column_bytes": columns.nbytes(),
+    }
+
+def main():
+    parser = base_parser(__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100000, 1000000])
+    args = parser.parse_args()
+    for size in args.sizes:
+        print(json.dumps(run_size(size, args.repeat)))
+
+if __name__ == "__main__":
+    main()
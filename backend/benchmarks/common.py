@@ -0,0 +1,112 @@
+"""Shared helpers for the benchmark scripts.
+
+Run benchmarks from the backend directory, e.g.
+``python -m benchmarks.analytics_pipelines --sizes 1000 10000``.
+They talk to a local mongod (``--mongo-url``, default ``$BENCH_MONGO_URL``
+or ``mongodb://localhost:27017``) or, with ``--mock``, to an in-memory
+mongomock stand-in (``pip install mongomock-motor``).
+"""
+import argparse
+import os
+import random
+import time
+from statistics import median
+from typing import Any, Dict, List
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from services.committees import DEFAULT_COMMITTEE_ID
+
+ROLES = [
+    "Team Lead",
+    "Marketing Coordinator",
+    "Event Coordinator",
+    "Outreach Specialist",
+    "Communications Manager",
+]
+MONTHS = ["Jan", "Feb", "Mar"]
+
+def base_parser(description: str) -> argparse.ArgumentParser:
+    """Argument parser with the options every benchmark understands"""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--mongo-url", default=os.getenv("BENCH_MONGO_URL", "mongodb://localhost:27017"))
+    parser.add_argument("--db-name", default="performance_manager_bench")
+    parser.add_argument("--mock", action="store_true", help="use an in-memory mongomock stand-in")
+    parser.add_argument("--repeat", type=int, default=5)
+    return parser
+
+def get_database(args):
+    """Return a Motor database for the benchmark run"""
+    if args.mock:
+        from mongomock_motor import AsyncMongoMockClient
+        return AsyncMongoMockClient()[args.db_name]
+    return AsyncIOMotorClient(args.mongo_url)[args.db_name]
+
+def synthetic_member(i: int, rng: random.Random, committee_id: str = DEFAULT_COMMITTEE_ID) -> Dict[str, Any]:
+    """A member document with the same shape as the startup sample data"""
+    completed = rng.randint(0, 40)
+    pending = rng.randint(0, 10)
+    efficiency = rng.randint(40, 100)
+    return {
+        "_id": f"bench-{i}",
+        "committeeId": committee_id,
+        "name": f"Member {i}",
+        "role": rng.choice(ROLES),
+        "contact": f"member{i}@email.com",
+        "phone": f"+1 (555) {i % 1000:03d}-{i % 10000:04d}",
+        "tasksCompleted": completed,
+        "tasksPending": pending,
+        "totalTasks": completed + pending,
+        "efficiency": efficiency,
+        "registrationsBrought": rng.randint(0, 25),
+        "performanceHistory": [
+            {"month": month, "score": max(0, min(100, efficiency + rng.randint(-8, 8)))}
+            for month in MONTHS
+        ],
+        "createdAt": "2024-01-01T00:00:00Z",
+        "updatedAt": "2024-03-01T00:00:00Z",
+    }
+
+async def seed_members(collection, count: int, batch_size: int = 10000, seed: int = 42) -> None:
+    """Replace the collection contents with ``count`` synthetic members"""
+    rng = random.Random(seed)
+    await collection.delete_many({})
+    batch: List[Dict[str, Any]] = []
+    for i in range(count):
+        batch.append(synthetic_member(i, rng))
+        if len(batch) >= batch_size:
+            await collection.insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        await collection.insert_many(batch, ordered=False)
+
+async def time_async(func, repeat: int) -> Dict[str, float]:
+    """Run ``func`` ``repeat`` times and return timing stats in milliseconds"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {"median_ms": round(median(samples), 2), "min_ms": round(min(samples), 2)}
+
+def load_app(args):
+    """Import the FastAPI app wired to the benchmark database.
+
+    With ``--mock`` the process-wide connection is made with a mongomock
+    client instead of one built from MONGO_URL.
+    """
+    os.environ.setdefault("MONGO_URL", args.mongo_url)
+    os.environ["DB_NAME"] = args.db_name
+    import database
+    if args.mock:
+        from mongomock_motor import AsyncMongoMockClient
+        database.connect(AsyncMongoMockClient())
+    import server
+    return server.app, database.get_db()
+
+def member_payload(i: int, rng: random.Random) -> Dict[str, Any]:
+    """A CommitteeMemberCreate body built from a synthetic member"""
+    document = synthetic_member(i, rng)
+    for field in ("_id", "committeeId", "tasksCompleted", "tasksPending", "totalTasks", "createdAt", "updatedAt"):
+        document.pop(field)
+    return document
@@ -0,0 +1,89 @@
+"""Throughput and memory of the streaming exports versus building the list in memory.
+
+    python -m benchmarks.export_stream --members 1000000
+
+Against a real mongod each mode runs in its own subprocess so peak RSS is
+measured independently. With ``--mock`` the data only exists in-process,
+so both modes share one process and RSS is reported as growth.
+"""
+import argparse
+import asyncio
+import json
+import resource
+import subprocess
+import sys
+import time
+
+from benchmarks.common import base_parser, get_database, seed_members
+from models.committee_member import CommitteeMember
+from services import exports, member_queries
+from services.committees import DEFAULT_COMMITTEE_ID
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process (ru_maxrss is KiB on Linux)"""
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+async def run_stream(collection, export_format: str, compress: bool):
+    fields = member_queries.parse_fields(None)
+    rows = exports.iter_members(collection, DEFAULT_COMMITTEE_ID, fields)
+    total = 0
+    async for chunk in exports.stream_rows(rows, ["id"] + fields, export_format, compress=compress):
+        total += len(chunk)
+    return total
+
+async def run_legacy(collection, export_format: str, compress: bool):
+    members = []
+    for member_data in await collection.find().to_list(None):
+        member_data["id"] = str(member_data.pop("_id"))
+        members.append(CommitteeMember(**member_data).model_dump(mode="json"))
+    return len(json.dumps(members).encode())
+
+async def measure(collection, mode: str, export_format: str, compress: bool, count: int):
+    rss_before = peak_rss_mb()
+    start = time.perf_counter()
+    size = await (run_stream if mode == "stream" else run_legacy)(collection, export_format, compress)
+    elapsed = time.perf_counter() - start
+    return {
+        "mode": mode,
+        "format": export_format if mode == "stream" else "json",
+        "gzip": compress and mode == "stream",
+        "members": count,
+        "seconds": round(elapsed, 2),
+        "rows_per_second": round(count / elapsed) if elapsed else None,
+        "bytes": size,
+        "peak_rss_mb": peak_rss_mb(),
+        "rss_growth_mb": round(peak_rss_mb() - rss_before, 1),
+    }
+
+async def main():
+    parser = base_parser(__doc__)
+    parser.add_argument("--members", type=int, default=1_000_000)
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    parser.add_argument("--gzip", action="store_true")
+    parser.add_argument("--skip-seed", action="store_true")
+    parser.add_argument("--worker", choices=["stream", "legacy"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    collection = get_database(args).committee_members
+
+    if args.worker:
+        print(json.dumps(await measure(collection, args.worker, args.format, args.gzip, args.members)))
+        return
+
+    if not args.skip_seed:
+        await seed_members(collection, args.members)
+
+    if args.mock:
+        for mode in ("stream", "legacy"):
+            print(json.dumps(await measure(collection, mode, args.format, args.gzip, args.members)))
+        return
+
+    for mode in ("stream", "legacy"):
+        command = [sys.executable, "-m", "benchmarks.export_stream", "--worker", mode, "--skip-seed",
+                   "--mongo-url", args.mongo_url, "--db-name", args.db_name,
+                   "--members", str(args.members), "--format", args.format]
+        if args.gzip:
+            command.append("--gzip")
+        subprocess.run(command, check=True)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,72 @@
+"""Rank-of-member and top-N latency: leaderboard index versus sorting every member.
+
+    python -m benchmarks.leaderboard --sizes 1000 10000 100000
+
+"sort" is the previous approach: pull every member ordered by the metric
+and find the member's position. "index" is the in-process leaderboard;
+its one-off load time is reported separately, as is the cost of an update.
+"""
+import asyncio
+import json
+import random
+import time
+
+from benchmarks.common import base_parser, get_database, seed_members, time_async
+from services import analytics
+from services.committees import DEFAULT_COMMITTEE_ID
+from services.leaderboard import Leaderboard
+
+async def rank_by_sort(collection, member_id: str) -> int:
+    ranked = await collection.aggregate(analytics.ranked_members_pipeline(DEFAULT_COMMITTEE_ID), allowDiskUse=True).to_list(None)
+    return next(position for position, doc in enumerate(ranked) if doc["_id"] == member_id) + 1
+
+async def main():
+    parser = base_parser(__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--lookups", type=int, default=1000)
+    args = parser.parse_args()
+    database = get_database(args)
+    collection = database.committee_members
+    rng = random.Random(7)
+
+    for size in args.sizes:
+        await seed_members(collection, size)
+        member_ids = [f"bench-{rng.randrange(size)}" for _ in range(args.lookups)]
+
+        board = Leaderboard(DEFAULT_COMMITTEE_ID)
+        start = time.perf_counter()
+        await board.ensure_loaded(database)
+        load_ms = (time.perf_counter() - start) * 1000
+        index = board.indexes["efficiency"]
+
+        sort_stats = await time_async(lambda: rank_by_sort(collection, member_ids[0]), args.repeat)
+        assert await rank_by_sort(collection, member_ids[0]) == index.position(member_ids[0]) + 1
+
+        start = time.perf_counter()
+        for member_id in member_ids:
+            index.position(member_id)
+        rank_us = (time.perf_counter() - start) / len(member_ids) * 1_000_000
+
+        start = time.perf_counter()
+        for offset in range(0, min(size, 50 * args.lookups), 50):
+            index.entries(offset, offset + 50)
+        pages = len(range(0, min(size, 50 * args.lookups), 50))
+        page_us = (time.perf_counter() - start) / pages * 1_000_000
+
+        start = time.perf_counter()
+        for member_id in member_ids:
+            board.apply([({"_id": member_id}, {"_id": member_id, "committeeId": DEFAULT_COMMITTEE_ID, "efficiency": rng.randint(40, 100), "registrationsBrought": rng.randint(0, 25)})])
+        update_us = (time.perf_counter() - start) / len(member_ids) * 1_000_000
+
+        print(json.dumps({
+            "members": size,
+            "sort_rank_ms": sort_stats["median_ms"],
+            "index_load_ms": round(load_ms, 2),
+            "index_rank_us": round(rank_us, 2),
+            "index_top50_us": round(page_us, 2),
+            "index_update_us": round(update_us, 2),
+        }))
+    await collection.drop()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,341 @@
+"""Concurrent load test of every API endpoint, with a JSON baseline to catch regressions.
+
+    python -m benchmarks.load_test --sizes 100 10000 1000000 --save benchmarks/baseline.json
+    python -m benchmarks.load_test --sizes 100 10000 1000000 --compare benchmarks/baseline.json
+
+For each committee size the database is reseeded with synthetic members of
+the startup sample shape, their history points and a set of tasks. Then
+every scenario is driven by ``--concurrency`` workers through an in-process
+ASGI client, so no network is involved. A scenario is one GET route with its
+path parameters filled in, or one write flow. Each scenario reports
+throughput, p50/p95/p99 latency and non-2xx responses. A final "mixed" phase
+interleaves all read scenarios. Process RSS is sampled after seeding and
+after the run.
+
+Every route in the app must be either a scenario or listed in SKIPPED, so a
+new endpoint cannot silently go unbenchmarked.
+
+``--compare`` exits with status 1 if any scenario regressed beyond
+``--tolerance``. That means p95 slower, or throughput lower, by more than
+that fraction (and by at least ``--min-ms`` for latency), or errors where
+the baseline had none. The response cache is off unless ``--cache`` is given.
+"""
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import resource
+import sys
+import time
+from datetime import datetime
+from statistics import quantiles
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from benchmarks.common import base_parser, load_app, synthetic_member
+from services import history
+from services.committees import DEFAULT_COMMITTEE_ID
+
+# Collections the load test reseeds and drops
+SEEDED_COLLECTIONS = ("committee_members", "tasks", history.HISTORY_COLLECTION, "task_category_stats", "analytics_summary", "analytics_snapshots")
+
+# Routes not driven by the load test, with the reason
+SKIPPED = {
+    "GET /openapi.json": "schema, development only",
+    "GET /docs": "development only",
+    "GET /docs/oauth2-redirect": "development only",
+    "GET /redoc": "development only",
+    "GET /api/stream/": "server-sent events never complete",
+    "GET /health/ready": "503 until the app lifespan has run, which the in-process client does not do",
+    "GET /api/admin/slow-requests/{request_id}": "ids exist only while in the ring buffer",
+    "GET /api/admin/slow-queries/{query_id}/explain": "ids exist only while in the ring buffer",
+    "POST /api/members/": "covered by the member create/delete flow",
+    "DELETE /api/members/{member_id}": "covered by the member create/delete flow",
+    "POST /api/members/bulk": "see benchmarks.bulk_members",
+    "POST /api/tasks/": "covered by the task create/delete flow",
+    "DELETE /api/tasks/{task_id}": "covered by the task create/delete flow",
+    "PUT /api/settings/registration-tiers": "rebuilds the summary; an admin operation, not load",
+    "DELETE /api/admin/cache": "admin operation",
+    "DELETE /api/admin/leaderboard": "admin operation",
+    "DELETE /api/admin/columns": "admin operation",
+    "DELETE /api/admin/search": "admin operation",
+    "DELETE /api/admin/slow-requests": "admin operation",
+}
+
+# Query strings for GET routes that take them
+QUERIES = {
+    "/api/members/": {"limit": 50, "sort": "efficiency", "order": "desc"},
+    "/api/members/search": {"q": "member 1"},
+    "/api/tasks/": {"limit": 50},
+    "/api/leaderboard/{metric}": {"limit": 50},
+    "/api/leaderboard/{metric}/members/{member_id}/around": {"before": 5, "after": 5},
+}
+
+Request = Callable[[httpx.AsyncClient, random.Random], Awaitable[httpx.Response]]
+
+def rss_mb() -> Optional[float]:
+    """Current resident set size, where /proc is available"""
+    try:
+        with open("/proc/self/statm") as statm:
+            return round(int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024, 1)
+    except (OSError, ValueError):
+        return None
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(peak / 1024 / (1024 if sys.platform == "darwin" else 1), 1)
+
+async def seed(database, size: int, batch_size: int = 10000) -> Dict[str, List[str]]:
+    """Members, history points and tasks for one committee size"""
+    # Imports database, so only after load_app has pointed it at the benchmark database
+    from services import tasks as task_counters
+
+    rng = random.Random(42)
+    for collection in SEEDED_COLLECTIONS:
+        await database[collection].delete_many({})
+    try:
+        await history.create_history_collection(database)
+    except Exception:
+        pass  # Time-series collections need MongoDB 5.0+; mongomock has none
+
+    first_batch: List[Dict[str, Any]] = []
+    for start in range(0, size, batch_size):
+        members = [synthetic_member(i, rng) for i in range(start, min(size, start + batch_size))]
+        points = []
+        for member in members:
+            points.extend(history.score_points(member["committeeId"], member["_id"], member.pop("performanceHistory")))
+            points.append({
+                "timestamp": history.month_start(datetime.utcnow(), rng.randrange(3)),
+                "meta": {"committeeId": member["committeeId"], "memberId": member["_id"], "metric": history.REGISTRATIONS},
+                "value": member["registrationsBrought"],
+            })
+        if not first_batch:
+            first_batch = members[:50]
+        await database.committee_members.insert_many(members, ordered=False)
+        await database[history.HISTORY_COLLECTION].insert_many(points, ordered=False)
+
+    await database.tasks.insert_many(task_counters.sample_tasks(DEFAULT_COMMITTEE_ID, first_batch))
+    # Member task counts follow the tasks collection, as after startup
+    await task_counters.rebuild_task_counters(database, DEFAULT_COMMITTEE_ID)
+    task_ids = [task["_id"] async for task in database.tasks.find({}, {"_id": 1}).limit(1000)]
+    return {"members": [f"bench-{i}" for i in range(size)], "tasks": task_ids}
+
+def read_scenarios(app, ids: Dict[str, List[str]]) -> Dict[str, Request]:
+    """One GET scenario per route, failing on routes neither driven nor skipped"""
+    params = {
+        "member_id": lambda rng: rng.choice(ids["members"]),
+        "task_id": lambda rng: rng.choice(ids["tasks"]),
+        "metric": lambda rng: rng.choice(["efficiency", "registrationsBrought"]),
+    }
+    scenarios: Dict[str, Request] = {}
+    for route in app.routes:
+        for method in sorted(getattr(route, "methods", None) or ()):
+            name = f"{method} {route.path}"
+            if method == "HEAD" or name in SKIPPED:
+                continue
+            if method != "GET" and name not in WRITE_SCENARIOS:
+                raise SystemExit(f"{name} is neither benchmarked nor listed in SKIPPED")
+            if method != "GET":
+                continue
+            missing = [param for param in route.param_convertors if param not in params]
+            if missing:
+                raise SystemExit(f"{name}: no value for path parameters {missing}")
+
+            def request(client, rng, path=route.path, names=list(route.param_convertors), query=QUERIES.get(route.path)):
+                return client.get(path.format(**{param: params[param](rng) for param in names}), params=query)
+
+            scenarios[name] = request
+    return scenarios
+
+async def update_member(client: httpx.AsyncClient, rng: random.Random, ids) -> httpx.Response:
+    member_id = rng.choice(ids["members"])
+    return await client.put(f"/api/members/{member_id}", json={
+        "efficiency": rng.randint(40, 100),
+        "registrationsBrought": rng.randint(0, 25),
+    })
+
+async def update_task(client: httpx.AsyncClient, rng: random.Random, ids) -> httpx.Response:
+    return await client.put(f"/api/tasks/{rng.choice(ids['tasks'])}", json={
+        "status": rng.choice(["pending", "completed"]),
+    })
+
+async def create_delete_member(client: httpx.AsyncClient, rng: random.Random, ids) -> httpx.Response:
+    member = synthetic_member(rng.randrange(10 ** 9), rng)
+    body = {key: member[key] for key in ("name", "role", "contact", "phone", "efficiency", "registrationsBrought")}
+    created = await client.post("/api/members/", json=body)
+    if created.status_code >= 300:
+        return created
+    return await client.delete(f"/api/members/{created.json()['id']}")
+
+async def create_delete_task(client: httpx.AsyncClient, rng: random.Random, ids) -> httpx.Response:
+    created = await client.post("/api/tasks/", json={
+        "title": "Load test task",
+        "category": "Load Test",
+        "assigneeId": rng.choice(ids["members"]),
+        "status": rng.choice(["pending", "completed"]),
+    })
+    if created.status_code >= 300:
+        return created
+    return await client.delete(f"/api/tasks/{created.json()['id']}")
+
+# Write flows, keyed by the route they exercise
+WRITE_SCENARIOS = {
+    "PUT /api/members/{member_id}": update_member,
+    "PUT /api/tasks/{task_id}": update_task,
+}
+FLOWS = {
+    "FLOW member create/delete": create_delete_member,
+    "FLOW task create/delete": create_delete_task,
+}
+
+async def drive(client: httpx.AsyncClient, requests: List[Request], total: int, concurrency: int) -> Dict[str, Any]:
+    """Run ``total`` requests, cycling through ``requests``, on ``concurrency`` workers"""
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    remaining = iter(range(total))
+
+    async def worker(number: int):
+        rng = random.Random(number)
+        for sequence in remaining:
+            request = requests[sequence % len(requests)]
+            start = time.perf_counter()
+            try:
+                response = await request(client, rng)
+                status = response.status_code
+            except Exception as e:
+                status = type(e).__name__
+            latencies.append((time.perf_counter() - start) * 1000)
+            if not isinstance(status, int) or status >= 300:
+                errors[str(status)] = errors.get(str(status), 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(number) for number in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    cuts = quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    return {
+        "requests": total,
+        "rps": round(total / elapsed, 1),
+        "p50_ms": round(cuts[49], 2),
+        "p95_ms": round(cuts[94], 2),
+        "p99_ms": round(cuts[98], 2),
+        "errors": errors,
+    }
+
+async def run_size(app, database, size: int, args) -> Dict[str, Any]:
+    from services.leaderboard import leaderboard
+    from services.member_search import search_index
+    from services.response_cache import response_cache
+    from services.snapshots import analytics_snapshots
+    from services.tiers import tier_config
+
+    start = time.perf_counter()
+    ids = await seed(database, size)
+    seed_seconds = round(time.perf_counter() - start, 1)
+    # In-process state built from the previous size's data
+    leaderboard.invalidate()
+    search_index.invalidate()
+    tier_config.invalidate()
+    analytics_snapshots.forget()
+    await response_cache.invalidate()
+    rss_seeded = rss_mb()
+
+    scenarios: Dict[str, Request] = read_scenarios(app, ids)
+    reads = list(scenarios.values())
+    for name, write in {**WRITE_SCENARIOS, **FLOWS}.items():
+        scenarios[name] = lambda client, rng, write=write: write(client, rng, ids)
+
+    results: Dict[str, Any] = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://load-test", timeout=None) as client:
+        for name, request in scenarios.items():
+            # Warm-up loads the leaderboard, tier config and connection pool
+            await drive(client, [request], args.concurrency, args.concurrency)
+            results[name] = await drive(client, [request], args.requests, args.concurrency)
+            print(json.dumps({"size": size, "scenario": name, **results[name]}), file=sys.stderr)
+        results["MIXED reads"] = await drive(client, reads, args.requests * 4, args.concurrency)
+
+    return {
+        "seconds_to_seed": seed_seconds,
+        "rss_mb_seeded": rss_seeded,
+        "rss_mb_after": rss_mb(),
+        "peak_rss_mb": peak_rss_mb(),
+        "scenarios": results,
+    }
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], tolerance: float, min_ms: float) -> List[Dict[str, Any]]:
+    """Scenarios whose p95, throughput or errors got worse than the baseline"""
+    regressions = []
+    for size, result in current["sizes"].items():
+        base_size = baseline["sizes"].get(size)
+        if base_size is None:
+            continue
+        for name, now in result["scenarios"].items():
+            before = base_size["scenarios"].get(name)
+            if before is None:
+                continue
+            reasons = []
+            if now["p95_ms"] > before["p95_ms"] * (1 + tolerance) and now["p95_ms"] - before["p95_ms"] >= min_ms:
+                reasons.append(f"p95 {before['p95_ms']} -> {now['p95_ms']} ms")
+            if now["rps"] < before["rps"] * (1 - tolerance):
+                reasons.append(f"throughput {before['rps']} -> {now['rps']} req/s")
+            if sum(now["errors"].values()) and not sum(before["errors"].values()):
+                reasons.append(f"errors {now['errors']}")
+            if reasons:
+                regressions.append({"size": size, "scenario": name, "reasons": reasons})
+    return regressions
+
+async def main():
+    parser = base_parser(__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--cache", action="store_true", help="leave the response cache on")
+    parser.add_argument("--save", metavar="PATH", help="write the results as a baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare against a saved baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--min-ms", type=float, default=1.0, help="ignore p95 changes smaller than this")
+    args = parser.parse_args()
+
+    os.environ["RESPONSE_CACHE_ENABLED"] = "true" if args.cache else "false"
+    # One INFO line per request would dominate the output
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    app, database = load_app(args)
+    if not args.mock:
+        import database as database_module
+        await database_module.create_indexes()
+
+    current = {
+        "meta": {
+            "python": platform.python_version(),
+            "mock": args.mock,
+            "cache": args.cache,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+        },
+        "sizes": {},
+    }
+    for size in args.sizes:
+        current["sizes"][str(size)] = await run_size(app, database, size, args)
+    for collection in SEEDED_COLLECTIONS:
+        await database.drop_collection(collection)
+
+    print(json.dumps(current, indent=2))
+    if args.save:
+        with open(args.save, "w") as output:
+            json.dump(current, output, indent=2)
+    if args.compare:
+        with open(args.compare) as source:
+            baseline = json.load(source)
+        if baseline["meta"] != current["meta"]:
+            print(f"warning: baseline settings differ: {baseline['meta']}", file=sys.stderr)
+        regressions = compare(baseline, current, args.tolerance, args.min_ms)
+        print(json.dumps({"regressions": regressions}, indent=2))
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    asyncio.run(main())
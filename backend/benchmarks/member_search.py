@@ -0,0 +1,129 @@
+"""Latency of member search: in-process index versus a regex scan in Mongo.
+
+    python -m benchmarks.member_search --members 100000 --queries 1000
+
+Members get names drawn from FIRST_NAMES and LAST_NAMES, so a two-letter
+prefix matches thousands of them. ``index`` times SearchIndex.search
+directly, ``route`` the whole GET /api/members/search request with the
+response cache disabled, and ``regex`` the case-insensitive word-prefix
+$regex query a search without the index would run. The one-off index load
+and the cost of folding a member write into it are reported separately.
+"""
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+from statistics import median
+
+import httpx
+
+from benchmarks.common import base_parser, load_app, synthetic_member
+from services.committees import DEFAULT_COMMITTEE_ID
+from services.member_search import FIELD_WEIGHTS, SearchIndex, parse_query, search_index
+
+FIRST_NAMES = [
+    "Sarah", "Michael", "Emily", "David", "Lisa", "James", "Maria", "Robert", "Linda", "William",
+    "Elena", "Thomas", "Aisha", "Daniel", "Sofia", "Kevin", "Grace", "Omar", "Hannah", "Lucas",
+]
+LAST_NAMES = [
+    "Johnson", "Chen", "Rodriguez", "Kim", "Thompson", "Smith", "Garcia", "Martinez", "Nguyen", "Patel",
+    "Brown", "Wilson", "Anderson", "Lopez", "Khan", "Müller", "Rossi", "Silva", "Cohen", "Okafor",
+]
+
+def percentiles(samples):
+    ordered = sorted(samples)
+    return {
+        "median_ms": round(median(ordered), 3),
+        "p95_ms": round(ordered[max(0, int(len(ordered) * 0.95) - 1)], 3),
+        "max_ms": round(ordered[-1], 3),
+    }
+
+def named_member(i: int, rng: random.Random):
+    member = synthetic_member(i, rng)
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    member["name"] = f"{first} {last} {i}"
+    member["contact"] = f"{first.lower()}.{last.lower()}{i}@email.com"
+    member.pop("performanceHistory")
+    return member
+
+def random_query(rng: random.Random) -> str:
+    """A typeahead prefix of a name, sometimes followed by a prefix of a surname or role"""
+    query = rng.choice(FIRST_NAMES)[:rng.randint(2, 5)]
+    if rng.random() < 0.5:
+        query += " " + rng.choice(LAST_NAMES + ["coordinator", "lead"])[:rng.randint(1, 4)]
+    return query
+
+def regex_filter(terms):
+    return {"committeeId": DEFAULT_COMMITTEE_ID, "$and": [
+        {"$or": [{field: {"$regex": f"\\b{term}", "$options": "i"}} for field in FIELD_WEIGHTS]}
+        for term in terms
+    ]}
+
+async def main():
+    parser = base_parser(__doc__)
+    parser.add_argument("--members", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--regex-queries", type=int, default=20)
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    os.environ["RESPONSE_CACHE_ENABLED"] = "false"
+    app, db = load_app(args)
+    rng = random.Random(42)
+
+    await db.committee_members.delete_many({})
+    for start in range(0, args.members, 10000):
+        await db.committee_members.insert_many(
+            [named_member(i, rng) for i in range(start, min(args.members, start + 10000))], ordered=False
+        )
+
+    index = SearchIndex(DEFAULT_COMMITTEE_ID)
+    start = time.perf_counter()
+    await index.ensure_loaded(db)
+    load_ms = (time.perf_counter() - start) * 1000
+
+    queries = [random_query(rng) for _ in range(args.queries)]
+    index_samples, totals = [], []
+    for query in queries:
+        start = time.perf_counter()
+        total, _ = index.search(parse_query(query), 0, 20)
+        index_samples.append((time.perf_counter() - start) * 1000)
+        totals.append(total)
+
+    start = time.perf_counter()
+    for i in range(args.queries):
+        member = named_member(rng.randrange(args.members), rng)
+        index.apply_one(member["_id"], member)
+    update_us = (time.perf_counter() - start) / args.queries * 1_000_000
+
+    route_samples = []
+    await search_index.loaded(db, DEFAULT_COMMITTEE_ID)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for query in queries:
+            start = time.perf_counter()
+            (await client.get("/api/members/search", params={"q": query})).raise_for_status()
+            route_samples.append((time.perf_counter() - start) * 1000)
+
+    regex_samples = []
+    for query in queries[:args.regex_queries]:
+        start = time.perf_counter()
+        await db.committee_members.find(regex_filter(parse_query(query)), {"name": 1}).limit(20).to_list(20)
+        regex_samples.append((time.perf_counter() - start) * 1000)
+
+    print(json.dumps({
+        "members": args.members,
+        "queries": args.queries,
+        "matches_median": median(totals),
+        "load_ms": round(load_ms, 1),
+        "words": len(index.words),
+        "update_us": round(update_us, 1),
+        "index": percentiles(index_samples),
+        "route": percentiles(route_samples),
+        "regex": percentiles(regex_samples),
+    }))
+    await db.committee_members.drop()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,126 @@
+"""Round trips and latency of PUT /members/{id}, and lost updates under contention.
+
+    python -m benchmarks.member_updates --members 1000 --updates 500 --writers 20
+
+``legacy_store_calls`` replays the old write path (find_one, update_one,
+find_one) against the collection, ``atomic_store_calls`` the route's single
+find_one_and_update; ``route`` is the whole PUT request. The contention run has ``--writers`` clients each
+incrementing one member's registrationsBrought ``--increments`` times with
+a read-modify-write: without If-Match some increments are lost, with
+If-Match a 412 makes the client re-read and retry.
+"""
+import asyncio
+import json
+import logging
+import random
+import time
+from statistics import median
+
+import httpx
+
+from pymongo import ReturnDocument
+
+from benchmarks.common import base_parser, load_app, seed_members
+
+async def legacy_update(collection, member_id, update_data):
+    existing = await collection.find_one({"_id": member_id})
+    update_data["totalTasks"] = update_data.get("tasksCompleted", existing["tasksCompleted"]) + update_data.get("tasksPending", existing["tasksPending"])
+    await collection.update_one({"_id": member_id}, {"$set": update_data})
+    return await collection.find_one({"_id": member_id})
+
+async def atomic_update(collection, member_id, update_data):
+    # Imported late: services pull in database, which load_app configures
+    from services.member_writes import member_update_pipeline
+    return await collection.find_one_and_update(
+        {"_id": member_id}, member_update_pipeline(update_data), return_document=ReturnDocument.BEFORE
+    )
+
+def percentiles(samples):
+    ordered = sorted(samples)
+    return {
+        "median_ms": round(median(ordered), 3),
+        "p95_ms": round(ordered[int(len(ordered) * 0.95) - 1], 3),
+    }
+
+async def compare_paths(client, collection, args, rng):
+    legacy, atomic, route = [], [], []
+    for i in range(args.updates):
+        member_id = f"bench-{rng.randrange(args.members)}"
+        body = {"registrationsBrought": rng.randint(0, 25), "efficiency": rng.randint(40, 100)}
+
+        start = time.perf_counter()
+        await legacy_update(collection, member_id, dict(body))
+        legacy.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        await atomic_update(collection, member_id, dict(body))
+        atomic.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        (await client.put(f"/api/members/{member_id}", json=body)).raise_for_status()
+        route.append((time.perf_counter() - start) * 1000)
+    return {
+        "legacy_store_calls": {"roundTrips": 3, **percentiles(legacy)},
+        "atomic_store_calls": {"roundTrips": 1, **percentiles(atomic)},
+        "route": percentiles(route),
+    }
+
+async def increment(client, member_id, times, use_if_match):
+    retries = 0
+    for _ in range(times):
+        while True:
+            current = await client.get(f"/api/members/{member_id}")
+            current.raise_for_status()
+            headers = {"If-Match": current.headers["etag"]} if use_if_match else {}
+            response = await client.put(
+                f"/api/members/{member_id}",
+                json={"registrationsBrought": current.json()["registrationsBrought"] + 1},
+                headers=headers,
+            )
+            if response.status_code == 412:
+                retries += 1
+                continue
+            response.raise_for_status()
+            break
+    return retries
+
+async def contention(client, collection, args, use_if_match):
+    member_id = "bench-0"
+    await collection.update_one({"_id": member_id}, {"$set": {"registrationsBrought": 0}})
+    start = time.perf_counter()
+    retries = await asyncio.gather(*(
+        increment(client, member_id, args.increments, use_if_match) for _ in range(args.writers)
+    ))
+    elapsed = time.perf_counter() - start
+    final = (await collection.find_one({"_id": member_id}))["registrationsBrought"]
+    expected = args.writers * args.increments
+    return {
+        "ifMatch": use_if_match,
+        "expected": expected,
+        "final": final,
+        "lostUpdates": expected - final,
+        "retries": sum(retries),
+        "seconds": round(elapsed, 3),
+    }
+
+async def main():
+    parser = base_parser(__doc__)
+    parser.add_argument("--members", type=int, default=1000)
+    parser.add_argument("--updates", type=int, default=500)
+    parser.add_argument("--writers", type=int, default=20)
+    parser.add_argument("--increments", type=int, default=10)
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    app, db = load_app(args)
+    rng = random.Random(42)
+    await seed_members(db.committee_members, args.members)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        print(json.dumps({"updates": args.updates, **await compare_paths(client, db.committee_members, args, rng)}))
+        for use_if_match in (False, True):
+            print(json.dumps(await contention(client, db.committee_members, args, use_if_match)))
+    await db.committee_members.drop()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,117 @@
+"""Added cost per request of MetricsMiddleware and the per-route Mongo command listener.
+
+    python -m benchmarks.metrics_overhead --requests 20000
+
+Drives a trivial FastAPI app directly over ASGI, once bare and once wrapped
+in MetricsMiddleware. Routing a FastAPI request costs far more than the
+middleware and varies run to run, so the middleware is also timed around a
+raw ASGI app that answers immediately, which isolates its cost. The command
+listener is timed by feeding it synthetic succeeded events, which is what
+PyMongo does once per command.
+"""
+import asyncio
+import json
+import time
+from statistics import median
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+
+from benchmarks.common import base_parser
+from middleware.metrics import MetricsMiddleware
+from services import metrics
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/members/{member_id}")
+    async def member(member_id: str):
+        return {"id": member_id}
+
+    return app
+
+async def raw_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+async def drive(app, requests: int) -> float:
+    """Seconds to push ``requests`` GETs through ``app``"""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/api/members/7",
+        "raw_path": b"/api/members/7",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+        "server": ("bench", 80),
+        "client": ("bench", 1),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return time.perf_counter() - start
+
+async def compare(name: str, bare, wrapped, args):
+    """Median µs per request with and without the middleware"""
+    await drive(bare, 200)
+    await drive(wrapped, 200)
+    results = {"bare": [], "metrics": []}
+    for _ in range(args.repeat):
+        results["bare"].append(await drive(bare, args.requests))
+        results["metrics"].append(await drive(wrapped, args.requests))
+    bare_us = median(results["bare"]) / args.requests * 1_000_000
+    metrics_us = median(results["metrics"]) / args.requests * 1_000_000
+    return {
+        "app": name,
+        "requests": args.requests,
+        "bare_us_per_request": round(bare_us, 2),
+        "metrics_us_per_request": round(metrics_us, 2),
+        "overhead_us_per_request": round(metrics_us - bare_us, 2),
+    }
+
+async def request_overhead(args):
+    app = build_app()
+    fastapi = await compare("fastapi", app, MetricsMiddleware(app, router=app.router), args)
+    # No "route" in scope, so this also pays for the fallback router match
+    raw = await compare("raw", raw_app, MetricsMiddleware(raw_app, router=app.router), args)
+    return [fastapi, raw]
+
+def listener_overhead(args):
+    event = SimpleNamespace(command_name="find", duration_micros=850)
+    token = metrics.current_scope.set({"route": SimpleNamespace(path_format="/api/members/{member_id}")})
+    samples = []
+    try:
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            for _ in range(args.requests):
+                metrics.route_command_listener.succeeded(event)
+            samples.append(time.perf_counter() - start)
+    finally:
+        metrics.current_scope.reset(token)
+    return {"commands": args.requests, "listener_us_per_command": round(median(samples) / args.requests * 1_000_000, 2)}
+
+async def main():
+    parser = base_parser(__doc__)
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    for result in await request_overhead(args):
+        print(json.dumps(result))
+    print(json.dumps(listener_overhead(args)))
+    render_start = time.perf_counter()
+    body = metrics.render()
+    print(json.dumps({"render_ms": round((time.perf_counter() - render_start) * 1000, 2), "bytes": len(body)}))
+
+if __name__ == "__main__":
+    asyncio.run(main())
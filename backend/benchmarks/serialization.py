@@ -0,0 +1,110 @@
+"""Per-member serialization cost and GET /api/members latency on the trusted read path.
+
+    python -m benchmarks.serialization --members 10000 --requests 200
+
+The first part times, per member, the old read path (rebuild a
+CommitteeMember, recompute totalTasks, re-validate against the response
+model and JSON-encode) against encoding already-projected rows with orjson.
+The second seeds ``--members`` members and reports p50/p99 latency of
+``GET /api/members`` with the response cache disabled.
+"""
+import asyncio
+import json
+import os
+import random
+import time
+from statistics import median, quantiles
+
+import httpx
+import orjson
+from fastapi.encoders import jsonable_encoder
+
+from benchmarks.common import base_parser, load_app, seed_members, synthetic_member
+from models.committee_member import CommitteeMember
+from services import member_queries
+
+def model_path(documents):
+    """What the read handlers used to do for every stored document"""
+    members = []
+    for document in documents:
+        member_data = dict(document)
+        member_data["id"] = str(member_data.pop("_id"))
+        member = CommitteeMember(**member_data)
+        member.calculate_total_tasks()
+        # FastAPI re-validated the result against response_model before encoding
+        members.append(CommitteeMember.model_validate(member.model_dump()))
+    return json.dumps(jsonable_encoder(members)).encode()
+
+def trusted_path(rows):
+    """Rows already shaped by response_projection, encoded as-is"""
+    return orjson.dumps(rows)
+
+def projected_rows(documents):
+    """Python equivalent of the response_projection stage"""
+    rows = []
+    for document in documents:
+        row = {"id": document["_id"]}
+        for field in member_queries.ALL_FIELDS:
+            if field == "totalTasks":
+                row[field] = document["tasksCompleted"] + document["tasksPending"]
+            elif field in document:
+                row[field] = document[field]
+        rows.append(row)
+    return rows
+
+def per_member_cost(count: int, repeat: int):
+    rng = random.Random(42)
+    documents = [synthetic_member(i, rng) for i in range(count)]
+    rows = projected_rows(documents)
+    results = {}
+    for name, func, data in (("model", model_path, documents), ("trusted", trusted_path, rows)):
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func(data)
+            samples.append(time.perf_counter() - start)
+        results[name] = round(median(samples) / count * 1_000_000, 2)
+    return {
+        "members": count,
+        "model_us_per_member": results["model"],
+        "trusted_us_per_member": results["trusted"],
+        "speedup": round(results["model"] / results["trusted"], 1) if results["trusted"] else None,
+    }
+
+async def list_latency(args):
+    os.environ["RESPONSE_CACHE_ENABLED"] = "false"
+    app, db = load_app(args)
+    await seed_members(db.committee_members, args.members)
+    await db.committee_members.update_many({}, {"$unset": {"performanceHistory": ""}})
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        samples = []
+        for _ in range(args.requests):
+            start = time.perf_counter()
+            response = await client.get("/api/members/", params={"limit": args.limit, "sort": "efficiency", "order": "desc"})
+            response.raise_for_status()
+            samples.append((time.perf_counter() - start) * 1000)
+    await db.committee_members.drop()
+
+    cuts = quantiles(samples, n=100)
+    return {
+        "members": args.members,
+        "limit": args.limit,
+        "requests": args.requests,
+        "p50_ms": round(cuts[49], 2),
+        "p99_ms": round(cuts[98], 2),
+    }
+
+async def main():
+    parser = base_parser(__doc__)
+    parser.add_argument("--members", type=int, default=10000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    print(json.dumps(per_member_cost(args.limit * 10, args.repeat)))
+    print(json.dumps(await list_latency(args)))
+
+if __name__ == "__main__":
+    asyncio.run(main())
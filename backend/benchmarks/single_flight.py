@@ -0,0 +1,76 @@
+"""Identical concurrent analytics requests with and without single-flight.
+
+    python -m benchmarks.single_flight --members 10000 --burst 50 --rounds 5
+
+Each round fires ``--burst`` identical GETs at once, as when a room full
+of people opens the dashboard together, with the response cache and
+analytics snapshots disabled so every request would reach its handler.
+For each endpoint and mode the output has the handler runs and MongoDB
+commands per burst and the burst's wall time. Commands are counted by the
+client's command listener, which mongomock does not call, so they are
+null with ``--mock``.
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+from statistics import median
+
+import httpx
+
+from benchmarks.common import base_parser, load_app, seed_members
+
+ENDPOINTS = ("/api/analytics/overview", "/api/analytics/tasks", "/api/dashboard")
+
+def command_count(command_metrics):
+    return sum(stats["count"] for stats in command_metrics.stats().values())
+
+async def run_bursts(client, flights, command_metrics, mock: bool, path: str, burst: int, rounds: int):
+    calls, commands, wall = [], [], []
+    for _ in range(rounds):
+        calls_before, commands_before = flights.calls, command_count(command_metrics)
+        start = time.perf_counter()
+        responses = await asyncio.gather(*(client.get(path) for _ in range(burst)))
+        wall.append((time.perf_counter() - start) * 1000)
+        for response in responses:
+            response.raise_for_status()
+        calls.append(flights.calls - calls_before)
+        commands.append(None if mock else command_count(command_metrics) - commands_before)
+    return {
+        "handler_runs": median(calls),
+        "mongo_commands": None if mock else median(commands),
+        "burst_ms": round(median(wall), 1),
+    }
+
+async def main():
+    parser = base_parser(__doc__)
+    parser.add_argument("--members", type=int, default=10000)
+    parser.add_argument("--burst", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    os.environ["RESPONSE_CACHE_ENABLED"] = "false"
+    os.environ["ANALYTICS_SNAPSHOTS_ENABLED"] = "false"
+    app, db = load_app(args)
+    # Imported late: services pull in database, which load_app configures
+    from services.committees import DEFAULT_COMMITTEE_ID
+    from services.mongo_metrics import command_metrics
+    from services.single_flight import request_flights
+    from services.summary import rebuild_summary
+
+    await seed_members(db.committee_members, args.members)
+    await rebuild_summary(db, DEFAULT_COMMITTEE_ID)
+    transport = httpx.ASGITransport(app=app)
+    results = {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for path in ENDPOINTS:
+            results[path] = {}
+            for mode, enabled in (("per_request", False), ("single_flight", True)):
+                request_flights.enabled = enabled
+                results[path][mode] = await run_bursts(client, request_flights, command_metrics, args.mock, path, args.burst, args.rounds)
+    print(json.dumps({"members": args.members, "burst": args.burst, "rounds": args.rounds, "endpoints": results}))
+    await db.committee_members.drop()
+
+if __name__ == "__main__":
+    asyncio.run(main())
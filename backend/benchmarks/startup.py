@@ -0,0 +1,95 @@
+"""Cold start cost: importing the app, running its lifespan and becoming ready.
+
+    python -m benchmarks.startup --repeat 5
+
+Every sample runs in a fresh interpreter. ``import_ms`` covers importing
+``server`` (and with it every route and service module), ``startup_ms``
+the lifespan startup uvicorn waits for before accepting connections,
+``ready_ms`` the time from the start of the lifespan until /health/ready
+answers 200, and ``first_request_ms`` one GET /api/members/ after that.
+``slowest_imports`` lists the modules ``server`` imports directly, by
+cumulative ``python -X importtime`` microseconds.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from statistics import median
+
+from benchmarks.common import base_parser, load_app
+
+async def boot(app, timeout: float):
+    import httpx
+    samples = {}
+    start = time.perf_counter()
+    async with app.router.lifespan_context(app):
+        samples["startup_ms"] = (time.perf_counter() - start) * 1000
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            while (await client.get("/health/ready")).status_code != 200:
+                if time.perf_counter() - start > timeout:
+                    raise TimeoutError(f"Not ready after {timeout}s")
+                await asyncio.sleep(0.005)
+            samples["ready_ms"] = (time.perf_counter() - start) * 1000
+            request_start = time.perf_counter()
+            (await client.get("/api/members/")).raise_for_status()
+            samples["first_request_ms"] = (time.perf_counter() - request_start) * 1000
+    return samples
+
+def child(args):
+    """One cold start, printed as JSON"""
+    start = time.perf_counter()
+    app, _ = load_app(args)
+    samples = {"import_ms": (time.perf_counter() - start) * 1000}
+    samples.update(asyncio.run(boot(app, args.ready_timeout)))
+    print(json.dumps(samples))
+
+def child_command(args):
+    command = [sys.executable, "-m", "benchmarks.startup", "--child", "--mongo-url", args.mongo_url, "--db-name", args.db_name]
+    return command + ["--mock"] if args.mock else command
+
+def slowest_imports(args, count: int = 10):
+    env = {**os.environ, "MONGO_URL": os.environ.get("MONGO_URL", args.mongo_url), "DB_NAME": args.db_name}
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import server"], env=env, capture_output=True, text=True, check=True)
+    children, direct = [], []
+    for line in result.stderr.splitlines():
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue  # Header line
+        # Modules are listed after the ones they import, indented two spaces per level
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 1:
+            children.append((int(cumulative), name.strip()))
+        elif depth == 0:
+            if name.strip() == "server":
+                direct = children
+            children = []
+    return [{"module": name, "cumulative_us": cumulative} for cumulative, name in sorted(direct, reverse=True)[:count]]
+
+def main():
+    parser = base_parser(__doc__)
+    parser.add_argument("--ready-timeout", type=float, default=60.0)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args)
+        return
+
+    runs = []
+    for _ in range(args.repeat):
+        output = subprocess.run(child_command(args), capture_output=True, text=True, check=True).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+    print(json.dumps({
+        "repeat": args.repeat,
+        **{
+            name: {"median_ms": round(median(run[name] for run in runs), 1), "max_ms": round(max(run[name] for run in runs), 1)}
+            for name in ("import_ms", "startup_ms", "ready_ms", "first_request_ms")
+        },
+        "slowest_imports": slowest_imports(args),
+    }))
+
+if __name__ == "__main__":
+    main()
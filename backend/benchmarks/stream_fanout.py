@@ -0,0 +1,85 @@
+"""Fan-out load test for the dashboard event broadcaster.
+
+Connects N in-process subscribers (a share of them deliberately slow),
+publishes a burst of member events the way the change stream watcher
+does, and reports delivery latency, drops and forced disconnects. No
+database is involved: the watcher publishes once per change regardless
+of how many dashboards are connected.
+
+    python -m benchmarks.stream_fanout --subscribers 1000 --events 500
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from services.committees import DEFAULT_COMMITTEE_ID
+from services.events import EventBroadcaster
+
+async def consume(subscriber, expected: int, delay: float, latencies: list, start_times: dict):
+    received = 0
+    while received < expected and not subscriber.closed:
+        try:
+            async with asyncio.timeout(2):
+                message = await subscriber.queue.get()
+        except TimeoutError:
+            break
+        received += 1
+        sequence = int(message.split(b'"seq": ', 1)[1].split(b"}", 1)[0])
+        latencies.append((time.perf_counter() - start_times[sequence]) * 1000)
+        if delay:
+            await asyncio.sleep(delay)
+    return received
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--subscribers", type=int, default=1000)
+    parser.add_argument("--events", type=int, default=500)
+    parser.add_argument("--slow-fraction", type=float, default=0.05)
+    parser.add_argument("--slow-delay", type=float, default=0.05)
+    parser.add_argument("--max-queue", type=int, default=100)
+    parser.add_argument("--rate", type=float, default=1000, help="published events per second")
+    args = parser.parse_args()
+
+    broadcaster = EventBroadcaster(max_queue=args.max_queue, max_consecutive_drops=args.events // 2)
+    subscribers = [broadcaster.subscribe(DEFAULT_COMMITTEE_ID) for _ in range(args.subscribers)]
+    slow_count = int(args.subscribers * args.slow_fraction)
+    latencies: list = []
+    slow_latencies: list = []
+    start_times: dict = {}
+
+    consumers = [
+        asyncio.create_task(consume(
+            subscriber,
+            args.events,
+            args.slow_delay if index < slow_count else 0,
+            slow_latencies if index < slow_count else latencies,
+            start_times
+        ))
+        for index, subscriber in enumerate(subscribers)
+    ]
+
+    publish_start = time.perf_counter()
+    for sequence in range(args.events):
+        start_times[sequence] = time.perf_counter()
+        broadcaster.publish("member.upserted", {"id": f"member-{sequence}", "efficiency": 80, "seq": sequence}, DEFAULT_COMMITTEE_ID)
+        # Changes arrive spaced out, letting consumers run in between
+        await asyncio.sleep(1 / args.rate)
+    publish_seconds = time.perf_counter() - publish_start
+
+    received = await asyncio.gather(*consumers)
+    latencies.sort()
+    print(json.dumps({
+        "subscribers": args.subscribers,
+        "slow_subscribers": slow_count,
+        "events": args.events,
+        "publish_us_per_event": round(publish_seconds / args.events * 1_000_000, 1),
+        "delivered": sum(received),
+        "fast_delivery_complete": all(count == args.events for count in received[slow_count:]),
+        "fast_latency_p50_ms": round(latencies[len(latencies) // 2], 2),
+        "fast_latency_p99_ms": round(latencies[int(len(latencies) * 0.99)], 2),
+        **broadcaster.stats(),
+    }))
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,123 @@
+"""Per-committee read latency with one committee versus many in the same collections.
+
+    python -m benchmarks.tenants --tenants 1000 --members 20 --requests 500
+
+Each committee gets ``--members`` members. The endpoints are first timed
+with only ``tenant-0`` in the database, then again with ``--tenants``
+committees of the same size, requests spread over random committees. With
+committeeId-leading indexes the per-committee latency should not grow with
+the number of committees. The response cache is disabled so every request
+reaches Mongo; each committee is requested once before timing so summaries
+and leaderboards are built. Against a real mongod the members page is also
+explained, reporting keys and documents examined per committee query.
+mongomock scans the whole collection whatever the indexes, so ``--mock``
+shows the cost of the same queries without them.
+"""
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+from statistics import median
+
+import httpx
+
+from benchmarks.common import base_parser, load_app, synthetic_member
+
+ENDPOINTS = {
+    "members": "/api/members/?limit=20",
+    "overview": "/api/analytics/overview",
+    "tasks": "/api/analytics/tasks",
+    "leaderboard": "/api/leaderboard/efficiency?limit=10",
+}
+
+def tenant_id(i: int) -> str:
+    return f"tenant-{i}"
+
+async def seed_tenants(database, start: int, stop: int, members: int, rng: random.Random) -> None:
+    batch = []
+    for tenant in range(start, stop):
+        for i in range(members):
+            member = synthetic_member(tenant * members + i, rng, tenant_id(tenant))
+            member.pop("performanceHistory")
+            batch.append(member)
+        if len(batch) >= 10000:
+            await database.committee_members.insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        await database.committee_members.insert_many(batch, ordered=False)
+
+def percentiles(samples):
+    ordered = sorted(samples)
+    return {
+        "median_ms": round(median(ordered), 3),
+        "p95_ms": round(ordered[max(0, int(len(ordered) * 0.95) - 1)], 3),
+    }
+
+async def warm(client, tenants: int) -> float:
+    start = time.perf_counter()
+    for tenant in range(tenants):
+        for path in ENDPOINTS.values():
+            (await client.get(path, headers={"X-Committee-Id": tenant_id(tenant)})).raise_for_status()
+    return round(time.perf_counter() - start, 2)
+
+async def measure(client, tenants: int, requests: int, rng: random.Random):
+    results = {}
+    for name, path in ENDPOINTS.items():
+        samples = []
+        for _ in range(requests):
+            headers = {"X-Committee-Id": tenant_id(rng.randrange(tenants))}
+            start = time.perf_counter()
+            (await client.get(path, headers=headers)).raise_for_status()
+            samples.append((time.perf_counter() - start) * 1000)
+        results[name] = percentiles(samples)
+    return results
+
+async def explain_members_page(database, tenant: str):
+    """Keys and documents examined by the first members page of one committee"""
+    plan = await database.command(
+        "explain",
+        {"find": "committee_members", "filter": {"committeeId": tenant}, "sort": {"_id": 1}, "limit": 20},
+        verbosity="executionStats",
+    )
+    stats = plan["executionStats"]
+    return {"keysExamined": stats["totalKeysExamined"], "docsExamined": stats["totalDocsExamined"], "returned": stats["nReturned"]}
+
+async def main():
+    parser = base_parser(__doc__)
+    parser.add_argument("--tenants", type=int, default=1000)
+    parser.add_argument("--members", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    os.environ["RESPONSE_CACHE_ENABLED"] = "false"
+    app, db = load_app(args)
+    # Imported late: services pull in database, which load_app configures
+    import database
+    from services.leaderboard import leaderboard
+    rng = random.Random(42)
+
+    await db.committee_members.delete_many({})
+    await db.analytics_summary.delete_many({})
+    await database.create_indexes()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for tenants, start in ((1, 0), (args.tenants, 1)):
+            await seed_tenants(db, start, tenants, args.members, rng)
+            row = {
+                "tenants": tenants,
+                "membersPerTenant": args.members,
+                "totalMembers": tenants * args.members,
+                "warmupSeconds": await warm(client, tenants),
+                "endpoints": await measure(client, tenants, args.requests, rng),
+                "leaderboards": leaderboard.stats()["loaded"],
+            }
+            if not args.mock:
+                row["explain"] = await explain_members_page(db, tenant_id(tenants - 1))
+            print(json.dumps(row))
+    await db.committee_members.drop()
+    await db.analytics_summary.drop()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,134 @@
+"""Maintenance commands for the Committee Performance Dashboard backend.
+
+Run from the backend directory, e.g. ``python cli.py verify-summary``.
+"""
+import asyncio
+import typer
+from typing import List, Optional
+
+from database import close, create_indexes, drop_undeclared_indexes, get_db
+from services import committee_migration, fixtures, history, summary, tasks
+from services.committees import DEFAULT_COMMITTEE_ID, InvalidCommittee, list_committees, resolve_committee_id
+
+app = typer.Typer(help="Committee Performance Dashboard maintenance commands")
+
+COMMITTEE_OPTION = typer.Option(None, "--committee", help="Committee id; every committee when omitted")
+
+def run(coro):
+    """Run a coroutine and close the Mongo client afterwards"""
+    try:
+        return asyncio.run(coro)
+    finally:
+        close()
+
+def committee_value(committee: str) -> str:
+    try:
+        return resolve_committee_id(committee)
+    except InvalidCommittee as e:
+        raise typer.BadParameter(str(e), param_hint="--committee")
+
+async def committees(committee: Optional[str]) -> List[str]:
+    """The given committee, or every committee with members or tasks"""
+    if committee is not None:
+        return [committee_value(committee)]
+    return await list_committees(get_db())
+
+@app.command("rebuild-summary")
+def rebuild_summary(committee: Optional[str] = COMMITTEE_OPTION):
+    """Recompute committees' analytics summary documents from committee_members"""
+    async def rebuild():
+        return [(c, await summary.rebuild_summary(get_db(), c)) for c in await committees(committee)]
+
+    for committee_id, result in run(rebuild()):
+        typer.echo(f"{committee_id}: rebuilt analytics summary for {result['totalMembers']} members")
+
+@app.command("verify-summary")
+def verify_summary(
+    committee: Optional[str] = COMMITTEE_OPTION,
+    fix: bool = typer.Option(False, "--fix", help="Rebuild the summary if drift is found"),
+):
+    """Report drift between committees' analytics summaries and committee_members"""
+    async def verify():
+        drifts = {}
+        for committee_id in await committees(committee):
+            drift = await summary.verify_summary(get_db(), committee_id)
+            if drift and fix:
+                await summary.rebuild_summary(get_db(), committee_id)
+            drifts[committee_id] = drift
+        return drifts
+
+    drifts = run(verify())
+    if not any(drifts.values()):
+        typer.echo("Analytics summaries are consistent")
+        return
+    for committee_id, drift in drifts.items():
+        for field, values in drift.items():
+            typer.echo(f"{committee_id}: {field}: stored={values['stored']} actual={values['actual']}")
+    if fix:
+        typer.echo("Analytics summaries rebuilt")
+    else:
+        raise typer.Exit(code=1)
+
+@app.command("migrate-history")
+def migrate_history():
+    """Move embedded performanceHistory arrays into the time-series collection"""
+    async def migrate():
+        await history.create_history_collection(get_db())
+        return await history.migrate_embedded_history(get_db())
+
+    migrated = run(migrate())
+    typer.echo(f"Migrated history for {migrated} members")
+
+@app.command("rebuild-task-counters")
+def rebuild_task_counters(committee: Optional[str] = COMMITTEE_OPTION):
+    """Recompute committees' category counters and member task counts from the tasks collection"""
+    async def rebuild():
+        return [(c, await tasks.rebuild_task_counters(get_db(), c)) for c in await committees(committee)]
+
+    for committee_id, result in run(rebuild()):
+        typer.echo(f"{committee_id}: rebuilt counters for {result['categories']} categories and {result['members']} assignees")
+
+@app.command("assign-committee")
+def assign_committee(
+    committee: str = typer.Option(DEFAULT_COMMITTEE_ID, "--committee", help="Committee receiving data written before committees existed"),
+    drop_old_indexes: bool = typer.Option(False, "--drop-old-indexes", help="Drop indexes that do not lead with committeeId"),
+):
+    """Stamp members, tasks and history without a committee, then rebuild that committee's counters"""
+    committee_id = committee_value(committee)
+
+    async def assign():
+        await committee_migration.remove_legacy_counters(get_db())
+        await create_indexes()
+        counts = await committee_migration.assign_committee(get_db(), committee_id)
+        dropped = await drop_undeclared_indexes() if drop_old_indexes else []
+        return counts, dropped
+
+    counts, dropped = run(assign())
+    for collection, count in counts.items():
+        typer.echo(f"{collection}: assigned {count} documents to {committee_id}")
+    for index in dropped:
+        typer.echo(f"Dropped index {index}")
+
+@app.command("seed")
+def seed(
+    committee: str = typer.Option(DEFAULT_COMMITTEE_ID, "--committee", help="Committee receiving the fixture"),
+    members: int = typer.Option(len(fixtures.SAMPLE_MEMBERS), "--members", min=1, help="Members to load; the sample members come first"),
+    batch_size: int = typer.Option(5000, "--batch-size", min=1, help="Documents per insert"),
+):
+    """Bulk-load fixture members with their history and tasks into an empty committee"""
+    committee_id = committee_value(committee)
+
+    async def load():
+        await history.create_history_collection(get_db())
+        await create_indexes()
+        return await fixtures.seed_committee(get_db(), committee_id, members, batch_size)
+
+    try:
+        counts = run(load())
+    except fixtures.CommitteeNotEmpty as e:
+        typer.echo(str(e), err=True)
+        raise typer.Exit(code=1)
+    typer.echo(f"{committee_id}: loaded {counts['members']} members, {counts['tasks']} tasks and {counts['historyPoints']} history points")
+
+if __name__ == "__main__":
+    app()
@@ -1,12 +1,127 @@
-from motor.motor_asyncio import AsyncIOMotorClient
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, IndexModel, ReadPreference
+from typing import List, Optional
 import os
 from dotenv import load_dotenv
 from pathlib import Path
+from services.mongo_metrics import command_metrics, pool_metrics
+from services.metrics import route_command_listener
+from services.profiling import slow_query_listener
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# MongoDB connection
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
\ No newline at end of file
+READ_PREFERENCES = {
+    "primary": ReadPreference.PRIMARY,
+    "primaryPreferred": ReadPreference.PRIMARY_PREFERRED,
+    "secondary": ReadPreference.SECONDARY,
+    "secondaryPreferred": ReadPreference.SECONDARY_PREFERRED,
+    "nearest": ReadPreference.NEAREST,
+}
+
+def client_options() -> dict:
+    """Motor client settings from the MONGO_* environment variables"""
+    return {
+        "maxPoolSize": int(os.getenv('MONGO_MAX_POOL_SIZE', '100')),
+        "minPoolSize": int(os.getenv('MONGO_MIN_POOL_SIZE', '0')),
+        "maxIdleTimeMS": int(os.getenv('MONGO_MAX_IDLE_TIME_MS', '300000')),
+        "waitQueueTimeoutMS": int(os.getenv('MONGO_WAIT_QUEUE_TIMEOUT_MS', '10000')),
+        "connectTimeoutMS": int(os.getenv('MONGO_CONNECT_TIMEOUT_MS', '10000')),
+        "serverSelectionTimeoutMS": int(os.getenv('MONGO_SERVER_SELECTION_TIMEOUT_MS', '10000')),
+        "socketTimeoutMS": int(os.getenv('MONGO_SOCKET_TIMEOUT_MS', '30000')),
+        # Compressors whose module is not installed are skipped by the driver
+        "compressors": os.getenv('MONGO_COMPRESSORS', 'zstd,snappy,zlib'),
+        "appname": os.getenv('MONGO_APP_NAME', 'performance-manager'),
+        "event_listeners": [pool_metrics, command_metrics, route_command_listener, slow_query_listener],
+    }
+
+def analytics_read_preference():
+    """Read preference for analytics aggregations (MONGO_ANALYTICS_READ_PREFERENCE)"""
+    name = os.getenv('MONGO_ANALYTICS_READ_PREFERENCE', 'primary')
+    if name not in READ_PREFERENCES:
+        raise ValueError(f"Unknown MONGO_ANALYTICS_READ_PREFERENCE: {name}")
+    return READ_PREFERENCES[name]
+
+class Mongo:
+    """A Motor client and the application databases on it"""
+
+    def __init__(self, client):
+        self.client = client
+        self.db = client[os.environ['DB_NAME']]
+        # Same database routed by the analytics read preference, e.g. to secondaries
+        self.analytics_db = client.get_database(os.environ['DB_NAME'], read_preference=analytics_read_preference())
+
+_mongo: Optional[Mongo] = None
+
+def connect(client=None) -> Mongo:
+    """The process-wide MongoDB connection, created on first use.
+
+    The app lifespan calls this at startup; the CLI and request handlers
+    running without it create the client on their first query. ``client``
+    replaces the one built from MONGO_URL, e.g. with an in-memory stand-in.
+    """
+    global _mongo
+    if client is not None:
+        _mongo = Mongo(client)
+    elif _mongo is None:
+        _mongo = Mongo(AsyncIOMotorClient(os.environ['MONGO_URL'], **client_options()))
+    return _mongo
+
+def get_db() -> AsyncIOMotorDatabase:
+    """The application database"""
+    return connect().db
+
+def close() -> None:
+    """Close the client; a later connect() creates a new one"""
+    global _mongo
+    if _mongo is not None:
+        _mongo.client.close()
+        _mongo = None
+
+# Indexes per collection, created at startup. Every query is scoped to one
+# committee, so every index leads with committeeId: a request reads only its
+# committee's range, and {committeeId: 1, _id: 1} can serve as a shard key.
+INDEXES = {
+    "committee_members": [
+        IndexModel([("committeeId", ASCENDING), ("_id", ASCENDING)]),
+        # (metric desc, _id asc) serves both sort orders of the paginated list and the analytics rankings
+        IndexModel([("committeeId", ASCENDING), ("efficiency", DESCENDING), ("_id", ASCENDING)]),
+        IndexModel([("committeeId", ASCENDING), ("registrationsBrought", DESCENDING), ("_id", ASCENDING)]),
+        IndexModel([("committeeId", ASCENDING), ("role", ASCENDING), ("_id", ASCENDING)]),
+        IndexModel([("committeeId", ASCENDING), ("role", ASCENDING), ("efficiency", DESCENDING), ("_id", ASCENDING)]),
+        IndexModel([("committeeId", ASCENDING), ("role", ASCENDING), ("registrationsBrought", DESCENDING), ("_id", ASCENDING)]),
+    ],
+    "tasks": [
+        # Task list filters; category counters live in task_category_stats
+        IndexModel([("committeeId", ASCENDING), ("_id", ASCENDING)]),
+        IndexModel([("committeeId", ASCENDING), ("assigneeId", ASCENDING), ("status", ASCENDING), ("_id", ASCENDING)]),
+        IndexModel([("committeeId", ASCENDING), ("category", ASCENDING), ("status", ASCENDING), ("_id", ASCENDING)]),
+        IndexModel([("committeeId", ASCENDING), ("status", ASCENDING), ("_id", ASCENDING)]),
+    ],
+    "task_category_stats": [
+        IndexModel([("committeeId", ASCENDING), ("category", ASCENDING)], unique=True),
+    ],
+    "analytics_snapshots": [
+        # Unique, so two workers cannot store the same version
+        IndexModel([("committeeId", ASCENDING), ("version", DESCENDING)], unique=True),
+        IndexModel([("committeeId", ASCENDING), ("month", ASCENDING), ("version", DESCENDING)]),
+    ],
+}
+
+async def create_indexes():
+    """Create every index declared in INDEXES; existing ones are left as they are"""
+    db = get_db()
+    for collection, indexes in INDEXES.items():
+        await db[collection].create_indexes(indexes)
+
+async def drop_undeclared_indexes() -> List[str]:
+    """Drop indexes of the INDEXES collections that are no longer declared there, e.g. pre-committee ones"""
+    db = get_db()
+    dropped = []
+    for collection, indexes in INDEXES.items():
+        declared = {tuple(index.document["key"].items()) for index in indexes}
+        async for index in db[collection].list_indexes():
+            if index["name"] != "_id_" and tuple(index["key"].items()) not in declared:
+                await db[collection].drop_index(index["name"])
+                dropped.append(f"{collection}.{index['name']}")
+    return dropped
@@ -0,0 +1,51 @@
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from typing import Iterable, List
+
+class CompressionMiddleware:
+    """Gzip responses except under ``excluded_prefixes``.
+
+    Server-sent event streams must not go through gzip, which would hold
+    events back in the compressor until enough bytes accumulate.
+
+    GZipMiddleware compresses any body sent in several messages, whatever
+    its size, and BaseHTTPMiddleware streams every response it passes on.
+    Body messages are therefore joined until ``minimum_size`` bytes or the
+    end of the body, so ``minimum_size`` applies to them too.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1000, excluded_prefixes: Iterable[str] = ()):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip = GZipMiddleware(self.coalesce_body, minimum_size=minimum_size)
+        self.excluded_prefixes = tuple(excluded_prefixes)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and not scope["path"].startswith(self.excluded_prefixes):
+            await self.gzip(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+    async def coalesce_body(self, scope: Scope, receive: Receive, send: Send) -> None:
+        start: List[Message] = []
+        body = b""
+        joining = True
+
+        async def send_joined(message: Message) -> None:
+            nonlocal body, joining
+            if not joining:
+                await send(message)
+            elif message["type"] == "http.response.start":
+                start.append(message)
+            elif message["type"] == "http.response.body":
+                body += message.get("body", b"")
+                more_body = message.get("more_body", False)
+                if more_body and len(body) < self.minimum_size:
+                    return
+                joining = False
+                await send(start.pop())
+                await send({"type": "http.response.body", "body": body, "more_body": more_body})
+            else:
+                await send(message)
+
+        await self.app(scope, receive, send_joined)
@@ -0,0 +1,43 @@
+from starlette.routing import Router
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from services import metrics
+from typing import Optional
+import time
+
+class MetricsMiddleware:
+    """Record request counts, status codes, latency and in-flight requests per route.
+
+    Written as plain ASGI rather than BaseHTTPMiddleware so each request costs
+    a few dict updates and no extra task. Requests answered before routing
+    (cache hits, 304s) are matched against ``router`` to find their route.
+    """
+
+    def __init__(self, app: ASGIApp, router: Optional[Router] = None):
+        self.app = app
+        self.routes = metrics.RouteMatcher(router)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        token = metrics.current_scope.set(scope)
+        metrics.http_in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            metrics.http_in_flight.dec()
+            metrics.current_scope.reset(token)
+            route = self.routes.label(scope)
+            metrics.http_latency.observe((scope["method"], route), elapsed)
+            metrics.http_requests.inc((scope["method"], route, str(status)))
@@ -0,0 +1,83 @@
+from datetime import datetime
+from starlette.datastructures import Headers
+from starlette.routing import Router
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from services.metrics import RouteMatcher
+from services.profiling import RequestProfiler, RequestTrace, current_trace, summarize_profile
+from typing import Optional
+import cProfile
+import random
+import time
+
+class ProfilingMiddleware:
+    """Trace Mongo time per request, profile sampled requests, keep slow ones.
+
+    Profiled responses carry ``X-Profile-Id``; the breakdown is at
+    ``/api/admin/slow-requests/{id}``. Requests answered before routing
+    are logged under the route ``router`` matches, as in the metrics.
+    """
+
+    def __init__(self, app: ASGIApp, profiler: RequestProfiler, router: Optional[Router] = None):
+        self.app = app
+        self.profiler = profiler
+        self.routes = RouteMatcher(router)
+
+    def wants_profile(self, scope: Scope) -> bool:
+        if self.profiler.profiling:
+            return False
+        if self.profiler.allow_header and Headers(scope=scope).get("x-profile") == "1":
+            return True
+        return self.profiler.sample_rate > 0 and random.random() < self.profiler.sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trace = RequestTrace()
+        token = current_trace.set(trace)
+        profiler = None
+        entry_id = None
+        if self.wants_profile(scope):
+            self.profiler.profiling = True
+            entry_id = self.profiler.next_id()
+            profiler = cProfile.Profile()
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if entry_id is not None:
+                    message["headers"] = list(message.get("headers", [])) + [(b"x-profile-id", str(entry_id).encode())]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            if profiler is not None:
+                profiler.enable()
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                self.profiler.profiling = False
+                self.profiler.profiled += 1
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            current_trace.reset(token)
+            if profiler is not None or elapsed_ms >= self.profiler.slow_request_ms:
+                entry = {
+                    "id": entry_id or self.profiler.next_id(),
+                    "at": datetime.utcnow().isoformat(),
+                    "method": scope["method"],
+                    "route": self.routes.label(scope),
+                    "path": scope["path"],
+                    "query": scope.get("query_string", b"").decode("latin-1"),
+                    "status": status,
+                    "durationMs": round(elapsed_ms, 3),
+                    "mongoMs": round(trace.mongo_ms, 3),
+                    "mongoCommands": trace.commands,
+                    "slowQueries": trace.slow_queries,
+                }
+                if profiler is not None:
+                    entry["profile"] = summarize_profile(profiler)
+                self.profiler.record_request(entry)
@@ -0,0 +1,76 @@
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+from services.committees import InvalidCommittee, resolve_committee_id
+from services.response_cache import CacheBackend, CachedResponse
+from typing import Iterable
+import hashlib
+
+# Headers that are recomputed rather than replayed from the cache
+SKIPPED_HEADERS = {"content-length", "etag", "x-cache"}
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Evaluate an If-None-Match header against an entity tag"""
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+class ResponseCacheMiddleware(BaseHTTPMiddleware):
+    """Serve cached GET responses for read endpoints, with ETag revalidation.
+
+    A request whose If-None-Match matches a cached entry gets a 304 without
+    reaching the route handler or the database. Entries are kept per
+    committee (X-Committee-Id), so one committee's writes leave the others'
+    entries alone.
+    """
+
+    def __init__(self, app, cache: CacheBackend, path_prefixes: Iterable[str], enabled: bool = True):
+        super().__init__(app)
+        self.cache = cache
+        self.path_prefixes = tuple(path_prefixes)
+        self.enabled = enabled
+
+    async def dispatch(self, request: Request, call_next):
+        if not self.enabled or request.method != "GET" or not request.url.path.startswith(self.path_prefixes):
+            return await call_next(request)
+
+        try:
+            committee_id = resolve_committee_id(request.headers.get("x-committee-id"))
+        except InvalidCommittee:
+            return await call_next(request)  # Rejected by the route
+        key = f"{request.url.path}?{request.url.query}"
+        if_none_match = request.headers.get("if-none-match")
+
+        entry = self.cache.get(committee_id, key)
+        if entry is not None:
+            return self.respond(entry, if_none_match, "HIT")
+
+        generation = self.cache.generation_of(committee_id)
+        response = await call_next(request)
+        if response.status_code != 200:
+            return response
+
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        entry = CachedResponse(
+            status_code=200,
+            headers=[
+                (name, value) for name, value in response.headers.items()
+                if name.lower() not in SKIPPED_HEADERS
+            ],
+            body=body,
+            # Handlers may set their own validator, e.g. a member's version
+            etag=response.headers.get("etag") or f'"{hashlib.sha1(body).hexdigest()}"'
+        )
+        self.cache.set(committee_id, key, entry, generation)
+        return self.respond(entry, if_none_match, "MISS")
+
+    def respond(self, entry: CachedResponse, if_none_match, cache_status: str) -> Response:
+        """Replay a cached entry, or a 304 when the client already has it"""
+        headers = {"ETag": entry.etag, "Cache-Control": "no-cache", "Vary": "X-Committee-Id", "X-Cache": cache_status}
+        if if_none_match and etag_matches(if_none_match, entry.etag):
+            self.cache.record_not_modified()
+            return Response(status_code=304, headers=headers)
+        response = Response(content=entry.body, status_code=entry.status_code)
+        for name, value in entry.headers:
+            response.headers.append(name, value)
+        response.headers.update(headers)
+        return response
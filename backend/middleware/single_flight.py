@@ -0,0 +1,59 @@
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from services.committees import InvalidCommittee, resolve_committee_id
+from services.response_cache import CacheBackend
+from services.single_flight import SingleFlight
+from typing import Iterable, List, Optional
+
+class SingleFlightMiddleware:
+    """Let concurrent identical GET requests share one response.
+
+    A request for the same committee, path and query as one still being
+    handled waits for it and gets a copy of its response instead of
+    running the handler again; only 200 responses are shared. The
+    committee's response cache generation is part of the key, so a request
+    made after a write never gets a response computed before it.
+    """
+
+    def __init__(self, app: ASGIApp, flights: SingleFlight, cache: CacheBackend, path_prefixes: Iterable[str]):
+        self.app = app
+        self.flights = flights
+        self.cache = cache
+        self.path_prefixes = tuple(path_prefixes)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "GET" or not scope["path"].startswith(self.path_prefixes):
+            await self.app(scope, receive, send)
+            return
+        try:
+            committee_id = resolve_committee_id(Headers(scope=scope).get("x-committee-id"))
+        except InvalidCommittee:
+            await self.app(scope, receive, send)  # Rejected by the route
+            return
+
+        sent = False
+
+        async def handle() -> Optional[List[Message]]:
+            """Run the request, sending as usual; the messages sent if the response is shareable"""
+            nonlocal sent
+            sent = True
+            messages: List[Message] = []
+
+            async def send_wrapper(message: Message) -> None:
+                messages.append(copy_message(message))
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
+            return messages if messages and messages[0].get("status") == 200 else None
+
+        key = (committee_id, scope["path"], scope["query_string"], self.cache.generation_of(committee_id))
+        messages = await self.flights.run(key, handle)
+        if not sent:
+            for message in messages:
+                await send(copy_message(message))
+
+def copy_message(message: Message) -> Message:
+    """Outer middleware such as gzip edit response headers in place"""
+    if "headers" in message:
+        return {**message, "headers": list(message["headers"])}
+    return message
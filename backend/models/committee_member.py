@@ -1,40 +1,70 @@
-from pydantic import BaseModel, Field, EmailStr
-from typing import List, Optional
+from pydantic import BaseModel, Field, EmailStr, field_validator, model_validator
+from typing import Any, Dict, List, Literal, Optional
 from datetime import datetime
+import re
 import uuid
 
+# Month names ("Mar", "March") or "YYYY-MM"; resolved by services.history.month_to_timestamp
+MONTH_PATTERN = re.compile(
+    r"^(jan(uary)?|feb(ruary)?|mar(ch)?|apr(il)?|may|june?|july?|aug(ust)?|sep(t(ember)?)?|oct(ober)?|nov(ember)?|dec(ember)?)$"
+    r"|^[1-9][0-9]{3}-(0[1-9]|1[0-2])",
+    re.IGNORECASE,
+)
+
 class PerformanceHistory(BaseModel):
     month: str
     score: int = Field(..., ge=0, le=100)
 
+    @field_validator("month")
+    @classmethod
+    def check_month(cls, month: str) -> str:
+        if not MONTH_PATTERN.match(month.strip()):
+            raise ValueError('month must be a month name such as "Mar" or "YYYY-MM"')
+        return month.strip()
+
 class CommitteeMemberBase(BaseModel):
     name: str = Field(..., min_length=1, max_length=100)
     role: str = Field(..., min_length=1, max_length=50)
     contact: EmailStr
     phone: Optional[str] = None
-    tasksCompleted: int = Field(default=0, ge=0)
-    tasksPending: int = Field(default=0, ge=0)
     efficiency: int = Field(default=0, ge=0, le=100)
     registrationsBrought: int = Field(default=0, ge=0)
     performanceHistory: List[PerformanceHistory] = Field(default=[])
 
+# Maintained from the tasks collection by services.tasks; never written by member requests
+TASK_COUNT_FIELDS = ("tasksCompleted", "tasksPending", "totalTasks")
+
+def reject_task_counts(data: Any) -> Any:
+    """Refuse member writes that try to set the task counters"""
+    if isinstance(data, dict):
+        given = [field for field in TASK_COUNT_FIELDS if field in data]
+        if given:
+            raise ValueError(f"{', '.join(given)} cannot be written; task counts are derived from the member's tasks")
+    return data
+
 class CommitteeMemberCreate(CommitteeMemberBase):
-    pass
+    _reject_task_counts = model_validator(mode="before")(reject_task_counts)
 
 class CommitteeMemberUpdate(BaseModel):
     name: Optional[str] = Field(None, min_length=1, max_length=100)
     role: Optional[str] = Field(None, min_length=1, max_length=50)
     contact: Optional[EmailStr] = None
     phone: Optional[str] = None
-    tasksCompleted: Optional[int] = Field(None, ge=0)
-    tasksPending: Optional[int] = Field(None, ge=0)
     efficiency: Optional[int] = Field(None, ge=0, le=100)
     registrationsBrought: Optional[int] = Field(None, ge=0)
     performanceHistory: Optional[List[PerformanceHistory]] = None
 
+    _reject_task_counts = model_validator(mode="before")(reject_task_counts)
+
 class CommitteeMember(CommitteeMemberBase):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    # Taken from X-Committee-Id when the member is created; members never change committee
+    committeeId: Optional[str] = None
+    tasksCompleted: int = Field(default=0, ge=0)
+    tasksPending: int = Field(default=0, ge=0)
     totalTasks: int = Field(default=0)
+    # Incremented by every write; the member's ETag
+    version: int = Field(default=1)
     createdAt: datetime = Field(default_factory=datetime.utcnow)
     updatedAt: datetime = Field(default_factory=datetime.utcnow)
 
@@ -42,6 +72,29 @@ class CommitteeMember(CommitteeMemberBase):
         self.totalTasks = self.tasksCompleted + self.tasksPending
         return self.totalTasks
 
+class BulkMemberOperation(BaseModel):
+    op: Literal["create", "update", "delete"]
+    id: Optional[str] = None
+    # Validated per item against CommitteeMemberCreate/CommitteeMemberUpdate
+    data: Optional[Dict[str, Any]] = None
+
+class BulkMemberRequest(BaseModel):
+    operations: List[BulkMemberOperation] = Field(..., min_length=1, max_length=1000)
+
+class BulkMemberResult(BaseModel):
+    index: int
+    op: str
+    id: Optional[str] = None
+    status: int
+    error: Optional[str] = None
+
+class BulkMemberResponse(BaseModel):
+    created: int = 0
+    updated: int = 0
+    deleted: int = 0
+    failed: int = 0
+    results: List[BulkMemberResult]
+
 class TaskCategory(BaseModel):
     category: str
     completed: int = Field(default=0, ge=0)
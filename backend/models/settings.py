@@ -0,0 +1,16 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime
+
+class RegistrationTier(BaseModel):
+    # Tier names become field names of the summary's tierCounts
+    tier: str = Field(..., min_length=1, max_length=30, pattern=r"^[A-Za-z0-9 _-]+$")
+    min: int = Field(..., ge=0)
+    tierColor: str = Field(default="bg-gray-100 text-gray-800", max_length=100)
+
+class RegistrationTierConfig(BaseModel):
+    tiers: List[RegistrationTier] = Field(..., min_length=1, max_length=20)
+
+class RegistrationTierSettings(RegistrationTierConfig):
+    version: int = 0
+    updatedAt: Optional[datetime] = None
@@ -0,0 +1,31 @@
+from pydantic import BaseModel, Field
+from typing import Literal, Optional
+from datetime import datetime
+import uuid
+
+TaskStatus = Literal["pending", "completed"]
+
+class TaskBase(BaseModel):
+    title: str = Field(..., min_length=1, max_length=200)
+    category: str = Field(..., min_length=1, max_length=50)
+    assigneeId: Optional[str] = None
+    status: TaskStatus = "pending"
+    dueDate: Optional[datetime] = None
+
+class TaskCreate(TaskBase):
+    pass
+
+class TaskUpdate(BaseModel):
+    title: Optional[str] = Field(None, min_length=1, max_length=200)
+    category: Optional[str] = Field(None, min_length=1, max_length=50)
+    assigneeId: Optional[str] = None
+    status: Optional[TaskStatus] = None
+    dueDate: Optional[datetime] = None
+
+class Task(TaskBase):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    # Taken from X-Committee-Id when the task is created
+    committeeId: Optional[str] = None
+    createdAt: datetime = Field(default_factory=datetime.utcnow)
+    updatedAt: datetime = Field(default_factory=datetime.utcnow)
+    completedAt: Optional[datetime] = None
\ No newline at end of file
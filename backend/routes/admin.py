@@ -0,0 +1,127 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from services.columnar import member_columns
+from services.events import broadcaster, watcher
+from services.leaderboard import leaderboard
+from services.member_search import search_index
+from services.mongo_metrics import command_metrics, pool_metrics
+from services.profiling import request_profiler
+from database import client_options
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from routes.dependencies import current_db
+from services.response_cache import response_cache
+from services.snapshots import analytics_snapshots
+from services.single_flight import request_flights
+import logging
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+logger = logging.getLogger(__name__)
+
+@router.get("/cache")
+async def get_cache_stats():
+    """Get response cache hit, miss and eviction counters"""
+    return response_cache.stats()
+
+@router.delete("/cache", status_code=status.HTTP_204_NO_CONTENT)
+async def clear_cache():
+    """Drop every cached response"""
+    await response_cache.invalidate()
+    return None
+
+
+@router.get("/single-flight")
+async def get_single_flight_stats():
+    """Get how many read requests shared another request's response"""
+    return request_flights.stats()
+
+@router.get("/snapshots")
+async def get_snapshot_stats():
+    """Get analytics snapshot versions and recompute counters"""
+    return analytics_snapshots.stats()
+
+@router.get("/stream")
+async def get_stream_stats():
+    """Get dashboard event stream subscriber and drop counters"""
+    return {**broadcaster.stats(), "preImages": watcher.pre_images, "unroutedDeletes": watcher.unrouted_deletes}
+
+@router.get("/database")
+async def get_database_stats():
+    """Get connection pool gauges, checkout wait times and per-command latency"""
+    options = {key: value for key, value in client_options().items() if key != "event_listeners"}
+    return {
+        "options": options,
+        "pool": pool_metrics.stats(),
+        "commands": command_metrics.stats(),
+    }
+
+@router.get("/leaderboard")
+async def get_leaderboard_stats():
+    """Get leaderboard index size and load counters"""
+    return leaderboard.stats()
+
+@router.delete("/leaderboard", status_code=status.HTTP_204_NO_CONTENT)
+async def reload_leaderboard():
+    """Rebuild the leaderboard indexes from the database on next use"""
+    leaderboard.invalidate()
+    return None
+
+@router.get("/columns")
+async def get_column_stats():
+    """Get columnar analytics engine size and load counters"""
+    return member_columns.stats()
+
+@router.delete("/columns", status_code=status.HTTP_204_NO_CONTENT)
+async def reload_columns():
+    """Rebuild the member columns from the database on next use"""
+    member_columns.invalidate()
+    return None
+
+@router.get("/search")
+async def get_search_stats():
+    """Get member search index size and load counters"""
+    return search_index.stats()
+
+@router.delete("/search", status_code=status.HTTP_204_NO_CONTENT)
+async def reload_search():
+    """Rebuild the member search indexes from the database on next use"""
+    search_index.invalidate()
+    return None
+
+@router.get("/slow-requests")
+async def get_slow_requests():
+    """Get profiler settings and recent slow or profiled requests, newest first"""
+    return {**request_profiler.stats(), "requests": request_profiler.recent_requests()}
+
+@router.get("/slow-requests/{request_id}")
+async def get_slow_request(request_id: int):
+    """Get one slow or profiled request with its profile breakdown"""
+    entry = request_profiler.find(request_profiler.requests, request_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Request not found in the slow request log")
+    return entry
+
+@router.get("/slow-queries")
+async def get_slow_queries():
+    """Get recent Mongo commands slower than SLOW_QUERY_MS, newest first"""
+    return request_profiler.recent_queries()
+
+@router.get("/slow-queries/{query_id}/explain")
+async def explain_slow_query(query_id: int, db: AsyncIOMotorDatabase = Depends(current_db)):
+    """Get a slow command with its query plan, explained on first request"""
+    try:
+        entry = await request_profiler.explain(db, query_id)
+        if entry is None:
+            raise HTTPException(status_code=404, detail="Query not found in the slow query log")
+        return entry
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error explaining slow query: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to explain query")
+
+@router.delete("/slow-requests", status_code=status.HTTP_204_NO_CONTENT)
+async def clear_slow_log():
+    """Empty the slow request and slow query logs"""
+    request_profiler.clear()
+    return None
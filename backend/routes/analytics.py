@@ -1,58 +1,46 @@
-from fastapi import APIRouter, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import ORJSONResponse
+from typing import Any, Dict, List, Literal, Optional
 from models.committee_member import OverviewMetrics, TaskCategory, RegistrationData, CommitteeMember
-from database import db
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from routes.dependencies import current_analytics_db, current_committee, current_db
+from services import analytics, columnar, history, member_queries, snapshots, summary
+from services.snapshots import analytics_snapshots
+from services.tiers import tier_config
+import asyncio
 import logging
 from datetime import datetime
 
 router = APIRouter(prefix="/analytics", tags=["analytics"])
 logger = logging.getLogger(__name__)
 
+def snapshot_response(body: bytes, snapshot: Dict[str, Any]) -> Response:
+    """A stored payload as sent, with the snapshot it came from"""
+    return Response(body, media_type="application/json", headers={
+        "X-Snapshot-Version": str(snapshot["version"]),
+        "X-Snapshot-Computed-At": snapshot["computedAt"].isoformat() + "Z",
+    })
+
 @router.get("/overview", response_model=OverviewMetrics)
-async def get_overview_metrics():
+async def get_overview_metrics(
+    committee_id: str = Depends(current_committee),
+    db: AsyncIOMotorDatabase = Depends(current_db),
+    analytics_db: AsyncIOMotorDatabase = Depends(current_analytics_db),
+):
     """Get dashboard overview metrics"""
     try:
-        # Fetch all members
-        members_cursor = db.committee_members.find()
-        members_data = await members_cursor.to_list(1000)
-        
-        if not members_data:
-            return OverviewMetrics(
-                totalMembers=0,
-                totalTasksCompleted=0,
-                totalTasksPending=0,
-                totalRegistrations=0,
-                avgEfficiency=0,
-                topPerformer=None
-            )
-        
-        # Convert to CommitteeMember objects
-        members = []
-        for member_data in members_data:
-            member_data["id"] = str(member_data["_id"])
-            del member_data["_id"]
-            member = CommitteeMember(**member_data)
-            member.calculate_total_tasks()
-            members.append(member)
-        
-        # Calculate metrics
-        total_members = len(members)
-        total_tasks_completed = sum(member.tasksCompleted for member in members)
-        total_tasks_pending = sum(member.tasksPending for member in members)
-        total_registrations = sum(member.registrationsBrought for member in members)
-        avg_efficiency = round(sum(member.efficiency for member in members) / total_members) if total_members > 0 else 0
-        
-        # Find top performer
-        top_performer = max(members, key=lambda m: m.efficiency) if members else None
-        
-        return OverviewMetrics(
-            totalMembers=total_members,
-            totalTasksCompleted=total_tasks_completed,
-            totalTasksPending=total_tasks_pending,
-            totalRegistrations=total_registrations,
-            avgEfficiency=avg_efficiency,
-            topPerformer=top_performer
+        if analytics_snapshots.enabled:
+            return snapshot_response(*await analytics_snapshots.section(db, analytics_db, committee_id, "overview"))
+        if columnar.member_columns.enabled:
+            settings = await tier_config.current(db, committee_id)
+            return ORJSONResponse(await columnar.overview(db, committee_id, settings["tiers"]))
+        
+        # Totals come from the materialized summary, the top performer from the efficiency index
+        totals, top_performer = await asyncio.gather(
+            summary.get_summary(db, committee_id),
+            member_queries.fetch_top_performer(db, committee_id),
         )
+        return ORJSONResponse(analytics.overview_from_totals(totals, top_performer))
         
     except Exception as e:
         logger.error(f"Error fetching overview metrics: {str(e)}")
@@ -62,52 +50,19 @@ async def get_overview_metrics():
         )
 
 @router.get("/tasks", response_model=dict)
-async def get_task_analytics():
+async def get_task_analytics(
+    committee_id: str = Depends(current_committee),
+    db: AsyncIOMotorDatabase = Depends(current_db),
+    analytics_db: AsyncIOMotorDatabase = Depends(current_analytics_db),
+):
     """Get task analytics data"""
     try:
-        # Fetch all members
-        members_cursor = db.committee_members.find()
-        members_data = await members_cursor.to_list(1000)
-        
-        # Convert to CommitteeMember objects
-        members = []
-        for member_data in members_data:
-            member_data["id"] = str(member_data["_id"])
-            del member_data["_id"]
-            member = CommitteeMember(**member_data)
-            member.calculate_total_tasks()
-            members.append(member)
-        
-        # Calculate task metrics
-        total_tasks = sum(member.totalTasks for member in members)
-        completed_tasks = sum(member.tasksCompleted for member in members)
-        pending_tasks = sum(member.tasksPending for member in members)
-        completion_rate = round((completed_tasks / total_tasks) * 100) if total_tasks > 0 else 0
-        avg_efficiency = round(sum(member.efficiency for member in members) / len(members)) if members else 0
-        
-        # Rank members by efficiency
-        ranked_members = sorted(members, key=lambda m: m.efficiency, reverse=True)
-        
-        return {
-            "totalTasks": total_tasks,
-            "completedTasks": completed_tasks,
-            "pendingTasks": pending_tasks,
-            "completionRate": completion_rate,
-            "avgEfficiency": avg_efficiency,
-            "rankedMembers": [
-                {
-                    "id": member.id,
-                    "name": member.name,
-                    "role": member.role,
-                    "efficiency": member.efficiency,
-                    "tasksCompleted": member.tasksCompleted,
-                    "totalTasks": member.totalTasks,
-                    "registrationsBrought": member.registrationsBrought,
-                    "rank": idx + 1
-                }
-                for idx, member in enumerate(ranked_members)
-            ]
-        }
+        if analytics_snapshots.enabled:
+            return snapshot_response(*await analytics_snapshots.section(db, analytics_db, committee_id, "tasks"))
+        if columnar.member_columns.enabled:
+            settings = await tier_config.current(db, committee_id)
+            return ORJSONResponse(await columnar.task_analytics(db, committee_id, settings["tiers"]))
+        return ORJSONResponse(await analytics.compute_task_analytics(analytics_db.committee_members, committee_id))
         
     except Exception as e:
         logger.error(f"Error fetching task analytics: {str(e)}")
@@ -117,88 +72,76 @@ async def get_task_analytics():
         )
 
 @router.get("/registrations", response_model=dict)
-async def get_registration_metrics():
+async def get_registration_metrics(
+    committee_id: str = Depends(current_committee),
+    db: AsyncIOMotorDatabase = Depends(current_db),
+    analytics_db: AsyncIOMotorDatabase = Depends(current_analytics_db),
+):
     """Get registration metrics data"""
     try:
-        # Fetch all members
-        members_cursor = db.committee_members.find()
-        members_data = await members_cursor.to_list(1000)
-        
-        # Convert to CommitteeMember objects
-        members = []
-        for member_data in members_data:
-            member_data["id"] = str(member_data["_id"])
-            del member_data["_id"]
-            member = CommitteeMember(**member_data)
-            members.append(member)
-        
-        if not members:
-            return {
-                "totalRegistrations": 0,
-                "avgRegistrationsPerMember": 0,
-                "topPerformer": None,
-                "registrationTiers": [],
-                "monthlyData": [
-                    {"month": "Jan", "registrations": 0},
-                    {"month": "Feb", "registrations": 0},
-                    {"month": "Mar", "registrations": 0}
-                ]
-            }
+        if analytics_snapshots.enabled:
+            return snapshot_response(*await analytics_snapshots.section(db, analytics_db, committee_id, "registrations"))
         
-        # Calculate registration metrics
-        total_registrations = sum(member.registrationsBrought for member in members)
-        avg_registrations = round(total_registrations / len(members))
-        top_performer = max(members, key=lambda m: m.registrationsBrought)
-        
-        # Create registration tiers
-        registration_tiers = []
-        sorted_members = sorted(members, key=lambda m: m.registrationsBrought, reverse=True)
-        
-        for idx, member in enumerate(sorted_members):
-            tier = "Bronze"
-            tier_color = "bg-orange-100 text-orange-800"
-            
-            if member.registrationsBrought >= 15:
-                tier = "Platinum"
-                tier_color = "bg-purple-100 text-purple-800"
-            elif member.registrationsBrought >= 12:
-                tier = "Gold"
-                tier_color = "bg-yellow-100 text-yellow-800"
-            elif member.registrationsBrought >= 8:
-                tier = "Silver"
-                tier_color = "bg-gray-100 text-gray-800"
-            
-            registration_tiers.append({
-                "id": member.id,
-                "name": member.name,
-                "role": member.role,
-                "registrationsBrought": member.registrationsBrought,
-                "tier": tier,
-                "tierColor": tier_color,
-                "percentage": round((member.registrationsBrought / total_registrations) * 100, 1) if total_registrations > 0 else 0
-            })
-        
-        # Mock monthly data (can be replaced with actual historical data later)
-        monthly_data = [
-            {"month": "Jan", "registrations": 35},
-            {"month": "Feb", "registrations": 42},
-            {"month": "Mar", "registrations": total_registrations}
-        ]
+        if columnar.member_columns.enabled:
+            monthly_data, settings = await asyncio.gather(
+                history.monthly_registrations(analytics_db, committee_id),
+                tier_config.current(db, committee_id),
+            )
+            return ORJSONResponse(await columnar.registration_metrics(db, committee_id, settings["tiers"], monthly_data))
         
-        return {
-            "totalRegistrations": total_registrations,
-            "avgRegistrationsPerMember": avg_registrations,
-            "topPerformer": {
-                "name": top_performer.name,
-                "registrationsBrought": top_performer.registrationsBrought
-            },
-            "registrationTiers": registration_tiers,
-            "monthlyData": monthly_data
-        }
+        # Totals and tier counts come from the summary, which tracks the current tier settings
+        monthly_data, totals = await asyncio.gather(
+            history.monthly_registrations(analytics_db, committee_id),
+            summary.get_summary(db, committee_id),
+        )
+        settings = await tier_config.current(db, committee_id)
+        return ORJSONResponse(await analytics.compute_registration_metrics(
+            analytics_db.committee_members, committee_id, monthly_data, settings["tiers"], totals
+        ))
         
     except Exception as e:
         logger.error(f"Error fetching registration metrics: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch registration metrics"
-        )
\ No newline at end of file
+        )
+
+@router.get("/history", response_model=dict)
+async def get_history_rollup(
+    metric: Literal["score", "registrations"] = "registrations",
+    unit: Literal["week", "month"] = "month",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    committee_id: str = Depends(current_committee),
+    analytics_db: AsyncIOMotorDatabase = Depends(current_analytics_db),
+):
+    """Get committee-wide registrations (summed) or scores (averaged) per week or month"""
+    try:
+        # Default to the last twelve months
+        start = start or history.month_start(datetime.utcnow(), 11)
+        periods = await history.rollup(analytics_db, committee_id, metric, unit, start, end)
+        return {"metric": metric, "unit": unit, "periods": periods}
+        
+    except Exception as e:
+        logger.error(f"Error fetching history rollup: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to fetch history rollup"
+        )
+
+@router.get("/trends", response_model=dict)
+async def get_monthly_trends(
+    months: int = Query(12, ge=1, le=60),
+    committee_id: str = Depends(current_committee),
+    analytics_db: AsyncIOMotorDatabase = Depends(current_analytics_db),
+):
+    """Get the analytics totals at the end of each recent month and their month-over-month change"""
+    try:
+        return ORJSONResponse({"months": await snapshots.monthly_trends(analytics_db, committee_id, months)})
+        
+    except Exception as e:
+        logger.error(f"Error fetching monthly trends: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to fetch monthly trends"
+        )
@@ -0,0 +1,41 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse
+from typing import Optional
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from routes.dependencies import current_analytics_db, current_committee, current_db
+from services import dashboard
+import logging
+
+router = APIRouter(prefix="/dashboard", tags=["dashboard"])
+logger = logging.getLogger(__name__)
+
+@router.get("")
+async def get_dashboard(
+    sections: Optional[str] = None,
+    membersLimit: int = Query(100, ge=1, le=1000),
+    committee_id: str = Depends(current_committee),
+    db: AsyncIOMotorDatabase = Depends(current_db),
+    analytics_db: AsyncIOMotorDatabase = Depends(current_analytics_db),
+):
+    """Get several dashboard sections in one response.
+
+    ``sections`` is a comma separated subset of overview, members, tasks,
+    registrations and categories (default: all). Each section has the shape
+    of its standalone endpoint; ``members`` is the first page of /members
+    with ``nextCursor`` in the body. Sections share one summary read and one
+    ranking scan, and a failed section is listed under ``errors``.
+    """
+    try:
+        requested = dashboard.parse_sections(sections)
+        return ORJSONResponse(await dashboard.build_dashboard(db, analytics_db, committee_id, requested, membersLimit))
+    except dashboard.InvalidSections as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Error fetching dashboard: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to fetch dashboard"
+        )
@@ -0,0 +1,23 @@
+from fastapi import Header, HTTPException, status
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from typing import Optional
+from services.committees import InvalidCommittee, resolve_committee_id
+import database
+
+async def current_committee(x_committee_id: Optional[str] = Header(None)) -> str:
+    """Committee a request acts on, from X-Committee-Id (the default committee when absent)"""
+    try:
+        return resolve_committee_id(x_committee_id)
+    except InvalidCommittee as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+async def current_db() -> AsyncIOMotorDatabase:
+    """The application database, connected by the app lifespan"""
+    return database.connect().db
+
+async def current_analytics_db() -> AsyncIOMotorDatabase:
+    """The application database read with MONGO_ANALYTICS_READ_PREFERENCE"""
+    return database.connect().analytics_db
@@ -0,0 +1,68 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+from typing import Literal, Optional
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from routes.dependencies import current_analytics_db, current_committee
+from services import exports, member_queries
+import logging
+
+router = APIRouter(prefix="/export", tags=["export"])
+logger = logging.getLogger(__name__)
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+def export_response(rows, columns, export_format: str, gzip: bool, filename: str) -> StreamingResponse:
+    """Wrap a row stream in a StreamingResponse"""
+    headers = {"Content-Disposition": f'attachment; filename="{filename}.{export_format}"'}
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        exports.stream_rows(rows, columns, export_format, compress=gzip),
+        media_type=MEDIA_TYPES[export_format],
+        headers=headers
+    )
+
+@router.get("/members")
+async def export_members(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    gzip: bool = False,
+    fields: Optional[str] = None,
+    committee_id: str = Depends(current_committee),
+    analytics_db: AsyncIOMotorDatabase = Depends(current_analytics_db),
+):
+    """Stream all committee members"""
+    try:
+        requested_fields = member_queries.parse_fields(fields)
+    except member_queries.InvalidQuery as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    rows = exports.iter_members(analytics_db.committee_members, committee_id, requested_fields)
+    return export_response(rows, ["id"] + requested_fields, format, gzip, "members")
+
+@router.get("/rankings")
+async def export_rankings(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    gzip: bool = False,
+    committee_id: str = Depends(current_committee),
+    analytics_db: AsyncIOMotorDatabase = Depends(current_analytics_db),
+):
+    """Stream members ranked by efficiency"""
+    rows = exports.iter_rankings(analytics_db.committee_members, committee_id)
+    return export_response(rows, exports.RANKING_COLUMNS, format, gzip, "rankings")
+
+@router.get("/registration-tiers")
+async def export_registration_tiers(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    gzip: bool = False,
+    committee_id: str = Depends(current_committee),
+    analytics_db: AsyncIOMotorDatabase = Depends(current_analytics_db),
+):
+    """Stream members with their registration tier"""
+    rows = exports.iter_registration_tiers(analytics_db.committee_members, committee_id)
+    return export_response(rows, exports.TIER_COLUMNS, format, gzip, "registration-tiers")
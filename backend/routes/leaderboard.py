@@ -0,0 +1,83 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse
+from typing import Literal
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from routes.dependencies import current_committee, current_db
+from services import leaderboard
+import logging
+
+router = APIRouter(prefix="/leaderboard", tags=["leaderboard"])
+logger = logging.getLogger(__name__)
+
+Metric = Literal["efficiency", "registrationsBrought"]
+
+@router.get("/{metric}")
+async def get_leaderboard(
+    metric: Metric,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=1000),
+    committee_id: str = Depends(current_committee),
+    db: AsyncIOMotorDatabase = Depends(current_db),
+):
+    """Get a page of members ranked by a metric, highest first.
+
+    Ties are ordered by member id; ``competitionRank`` is shared by tied members.
+    """
+    try:
+        return ORJSONResponse(await leaderboard.top(db, committee_id, metric, offset, limit))
+        
+    except Exception as e:
+        logger.error(f"Error fetching {metric} leaderboard: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to fetch leaderboard"
+        )
+
+@router.get("/{metric}/members/{member_id}")
+async def get_member_rank(metric: Metric, member_id: str, committee_id: str = Depends(current_committee), db: AsyncIOMotorDatabase = Depends(current_db)):
+    """Get the rank of one member"""
+    try:
+        rank = await leaderboard.rank_of(db, committee_id, metric, member_id)
+        if rank is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Committee member not found"
+            )
+        return ORJSONResponse(rank)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching {metric} rank of member {member_id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to fetch member rank"
+        )
+
+@router.get("/{metric}/members/{member_id}/around")
+async def get_members_around(
+    metric: Metric,
+    member_id: str,
+    before: int = Query(5, ge=0, le=100),
+    after: int = Query(5, ge=0, le=100),
+    committee_id: str = Depends(current_committee),
+    db: AsyncIOMotorDatabase = Depends(current_db),
+):
+    """Get the members ranked just above and below one member"""
+    try:
+        neighbours = await leaderboard.around(db, committee_id, metric, member_id, before, after)
+        if neighbours is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Committee member not found"
+            )
+        return ORJSONResponse(neighbours)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching members around {member_id} by {metric}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to fetch leaderboard"
+        )
@@ -1,33 +1,77 @@
-from fastapi import APIRouter, HTTPException, status
-from typing import List
-from models.committee_member import CommitteeMember, CommitteeMemberCreate, CommitteeMemberUpdate
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse
+from typing import List, Literal, Optional
+from models.committee_member import CommitteeMember, CommitteeMemberCreate, CommitteeMemberUpdate, BulkMemberRequest, BulkMemberResponse
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from database import db
+from routes.dependencies import current_committee, current_db
+from services import bulk_members, history, member_queries, member_search
+from services.member_writes import (
+    InvalidPrecondition,
+    apply_member_write,
+    build_member_update,
+    member_etag,
+    member_update_pipeline,
+    parse_if_match,
+    split_performance_history,
+    store_scores,
+    updated_document,
+    version_filter,
+)
+from pymongo import ReturnDocument
 import logging
 from datetime import datetime
 
 router = APIRouter(prefix="/members", tags=["members"])
 logger = logging.getLogger(__name__)
 
-@router.get("/", response_model=List[CommitteeMember])
-async def get_all_members():
-    """Get all committee members"""
+@router.get("/")
+async def get_all_members(
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    sort: Literal["id", "efficiency", "registrationsBrought"] = "id",
+    order: Literal["asc", "desc"] = "asc",
+    fields: Optional[str] = None,
+    role: Optional[str] = None,
+    minEfficiency: Optional[int] = Query(None, ge=0, le=100),
+    maxEfficiency: Optional[int] = Query(None, ge=0, le=100),
+    minRegistrations: Optional[int] = Query(None, ge=0),
+    maxRegistrations: Optional[int] = Query(None, ge=0),
+    committee_id: str = Depends(current_committee),
+    db: AsyncIOMotorDatabase = Depends(current_db),
+):
+    """Get a page of committee members.
+
+    The next page is requested by passing the ``X-Next-Cursor`` response
+    header back as ``cursor``; the header is absent on the last page.
+    Rows are shaped by the aggregation and encoded as-is; stored documents
+    were validated when they were written.
+    """
     try:
-        members_cursor = db.committee_members.find()
-        members_data = await members_cursor.to_list(1000)
-        
-        members = []
-        for member_data in members_data:
-            # Convert MongoDB _id to id
-            if "_id" in member_data:
-                member_data["id"] = str(member_data["_id"])
-                del member_data["_id"]
-            
-            member = CommitteeMember(**member_data)
-            member.calculate_total_tasks()
-            members.append(member)
-        
-        return members
+        requested_fields = member_queries.parse_fields(fields)
+        query = member_queries.build_filter(committee_id, role, minEfficiency, maxEfficiency, minRegistrations, maxRegistrations)
+        if cursor:
+            query = {"$and": [query, member_queries.decode_cursor(cursor, sort, order)]}
+        
+        # Fetch one extra row to know whether another page exists
+        members_cursor = db.committee_members.aggregate(
+            member_queries.list_pipeline(query, requested_fields, sort, order, limit + 1)
+        )
+        members = await members_cursor.to_list(limit + 1)
+        
+        headers = {}
+        if len(members) > limit:
+            members = members[:limit]
+            headers["X-Next-Cursor"] = member_queries.encode_cursor(sort, order, members[-1])
+        member_queries.strip_sort_key(members, requested_fields, sort)
+        
+        if "performanceHistory" in requested_fields:
+            await history.attach_performance_history(db, committee_id, members)
+        return ORJSONResponse(members, headers=headers)
+    except member_queries.InvalidQuery as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         logger.error(f"Error fetching members: {str(e)}")
         raise HTTPException(
@@ -35,20 +79,52 @@ async def get_all_members():
             detail="Failed to fetch committee members"
         )
 
+@router.get("/search")
+async def search_members(
+    q: str = Query(..., min_length=1, max_length=200),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    committee_id: str = Depends(current_committee),
+    db: AsyncIOMotorDatabase = Depends(current_db),
+):
+    """Search members by name, role and contact as the user types.
+
+    Every word of ``q`` must start a word of one of the fields. Matches
+    are ordered by score (name over role over contact, whole words over
+    prefixes), then by name.
+    """
+    try:
+        return ORJSONResponse(await member_search.search(db, committee_id, q, offset, limit))
+    except member_search.InvalidSearch as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Error searching members: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to search committee members"
+        )
+
 @router.post("/", response_model=CommitteeMember, status_code=status.HTTP_201_CREATED)
-async def create_member(member_data: CommitteeMemberCreate):
+async def create_member(member_data: CommitteeMemberCreate, committee_id: str = Depends(current_committee), db: AsyncIOMotorDatabase = Depends(current_db)):
     """Create a new committee member"""
     try:
         # Create member instance
-        member = CommitteeMember(**member_data.dict())
+        member = CommitteeMember(**member_data.dict(), committeeId=committee_id)
         member.calculate_total_tasks()
         
         # Convert to dict for MongoDB
         member_dict = member.dict()
         member_dict["_id"] = member_dict.pop("id")  # Use id as _id for MongoDB
+        performance_history = split_performance_history(member_dict)
         
         # Insert into database
         result = await db.committee_members.insert_one(member_dict)
+        if performance_history:
+            await store_scores(db, committee_id, member_dict["_id"], performance_history)
+        await apply_member_write(None, member_dict)
         
         # Return created member
         member.id = str(result.inserted_id)
@@ -61,25 +137,38 @@ async def create_member(member_data: CommitteeMemberCreate):
             detail="Failed to create committee member"
         )
 
+@router.post("/bulk", response_model=BulkMemberResponse)
+async def bulk_members_write(request: BulkMemberRequest, committee_id: str = Depends(current_committee), db: AsyncIOMotorDatabase = Depends(current_db)):
+    """Create, update and delete committee members in one batch"""
+    try:
+        return await bulk_members.run_bulk(db, committee_id, request.operations)
+        
+    except Exception as e:
+        logger.error(f"Error applying bulk member operations: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to apply bulk member operations"
+        )
+
 @router.get("/{member_id}", response_model=CommitteeMember)
-async def get_member(member_id: str):
-    """Get a specific committee member by ID"""
+async def get_member(member_id: str, committee_id: str = Depends(current_committee), db: AsyncIOMotorDatabase = Depends(current_db)):
+    """Get a specific committee member by ID.
+
+    The ``ETag`` header is the member's version, for ``If-Match`` on updates.
+    """
     try:
-        member_data = await db.committee_members.find_one({"_id": member_id})
+        members = await db.committee_members.aggregate(
+            member_queries.list_pipeline({"_id": member_id, "committeeId": committee_id}, member_queries.ALL_FIELDS, "id", "asc", 1)
+        ).to_list(1)
         
-        if not member_data:
+        if not members:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Committee member not found"
             )
         
-        # Convert MongoDB _id to id
-        member_data["id"] = str(member_data["_id"])
-        del member_data["_id"]
-        
-        member = CommitteeMember(**member_data)
-        member.calculate_total_tasks()
-        return member
+        await history.attach_performance_history(db, committee_id, members)
+        return ORJSONResponse(members[0], headers={"ETag": member_etag(members[0]["version"])})
         
     except HTTPException:
         raise
@@ -90,51 +179,84 @@ async def get_member(member_id: str):
             detail="Failed to fetch committee member"
         )
 
-@router.put("/{member_id}", response_model=CommitteeMember)
-async def update_member(member_id: str, member_update: CommitteeMemberUpdate):
-    """Update a committee member"""
+@router.get("/{member_id}/history")
+async def get_member_history(
+    member_id: str,
+    metric: Literal["score", "registrations"] = "score",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    committee_id: str = Depends(current_committee),
+    db: AsyncIOMotorDatabase = Depends(current_db),
+):
+    """Get a member's performance scores or registration events over a time range"""
     try:
-        # Check if member exists
-        existing_member = await db.committee_members.find_one({"_id": member_id})
-        if not existing_member:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Committee member not found"
-            )
-        
-        # Prepare update data
-        update_data = {k: v for k, v in member_update.dict().items() if v is not None}
-        update_data["updatedAt"] = datetime.utcnow()
+        points = await history.member_history(db, committee_id, member_id, metric, start, end)
+        return {"memberId": member_id, "metric": metric, "points": points}
         
-        # Calculate total tasks if task data is updated
-        if "tasksCompleted" in update_data or "tasksPending" in update_data:
-            tasks_completed = update_data.get("tasksCompleted", existing_member.get("tasksCompleted", 0))
-            tasks_pending = update_data.get("tasksPending", existing_member.get("tasksPending", 0))
-            update_data["totalTasks"] = tasks_completed + tasks_pending
-        
-        # Update in database
-        result = await db.committee_members.update_one(
-            {"_id": member_id},
-            {"$set": update_data}
+    except Exception as e:
+        logger.error(f"Error fetching history for member {member_id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to fetch member history"
         )
+
+@router.put("/{member_id}", response_model=CommitteeMember)
+async def update_member(
+    member_id: str,
+    member_update: CommitteeMemberUpdate,
+    if_match: Optional[str] = Header(None),
+    committee_id: str = Depends(current_committee),
+    db: AsyncIOMotorDatabase = Depends(current_db),
+):
+    """Update a committee member in one atomic find_one_and_update.
+
+    With ``If-Match`` (an ETag from GET or a previous update) the write only
+    applies if the member is still at that version, otherwise 412 is returned
+    with the current ETag. totalTasks and version are computed server-side.
+    """
+    try:
+        versions = parse_if_match(if_match)
+        update_data = build_member_update(member_update)
+        performance_history = split_performance_history(update_data)
         
-        if result.modified_count == 0:
+        query = {"_id": member_id, "committeeId": committee_id}
+        if versions is not None:
+            query = {"$and": [query, version_filter(versions)]}
+        # The pre-image feeds the summary and history deltas; the post-image follows from it
+        existing_member = await db.committee_members.find_one_and_update(
+            query,
+            member_update_pipeline(update_data),
+            return_document=ReturnDocument.BEFORE
+        )
+        if existing_member is None:
+            current = await db.committee_members.find_one({"_id": member_id, "committeeId": committee_id}, {"version": 1}) if versions is not None else None
+            if current is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Committee member not found"
+                )
             raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="No changes were made"
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail="Committee member was modified by another request",
+                headers={"ETag": member_etag(current.get("version") or 0)}
             )
+        updated_member = updated_document(existing_member, update_data)
         
-        # Return updated member
-        updated_member_data = await db.committee_members.find_one({"_id": member_id})
-        updated_member_data["id"] = str(updated_member_data["_id"])
-        del updated_member_data["_id"]
+        if performance_history is not None:
+            await store_scores(db, committee_id, member_id, performance_history)
+        await apply_member_write(existing_member, updated_member)
         
-        updated_member = CommitteeMember(**updated_member_data)
-        updated_member.calculate_total_tasks()
-        return updated_member
+        row = member_queries.document_row(updated_member, member_queries.ALL_FIELDS)
+        await history.attach_performance_history(db, committee_id, [row])
+        return ORJSONResponse(row, headers={"ETag": member_etag(row["version"])})
         
     except HTTPException:
         raise
+    except InvalidPrecondition as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         logger.error(f"Error updating member {member_id}: {str(e)}")
         raise HTTPException(
@@ -143,17 +265,18 @@ async def update_member(member_id: str, member_update: CommitteeMemberUpdate):
         )
 
 @router.delete("/{member_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_member(member_id: str):
+async def delete_member(member_id: str, committee_id: str = Depends(current_committee), db: AsyncIOMotorDatabase = Depends(current_db)):
     """Delete a committee member"""
     try:
-        result = await db.committee_members.delete_one({"_id": member_id})
+        deleted_member = await db.committee_members.find_one_and_delete({"_id": member_id, "committeeId": committee_id})
         
-        if result.deleted_count == 0:
+        if deleted_member is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Committee member not found"
             )
         
+        await apply_member_write(deleted_member, None)
         return None
         
     except HTTPException:
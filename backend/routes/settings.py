@@ -0,0 +1,44 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from models.settings import RegistrationTierConfig, RegistrationTierSettings
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from routes.dependencies import current_committee, current_db
+from services import summary, tiers
+from services.response_cache import response_cache
+import logging
+
+router = APIRouter(prefix="/settings", tags=["settings"])
+logger = logging.getLogger(__name__)
+
+@router.get("/registration-tiers", response_model=RegistrationTierSettings)
+async def get_registration_tiers(committee_id: str = Depends(current_committee), db: AsyncIOMotorDatabase = Depends(current_db)):
+    """Get the committee's registration tier thresholds, highest first"""
+    try:
+        return await tiers.tier_config.current(db, committee_id)
+        
+    except Exception as e:
+        logger.error(f"Error fetching registration tiers: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to fetch registration tiers"
+        )
+
+@router.put("/registration-tiers", response_model=RegistrationTierSettings)
+async def update_registration_tiers(config: RegistrationTierConfig, committee_id: str = Depends(current_committee), db: AsyncIOMotorDatabase = Depends(current_db)):
+    """Replace the committee's registration tiers and recount its members per tier"""
+    try:
+        settings = await tiers.save_tiers(db, committee_id, [tier.dict() for tier in config.tiers])
+        await summary.rebuild_summary(db, committee_id)
+        await response_cache.invalidate(committee_id)
+        return settings
+        
+    except tiers.InvalidTierConfig as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Error updating registration tiers: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to update registration tiers"
+        )
@@ -0,0 +1,58 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from typing import Optional
+from routes.dependencies import current_db
+from services.committees import InvalidCommittee, resolve_committee_id
+from services.events import broadcaster, encode_event, watcher
+import asyncio
+import logging
+
+router = APIRouter(prefix="/stream", tags=["stream"])
+logger = logging.getLogger(__name__)
+
+# Seconds between keep-alive comments on an idle connection
+HEARTBEAT_INTERVAL = 15
+
+@router.get("/")
+async def stream_events(request: Request, committeeId: Optional[str] = None, db: AsyncIOMotorDatabase = Depends(current_db)):
+    """Push a committee's member and overview changes to a dashboard as server-sent events.
+
+    EventSource cannot send headers, so the committee may also be given as
+    ``committeeId``; X-Committee-Id wins when both are present.
+    """
+    try:
+        committee_id = resolve_committee_id(request.headers.get("x-committee-id") or committeeId)
+    except InvalidCommittee as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    watcher.ensure_started(db)
+    subscriber = broadcaster.subscribe(committee_id)
+
+    async def event_stream():
+        try:
+            # Start every connection from the current totals
+            try:
+                yield encode_event("overview", await watcher.overview(committee_id))
+            except Exception as e:
+                logger.error(f"Error fetching initial overview: {str(e)}")
+            
+            while not subscriber.closed:
+                try:
+                    async with asyncio.timeout(HEARTBEAT_INTERVAL):
+                        message = await subscriber.queue.get()
+                    yield message
+                except TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield b": keep-alive\n\n"
+        finally:
+            broadcaster.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -1,24 +1,22 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from typing import List
 from models.committee_member import TaskCategory
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from routes.dependencies import current_committee, current_db
+from services import tasks
 import logging
 
 router = APIRouter(prefix="/task-categories", tags=["task-categories"])
 logger = logging.getLogger(__name__)
 
 @router.get("/", response_model=List[TaskCategory])
-async def get_task_categories():
-    """Get task categories with completion data (static for now)"""
+async def get_task_categories(committee_id: str = Depends(current_committee), db: AsyncIOMotorDatabase = Depends(current_db)):
+    """Get task categories with completion data"""
     try:
-        # Static task categories (can be made dynamic later)
-        categories = [
-            TaskCategory(category="Event Planning", completed=25, pending=8, total=33),
-            TaskCategory(category="Marketing", completed=18, pending=5, total=23),
-            TaskCategory(category="Outreach", completed=22, pending=4, total=26),
-            TaskCategory(category="Administration", completed=15, pending=7, total=22)
-        ]
+        # Read from the per-category counters maintained on every task write
+        categories = await tasks.category_stats(db, committee_id)
         
-        return categories
+        return [TaskCategory(**category) for category in categories]
         
     except Exception as e:
         logger.error(f"Error fetching task categories: {str(e)}")
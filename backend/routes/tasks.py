@@ -0,0 +1,173 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from typing import Any, Dict, List, Optional
+from models.task import Task, TaskCreate, TaskStatus, TaskUpdate
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from routes.dependencies import current_committee, current_db
+from services import tasks as task_counters
+from pymongo import ReturnDocument
+import logging
+from datetime import datetime
+
+router = APIRouter(prefix="/tasks", tags=["tasks"])
+logger = logging.getLogger(__name__)
+
+def to_task(task_data: Dict[str, Any]) -> Task:
+    """Convert a tasks document to the API model"""
+    task_data = dict(task_data)
+    task_data["id"] = task_data.pop("_id")
+    return Task(**task_data)
+
+async def ensure_assignee(database: AsyncIOMotorDatabase, committee_id: str, assignee_id: Optional[str]) -> None:
+    """Reject tasks assigned to a member that does not exist in the committee"""
+    if assignee_id and not await database.committee_members.find_one({"_id": assignee_id, "committeeId": committee_id}, {"_id": 1}):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Assignee is not a committee member"
+        )
+
+@router.get("/", response_model=List[Task])
+async def get_tasks(
+    response: Response,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    category: Optional[str] = None,
+    assigneeId: Optional[str] = None,
+    status_filter: Optional[TaskStatus] = Query(None, alias="status"),
+    committee_id: str = Depends(current_committee),
+    db: AsyncIOMotorDatabase = Depends(current_db),
+):
+    """Get a page of tasks in id order.
+
+    The next page is requested by passing the ``X-Next-Cursor`` response
+    header back as ``cursor``; the header is absent on the last page.
+    """
+    try:
+        query: Dict[str, Any] = {"committeeId": committee_id}
+        if category:
+            query["category"] = category
+        if assigneeId:
+            query["assigneeId"] = assigneeId
+        if status_filter:
+            query["status"] = status_filter
+        if cursor:
+            query["_id"] = {"$gt": cursor}
+
+        tasks_data = await db.tasks.find(query, sort=[("_id", 1)], limit=limit + 1).to_list(limit + 1)
+        if len(tasks_data) > limit:
+            tasks_data = tasks_data[:limit]
+            response.headers["X-Next-Cursor"] = tasks_data[-1]["_id"]
+        return [to_task(task_data) for task_data in tasks_data]
+    except Exception as e:
+        logger.error(f"Error fetching tasks: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to fetch tasks"
+        )
+
+@router.post("/", response_model=Task, status_code=status.HTTP_201_CREATED)
+async def create_task(task_data: TaskCreate, committee_id: str = Depends(current_committee), db: AsyncIOMotorDatabase = Depends(current_db)):
+    """Create a new task"""
+    try:
+        await ensure_assignee(db, committee_id, task_data.assigneeId)
+        task = Task(**task_data.dict(), committeeId=committee_id)
+        if task.status == "completed":
+            task.completedAt = task.updatedAt
+
+        task_dict = task.dict()
+        task_dict["_id"] = task_dict.pop("id")
+        await db.tasks.insert_one(task_dict)
+        await task_counters.apply_task_change(db, None, task_dict)
+        return task
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error creating task: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to create task"
+        )
+
+@router.get("/{task_id}", response_model=Task)
+async def get_task(task_id: str, committee_id: str = Depends(current_committee), db: AsyncIOMotorDatabase = Depends(current_db)):
+    """Get a specific task by ID"""
+    try:
+        task_data = await db.tasks.find_one({"_id": task_id, "committeeId": committee_id})
+        if not task_data:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Task not found"
+            )
+        return to_task(task_data)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching task {task_id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to fetch task"
+        )
+
+@router.put("/{task_id}", response_model=Task)
+async def update_task(task_id: str, task_update: TaskUpdate, committee_id: str = Depends(current_committee), db: AsyncIOMotorDatabase = Depends(current_db)):
+    """Update a task; ``assigneeId: null`` unassigns it"""
+    try:
+        update_data = task_update.dict(exclude_unset=True)
+        for field in ("title", "category", "status"):
+            if field in update_data and update_data[field] is None:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"{field} cannot be null"
+                )
+        if "assigneeId" in update_data:
+            await ensure_assignee(db, committee_id, update_data["assigneeId"])
+
+        now = datetime.utcnow()
+        update_data["updatedAt"] = now
+        if update_data.get("status") == "completed":
+            update_data["completedAt"] = now
+        elif update_data.get("status") == "pending":
+            update_data["completedAt"] = None
+
+        # The pre-image of an atomic update gives exact counter deltas
+        old_task = await db.tasks.find_one_and_update(
+            {"_id": task_id, "committeeId": committee_id},
+            {"$set": update_data},
+            return_document=ReturnDocument.BEFORE
+        )
+        if not old_task:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Task not found"
+            )
+        new_task = {**old_task, **update_data}
+        await task_counters.apply_task_change(db, old_task, new_task)
+        return to_task(new_task)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error updating task {task_id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to update task"
+        )
+
+@router.delete("/{task_id}")
+async def delete_task(task_id: str, committee_id: str = Depends(current_committee), db: AsyncIOMotorDatabase = Depends(current_db)):
+    """Delete a task"""
+    try:
+        task_data = await db.tasks.find_one_and_delete({"_id": task_id, "committeeId": committee_id})
+        if not task_data:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Task not found"
+            )
+        await task_counters.apply_task_change(db, task_data, None)
+        return {"message": "Task deleted successfully"}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error deleting task {task_id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to delete task"
+        )
@@ -1,81 +1,33 @@
-from fastapi import FastAPI, APIRouter
-from dotenv import load_dotenv
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, APIRouter, Request, Response, status
+from fastapi.responses import JSONResponse
 from starlette.middleware.cors import CORSMiddleware
+from typing import Any, Dict
+import asyncio
 import os
 import logging
-from pathlib import Path
-
-# Import database and route modules
-from database import db, client
-from routes import members, analytics, task_categories
-
-ROOT_DIR = Path(__file__).parent
-load_dotenv(ROOT_DIR / '.env')
-
-# Get CORS origins from environment variable
-cors_origins_str = os.getenv('CORS_ORIGINS', 'http://localhost:3000')
-cors_origins = [origin.strip() for origin in cors_origins_str.split(',')]
-
-# Get environment configuration
-environment = os.getenv('ENVIRONMENT', 'development')
-api_title = os.getenv('API_TITLE', 'Committee Performance Dashboard API')
-api_version = os.getenv('API_VERSION', '1.0.0')
-
-# Create the main app without a prefix
-app = FastAPI(
-    title=api_title,
-    version=api_version,
-    docs_url="/docs" if environment == "development" else None,
-    redoc_url="/redoc" if environment == "development" else None
-)
-
-# Create a router with the /api prefix
-api_router = APIRouter(prefix="/api")
 
-# Health check endpoint (outside /api prefix for platform monitoring)
-@app.get("/health")
-async def health_check():
-    """Health check endpoint for monitoring"""
-    try:
-        # Test database connection
-        await db.command('ping')
-        return {
-            "status": "healthy",
-            "service": "Committee Performance Dashboard API",
-            "version": api_version,
-            "database": "connected"
-        }
-    except Exception as e:
-        logger.error(f"Health check failed: {str(e)}")
-        return {
-            "status": "unhealthy",
-            "service": "Committee Performance Dashboard API",
-            "version": api_version,
-            "database": "disconnected",
-            "error": str(e)
-        }
+# database loads backend/.env, so it comes before anything reading the environment
+import database
+from routes import members, analytics, dashboard, task_categories, tasks, leaderboard, settings, exports, admin, stream
+from middleware.response_cache import ResponseCacheMiddleware
+from middleware.metrics import MetricsMiddleware
+from middleware.profiling import ProfilingMiddleware
+from middleware.compression import CompressionMiddleware
+from middleware.single_flight import SingleFlightMiddleware
+from services.response_cache import response_cache
+from services.profiling import request_profiler
+from services.single_flight import request_flights
+from services.events import watcher
+from services.snapshots import analytics_snapshots
+from services import committee_migration, history, metrics
+from services.committees import DEFAULT_COMMITTEE_ID
+from services.member_index import MAX_AGE_SECONDS
 
-# API root endpoint
-@api_router.get("/")
-async def root():
-    return {"message": "Committee Performance Dashboard API is running!"}
+SERVICE_NAME = "Committee Performance Dashboard API"
 
-# Include route modules
-api_router.include_router(members.router)
-api_router.include_router(analytics.router)
-api_router.include_router(task_categories.router)
-
-# Include the router in the main app
-app.include_router(api_router)
-
-# CORS middleware with environment-based origins
-app.add_middleware(
-    CORSMiddleware,
-    allow_credentials=True,
-    allow_origins=cors_origins,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# Seconds between attempts at the startup database work while MongoDB is unreachable
+STARTUP_RETRY_SECONDS = float(os.getenv('STARTUP_RETRY_SECONDS', '5'))
 
 # Configure logging
 logging.basicConfig(
@@ -84,119 +36,210 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-@app.on_event("shutdown")
-async def shutdown_db_client():
-    client.close()
+async def prepare_database(app: FastAPI) -> None:
+    """Migrations, indexes and collections the app needs, run after startup.
+
+    The app reports ready on /health/ready once this is done. Migrations
+    and indexes are retried until MongoDB answers.
+    """
+    db = database.get_db()
+    while True:
+        try:
+            # Pre-committee counters would collide with the (committeeId, category) unique index
+            await committee_migration.remove_legacy_counters(db)
+            await database.create_indexes()
+            if await committee_migration.has_unassigned_documents(db):
+                counts = await committee_migration.assign_committee(db, DEFAULT_COMMITTEE_ID)
+                logger.info(f"Assigned existing data to committee {DEFAULT_COMMITTEE_ID}: {counts}")
+            break
+        except Exception as e:
+            logger.error(f"Error preparing database: {str(e)}")
+            await asyncio.sleep(STARTUP_RETRY_SECONDS)
 
-# Startup event to initialize database with sample data
-@app.on_event("startup")
-async def startup_db_client():
     try:
-        # Check if we have any existing members
-        existing_count = await db.committee_members.count_documents({})
-        
-        if existing_count == 0:
-            # Initialize with sample data
-            sample_members = [
-                {
-                    "_id": "1",
-                    "name": "Sarah Johnson",
-                    "role": "Team Lead",
-                    "contact": "sarah.johnson@email.com",
-                    "phone": "+1 (555) 123-4567",
-                    "tasksCompleted": 15,
-                    "tasksPending": 3,
-                    "totalTasks": 18,
-                    "efficiency": 85,
-                    "registrationsBrought": 12,
-                    "performanceHistory": [
-                        {"month": "Jan", "score": 78},
-                        {"month": "Feb", "score": 82},
-                        {"month": "Mar", "score": 85}
-                    ],
-                    "createdAt": "2024-01-01T00:00:00Z",
-                    "updatedAt": "2024-03-01T00:00:00Z"
-                },
-                {
-                    "_id": "2",
-                    "name": "Michael Chen",
-                    "role": "Marketing Coordinator",
-                    "contact": "michael.chen@email.com",
-                    "phone": "+1 (555) 234-5678",
-                    "tasksCompleted": 22,
-                    "tasksPending": 5,
-                    "totalTasks": 27,
-                    "efficiency": 92,
-                    "registrationsBrought": 18,
-                    "performanceHistory": [
-                        {"month": "Jan", "score": 88},
-                        {"month": "Feb", "score": 90},
-                        {"month": "Mar", "score": 92}
-                    ],
-                    "createdAt": "2024-01-01T00:00:00Z",
-                    "updatedAt": "2024-03-01T00:00:00Z"
-                },
-                {
-                    "_id": "3",
-                    "name": "Emily Rodriguez",
-                    "role": "Event Coordinator",
-                    "contact": "emily.rodriguez@email.com",
-                    "phone": "+1 (555) 345-6789",
-                    "tasksCompleted": 11,
-                    "tasksPending": 7,
-                    "totalTasks": 18,
-                    "efficiency": 72,
-                    "registrationsBrought": 8,
-                    "performanceHistory": [
-                        {"month": "Jan", "score": 75},
-                        {"month": "Feb", "score": 70},
-                        {"month": "Mar", "score": 72}
-                    ],
-                    "createdAt": "2024-01-01T00:00:00Z",
-                    "updatedAt": "2024-03-01T00:00:00Z"
-                },
-                {
-                    "_id": "4",
-                    "name": "David Kim",
-                    "role": "Outreach Specialist",
-                    "contact": "david.kim@email.com",
-                    "phone": "+1 (555) 456-7890",
-                    "tasksCompleted": 19,
-                    "tasksPending": 2,
-                    "totalTasks": 21,
-                    "efficiency": 88,
-                    "registrationsBrought": 15,
-                    "performanceHistory": [
-                        {"month": "Jan", "score": 85},
-                        {"month": "Feb", "score": 87},
-                        {"month": "Mar", "score": 88}
-                    ],
-                    "createdAt": "2024-01-01T00:00:00Z",
-                    "updatedAt": "2024-03-01T00:00:00Z"
-                },
-                {
-                    "_id": "5",
-                    "name": "Lisa Thompson",
-                    "role": "Communications Manager",
-                    "contact": "lisa.thompson@email.com",
-                    "phone": "+1 (555) 567-8901",
-                    "tasksCompleted": 13,
-                    "tasksPending": 4,
-                    "totalTasks": 17,
-                    "efficiency": 79,
-                    "registrationsBrought": 10,
-                    "performanceHistory": [
-                        {"month": "Jan", "score": 76},
-                        {"month": "Feb", "score": 78},
-                        {"month": "Mar", "score": 79}
-                    ],
-                    "createdAt": "2024-01-01T00:00:00Z",
-                    "updatedAt": "2024-03-01T00:00:00Z"
-                }
-            ]
-            
-            await db.committee_members.insert_many(sample_members)
-            logger.info("Initialized database with sample committee members")
-        
+        await history.create_history_collection(db)
     except Exception as e:
-        logger.error(f"Error during startup: {str(e)}")
\ No newline at end of file
+        # Time-series collections need MongoDB 5.0+
+        logger.error(f"Error creating history collection: {str(e)}")
+
+    try:
+        await response_cache.start(db)
+    except Exception as e:
+        logger.error(f"Error starting response cache: {str(e)}")
+
+    app.state.ready = True
+
+def warn_without_invalidation_channel() -> None:
+    """Warn when several workers run with no way of telling each other about writes"""
+    # Read by uvicorn and gunicorn as the default worker count
+    workers = int(os.getenv('WEB_CONCURRENCY', '1'))
+    if workers <= 1 or response_cache.name != "memory":
+        return
+    if MAX_AGE_SECONDS > 0:
+        logger.warning(
+            f"{workers} workers without RESPONSE_CACHE_BACKEND=mongo: a write reaches the other workers' "
+            f"leaderboard, search and columnar indexes only after up to {MAX_AGE_SECONDS:g}s (MEMBER_INDEX_MAX_AGE_SECONDS)"
+        )
+    else:
+        logger.warning(
+            f"{workers} workers without RESPONSE_CACHE_BACKEND=mongo and with MEMBER_INDEX_MAX_AGE_SECONDS=0: "
+            "the other workers' leaderboard, search and columnar indexes never see a write"
+        )
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create the Mongo client and prepare the database in the background.
+
+    Nothing here waits on MongoDB, so the process is live as soon as it
+    starts; readiness follows once prepare_database has run. Sample data
+    is no longer inserted here; see ``python cli.py seed``.
+    """
+    database.connect()
+    warn_without_invalidation_channel()
+    app.state.ready = False
+    preparation = asyncio.create_task(prepare_database(app))
+    try:
+        yield
+    finally:
+        preparation.cancel()
+        await asyncio.gather(preparation, return_exceptions=True)
+        await response_cache.stop()
+        await watcher.stop()
+        await analytics_snapshots.stop()
+        database.close()
+
+# Health checks (outside /api prefix for platform monitoring)
+health_router = APIRouter(prefix="/health", tags=["health"])
+
+async def readiness(request: Request) -> Dict[str, Any]:
+    """Startup and database checks; ready when both pass"""
+    checks: Dict[str, Any] = {
+        "startup": "complete" if getattr(request.app.state, "ready", False) else "pending",
+    }
+    try:
+        await database.get_db().command('ping')
+        checks["database"] = "connected"
+    except Exception as e:
+        logger.error(f"Health check failed: {str(e)}")
+        checks["database"] = "disconnected"
+        checks["error"] = str(e)
+    checks["ready"] = checks["startup"] == "complete" and checks["database"] == "connected"
+    return checks
+
+@health_router.get("")
+async def health_check(request: Request):
+    """Health check endpoint for monitoring; always 200, see /health/ready for a gating check"""
+    checks = await readiness(request)
+    return {
+        "status": "healthy" if checks["database"] == "connected" else "unhealthy",
+        "service": SERVICE_NAME,
+        "version": request.app.version,
+        "live": True,
+        **checks,
+    }
+
+@health_router.get("/live")
+async def liveness_check(request: Request):
+    """The process is up and serving; does not touch MongoDB"""
+    return {"status": "alive", "service": SERVICE_NAME, "version": request.app.version}
+
+@health_router.get("/ready")
+async def readiness_check(request: Request):
+    """503 until startup work is done and MongoDB answers a ping"""
+    checks = await readiness(request)
+    return JSONResponse(
+        {"status": "ready" if checks["ready"] else "not ready", "service": SERVICE_NAME, "version": request.app.version, **checks},
+        status_code=status.HTTP_200_OK if checks["ready"] else status.HTTP_503_SERVICE_UNAVAILABLE,
+    )
+
+# Prometheus scrape endpoint (outside /api prefix, like /health)
+async def prometheus_metrics():
+    """Request, Mongo command and connection pool metrics in Prometheus text format"""
+    return Response(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+# API root endpoint
+async def root():
+    return {"message": "Committee Performance Dashboard API is running!"}
+
+def create_app() -> FastAPI:
+    """Build the app from the environment; MongoDB is connected by its lifespan"""
+    # Get CORS origins from environment variable
+    cors_origins_str = os.getenv('CORS_ORIGINS', 'http://localhost:3000')
+    cors_origins = [origin.strip() for origin in cors_origins_str.split(',')]
+
+    # Get environment configuration
+    environment = os.getenv('ENVIRONMENT', 'development')
+    api_title = os.getenv('API_TITLE', SERVICE_NAME)
+    api_version = os.getenv('API_VERSION', '1.0.0')
+
+    # Create the main app without a prefix
+    app = FastAPI(
+        title=api_title,
+        version=api_version,
+        docs_url="/docs" if environment == "development" else None,
+        redoc_url="/redoc" if environment == "development" else None,
+        lifespan=lifespan,
+    )
+    app.include_router(health_router)
+    app.add_api_route("/metrics", prometheus_metrics, methods=["GET"], include_in_schema=False)
+
+    # Create a router with the /api prefix
+    api_router = APIRouter(prefix="/api")
+    api_router.add_api_route("/", root, methods=["GET"])
+
+    # Include route modules
+    api_router.include_router(members.router)
+    api_router.include_router(analytics.router)
+    api_router.include_router(dashboard.router)
+    api_router.include_router(task_categories.router)
+    api_router.include_router(tasks.router)
+    api_router.include_router(leaderboard.router)
+    api_router.include_router(settings.router)
+    api_router.include_router(exports.router)
+    api_router.include_router(admin.router)
+    api_router.include_router(stream.router)
+
+    # Include the router in the main app
+    app.include_router(api_router)
+
+    read_prefixes = ["/api/members", "/api/analytics", "/api/dashboard", "/api/task-categories", "/api/tasks", "/api/leaderboard", "/api/settings"]
+
+    # Concurrent identical reads the cache cannot answer share one handler run; see SINGLE_FLIGHT_ENABLED
+    app.add_middleware(SingleFlightMiddleware, flights=request_flights, cache=response_cache, path_prefixes=read_prefixes)
+
+    # Cache GET responses of the dashboard read endpoints; member writes invalidate them
+    app.add_middleware(
+        ResponseCacheMiddleware,
+        cache=response_cache,
+        path_prefixes=read_prefixes,
+        enabled=os.getenv('RESPONSE_CACHE_ENABLED', 'true').lower() == 'true',
+    )
+
+    # CORS middleware with environment-based origins
+    app.add_middleware(
+        CORSMiddleware,
+        allow_credentials=True,
+        allow_origins=cors_origins,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=["X-Next-Cursor", "X-Profile-Id", "ETag"],
+    )
+
+    # Gzip everything but the event stream
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=int(os.getenv('GZIP_MINIMUM_SIZE', '1000')),
+        excluded_prefixes=["/api/stream"],
+    )
+
+    # Slow request log and sampled profiles; see PROFILING_* and SLOW_* variables
+    app.add_middleware(ProfilingMiddleware, profiler=request_profiler, router=app.router)
+
+    # Outermost, so cache hits and CORS preflights are timed too
+    if os.getenv('METRICS_ENABLED', 'true').lower() == 'true':
+        app.add_middleware(MetricsMiddleware, router=app.router)
+
+    return app
+
+# Served by `uvicorn server:app`
+app = create_app()
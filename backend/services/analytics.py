@@ -0,0 +1,315 @@
+from typing import Any, Dict, List, Optional
+from motor.motor_asyncio import AsyncIOMotorCollection
+import asyncio
+
+# Tier lists below are ordered highest threshold first and end with a 0 threshold
+# (see services.tiers). Every pipeline starts by matching one committee, which
+# the committeeId-leading indexes serve.
+
+# Field expressions shared by the pipelines below
+TOTAL_TASKS_EXPR = {
+    "$add": [
+        {"$ifNull": ["$tasksCompleted", 0]},
+        {"$ifNull": ["$tasksPending", 0]},
+    ]
+}
+
+# Members written before versioning count as version 0
+VERSION_EXPR = {"$ifNull": ["$version", 0]}
+
+def tier_for(registrations: int, tiers: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Return the tier definition a registration count falls into"""
+    for tier in tiers:
+        if registrations >= tier["min"]:
+            return tier
+    return tiers[-1]
+
+def tier_switch(field: str, tiers: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Build a $switch expression mapping a registration count to a tier"""
+    return {
+        "$switch": {
+            "branches": [
+                {
+                    "case": {"$gte": [{"$ifNull": [field, 0]}, tier["min"]]},
+                    "then": {"tier": tier["tier"], "tierColor": tier["tierColor"]},
+                }
+                for tier in tiers[:-1]
+            ],
+            "default": {
+                "tier": tiers[-1]["tier"],
+                "tierColor": tiers[-1]["tierColor"],
+            },
+        }
+    }
+
+def percentage(part: int, total: int) -> float:
+    """Share of ``total`` as a percentage rounded to one decimal"""
+    return round(part / total * 100, 1) if total > 0 else 0
+
+def percentage_expr(field: str, total: int) -> Any:
+    """Unrounded share of ``total`` as a percentage.
+
+    Rows are rounded by round_percentage after the aggregation, as $round
+    needs MongoDB 4.2 and is missing from mongomock; dividing and
+    multiplying in the same order keeps the result equal to percentage().
+    """
+    if total <= 0:
+        return {"$literal": 0}
+    return {"$multiply": [{"$divide": [{"$ifNull": [field, 0]}, total]}, 100]}
+
+def round_percentage(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Round the percentage_expr share of a pipeline row to one decimal"""
+    row["percentage"] = round(row["percentage"], 1)
+    return row
+
+def committee_match(committee_id: str) -> Dict[str, Any]:
+    """$match stage restricting a pipeline to one committee"""
+    return {"$match": {"committeeId": committee_id}}
+
+def totals_pipeline(committee_id: str) -> List[Dict[str, Any]]:
+    """Committee-wide sums used by every analytics endpoint"""
+    return [
+        committee_match(committee_id),
+        {
+            "$group": {
+                "_id": None,
+                "totalMembers": {"$sum": 1},
+                "tasksCompleted": {"$sum": "$tasksCompleted"},
+                "tasksPending": {"$sum": "$tasksPending"},
+                "totalTasks": {"$sum": TOTAL_TASKS_EXPR},
+                "efficiencySum": {"$sum": "$efficiency"},
+                "registrations": {"$sum": "$registrationsBrought"},
+            }
+        }
+    ]
+
+def ranked_members_pipeline(committee_id: str) -> List[Dict[str, Any]]:
+    """Members ordered by efficiency, projected to the ranking row shape"""
+    return [
+        committee_match(committee_id),
+        {"$sort": {"efficiency": -1, "_id": 1}},
+        {
+            "$project": {
+                "name": 1,
+                "role": 1,
+                "efficiency": {"$ifNull": ["$efficiency", 0]},
+                "tasksCompleted": {"$ifNull": ["$tasksCompleted", 0]},
+                "totalTasks": TOTAL_TASKS_EXPR,
+                "registrationsBrought": {"$ifNull": ["$registrationsBrought", 0]},
+            }
+        },
+    ]
+
+def registration_tiers_pipeline(committee_id: str, tiers: List[Dict[str, Any]], total_registrations: int) -> List[Dict[str, Any]]:
+    """Members ordered by registrations as registrationTiers rows.
+
+    Tier and share of ``total_registrations`` are resolved server-side, so
+    the rows only need their share rounded with round_percentage.
+    """
+    return [
+        committee_match(committee_id),
+        {"$sort": {"registrationsBrought": -1, "_id": 1}},
+        {
+            "$project": {
+                "name": 1,
+                "role": 1,
+                "registrationsBrought": {"$ifNull": ["$registrationsBrought", 0]},
+                "tierInfo": tier_switch("$registrationsBrought", tiers),
+                "percentage": percentage_expr("$registrationsBrought", total_registrations),
+            }
+        },
+        {
+            "$project": {
+                "_id": 0,
+                "id": "$_id",
+                "name": 1,
+                "role": 1,
+                "registrationsBrought": 1,
+                "tier": "$tierInfo.tier",
+                "tierColor": "$tierInfo.tierColor",
+                "percentage": 1,
+            }
+        },
+    ]
+
+def tier_counts_pipeline(committee_id: str, tiers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Member count per registration tier"""
+    boundaries = sorted(tier["min"] for tier in tiers)
+    return [
+        committee_match(committee_id),
+        {
+            "$bucket": {
+                "groupBy": {"$ifNull": ["$registrationsBrought", 0]},
+                "boundaries": boundaries,
+                # Everything at or above the highest threshold lands in the default bucket
+                "default": "top",
+                "output": {"count": {"$sum": 1}},
+            }
+        }
+    ]
+
+async def fetch_tier_counts(collection: AsyncIOMotorCollection, committee_id: str, tiers: List[Dict[str, Any]]) -> Dict[str, int]:
+    """Run the tier bucket pipeline, keyed by tier name"""
+    tier_by_min = {tier["min"]: tier["tier"] for tier in tiers}
+    top_tier = tiers[0]["tier"]
+    counts = {tier["tier"]: 0 for tier in tiers}
+    async for bucket in collection.aggregate(tier_counts_pipeline(committee_id, tiers)):
+        counts[tier_by_min.get(bucket["_id"], top_tier)] += bucket["count"]
+    return counts
+
+async def fetch_totals(collection: AsyncIOMotorCollection, committee_id: str) -> Dict[str, Any]:
+    """Run the totals pipeline, returning zeroed totals for an empty committee"""
+    results = await collection.aggregate(totals_pipeline(committee_id)).to_list(1)
+    if not results:
+        return {
+            "totalMembers": 0,
+            "tasksCompleted": 0,
+            "tasksPending": 0,
+            "totalTasks": 0,
+            "efficiencySum": 0,
+            "registrations": 0,
+        }
+    return results[0]
+
+def ranked_row(doc: Dict[str, Any], rank: int) -> Dict[str, Any]:
+    """Shape a ranked_members_pipeline document into a rankedMembers row"""
+    return {
+        "id": str(doc["_id"]),
+        "name": doc.get("name"),
+        "role": doc.get("role"),
+        "efficiency": doc["efficiency"],
+        "tasksCompleted": doc["tasksCompleted"],
+        "totalTasks": doc["totalTasks"],
+        "registrationsBrought": doc["registrationsBrought"],
+        "rank": rank,
+    }
+
+def scanned_row(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Python equivalent of the ranked_members_pipeline projection"""
+    tasks_completed = doc.get("tasksCompleted") or 0
+    return {
+        "_id": doc["_id"],
+        "name": doc.get("name"),
+        "role": doc.get("role"),
+        "efficiency": doc.get("efficiency") or 0,
+        "tasksCompleted": tasks_completed,
+        "totalTasks": tasks_completed + (doc.get("tasksPending") or 0),
+        "registrationsBrought": doc.get("registrationsBrought") or 0,
+    }
+
+def registration_tier_row(doc: Dict[str, Any], tiers: List[Dict[str, Any]], total_registrations: int) -> Dict[str, Any]:
+    """Python equivalent of registration_tiers_pipeline for one scanned_row"""
+    registrations = doc["registrationsBrought"]
+    tier = tier_for(registrations, tiers)
+    return {
+        "id": doc["_id"],
+        "name": doc["name"],
+        "role": doc["role"],
+        "registrationsBrought": registrations,
+        "tier": tier["tier"],
+        "tierColor": tier["tierColor"],
+        "percentage": percentage(registrations, total_registrations),
+    }
+
+def tier_count_rows(tiers: List[Dict[str, Any]], tier_counts: Dict[str, int]) -> List[Dict[str, Any]]:
+    """Tier definitions with their member counts, highest tier first"""
+    return [{**tier, "count": tier_counts.get(tier["tier"], 0)} for tier in tiers]
+
+def overview_from_totals(totals: Dict[str, Any], top_performer) -> Dict[str, Any]:
+    """Shape collection totals into the overview payload"""
+    total_members = totals["totalMembers"]
+    return {
+        "totalMembers": total_members,
+        "totalTasksCompleted": totals["tasksCompleted"],
+        "totalTasksPending": totals["tasksPending"],
+        "totalRegistrations": totals["registrations"],
+        "avgEfficiency": round(totals["efficiencySum"] / total_members) if total_members > 0 else 0,
+        "topPerformer": top_performer,
+    }
+
+async def compute_task_analytics(collection: AsyncIOMotorCollection, committee_id: str) -> Dict[str, Any]:
+    """Task totals plus members ranked by efficiency"""
+    totals, ranked_docs = await asyncio.gather(
+        fetch_totals(collection, committee_id),
+        collection.aggregate(ranked_members_pipeline(committee_id), allowDiskUse=True).to_list(None),
+    )
+    return task_analytics_from(totals, ranked_docs)
+
+def task_analytics_from(totals: Dict[str, Any], ranked_docs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Shape totals and efficiency-ordered ranked_members_pipeline documents"""
+    total_tasks = totals["totalTasks"]
+    total_members = totals["totalMembers"]
+    return {
+        "totalTasks": total_tasks,
+        "completedTasks": totals["tasksCompleted"],
+        "pendingTasks": totals["tasksPending"],
+        "completionRate": round((totals["tasksCompleted"] / total_tasks) * 100) if total_tasks > 0 else 0,
+        "avgEfficiency": round(totals["efficiencySum"] / total_members) if total_members > 0 else 0,
+        "rankedMembers": [ranked_row(doc, idx + 1) for idx, doc in enumerate(ranked_docs)],
+    }
+
+async def compute_registration_metrics(
+    collection: AsyncIOMotorCollection,
+    committee_id: str,
+    monthly_data: List[Dict[str, Any]],
+    tiers: List[Dict[str, Any]],
+    totals: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Registration totals plus members bucketed into tiers.
+
+    ``monthlyData`` comes from the registration history rollup. ``totals``
+    may be the analytics summary, whose ``tierCounts`` are then reused
+    instead of bucketing the collection again.
+    """
+    if totals is None:
+        totals = await fetch_totals(collection, committee_id)
+    tier_counts = totals.get("tierCounts")
+    if tier_counts is None:
+        tier_counts = await fetch_tier_counts(collection, committee_id, tiers)
+    tier_docs = []
+    if totals["totalMembers"] > 0:
+        tier_docs = await collection.aggregate(
+            registration_tiers_pipeline(committee_id, tiers, totals["registrations"]),
+            allowDiskUse=True
+        ).to_list(None)
+        tier_docs = [round_percentage(document) for document in tier_docs]
+    return registration_metrics_from(totals, tiers, tier_counts, tier_docs, monthly_data)
+
+def registration_metrics_from(
+    totals: Dict[str, Any],
+    tiers: List[Dict[str, Any]],
+    tier_counts: Dict[str, int],
+    tier_docs: List[Dict[str, Any]],
+    monthly_data: List[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Shape totals and registration-ordered registrationTiers rows"""
+    total_members = totals["totalMembers"]
+    total_registrations = totals["registrations"]
+
+    if total_members == 0:
+        return {
+            "totalRegistrations": 0,
+            "avgRegistrationsPerMember": 0,
+            "topPerformer": None,
+            "registrationTiers": [],
+            "tierCounts": tier_count_rows(tiers, {}),
+            "monthlyData": monthly_data
+        }
+
+    # Tier rows are sorted by registrations, so the first one is the top performer.
+    # totals may be a summary counting members a lagging read does not return yet
+    top_performer = None
+    if tier_docs:
+        top_performer = {
+            "name": tier_docs[0].get("name"),
+            "registrationsBrought": tier_docs[0]["registrationsBrought"]
+        }
+
+    return {
+        "totalRegistrations": total_registrations,
+        "avgRegistrationsPerMember": round(total_registrations / total_members),
+        "topPerformer": top_performer,
+        "registrationTiers": tier_docs,
+        "tierCounts": tier_count_rows(tiers, tier_counts),
+        "monthlyData": monthly_data,
+    }
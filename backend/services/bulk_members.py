@@ -0,0 +1,192 @@
+from typing import Any, Dict, List, Optional, Tuple
+from fastapi import status
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pydantic import ValidationError
+from pymongo import DeleteOne, InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError
+from models.committee_member import (
+    BulkMemberOperation,
+    BulkMemberResponse,
+    BulkMemberResult,
+    CommitteeMember,
+    CommitteeMemberCreate,
+    CommitteeMemberUpdate,
+)
+from services.member_writes import MemberChange, apply_member_writes, build_member_update, member_update_pipeline, split_performance_history, store_scores, updated_document, version_filter
+from services import summary
+from services.response_cache import response_cache
+import logging
+
+logger = logging.getLogger(__name__)
+
+def validation_message(error: ValidationError) -> str:
+    """Flatten a pydantic error into a single line"""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}" for item in error.errors()
+    )
+
+# Updates and deletes whose member changed between reading its pre-image and
+# the bulk_write are read and sent again, at most this many times in total
+BULK_WRITE_ATTEMPTS = 3
+
+async def run_bulk(database: AsyncIOMotorDatabase, committee_id: str, operations: List[BulkMemberOperation]) -> BulkMemberResponse:
+    """Apply a batch of one committee's member operations.
+
+    The pre-images of the updated and deleted members are read with one
+    find, then every create, update and delete is sent in one unordered
+    bulk_write. Updates and deletes are guarded by the pre-image's version,
+    so the summary and history deltas describe exactly what each write
+    changed; members a single-member write changed in between no longer
+    match and are retried from a fresh pre-image. Updates use the same
+    pipeline as update_member.
+    """
+    collection = database.committee_members
+    results: List[BulkMemberResult] = [
+        BulkMemberResult(index=index, op=operation.op, id=operation.id, status=status.HTTP_200_OK)
+        for index, operation in enumerate(operations)
+    ]
+
+    def fail(index: int, code: int, message: str) -> None:
+        results[index].status = code
+        results[index].error = message
+
+    seen_ids = set()
+    inserts: List[Tuple[int, Dict[str, Any]]] = []
+    # Operation index -> fields to set for updates, None for deletes
+    targeted: Dict[int, Optional[Dict[str, Any]]] = {}
+    # Operation index -> performanceHistory to store in the time-series collection
+    histories: Dict[int, List[Dict[str, Any]]] = {}
+    for index, operation in enumerate(operations):
+        try:
+            if operation.op == "create":
+                member = CommitteeMember(**CommitteeMemberCreate(**(operation.data or {})).dict(), committeeId=committee_id)
+                member.calculate_total_tasks()
+                member_dict = member.dict()
+                member_dict["_id"] = member_dict.pop("id")
+                performance_history = split_performance_history(member_dict)
+                if performance_history:
+                    histories[index] = performance_history
+                results[index].id = member_dict["_id"]
+                results[index].status = status.HTTP_201_CREATED
+                inserts.append((index, member_dict))
+                continue
+
+            if not operation.id:
+                fail(index, status.HTTP_400_BAD_REQUEST, "id is required")
+                continue
+            if operation.id in seen_ids:
+                fail(index, status.HTTP_400_BAD_REQUEST, "Member already targeted earlier in this batch")
+                continue
+            seen_ids.add(operation.id)
+
+            if operation.op == "update":
+                update_data = build_member_update(CommitteeMemberUpdate(**(operation.data or {})))
+                performance_history = split_performance_history(update_data)
+                if performance_history is not None:
+                    histories[index] = performance_history
+                targeted[index] = update_data
+            else:
+                targeted[index] = None
+        except ValidationError as e:
+            fail(index, status.HTTP_422_UNPROCESSABLE_ENTITY, validation_message(e))
+
+    # (operation index, (old, new)) for the writes that went through
+    applied: List[Tuple[int, MemberChange]] = []
+    # Set when a write landing right after the bulk_write hid which guards matched
+    uncertain = False
+
+    async def guarded_writes(pending: List[int]) -> List[Tuple[int, Any, MemberChange]]:
+        """(operation index, write, (old, new)) for each pending update or delete whose member exists"""
+        ids = [operations[index].id for index in pending]
+        members = await collection.find({"_id": {"$in": ids}, "committeeId": committee_id}).to_list(None)
+        before_of = {member["_id"]: member for member in members}
+        writes = []
+        for index in pending:
+            before = before_of.get(operations[index].id)
+            if before is None:
+                fail(index, status.HTTP_404_NOT_FOUND, "Committee member not found")
+                continue
+            guard = {"$and": [{"_id": before["_id"], "committeeId": committee_id}, version_filter([before.get("version") or 0])]}
+            update_data = targeted[index]
+            if update_data is None:
+                writes.append((index, DeleteOne(guard), (before, None)))
+            else:
+                writes.append((index, UpdateOne(guard, member_update_pipeline(update_data)), (before, updated_document(before, update_data))))
+        return writes
+
+    async def missed_guards(written: List[Tuple[int, MemberChange]], matched: int, removed: int) -> List[int]:
+        """Indexes of the updates and deletes whose member changed before the bulk_write reached it"""
+        guarded = [(index, change) for index, change in written if change[0] is not None]
+        updates = sum(1 for _, (_, new) in guarded if new is not None)
+        if matched == updates and removed == len(guarded) - updates:
+            return []
+        nonlocal uncertain
+        current = await collection.find({"_id": {"$in": [old["_id"] for _, (old, _) in guarded]}}).to_list(None)
+        current_of = {member["_id"]: member for member in current}
+        missed = []
+        for index, (old, new) in guarded:
+            member = current_of.get(old["_id"])
+            if new is None:
+                went_through = member is None
+            else:
+                went_through = member is not None and member.get("version") == new["version"] and all(
+                    member.get(field) == value for field, value in targeted[index].items() if field != "updatedAt"
+                )
+            if not went_through:
+                missed.append(index)
+        if len(guarded) - len(missed) != matched + removed:
+            uncertain = True
+            logger.warning(f"Members of committee {committee_id} changed while their bulk writes were confirmed; rebuilding its summary")
+        return missed
+
+    creates = inserts
+    pending = list(targeted)
+    for _ in range(BULK_WRITE_ATTEMPTS):
+        writes: List[Tuple[int, Any, MemberChange]] = [(index, InsertOne(document), (None, document)) for index, document in creates]
+        creates = []
+        if pending:
+            writes.extend(await guarded_writes(pending))
+        if not writes:
+            break
+        try:
+            outcome = await collection.bulk_write([write for _, write, _ in writes], ordered=False)
+            matched, removed, write_errors = outcome.matched_count, outcome.deleted_count, []
+        except BulkWriteError as e:
+            matched, removed = e.details.get("nMatched", 0), e.details.get("nRemoved", 0)
+            write_errors = e.details.get("writeErrors", [])
+        failed = set()
+        for write_error in write_errors:
+            failed.add(write_error["index"])
+            index = writes[write_error["index"]][0]
+            code = status.HTTP_409_CONFLICT if write_error.get("code") == 11000 else status.HTTP_500_INTERNAL_SERVER_ERROR
+            fail(index, code, write_error.get("errmsg", "Write failed"))
+        written = [(index, change) for position, (index, _, change) in enumerate(writes) if position not in failed]
+        pending = await missed_guards(written, matched, removed)
+        applied.extend((index, change) for index, change in written if index not in pending)
+        if not pending:
+            break
+    for index in pending:
+        fail(index, status.HTTP_409_CONFLICT, "Committee member kept changing during the batch")
+
+    for index, _ in applied:
+        if index in histories:
+            await store_scores(database, committee_id, results[index].id, histories[index])
+    await apply_member_writes([change for _, change in applied])
+    if uncertain:
+        try:
+            await summary.rebuild_summary(database, committee_id)
+            await response_cache.invalidate(committee_id)
+        except Exception as e:
+            logger.error(f"Error rebuilding analytics summary: {str(e)}")
+
+    response = BulkMemberResponse(results=results)
+    for result in results:
+        if result.error:
+            response.failed += 1
+        elif result.op == "create":
+            response.created += 1
+        elif result.op == "update":
+            response.updated += 1
+        else:
+            response.deleted += 1
+    return response
@@ -0,0 +1,245 @@
+from typing import Any, Dict, List, Optional
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from services import analytics, member_queries
+from services.member_index import CommitteeIndexes, MemberIndex
+from services.response_cache import response_cache
+import numpy as np
+import os
+
+# Member fields kept as int64 columns; missing values count as 0, as in the pipelines
+NUMERIC_FIELDS = ("tasksCompleted", "tasksPending", "efficiency", "registrationsBrought")
+
+class MemberColumns(MemberIndex):
+    """One committee's members as NumPy columns, for vectorized analytics.
+
+    Numeric fields are int64 arrays; ids, names and roles are lists in the
+    same row order. An insert appends a row and a delete moves the last row
+    into the freed one, so every write is O(1); arrays grow by doubling.
+    Rankings order rows by value descending, then ``_id`` ascending, like
+    the ``(committeeId, metric desc, _id asc)`` indexes.
+    """
+
+    fields = ("name", "role") + NUMERIC_FIELDS
+
+    def __init__(self, committee_id: str):
+        super().__init__(committee_id)
+        self.size = 0
+        self.ids: List[str] = []
+        self.names: List[Optional[str]] = []
+        self.roles: List[Optional[str]] = []
+        self.columns = {field: np.zeros(0, dtype=np.int64) for field in NUMERIC_FIELDS}
+        self.row_of: Dict[str, int] = {}
+        # Position of each row in _id order, rebuilt after inserts and deletes
+        self._id_ranks: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return self.size
+
+    def load(self, members: List[Dict[str, Any]]) -> None:
+        self.size = len(members)
+        self.ids = [member["_id"] for member in members]
+        self.names = [member.get("name") for member in members]
+        self.roles = [member.get("role") for member in members]
+        self.columns = {
+            field: np.fromiter((member.get(field) or 0 for member in members), dtype=np.int64, count=self.size)
+            for field in NUMERIC_FIELDS
+        }
+        self.row_of = {member_id: row for row, member_id in enumerate(self.ids)}
+        self._id_ranks = None
+
+    def apply_one(self, member_id: str, member: Optional[Dict[str, Any]]) -> None:
+        row = self.row_of.get(member_id)
+        if member is None:
+            if row is not None:
+                self._remove(row)
+            return
+        if row is None:
+            row = self._append(member_id)
+        self.names[row] = member.get("name")
+        self.roles[row] = member.get("role")
+        for field, column in self.columns.items():
+            column[row] = member.get(field) or 0
+
+    def _append(self, member_id: str) -> int:
+        row = self.size
+        capacity = len(self.columns["efficiency"])
+        if row == capacity:
+            for field, column in self.columns.items():
+                grown = np.zeros(max(16, capacity * 2), dtype=np.int64)
+                grown[:row] = column[:row]
+                self.columns[field] = grown
+        self.ids.append(member_id)
+        self.names.append(None)
+        self.roles.append(None)
+        self.row_of[member_id] = row
+        self.size += 1
+        self._id_ranks = None
+        return row
+
+    def _remove(self, row: int) -> None:
+        last = self.size - 1
+        del self.row_of[self.ids[row]]
+        if row != last:
+            self.ids[row], self.names[row], self.roles[row] = self.ids[last], self.names[last], self.roles[last]
+            self.row_of[self.ids[row]] = row
+            for column in self.columns.values():
+                column[row] = column[last]
+        self.ids.pop()
+        self.names.pop()
+        self.roles.pop()
+        self.size = last
+        self._id_ranks = None
+
+    def column(self, field: str) -> np.ndarray:
+        """The live rows of a numeric column"""
+        return self.columns[field][:self.size]
+
+    def id_ranks(self) -> np.ndarray:
+        """Tie-breaker for rankings; sorted once per insert or delete, not per update"""
+        if self._id_ranks is None:
+            ranks = np.empty(self.size, dtype=np.int64)
+            ranks[np.argsort(np.array(self.ids, dtype=str), kind="stable")] = np.arange(self.size)
+            self._id_ranks = ranks
+        return self._id_ranks
+
+    def order(self, field: str) -> np.ndarray:
+        """Rows by ``field`` descending, ties by ascending _id"""
+        return np.lexsort((self.id_ranks(), -self.column(field)))
+
+    def top_id(self, field: str) -> Optional[str]:
+        """_id of the first member ranked by ``field``, None for an empty committee"""
+        if self.size == 0:
+            return None
+        values = self.column(field)
+        candidates = np.flatnonzero(values == values.max())
+        return self.ids[candidates[np.argmin(self.id_ranks()[candidates])]]
+
+    def tier_indexes(self, tiers: List[Dict[str, Any]], registrations: Optional[np.ndarray] = None) -> np.ndarray:
+        """Position in ``tiers`` (highest threshold first) of registration counts, every row's by default"""
+        if registrations is None:
+            registrations = self.column("registrationsBrought")
+        ascending = np.array([tier["min"] for tier in reversed(tiers)], dtype=np.int64)
+        at_or_below = np.searchsorted(ascending, registrations, side="right")
+        return np.minimum(len(tiers) - at_or_below, len(tiers) - 1)
+
+    def totals(self, tiers: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """The analytics summary fields, computed from the columns"""
+        completed, pending = self.column("tasksCompleted"), self.column("tasksPending")
+        tier_counts = np.bincount(self.tier_indexes(tiers), minlength=len(tiers))
+        return {
+            "totalMembers": self.size,
+            "tasksCompleted": int(completed.sum()),
+            "tasksPending": int(pending.sum()),
+            "totalTasks": int(completed.sum() + pending.sum()),
+            "efficiencySum": int(self.column("efficiency").sum()),
+            "registrations": int(self.column("registrationsBrought").sum()),
+            "tierCounts": {tier["tier"]: int(count) for tier, count in zip(tiers, tier_counts)},
+        }
+
+    def ordered(self, values: List[Any], order: List[int]) -> List[Any]:
+        """A per-row list (ids, names, roles) in ``order``"""
+        return list(map(values.__getitem__, order))
+
+    def ranked_rows(self) -> List[Dict[str, Any]]:
+        """rankedMembers of /analytics/tasks"""
+        order = self.order("efficiency")
+        rows = order.tolist()
+        completed = self.column("tasksCompleted")
+        columns = zip(
+            self.ordered(self.ids, rows),
+            self.ordered(self.names, rows),
+            self.ordered(self.roles, rows),
+            self.column("efficiency")[order].tolist(),
+            completed[order].tolist(),
+            (completed + self.column("tasksPending"))[order].tolist(),
+            self.column("registrationsBrought")[order].tolist(),
+        )
+        return [
+            {
+                "id": member_id,
+                "name": name,
+                "role": role,
+                "efficiency": efficiency,
+                "tasksCompleted": tasks_completed,
+                "totalTasks": total_tasks,
+                "registrationsBrought": registrations,
+                "rank": rank,
+            }
+            for rank, (member_id, name, role, efficiency, tasks_completed, total_tasks, registrations) in enumerate(columns, 1)
+        ]
+
+    def registration_tier_rows(self, tiers: List[Dict[str, Any]], total_registrations: int) -> List[Dict[str, Any]]:
+        """registrationTiers of /analytics/registrations"""
+        order = self.order("registrationsBrought")
+        rows = order.tolist()
+        counts = self.column("registrationsBrought")[order]
+        # Tier and percentage depend on the count alone, so they are worked out once per distinct count
+        distinct = np.unique(counts)
+        tier_of = {count: tiers[index] for count, index in zip(distinct.tolist(), self.tier_indexes(tiers, distinct).tolist())}
+        percentage_of = {count: analytics.percentage(count, total_registrations) for count in distinct.tolist()}
+        return [
+            {
+                "id": member_id,
+                "name": name,
+                "role": role,
+                "registrationsBrought": count,
+                "tier": tier_of[count]["tier"],
+                "tierColor": tier_of[count]["tierColor"],
+                "percentage": percentage_of[count],
+            }
+            for member_id, name, role, count in zip(
+                self.ordered(self.ids, rows), self.ordered(self.names, rows), self.ordered(self.roles, rows), counts.tolist()
+            )
+        ]
+
+    def nbytes(self) -> int:
+        """Bytes held by the numeric columns, capacity included"""
+        return sum(column.nbytes for column in self.columns.values())
+
+class CommitteeColumns(CommitteeIndexes[MemberColumns]):
+    """MemberColumns per committee, used when ``enabled``"""
+
+    def __init__(self, enabled: bool = False):
+        super().__init__(MemberColumns)
+        self.enabled = enabled
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters exposed on /api/admin/columns"""
+        return {
+            "enabled": self.enabled,
+            **self.load_stats(),
+            "members": sum(len(columns) for columns in self.committees.values()),
+            "columnBytes": sum(columns.nbytes() for columns in self.committees.values()),
+        }
+
+async def overview(database: AsyncIOMotorDatabase, committee_id: str, tiers: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """The /analytics/overview payload, with the top performer found by argmax"""
+    columns = await member_columns.loaded(database, committee_id)
+    top_id = columns.top_id("efficiency")
+    top_performer = None
+    if top_id is not None:
+        top_performer = await member_queries.fetch_top_performer(database, committee_id, top_id)
+    return analytics.overview_from_totals(columns.totals(tiers), top_performer)
+
+async def task_analytics(database: AsyncIOMotorDatabase, committee_id: str, tiers: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """The /analytics/tasks payload"""
+    columns = await member_columns.loaded(database, committee_id)
+    payload = analytics.task_analytics_from(columns.totals(tiers), [])
+    payload["rankedMembers"] = columns.ranked_rows()
+    return payload
+
+async def registration_metrics(
+    database: AsyncIOMotorDatabase,
+    committee_id: str,
+    tiers: List[Dict[str, Any]],
+    monthly_data: List[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """The /analytics/registrations payload; ``monthlyData`` still comes from the history rollup"""
+    columns = await member_columns.loaded(database, committee_id)
+    totals = columns.totals(tiers)
+    tier_rows = columns.registration_tier_rows(tiers, totals["registrations"])
+    return analytics.registration_metrics_from(totals, tiers, totals["tierCounts"], tier_rows, monthly_data)
+
+# Process-wide columns kept in sync by the member write path; see ANALYTICS_ENGINE
+member_columns = CommitteeColumns(enabled=os.getenv('ANALYTICS_ENGINE', 'mongo').lower() == 'columnar')
+response_cache.on_remote_invalidation(member_columns.invalidate)
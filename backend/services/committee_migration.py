@@ -0,0 +1,55 @@
+from typing import Dict
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from services import tasks
+from services.committees import COMMITTEE_COLLECTIONS, scoped_id
+from services.history import HISTORY_COLLECTION
+from services.summary import SUMMARY_ID
+from services.tiers import SETTINGS_ID, tier_config
+
+# Filter for documents written before committees existed
+UNASSIGNED = {"committeeId": {"$exists": False}}
+
+async def remove_legacy_counters(database: AsyncIOMotorDatabase) -> None:
+    """Delete installation-wide category counters and summary.
+
+    Runs before create_indexes: legacy counters would collide on the unique
+    (committeeId, category) index. Both are rebuilt per committee.
+    """
+    await database[tasks.CATEGORY_STATS].delete_many(UNASSIGNED)
+    await database.analytics_summary.delete_one({"_id": SUMMARY_ID})
+
+async def has_unassigned_documents(database: AsyncIOMotorDatabase) -> bool:
+    """Whether any member or task lacks a committeeId (served by the committeeId indexes)"""
+    for collection in COMMITTEE_COLLECTIONS:
+        if await database[collection].find_one(UNASSIGNED, {"_id": 1}):
+            return True
+    return False
+
+async def assign_committee(database: AsyncIOMotorDatabase, committee_id: str) -> Dict[str, int]:
+    """Move documents written before committees existed into ``committee_id``.
+
+    Members, tasks and history points without a committee are stamped with
+    it, the installation-wide tier settings become the committee's own, and
+    the committee's counters and summary are rebuilt.
+    """
+    counts = {}
+    for collection in COMMITTEE_COLLECTIONS:
+        result = await database[collection].update_many(UNASSIGNED, {"$set": {"committeeId": committee_id}})
+        counts[collection] = result.modified_count
+    # Time-series collections accept updates that only touch the metaField
+    result = await database[HISTORY_COLLECTION].update_many(
+        {"meta.committeeId": {"$exists": False}},
+        {"$set": {"meta.committeeId": committee_id}}
+    )
+    counts[HISTORY_COLLECTION] = result.modified_count
+
+    legacy_settings = await database.settings.find_one({"_id": SETTINGS_ID})
+    if legacy_settings is not None:
+        legacy_settings["_id"] = scoped_id(SETTINGS_ID, committee_id)
+        await database.settings.replace_one({"_id": legacy_settings["_id"]}, legacy_settings, upsert=True)
+        await database.settings.delete_one({"_id": SETTINGS_ID})
+        tier_config.invalidate(committee_id)
+
+    await remove_legacy_counters(database)
+    await tasks.rebuild_task_counters(database, committee_id)
+    return counts
@@ -0,0 +1,47 @@
+from typing import Any, Dict, Iterable, List, Optional, Set
+from motor.motor_asyncio import AsyncIOMotorDatabase
+import os
+import re
+
+# Committee used by requests without an X-Committee-Id header and by data written before committees existed
+DEFAULT_COMMITTEE_ID = os.getenv('DEFAULT_COMMITTEE_ID', 'default')
+
+# Committee ids become part of summary and settings _ids, so ":" is excluded
+COMMITTEE_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+# Collections holding one document per member or task, stamped with committeeId
+COMMITTEE_COLLECTIONS = ("committee_members", "tasks")
+
+class InvalidCommittee(ValueError):
+    """Raised for an X-Committee-Id that is not a valid committee id"""
+
+def resolve_committee_id(value: Optional[str]) -> str:
+    """Committee named by an X-Committee-Id header, the default one when absent"""
+    if value is None or not value.strip():
+        return DEFAULT_COMMITTEE_ID
+    value = value.strip()
+    if not COMMITTEE_ID_PATTERN.match(value):
+        raise InvalidCommittee("X-Committee-Id must be 1-64 letters, digits, '_' or '-'")
+    return value
+
+def scoped_id(name: str, committee_id: str) -> str:
+    """_id of a per-committee singleton document such as the analytics summary"""
+    return f"{name}:{committee_id}"
+
+def committee_of(change: Iterable[Optional[Dict[str, Any]]]) -> str:
+    """Committee of an (old, new) document pair"""
+    for document in change:
+        if document is not None:
+            return document.get("committeeId") or DEFAULT_COMMITTEE_ID
+    return DEFAULT_COMMITTEE_ID
+
+def committees_of(changes: Iterable[Iterable[Optional[Dict[str, Any]]]]) -> Set[str]:
+    """Committees touched by a batch of (old, new) pairs"""
+    return {committee_of(change) for change in changes}
+
+async def list_committees(database: AsyncIOMotorDatabase) -> List[str]:
+    """Every committee with members or tasks, served by the committeeId-leading indexes"""
+    committees: Set[str] = set()
+    for collection in COMMITTEE_COLLECTIONS:
+        committees.update(value for value in await database[collection].distinct("committeeId") if value)
+    return sorted(committees)
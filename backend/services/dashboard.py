@@ -0,0 +1,140 @@
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from services import analytics, columnar, history, member_queries, summary, tasks
+from services.tiers import tier_config
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Sections in response order
+SECTIONS = ("overview", "members", "tasks", "registrations", "categories")
+
+# Member fields read by the shared ranking scan
+SCAN_FIELDS = {"name": 1, "role": 1, "efficiency": 1, "tasksCompleted": 1, "tasksPending": 1, "registrationsBrought": 1}
+
+class InvalidSections(ValueError):
+    """Raised for an unknown section name"""
+
+def parse_sections(value: Optional[str]) -> List[str]:
+    """Validate a comma separated ``sections=`` value; empty means every section"""
+    if not value:
+        return list(SECTIONS)
+    requested = {section.strip() for section in value.split(",") if section.strip()}
+    unknown = requested - set(SECTIONS)
+    if unknown:
+        raise InvalidSections(f"Unknown sections: {', '.join(sorted(unknown))}")
+    return [section for section in SECTIONS if section in requested]
+
+async def scan_members(database: AsyncIOMotorDatabase, committee_id: str) -> List[Dict[str, Any]]:
+    """Every member's ranking fields in one pass, in efficiency order.
+
+    The sort is served by the (committeeId, efficiency desc, _id asc) index.
+    This one scan replaces the two ranking aggregations of /analytics/tasks
+    and /analytics/registrations.
+    """
+    cursor = database.committee_members.find({"committeeId": committee_id}, SCAN_FIELDS).sort([("efficiency", -1), ("_id", 1)])
+    return [analytics.scanned_row(doc) async for doc in cursor]
+
+class SharedReads:
+    """Reads needed by several sections, each started once and awaited by all of them"""
+
+    def __init__(self, database: AsyncIOMotorDatabase, analytics_database: AsyncIOMotorDatabase, committee_id: str, members_limit: int):
+        self.database = database
+        self.analytics_database = analytics_database
+        self.committee_id = committee_id
+        self.members_limit = members_limit
+        self._tasks: Dict[str, asyncio.Future] = {}
+
+    def _once(self, name: str, factory: Callable[[], Awaitable[Any]]) -> asyncio.Future:
+        if name not in self._tasks:
+            self._tasks[name] = asyncio.ensure_future(factory())
+        return self._tasks[name]
+
+    def summary(self) -> asyncio.Future:
+        return self._once("summary", lambda: summary.get_summary(self.database, self.committee_id))
+
+    def scan(self) -> asyncio.Future:
+        return self._once("scan", lambda: scan_members(self.analytics_database, self.committee_id))
+
+    def tiers(self) -> asyncio.Future:
+        return self._once("tiers", lambda: tier_config.current(self.database, self.committee_id))
+
+async def overview_section(reads: SharedReads) -> Dict[str, Any]:
+    if columnar.member_columns.enabled:
+        return await columnar.overview(reads.database, reads.committee_id, (await reads.tiers())["tiers"])
+    top_performer = await member_queries.fetch_top_performer(reads.database, reads.committee_id)
+    return analytics.overview_from_totals(await reads.summary(), top_performer)
+
+async def members_section(reads: SharedReads) -> Dict[str, Any]:
+    """First page of GET /members, with the cursor in the body instead of a header"""
+    fields = sorted(member_queries.DEFAULT_FIELDS)
+    rows = await reads.database.committee_members.aggregate(
+        member_queries.list_pipeline({"committeeId": reads.committee_id}, fields, "id", "asc", reads.members_limit + 1)
+    ).to_list(reads.members_limit + 1)
+    next_cursor = None
+    if len(rows) > reads.members_limit:
+        rows = rows[:reads.members_limit]
+        next_cursor = member_queries.encode_cursor("id", "asc", rows[-1])
+    return {"items": rows, "nextCursor": next_cursor}
+
+async def tasks_section(reads: SharedReads) -> Dict[str, Any]:
+    if columnar.member_columns.enabled:
+        return await columnar.task_analytics(reads.database, reads.committee_id, (await reads.tiers())["tiers"])
+    totals, ranked = await asyncio.gather(reads.summary(), reads.scan())
+    return analytics.task_analytics_from(totals, ranked)
+
+async def registrations_section(reads: SharedReads) -> Dict[str, Any]:
+    if columnar.member_columns.enabled:
+        settings, monthly_data = await asyncio.gather(
+            reads.tiers(),
+            history.monthly_registrations(reads.analytics_database, reads.committee_id),
+        )
+        return await columnar.registration_metrics(reads.database, reads.committee_id, settings["tiers"], monthly_data)
+    totals, ranked, settings, monthly_data = await asyncio.gather(
+        reads.summary(),
+        reads.scan(),
+        reads.tiers(),
+        history.monthly_registrations(reads.analytics_database, reads.committee_id),
+    )
+    tiers = settings["tiers"]
+    by_registrations = sorted(ranked, key=lambda row: (-row["registrationsBrought"], row["_id"]))
+    tier_rows = [analytics.registration_tier_row(row, tiers, totals["registrations"]) for row in by_registrations]
+    return analytics.registration_metrics_from(totals, tiers, totals["tierCounts"], tier_rows, monthly_data)
+
+async def categories_section(reads: SharedReads) -> List[Dict[str, Any]]:
+    return await tasks.category_stats(reads.database, reads.committee_id)
+
+SECTION_BUILDERS = {
+    "overview": overview_section,
+    "members": members_section,
+    "tasks": tasks_section,
+    "registrations": registrations_section,
+    "categories": categories_section,
+}
+
+async def build_dashboard(
+    database: AsyncIOMotorDatabase,
+    analytics_database: AsyncIOMotorDatabase,
+    committee_id: str,
+    sections: List[str],
+    members_limit: int = 100,
+) -> Dict[str, Any]:
+    """A committee's requested sections computed concurrently over shared reads.
+
+    A failing section is reported under ``errors`` and does not fail the
+    others, as when each section was its own request.
+    """
+    reads = SharedReads(database, analytics_database, committee_id, members_limit)
+    results = await asyncio.gather(
+        *(SECTION_BUILDERS[section](reads) for section in sections),
+        return_exceptions=True,
+    )
+    dashboard: Dict[str, Any] = {"sections": sections, "errors": {}}
+    for section, result in zip(sections, results):
+        if isinstance(result, Exception):
+            logger.error(f"Error building dashboard section {section}: {str(result)}")
+            dashboard["errors"][section] = f"Failed to fetch {section}"
+        else:
+            dashboard[section] = result
+    return dashboard
@@ -0,0 +1,207 @@
+from typing import Any, Dict, Optional, Set
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from services import member_queries, summary
+from services.analytics import overview_from_totals
+from services.committees import DEFAULT_COMMITTEE_ID
+import asyncio
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+class Subscriber:
+    """A connected dashboard of one committee with its own bounded queue of encoded events"""
+
+    def __init__(self, committee_id: str, max_queue: int):
+        self.committee_id = committee_id
+        self.queue: "asyncio.Queue[bytes]" = asyncio.Queue(maxsize=max_queue)
+        self.dropped = 0
+        self.consecutive_drops = 0
+        self.closed = False
+
+class EventBroadcaster:
+    """Fan-out of dashboard events to every connected subscriber.
+
+    Events are encoded once per publish. A subscriber whose queue is full
+    loses its oldest event; one that keeps falling behind is closed so the
+    client reconnects and resynchronizes.
+    """
+
+    def __init__(self, max_queue: int = 100, max_consecutive_drops: int = 500):
+        self.max_queue = max_queue
+        self.max_consecutive_drops = max_consecutive_drops
+        self.subscribers: Set[Subscriber] = set()
+        self.published = 0
+        self.dropped = 0
+        self.disconnected = 0
+
+    def subscribe(self, committee_id: str) -> Subscriber:
+        """Register a new subscriber to a committee's events"""
+        subscriber = Subscriber(committee_id, self.max_queue)
+        self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        """Forget a subscriber; safe to call more than once"""
+        self.subscribers.discard(subscriber)
+
+    def publish(self, event: str, data: Any, committee_id: Optional[str] = None) -> None:
+        """Queue an event for a committee's subscribers (every subscriber when None) without waiting on any of them"""
+        message = encode_event(event, data)
+        self.published += 1
+        for subscriber in list(self.subscribers):
+            if committee_id is not None and subscriber.committee_id != committee_id:
+                continue
+            try:
+                subscriber.queue.put_nowait(message)
+                subscriber.consecutive_drops = 0
+            except asyncio.QueueFull:
+                subscriber.queue.get_nowait()
+                subscriber.queue.put_nowait(message)
+                subscriber.dropped += 1
+                subscriber.consecutive_drops += 1
+                self.dropped += 1
+                if subscriber.consecutive_drops >= self.max_consecutive_drops:
+                    subscriber.closed = True
+                    self.disconnected += 1
+                    self.unsubscribe(subscriber)
+
+    def committees(self) -> Set[str]:
+        """Committees with at least one subscriber"""
+        return {subscriber.committee_id for subscriber in self.subscribers}
+
+    def stats(self) -> Dict[str, int]:
+        """Counters exposed on /api/admin/stream"""
+        return {
+            "subscribers": len(self.subscribers),
+            "published": self.published,
+            "dropped": self.dropped,
+            "disconnected": self.disconnected,
+        }
+
+def encode_event(event: str, data: Any) -> bytes:
+    """Server-sent event frame"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n".encode()
+
+class ChangeStreamWatcher:
+    """Single change stream on committee_members feeding the broadcaster.
+
+    Events go to the subscribers of the changed member's committee. A
+    committee's overview totals are re-read from its analytics summary at
+    most once per ``overview_delay`` seconds, so write bursts produce one
+    overview event.
+
+    A delete event only carries the member's _id; its committee comes from
+    the pre-image, which the watcher enables on committee_members (MongoDB
+    6.0+). Without one the delete is not sent to anyone, since other
+    committees must not see the id, and every subscribed committee gets a
+    fresh overview instead.
+    """
+
+    def __init__(self, broadcaster: EventBroadcaster, overview_delay: float = 0.25):
+        self.broadcaster = broadcaster
+        self.overview_delay = overview_delay
+        self.database: Optional[AsyncIOMotorDatabase] = None
+        self.resume_token = None
+        self._task: Optional[asyncio.Task] = None
+        # Committee -> task publishing its overview once the current burst settles
+        self._overviews: Dict[str, asyncio.Task] = {}
+        self.pre_images = False
+        self.unrouted_deletes = 0
+
+    def ensure_started(self, database: AsyncIOMotorDatabase) -> None:
+        """Start watching on first use; later calls are no-ops"""
+        if self._task is None or self._task.done():
+            self.database = database
+            self._task = asyncio.create_task(self._watch())
+
+    async def stop(self) -> None:
+        """Close the change stream and drop pending overview events"""
+        tasks = list(self._overviews.values()) + ([self._task] if self._task else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._overviews.clear()
+        self._task = None
+
+    async def overview(self, committee_id: str) -> Dict[str, Any]:
+        """A committee's current overview totals without the top performer document"""
+        totals = await summary.get_summary(self.database, committee_id)
+        overview = overview_from_totals(totals, None)
+        overview.pop("topPerformer")
+        return overview
+
+    async def enable_pre_images(self) -> bool:
+        """Record pre-images of member changes, so deletes can be routed to their committee"""
+        try:
+            await self.database.command("collMod", "committee_members", changeStreamPreAndPostImages={"enabled": True})
+            return True
+        except Exception as e:
+            # Needs MongoDB 6.0+ and the collMod privilege
+            logger.warning(f"Change stream pre-images unavailable, member deletes are not streamed: {str(e)}")
+            return False
+
+    def route_delete(self, change: Dict[str, Any]) -> None:
+        """Send a member delete to its committee, or refresh every subscribed committee when that is unknown"""
+        before = change.get("fullDocumentBeforeChange") or {}
+        # documentKey only holds committeeId when it is part of the shard key
+        committee_id = before.get("committeeId") or change["documentKey"].get("committeeId")
+        if committee_id is None:
+            self.unrouted_deletes += 1
+            for committee in self.broadcaster.committees():
+                self._schedule_overview(committee)
+            return
+        self.broadcaster.publish("member.deleted", {"id": str(change["documentKey"]["_id"])}, committee_id)
+        self._schedule_overview(committee_id)
+
+    async def _watch(self) -> None:
+        fields = sorted(member_queries.DEFAULT_FIELDS)
+        while True:
+            try:
+                if not self.pre_images:
+                    self.pre_images = await self.enable_pre_images()
+                options = {"full_document": "updateLookup", "resume_after": self.resume_token}
+                if self.pre_images:
+                    options["full_document_before_change"] = "whenAvailable"
+                async with self.database.committee_members.watch(**options) as stream:
+                    async for change in stream:
+                        self.resume_token = stream.resume_token
+                        if change["operationType"] == "delete":
+                            self.route_delete(change)
+                        elif change.get("fullDocument"):
+                            committee_id = change["fullDocument"].get("committeeId") or DEFAULT_COMMITTEE_ID
+                            member = member_queries.to_response(change["fullDocument"], fields)
+                            self.broadcaster.publish("member.upserted", member, committee_id)
+                            self._schedule_overview(committee_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Change streams need a replica set; retry so a failover does not end the feed
+                logger.error(f"Change stream error: {str(e)}")
+                if getattr(e, "code", None) == 286:
+                    # ChangeStreamHistoryLost: the resume point fell off the oplog
+                    self.resume_token = None
+                await asyncio.sleep(5)
+
+    def _schedule_overview(self, committee_id: str) -> None:
+        """Publish a committee's overview totals once the current burst of changes settles"""
+        if committee_id not in self._overviews:
+            self._overviews[committee_id] = asyncio.create_task(self._publish_overview(committee_id))
+
+    async def _publish_overview(self, committee_id: str) -> None:
+        try:
+            await asyncio.sleep(self.overview_delay)
+        finally:
+            self._overviews.pop(committee_id, None)
+        try:
+            self.broadcaster.publish("overview", await self.overview(committee_id), committee_id)
+        except Exception as e:
+            logger.error(f"Error publishing overview of committee {committee_id}: {str(e)}")
+
+# Process-wide broadcaster and watcher used by /api/stream
+broadcaster = EventBroadcaster(
+    max_queue=int(os.getenv('STREAM_MAX_QUEUE', '100')),
+    max_consecutive_drops=int(os.getenv('STREAM_MAX_CONSECUTIVE_DROPS', '500')),
+)
+watcher = ChangeStreamWatcher(broadcaster)
@@ -0,0 +1,111 @@
+from typing import Any, AsyncIterator, Dict, Iterable, List
+from motor.motor_asyncio import AsyncIOMotorCollection
+from services import analytics, history, member_queries, summary
+from services.tiers import tier_config
+import csv
+import io
+import json
+import zlib
+
+# Documents pulled from Mongo per round-trip, and rows per emitted chunk
+EXPORT_BATCH_SIZE = 1000
+
+RANKING_COLUMNS = ["rank", "id", "name", "role", "efficiency", "tasksCompleted", "totalTasks", "registrationsBrought"]
+TIER_COLUMNS = ["id", "name", "role", "registrationsBrought", "tier", "tierColor", "percentage"]
+
+async def iter_members(collection: AsyncIOMotorCollection, committee_id: str, fields: List[str]) -> AsyncIterator[Dict[str, Any]]:
+    """Stream a committee's member rows in _id order"""
+    cursor = collection.find(
+        {"committeeId": committee_id},
+        member_queries.build_projection(fields, "id"),
+        sort=[("_id", 1)],
+        batch_size=EXPORT_BATCH_SIZE
+    )
+    with_history = "performanceHistory" in fields
+    batch = []
+    async for document in cursor:
+        if not with_history:
+            yield member_queries.to_response(document, fields)
+            continue
+        # History is looked up from the time-series collection once per batch
+        batch.append(member_queries.to_response(document, fields))
+        if len(batch) >= EXPORT_BATCH_SIZE:
+            await history.attach_performance_history(collection.database, committee_id, batch)
+            for member in batch:
+                yield member
+            batch = []
+    if batch:
+        await history.attach_performance_history(collection.database, committee_id, batch)
+        for member in batch:
+            yield member
+
+async def iter_rankings(collection: AsyncIOMotorCollection, committee_id: str) -> AsyncIterator[Dict[str, Any]]:
+    """Stream the rankedMembers table of /analytics/tasks"""
+    cursor = collection.aggregate(
+        analytics.ranked_members_pipeline(committee_id),
+        allowDiskUse=True,
+        batchSize=EXPORT_BATCH_SIZE
+    )
+    rank = 0
+    async for document in cursor:
+        rank += 1
+        yield analytics.ranked_row(document, rank)
+
+async def iter_registration_tiers(collection: AsyncIOMotorCollection, committee_id: str) -> AsyncIterator[Dict[str, Any]]:
+    """Stream the registrationTiers table of /analytics/registrations"""
+    totals = await summary.get_summary(collection.database, committee_id)
+    settings = await tier_config.current(collection.database, committee_id)
+    cursor = collection.aggregate(
+        analytics.registration_tiers_pipeline(committee_id, settings["tiers"], totals["registrations"]),
+        allowDiskUse=True,
+        batchSize=EXPORT_BATCH_SIZE
+    )
+    async for document in cursor:
+        yield analytics.round_percentage(document)
+
+def encode_ndjson(rows: Iterable[Dict[str, Any]], columns: List[str]) -> str:
+    """One JSON object per line"""
+    return "".join(json.dumps(row, default=str) + "\n" for row in rows)
+
+def encode_csv(rows: Iterable[Dict[str, Any]], columns: List[str]) -> str:
+    """CSV rows without a header line"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction="ignore")
+    writer.writerows(rows)
+    return buffer.getvalue()
+
+def csv_header(columns: List[str]) -> str:
+    """CSV header line"""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(columns)
+    return buffer.getvalue()
+
+async def stream_rows(
+    rows: AsyncIterator[Dict[str, Any]],
+    columns: List[str],
+    export_format: str,
+    compress: bool = False,
+) -> AsyncIterator[bytes]:
+    """Encode rows in batches, optionally gzip-compressing the stream"""
+    encode = encode_csv if export_format == "csv" else encode_ndjson
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS) if compress else None
+
+    def emit(text: str) -> bytes:
+        data = text.encode()
+        return compressor.compress(data) if compressor else data
+
+    if export_format == "csv":
+        yield emit(csv_header(columns))
+
+    batch = []
+    async for row in rows:
+        batch.append(row)
+        if len(batch) >= EXPORT_BATCH_SIZE:
+            chunk = emit(encode(batch, columns))
+            batch = []
+            if chunk:
+                yield chunk
+    if batch:
+        yield emit(encode(batch, columns))
+    if compressor:
+        yield compressor.flush()
@@ -0,0 +1,203 @@
+from typing import Any, Dict, List
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from services import history
+from services import tasks as task_counters
+from services.committees import DEFAULT_COMMITTEE_ID
+from datetime import datetime
+import random
+import uuid
+
+# The demo members the server used to insert into an empty database
+SAMPLE_MEMBERS = [
+    {
+        "_id": "1",
+        "name": "Sarah Johnson",
+        "role": "Team Lead",
+        "contact": "sarah.johnson@email.com",
+        "phone": "+1 (555) 123-4567",
+        "tasksCompleted": 15,
+        "tasksPending": 3,
+        "totalTasks": 18,
+        "efficiency": 85,
+        "registrationsBrought": 12,
+        "performanceHistory": [
+            {"month": "Jan", "score": 78},
+            {"month": "Feb", "score": 82},
+            {"month": "Mar", "score": 85}
+        ],
+        "createdAt": "2024-01-01T00:00:00Z",
+        "updatedAt": "2024-03-01T00:00:00Z"
+    },
+    {
+        "_id": "2",
+        "name": "Michael Chen",
+        "role": "Marketing Coordinator",
+        "contact": "michael.chen@email.com",
+        "phone": "+1 (555) 234-5678",
+        "tasksCompleted": 22,
+        "tasksPending": 5,
+        "totalTasks": 27,
+        "efficiency": 92,
+        "registrationsBrought": 18,
+        "performanceHistory": [
+            {"month": "Jan", "score": 88},
+            {"month": "Feb", "score": 90},
+            {"month": "Mar", "score": 92}
+        ],
+        "createdAt": "2024-01-01T00:00:00Z",
+        "updatedAt": "2024-03-01T00:00:00Z"
+    },
+    {
+        "_id": "3",
+        "name": "Emily Rodriguez",
+        "role": "Event Coordinator",
+        "contact": "emily.rodriguez@email.com",
+        "phone": "+1 (555) 345-6789",
+        "tasksCompleted": 11,
+        "tasksPending": 7,
+        "totalTasks": 18,
+        "efficiency": 72,
+        "registrationsBrought": 8,
+        "performanceHistory": [
+            {"month": "Jan", "score": 75},
+            {"month": "Feb", "score": 70},
+            {"month": "Mar", "score": 72}
+        ],
+        "createdAt": "2024-01-01T00:00:00Z",
+        "updatedAt": "2024-03-01T00:00:00Z"
+    },
+    {
+        "_id": "4",
+        "name": "David Kim",
+        "role": "Outreach Specialist",
+        "contact": "david.kim@email.com",
+        "phone": "+1 (555) 456-7890",
+        "tasksCompleted": 19,
+        "tasksPending": 2,
+        "totalTasks": 21,
+        "efficiency": 88,
+        "registrationsBrought": 15,
+        "performanceHistory": [
+            {"month": "Jan", "score": 85},
+            {"month": "Feb", "score": 87},
+            {"month": "Mar", "score": 88}
+        ],
+        "createdAt": "2024-01-01T00:00:00Z",
+        "updatedAt": "2024-03-01T00:00:00Z"
+    },
+    {
+        "_id": "5",
+        "name": "Lisa Thompson",
+        "role": "Communications Manager",
+        "contact": "lisa.thompson@email.com",
+        "phone": "+1 (555) 567-8901",
+        "tasksCompleted": 13,
+        "tasksPending": 4,
+        "totalTasks": 17,
+        "efficiency": 79,
+        "registrationsBrought": 10,
+        "performanceHistory": [
+            {"month": "Jan", "score": 76},
+            {"month": "Feb", "score": 78},
+            {"month": "Mar", "score": 79}
+        ],
+        "createdAt": "2024-01-01T00:00:00Z",
+        "updatedAt": "2024-03-01T00:00:00Z"
+    }
+]
+
+class CommitteeNotEmpty(ValueError):
+    """Raised when seeding a committee that already has members"""
+
+def generated_member(i: int, rng: random.Random) -> Dict[str, Any]:
+    """A member shaped like the samples, numbered after them"""
+    sample = SAMPLE_MEMBERS[i % len(SAMPLE_MEMBERS)]
+    completed, pending = rng.randint(0, 25), rng.randint(0, 8)
+    efficiency = rng.randint(40, 100)
+    return {
+        "_id": str(i + 1),
+        "name": f"Member {i + 1}",
+        "role": sample["role"],
+        "contact": f"member{i + 1}@email.com",
+        "phone": f"+1 (555) {i % 1000:03d}-{i % 10000:04d}",
+        "tasksCompleted": completed,
+        "tasksPending": pending,
+        "totalTasks": completed + pending,
+        "efficiency": efficiency,
+        "registrationsBrought": rng.randint(0, 25),
+        "performanceHistory": [
+            {"month": entry["month"], "score": max(0, min(100, efficiency + rng.randint(-8, 8)))}
+            for entry in sample["performanceHistory"]
+        ],
+        "createdAt": sample["createdAt"],
+        "updatedAt": sample["updatedAt"],
+    }
+
+def fixture_members(committee_id: str, count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """``count`` members of a committee: the samples first, then generated ones.
+
+    Member ids are unique across committees, so outside the default
+    committee they are prefixed with the committee id.
+    """
+    rng = random.Random(seed)
+    members = [dict(member) for member in SAMPLE_MEMBERS[:count]]
+    members.extend(generated_member(i, rng) for i in range(len(members), count))
+    for member in members:
+        member["committeeId"] = committee_id
+        if committee_id != DEFAULT_COMMITTEE_ID:
+            member["_id"] = f"{committee_id}-{member['_id']}"
+    return members
+
+def member_tasks(committee_id: str, members: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """One task per completed and pending task counted on each member, categories taken in turn"""
+    now = datetime.utcnow()
+    categories = [category for category, _, _ in task_counters.SAMPLE_CATEGORIES]
+    tasks = []
+    for member in members:
+        for task_status, field in task_counters.MEMBER_STATUS_FIELDS.items():
+            for _ in range(member.get(field) or 0):
+                category = categories[len(tasks) % len(categories)]
+                tasks.append({
+                    "_id": str(uuid.uuid4()),
+                    "committeeId": committee_id,
+                    "title": f"{category} task for {member['name']}",
+                    "category": category,
+                    "assigneeId": member["_id"],
+                    "status": task_status,
+                    "dueDate": None,
+                    "createdAt": now,
+                    "updatedAt": now,
+                    "completedAt": now if task_status == "completed" else None,
+                })
+    return tasks
+
+async def insert_batches(collection, documents: List[Dict[str, Any]], batch_size: int) -> None:
+    for start in range(0, len(documents), batch_size):
+        await collection.insert_many(documents[start:start + batch_size], ordered=False)
+
+async def seed_committee(database: AsyncIOMotorDatabase, committee_id: str, count: int, batch_size: int = 5000, seed: int = 0) -> Dict[str, int]:
+    """Bulk-load ``count`` fixture members with their history and tasks into an empty committee.
+
+    History and tasks are written directly in batches rather than through
+    the member write path; the committee's task counters and analytics
+    summary are rebuilt at the end.
+    """
+    if await database.committee_members.find_one({"committeeId": committee_id}, {"_id": 1}):
+        raise CommitteeNotEmpty(f"Committee {committee_id} already has members")
+    members = fixture_members(committee_id, count, seed)
+    samples, generated = members[:len(SAMPLE_MEMBERS)], members[len(SAMPLE_MEMBERS):]
+    tasks = task_counters.sample_tasks(committee_id, samples) + member_tasks(committee_id, generated)
+
+    points = []
+    for member in members:
+        points.extend(history.score_points(committee_id, member["_id"], member.pop("performanceHistory")))
+    await insert_batches(database.committee_members, members, batch_size)
+    await insert_batches(database[history.HISTORY_COLLECTION], points, batch_size)
+    await history.record_registrations(database, [
+        {"committeeId": committee_id, "memberId": member["_id"], "delta": member["registrationsBrought"]}
+        for member in members
+    ])
+    await insert_batches(database.tasks, tasks, batch_size)
+    # Derives member task counts and category counters, then the summary
+    await task_counters.rebuild_task_counters(database, committee_id)
+    return {"members": len(members), "tasks": len(tasks), "historyPoints": len(points)}
@@ -0,0 +1,199 @@
+from typing import Any, Dict, Iterable, List, Optional
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import CollectionInvalid
+from services.committees import DEFAULT_COMMITTEE_ID
+from datetime import datetime
+import calendar
+
+# Time-series collection holding performance scores and registration events;
+# meta is {committeeId, memberId, metric}
+HISTORY_COLLECTION = "member_metrics"
+
+SCORE = "score"
+REGISTRATIONS = "registrations"
+
+# Rollup aggregation per metric: scores are averaged, registrations summed
+ROLLUP_ACCUMULATORS = {
+    SCORE: {"$avg": "$value"},
+    REGISTRATIONS: {"$sum": "$value"},
+}
+
+MONTH_NUMBERS = {name: number for number, name in enumerate(calendar.month_abbr) if name}
+
+async def create_history_collection(database: AsyncIOMotorDatabase) -> None:
+    """Create the time-series collection and its series/time index"""
+    try:
+        await database.create_collection(
+            HISTORY_COLLECTION,
+            timeseries={"timeField": "timestamp", "metaField": "meta", "granularity": "hours"}
+        )
+    except CollectionInvalid:
+        pass  # Already exists
+    await database[HISTORY_COLLECTION].create_index([("meta.committeeId", 1), ("meta.memberId", 1), ("meta.metric", 1), ("timestamp", 1)])
+    await database[HISTORY_COLLECTION].create_index([("meta.committeeId", 1), ("meta.metric", 1), ("timestamp", 1)])
+
+def month_to_timestamp(month: str, now: Optional[datetime] = None) -> datetime:
+    """Resolve a ``performanceHistory`` month ("Mar", "2024-03") to its first day.
+
+    Bare month names refer to the most recent such month up to ``now``.
+    """
+    now = now or datetime.utcnow()
+    if month[:3].title() in MONTH_NUMBERS and not month[:1].isdigit():
+        number = MONTH_NUMBERS[month[:3].title()]
+        year = now.year if number <= now.month else now.year - 1
+        return datetime(year, number, 1)
+    return datetime.strptime(month[:7], "%Y-%m")
+
+def score_points(committee_id: str, member_id: str, performance_history: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Time-series documents for a member's performanceHistory entries"""
+    return [
+        {
+            "timestamp": month_to_timestamp(entry["month"]),
+            "meta": {"committeeId": committee_id, "memberId": member_id, "metric": SCORE},
+            "value": entry["score"],
+        }
+        for entry in performance_history
+    ]
+
+async def replace_scores(database: AsyncIOMotorDatabase, committee_id: str, member_id: str, performance_history: Iterable[Dict[str, Any]]) -> None:
+    """Store a member's performanceHistory as score points, replacing earlier ones"""
+    collection = database[HISTORY_COLLECTION]
+    await collection.delete_many({"meta.committeeId": committee_id, "meta.memberId": member_id, "meta.metric": SCORE})
+    points = score_points(committee_id, member_id, performance_history)
+    if points:
+        await collection.insert_many(points, ordered=False)
+
+async def record_registrations(database: AsyncIOMotorDatabase, changes: Iterable[Dict[str, Any]]) -> None:
+    """Append registration deltas ({committeeId, memberId, delta, timestamp}) to the series"""
+    points = [
+        {
+            "timestamp": change.get("timestamp") or datetime.utcnow(),
+            "meta": {"committeeId": change["committeeId"], "memberId": change["memberId"], "metric": REGISTRATIONS},
+            "value": change["delta"],
+        }
+        for change in changes
+        if change["delta"]
+    ]
+    if points:
+        await database[HISTORY_COLLECTION].insert_many(points, ordered=False)
+
+async def delete_member_points(database: AsyncIOMotorDatabase, committee_id: str, member_ids: List[str]) -> None:
+    """Remove every score and registration point of deleted members"""
+    if member_ids:
+        await database[HISTORY_COLLECTION].delete_many({"meta.committeeId": committee_id, "meta.memberId": {"$in": member_ids}})
+
+async def member_history(
+    database: AsyncIOMotorDatabase,
+    committee_id: str,
+    member_id: str,
+    metric: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> List[Dict[str, Any]]:
+    """Points of one metric for one member, oldest first"""
+    query: Dict[str, Any] = {"meta.committeeId": committee_id, "meta.memberId": member_id, "meta.metric": metric}
+    if start or end:
+        query["timestamp"] = {}
+        if start:
+            query["timestamp"]["$gte"] = start
+        if end:
+            query["timestamp"]["$lt"] = end
+    cursor = database[HISTORY_COLLECTION].find(query, {"_id": 0, "timestamp": 1, "value": 1}, sort=[("timestamp", 1)])
+    return await cursor.to_list(None)
+
+async def performance_history(database: AsyncIOMotorDatabase, committee_id: str, member_ids: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """``performanceHistory`` arrays for several members of a committee from one aggregation"""
+    pipeline = [
+        {"$match": {"meta.committeeId": committee_id, "meta.memberId": {"$in": member_ids}, "meta.metric": SCORE}},
+        {"$sort": {"timestamp": 1}},
+        {"$group": {"_id": "$meta.memberId", "points": {"$push": {"timestamp": "$timestamp", "value": "$value"}}}},
+    ]
+    histories = {member_id: [] for member_id in member_ids}
+    async for group in database[HISTORY_COLLECTION].aggregate(pipeline):
+        histories[group["_id"]] = [
+            # Year-qualified, so months of different years stay apart; PUT accepts it back unchanged
+            {"month": point["timestamp"].strftime("%Y-%m"), "score": round(point["value"])}
+            for point in group["points"]
+        ]
+    return histories
+
+async def attach_performance_history(database: AsyncIOMotorDatabase, committee_id: str, members: List[Dict[str, Any]]) -> None:
+    """Fill ``performanceHistory`` on a committee's shaped member dicts that do not embed it"""
+    missing = [member for member in members if not member.get("performanceHistory")]
+    if not missing:
+        return
+    histories = await performance_history(database, committee_id, [member["id"] for member in missing])
+    for member in missing:
+        member["performanceHistory"] = histories.get(member["id"], [])
+
+async def rollup(
+    database: AsyncIOMotorDatabase,
+    committee_id: str,
+    metric: str,
+    unit: str,
+    start: datetime,
+    end: Optional[datetime] = None,
+) -> List[Dict[str, Any]]:
+    """A committee's totals (registrations) or averages (scores) per week or month"""
+    match: Dict[str, Any] = {"meta.committeeId": committee_id, "meta.metric": metric, "timestamp": {"$gte": start}}
+    if end:
+        match["timestamp"]["$lt"] = end
+    truncate: Dict[str, Any] = {"date": "$timestamp", "unit": unit}
+    if unit == "week":
+        truncate["startOfWeek"] = "monday"
+    pipeline = [
+        {"$match": match},
+        {
+            "$group": {
+                "_id": {"$dateTrunc": truncate},
+                "value": ROLLUP_ACCUMULATORS[metric],
+                "points": {"$sum": 1},
+            }
+        },
+        {"$sort": {"_id": 1}},
+        {"$project": {"_id": 0, "period": "$_id", "value": 1, "points": 1}},
+    ]
+    return await database[HISTORY_COLLECTION].aggregate(pipeline).to_list(None)
+
+def month_start(now: datetime, months_back: int) -> datetime:
+    """First day of the month ``months_back`` months before ``now``"""
+    month_index = now.year * 12 + now.month - 1 - months_back
+    return datetime(month_index // 12, month_index % 12 + 1, 1)
+
+async def monthly_registrations(database: AsyncIOMotorDatabase, committee_id: str, months: int = 3) -> List[Dict[str, Any]]:
+    """``monthlyData`` for /analytics/registrations: registrations in each recent month"""
+    now = datetime.utcnow()
+    start = month_start(now, months - 1)
+    totals = {row["period"]: row["value"] for row in await rollup(database, committee_id, REGISTRATIONS, "month", start)}
+    return [
+        {
+            "month": period.strftime("%b"),
+            "registrations": totals.get(period, 0),
+        }
+        for period in (month_start(now, back) for back in range(months - 1, -1, -1))
+    ]
+
+async def migrate_embedded_history(database: AsyncIOMotorDatabase) -> int:
+    """Move embedded performanceHistory arrays into the time-series collection.
+
+    Members without any registration events also get their current
+    registrationsBrought recorded, so monthly rollups start from real totals.
+    """
+    migrated = 0
+    cursor = database.committee_members.find(
+        {"performanceHistory": {"$exists": True}},
+        {"performanceHistory": 1, "registrationsBrought": 1, "committeeId": 1}
+    )
+    async for member in cursor:
+        committee_id = member.get("committeeId") or DEFAULT_COMMITTEE_ID
+        await replace_scores(database, committee_id, member["_id"], member.get("performanceHistory") or [])
+        has_registrations = await database[HISTORY_COLLECTION].find_one(
+            {"meta.committeeId": committee_id, "meta.memberId": member["_id"], "meta.metric": REGISTRATIONS}
+        )
+        if not has_registrations:
+            await record_registrations(database, [
+                {"committeeId": committee_id, "memberId": member["_id"], "delta": member.get("registrationsBrought") or 0}
+            ])
+        await database.committee_members.update_one({"_id": member["_id"]}, {"$unset": {"performanceHistory": ""}})
+        migrated += 1
+    return migrated
@@ -0,0 +1,156 @@
+from bisect import bisect_left, insort
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from services import member_queries
+from services.member_index import CommitteeIndexes, MemberIndex
+from services.response_cache import response_cache
+
+# Metrics members are ranked by, highest first
+METRICS = ("efficiency", "registrationsBrought")
+
+# Member fields returned with each leaderboard row
+ROW_FIELDS = ["name", "role", "efficiency", "registrationsBrought", "tasksCompleted", "totalTasks"]
+
+Key = Tuple[int, str]
+
+class RankedIndex:
+    """Members ordered by one metric, highest first, ties broken by ascending _id.
+
+    Keys are ``(-value, _id)`` tuples in a sorted list, which is the order of
+    the ``(metric desc, _id asc)`` index and of /analytics/tasks rankings.
+    Rank lookups are a dict hit plus a bisect.
+    """
+
+    def __init__(self, field: str):
+        self.field = field
+        self.keys: List[Key] = []
+        self.key_of: Dict[str, Key] = {}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def load(self, members: Iterable[Tuple[str, int]]) -> None:
+        """Replace the contents with ``(member_id, value)`` pairs"""
+        self.key_of = {member_id: (-value, member_id) for member_id, value in members}
+        self.keys = sorted(self.key_of.values())
+
+    def upsert(self, member_id: str, value: int) -> None:
+        """Insert a member or move it to its new position"""
+        key = (-value, member_id)
+        if self.key_of.get(member_id) == key:
+            return
+        self.remove(member_id)
+        insort(self.keys, key)
+        self.key_of[member_id] = key
+
+    def remove(self, member_id: str) -> None:
+        """Forget a member; unknown ids are ignored"""
+        key = self.key_of.pop(member_id, None)
+        if key is not None:
+            del self.keys[bisect_left(self.keys, key)]
+
+    def position(self, member_id: str) -> Optional[int]:
+        """Zero-based position of a member, None when not ranked"""
+        key = self.key_of.get(member_id)
+        return None if key is None else bisect_left(self.keys, key)
+
+    def competition_rank(self, value: int) -> int:
+        """1 + number of members strictly ahead, so tied members share a rank"""
+        return bisect_left(self.keys, (-value, "")) + 1
+
+    def entries(self, start: int, stop: int) -> List[Dict[str, Any]]:
+        """Ranked entries for positions ``start`` to ``stop`` (exclusive)"""
+        start = max(start, 0)
+        return [
+            {
+                "rank": start + offset + 1,
+                "competitionRank": self.competition_rank(-key[0]),
+                "id": key[1],
+                "value": -key[0],
+            }
+            for offset, key in enumerate(self.keys[start:stop])
+        ]
+
+class Leaderboard(MemberIndex):
+    """Ranked indexes of one committee for every metric in METRICS"""
+
+    fields = METRICS
+
+    def __init__(self, committee_id: str):
+        super().__init__(committee_id)
+        self.indexes = {field: RankedIndex(field) for field in METRICS}
+
+    def load(self, members: List[Dict[str, Any]]) -> None:
+        for field, index in self.indexes.items():
+            index.load((member["_id"], member.get(field) or 0) for member in members)
+
+    def apply_one(self, member_id: str, member: Optional[Dict[str, Any]]) -> None:
+        for field, index in self.indexes.items():
+            if member is None:
+                index.remove(member_id)
+            else:
+                index.upsert(member_id, member.get(field) or 0)
+
+    async def index(self, database: AsyncIOMotorDatabase, metric: str) -> RankedIndex:
+        """Loaded index for ``metric``"""
+        await self.ensure_loaded(database)
+        return self.indexes[metric]
+
+class CommitteeLeaderboards(CommitteeIndexes[Leaderboard]):
+    """A Leaderboard per committee"""
+
+    def __init__(self):
+        super().__init__(Leaderboard)
+
+    async def index(self, database: AsyncIOMotorDatabase, committee_id: str, metric: str) -> RankedIndex:
+        """Loaded index of a committee for ``metric``"""
+        return await self.get(committee_id).index(database, metric)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters exposed on /api/admin/leaderboard"""
+        return {
+            **self.load_stats(),
+            "members": {
+                field: sum(len(board.indexes[field]) for board in self.committees.values())
+                for field in METRICS
+            },
+        }
+
+async def attach_members(database: AsyncIOMotorDatabase, committee_id: str, entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Merge member fields into ranked entries with one ``$in`` query"""
+    if not entries:
+        return []
+    ids = [entry["id"] for entry in entries]
+    rows = await database.committee_members.aggregate(
+        member_queries.list_pipeline({"committeeId": committee_id, "_id": {"$in": ids}}, ROW_FIELDS, "id", "asc", len(ids))
+    ).to_list(None)
+    by_id = {row["id"]: row for row in rows}
+    return [{**by_id.get(entry["id"], {}), **entry} for entry in entries]
+
+async def top(database: AsyncIOMotorDatabase, committee_id: str, metric: str, offset: int, limit: int) -> Dict[str, Any]:
+    """A page of a committee's leaderboard"""
+    index = await leaderboard.index(database, committee_id, metric)
+    rows = await attach_members(database, committee_id, index.entries(offset, offset + limit))
+    return {"metric": metric, "total": len(index), "offset": offset, "members": rows}
+
+async def rank_of(database: AsyncIOMotorDatabase, committee_id: str, metric: str, member_id: str) -> Optional[Dict[str, Any]]:
+    """Rank of one member, None when the member does not exist"""
+    index = await leaderboard.index(database, committee_id, metric)
+    position = index.position(member_id)
+    if position is None:
+        return None
+    entry = index.entries(position, position + 1)[0]
+    return {"metric": metric, "total": len(index), **entry}
+
+async def around(database: AsyncIOMotorDatabase, committee_id: str, metric: str, member_id: str, before: int, after: int) -> Optional[Dict[str, Any]]:
+    """Members ranked just above and below one member, None when it does not exist"""
+    index = await leaderboard.index(database, committee_id, metric)
+    position = index.position(member_id)
+    if position is None:
+        return None
+    rows = await attach_members(database, committee_id, index.entries(position - before, position + after + 1))
+    return {"metric": metric, "total": len(index), "id": member_id, "members": rows}
+
+# Process-wide leaderboards kept in sync by the member write path
+leaderboard = CommitteeLeaderboards()
+response_cache.on_remote_invalidation(leaderboard.invalidate)
@@ -0,0 +1,143 @@
+from typing import Any, Callable, Dict, Generic, Iterable, List, Optional, Tuple, TypeVar
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from services.committees import committee_of
+import asyncio
+import os
+import time
+
+# Seconds a loaded index is trusted before it is reloaded; 0 keeps it until invalidated
+MAX_AGE_SECONDS = float(os.getenv('MEMBER_INDEX_MAX_AGE_SECONDS', '60'))
+
+MemberChange = Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]
+
+class MemberIndex:
+    """Per-process index over one committee's members.
+
+    Loaded from committee_members on first use and kept current by
+    ``apply_member_writes``. Writes arriving while a load is in progress are
+    replayed once it finishes. Writes made by other workers reach this one
+    through ``invalidate``, which forces a reload on the next query; that
+    needs RESPONSE_CACHE_BACKEND=mongo. Writes nothing reports, such as
+    those of other workers on the memory backend or of ``cli.py``, are
+    picked up by reloading an index once it is ``max_age`` seconds old.
+
+    Subclasses name the member ``fields`` they need and implement ``load``
+    and ``apply_one``.
+    """
+
+    fields: Tuple[str, ...] = ()
+    max_age: float = MAX_AGE_SECONDS
+
+    def __init__(self, committee_id: str):
+        self.committee_id = committee_id
+        self.loaded = False
+        self.loaded_at = 0.0
+        self.loads = 0
+        self.expirations = 0
+        self._generation = 0
+        self._lock = asyncio.Lock()
+        self._pending: Optional[List[Tuple[str, Optional[Dict[str, Any]]]]] = None
+
+    def load(self, members: List[Dict[str, Any]]) -> None:
+        """Replace the contents with ``members``"""
+        raise NotImplementedError
+
+    def apply_one(self, member_id: str, member: Optional[Dict[str, Any]]) -> None:
+        """Insert, move or (for None) remove one member"""
+        raise NotImplementedError
+
+    def expired(self) -> bool:
+        """Whether the contents are older than ``max_age``"""
+        return self.max_age > 0 and time.monotonic() - self.loaded_at >= self.max_age
+
+    async def ensure_loaded(self, database: AsyncIOMotorDatabase) -> None:
+        """Build the index from the member collection if needed"""
+        if self.loaded and not self.expired():
+            return
+        async with self._lock:
+            if self.loaded and not self.expired():
+                return
+            if self.loaded:
+                # Writes made during the reload are queued as on a first load
+                self.loaded = False
+                self.expirations += 1
+            generation = self._generation
+            self._pending = []
+            try:
+                started = time.monotonic()
+                members = await database.committee_members.find(
+                    {"committeeId": self.committee_id}, {field: 1 for field in self.fields}
+                ).to_list(None)
+                self.load(members)
+                for member_id, member in self._pending:
+                    self.apply_one(member_id, member)
+                # An invalidation during the load means the data may already be stale
+                self.loaded = generation == self._generation
+                self.loaded_at = started
+                self.loads += 1
+            finally:
+                self._pending = None
+
+    def invalidate(self) -> None:
+        """Drop the contents; they are rebuilt on the next query"""
+        self._generation += 1
+        self.loaded = False
+
+    def apply(self, changes: Iterable[MemberChange]) -> None:
+        """Fold ``(old, new)`` member writes into the index"""
+        for old, new in changes:
+            member_id = (new or old)["_id"]
+            if self._pending is not None:
+                self._pending.append((member_id, new))
+            elif self.loaded:
+                self.apply_one(member_id, new)
+
+Index = TypeVar("Index", bound=MemberIndex)
+
+class CommitteeIndexes(Generic[Index]):
+    """A MemberIndex per committee, created by the committee's first query.
+
+    Writes to committees nobody has queried yet are ignored; their index
+    loads the current state when it is first needed.
+    """
+
+    def __init__(self, factory: Callable[[str], Index]):
+        self.factory = factory
+        self.committees: Dict[str, Index] = {}
+
+    def get(self, committee_id: str) -> Index:
+        """A committee's index, not loaded until its first query"""
+        index = self.committees.get(committee_id)
+        if index is None:
+            index = self.committees[committee_id] = self.factory(committee_id)
+        return index
+
+    async def loaded(self, database: AsyncIOMotorDatabase, committee_id: str) -> Index:
+        """A committee's index, loaded"""
+        index = self.get(committee_id)
+        await index.ensure_loaded(database)
+        return index
+
+    def apply(self, changes: Iterable[MemberChange]) -> None:
+        """Fold ``(old, new)`` member writes into their committees' indexes"""
+        for change in changes:
+            index = self.committees.get(committee_of(change))
+            if index is not None:
+                index.apply([change])
+
+    def invalidate(self, committee_id: Optional[str] = None) -> None:
+        """Drop one committee's index, or every committee's"""
+        indexes = self.committees.values() if committee_id is None else [self.committees.get(committee_id)]
+        for index in indexes:
+            if index is not None:
+                index.invalidate()
+
+    def load_stats(self) -> Dict[str, int]:
+        """Committees seen, indexes currently loaded, loads so far and how many of them were max-age reloads"""
+        return {
+            "committees": len(self.committees),
+            "loaded": sum(index.loaded for index in self.committees.values()),
+            "loads": sum(index.loads for index in self.committees.values()),
+            "expirations": sum(index.expirations for index in self.committees.values()),
+            "maxAgeSeconds": MAX_AGE_SECONDS,
+        }
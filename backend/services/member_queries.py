@@ -0,0 +1,193 @@
+from typing import Any, Dict, List, Optional, Tuple
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from services import history
+from services.analytics import TOTAL_TASKS_EXPR, VERSION_EXPR
+import base64
+import json
+
+# Sort keys accepted by the member list, mapped to document fields
+SORT_FIELDS = {
+    "id": "_id",
+    "efficiency": "efficiency",
+    "registrationsBrought": "registrationsBrought",
+}
+
+# Fields that can be requested through ``fields=``
+PROJECTABLE_FIELDS = {
+    "name",
+    "role",
+    "contact",
+    "phone",
+    "tasksCompleted",
+    "tasksPending",
+    "totalTasks",
+    "efficiency",
+    "registrationsBrought",
+    "performanceHistory",
+    "createdAt",
+    "updatedAt",
+    "version",
+    "committeeId",
+}
+
+# performanceHistory is only returned when asked for explicitly
+DEFAULT_FIELDS = PROJECTABLE_FIELDS - {"performanceHistory"}
+
+# Every field, as returned by GET /members/{id}
+ALL_FIELDS = sorted(PROJECTABLE_FIELDS)
+
+class InvalidQuery(ValueError):
+    """Raised when list parameters or a cursor cannot be used"""
+
+def parse_fields(fields: Optional[str]) -> List[str]:
+    """Validate a comma separated ``fields=`` value"""
+    if not fields:
+        return sorted(DEFAULT_FIELDS)
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in PROJECTABLE_FIELDS | {"id"}]
+    if unknown:
+        raise InvalidQuery(f"Unknown fields: {', '.join(unknown)}")
+    return [field for field in requested if field != "id"]
+
+def build_projection(fields: List[str], sort: str) -> Dict[str, int]:
+    """Mongo projection for the requested response fields and the cursor's sort key"""
+    projection = {field: 1 for field in fields if field != "totalTasks"}
+    projection[SORT_FIELDS[sort]] = 1
+    if "totalTasks" in fields:
+        projection["tasksCompleted"] = 1
+        projection["tasksPending"] = 1
+    return projection
+
+def response_projection(fields: List[str], sort: str) -> Dict[str, Any]:
+    """``$project`` shaping stored members straight into API rows.
+
+    Renames ``_id`` to ``id`` and computes totalTasks, so read handlers can
+    encode the rows without building models. The sort key is kept for the
+    cursor even when not requested; ``strip_sort_key`` removes it again.
+    """
+    projection: Dict[str, Any] = {"_id": 0, "id": "$_id"}
+    computed = {"totalTasks": TOTAL_TASKS_EXPR, "version": VERSION_EXPR}
+    for field in fields:
+        projection[field] = computed.get(field, 1)
+    if SORT_FIELDS[sort] != "_id":
+        projection[SORT_FIELDS[sort]] = 1
+    return projection
+
+def document_row(document: Dict[str, Any], fields: List[str]) -> Dict[str, Any]:
+    """Python equivalent of ``response_projection`` for a document already in hand"""
+    row: Dict[str, Any] = {"id": document["_id"]}
+    for field in fields:
+        if field == "totalTasks":
+            row[field] = (document.get("tasksCompleted") or 0) + (document.get("tasksPending") or 0)
+        elif field == "version":
+            row[field] = document.get("version") or 0
+        elif field in document:
+            row[field] = document[field]
+    return row
+
+def list_pipeline(query: Dict[str, Any], fields: List[str], sort: str, order: str, limit: int) -> List[Dict[str, Any]]:
+    """Aggregation returning a page of API rows"""
+    return [
+        {"$match": query},
+        {"$sort": dict(sort_spec(sort, order))},
+        {"$limit": limit},
+        {"$project": response_projection(fields, sort)},
+    ]
+
+async def fetch_top_performer(database: AsyncIOMotorDatabase, committee_id: str, member_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """The committee's most efficient member, or ``member_id``, as a GET /members/{id} row with its history.
+
+    The sort is served by the (committeeId, efficiency desc, _id asc) index.
+    """
+    query = {"committeeId": committee_id}
+    if member_id is not None:
+        query["_id"] = member_id
+    rows = await database.committee_members.aggregate(list_pipeline(query, ALL_FIELDS, "efficiency", "desc", 1)).to_list(1)
+    await history.attach_performance_history(database, committee_id, rows)
+    return rows[0] if rows else None
+
+def strip_sort_key(rows: List[Dict[str, Any]], fields: List[str], sort: str) -> None:
+    """Drop a sort key that was only projected for the cursor"""
+    field = SORT_FIELDS[sort]
+    if field != "_id" and field not in fields:
+        for row in rows:
+            row.pop(field, None)
+
+def build_filter(
+    committee_id: str,
+    role: Optional[str],
+    min_efficiency: Optional[int],
+    max_efficiency: Optional[int],
+    min_registrations: Optional[int],
+    max_registrations: Optional[int],
+) -> Dict[str, Any]:
+    """Mongo filter for the member list query parameters within one committee"""
+    query: Dict[str, Any] = {"committeeId": committee_id}
+    if role:
+        query["role"] = role
+    for field, low, high in (
+        ("efficiency", min_efficiency, max_efficiency),
+        ("registrationsBrought", min_registrations, max_registrations),
+    ):
+        bounds = {}
+        if low is not None:
+            bounds["$gte"] = low
+        if high is not None:
+            bounds["$lte"] = high
+        if bounds:
+            query[field] = bounds
+    return query
+
+def sort_spec(sort: str, order: str) -> List[Tuple[str, int]]:
+    """Sort specification, with _id breaking ties.
+
+    Ties on a metric are ordered by _id in the opposite direction, so both
+    orders walk the same ``(metric desc, _id asc)`` index.
+    """
+    field = SORT_FIELDS[sort]
+    direction = -1 if order == "desc" else 1
+    if field == "_id":
+        return [("_id", direction)]
+    return [(field, direction), ("_id", -direction)]
+
+def encode_cursor(sort: str, order: str, row: Dict[str, Any]) -> str:
+    """Opaque cursor pointing just after ``row``, a ``response_projection`` row"""
+    field = SORT_FIELDS[sort]
+    payload = {"s": sort, "o": order, "id": row["id"]}
+    if field != "_id":
+        payload["v"] = row.get(field)
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str, sort: str, order: str) -> Dict[str, Any]:
+    """Turn a cursor back into a Mongo filter for the next page"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        last_id = payload["id"]
+    except (ValueError, KeyError, TypeError):
+        raise InvalidQuery("Invalid cursor")
+    if payload.get("s") != sort or payload.get("o") != order:
+        raise InvalidQuery("Cursor does not match the requested sort")
+
+    (field, direction), *_ = sort_spec(sort, order)
+    after = "$gt" if direction == 1 else "$lt"
+    if field == "_id":
+        return {"_id": {after: last_id}}
+    tie_after = "$lt" if direction == 1 else "$gt"
+    return {
+        "$or": [
+            {field: {after: payload.get("v")}},
+            {field: payload.get("v"), "_id": {tie_after: last_id}},
+        ]
+    }
+
+def to_response(document: Dict[str, Any], fields: List[str]) -> Dict[str, Any]:
+    """Shape a projected member document for the API"""
+    member = {"id": str(document["_id"])}
+    for field in fields:
+        if field == "totalTasks":
+            member["totalTasks"] = (document.get("tasksCompleted") or 0) + (document.get("tasksPending") or 0)
+        elif field in document:
+            member[field] = document[field]
+    return member
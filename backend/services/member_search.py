@@ -0,0 +1,231 @@
+from bisect import bisect_left, insort
+from typing import Any, Dict, List, Optional, Set, Tuple
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from services.member_index import CommitteeIndexes, MemberIndex
+from services.response_cache import response_cache
+import heapq
+import re
+import unicodedata
+
+# Searched member fields and how much a match in each counts, highest first
+FIELD_WEIGHTS = {"name": 3.0, "role": 2.0, "contact": 1.0}
+
+# A query term equal to a token scores this much more than one only prefixing it
+EXACT_BONUS = 2.0
+
+# Longest query accepted, in terms
+MAX_TERMS = 8
+
+# Prefixes up to this length match most members, so their matches are kept precomputed
+SHORT_PREFIX = 2
+
+# Letters and digits are separate words: "mchen84" is "mchen" and "84", which keeps
+# numbered emails from adding a word per member under every surname prefix
+TOKEN_PATTERN = re.compile(r"[a-z]+|[0-9]+")
+
+def normalize(text: str) -> str:
+    """Lowercase without accents, so that "jose" finds "José"."""
+    if text.isascii():
+        return text.lower()
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Words of a field value; emails split at "." and "@" """
+    return TOKEN_PATTERN.findall(normalize(text)) if text else []
+
+class InvalidSearch(ValueError):
+    """Raised for a query without searchable terms"""
+
+def parse_query(query: str) -> List[str]:
+    terms = list(dict.fromkeys(tokenize(query)))
+    if not terms:
+        raise InvalidSearch("q must contain letters or digits")
+    if len(terms) > MAX_TERMS:
+        raise InvalidSearch(f"q may hold at most {MAX_TERMS} terms")
+    return terms
+
+Level = Tuple[float, Set[str]]
+
+class SearchIndex(MemberIndex):
+    """Inverted index over one committee's member names, roles and contacts.
+
+    Every term of a query must match the start of a word in one of the
+    fields, so "sar joh" finds "Sarah Johnson" as the user types. Postings
+    map each word to the members holding it, grouped by the weight of the
+    best field it appears in; the sorted word list turns a prefix into a
+    contiguous range found by bisect.
+
+    A term's matches are split into score levels, sets of members with
+    the same score, so ranking and counting are set operations and only
+    the page being returned is sorted by name. One and two letter terms
+    expand to thousands of words; their levels are kept per prefix instead.
+    """
+
+    fields = tuple(FIELD_WEIGHTS)
+
+    def __init__(self, committee_id: str):
+        super().__init__(committee_id)
+        self.words: List[str] = []
+        self.postings: Dict[str, Dict[float, Set[str]]] = {}
+        self.documents: Dict[str, Dict[str, Any]] = {}
+        # Normalized name, then id: one string compares faster than a tuple
+        self.sort_keys: Dict[str, str] = {}
+        self.short_prefixes: Dict[str, Dict[float, Set[str]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def load(self, members: List[Dict[str, Any]]) -> None:
+        self.words, self.postings, self.documents, self.sort_keys, self.short_prefixes = [], {}, {}, {}, {}
+        for member in members:
+            self._add(member["_id"], member, keep_sorted=False)
+        self.words = sorted(self.postings)
+
+    def apply_one(self, member_id: str, member: Optional[Dict[str, Any]]) -> None:
+        old_words = self._remove(member_id)
+        if member is not None:
+            self._add(member_id, member)
+        for word in old_words:
+            if not self.postings[word]:
+                del self.postings[word]
+                del self.words[bisect_left(self.words, word)]
+
+    def _add(self, member_id: str, member: Dict[str, Any], keep_sorted: bool = True) -> None:
+        # Fields come highest weight first, so the first weight seen for a word or prefix is its best
+        weights: Dict[str, float] = {}
+        for field, weight in FIELD_WEIGHTS.items():
+            for word in tokenize(member.get(field)):
+                weights.setdefault(word, weight)
+        prefixes: Dict[str, float] = {}
+        for word, weight in weights.items():
+            for length in range(1, SHORT_PREFIX + 1):
+                prefixes.setdefault(word[:length], weight)
+        self.documents[member_id] = {
+            "row": {"id": member_id, **{field: member.get(field) for field in FIELD_WEIGHTS}},
+            "weights": weights,
+            "prefixes": prefixes,
+        }
+        self.sort_keys[member_id] = f"{normalize(member.get('name') or '')}\0{member_id}"
+        for word, weight in weights.items():
+            posting = self.postings.get(word)
+            if posting is None:
+                posting = self.postings[word] = {}
+                if keep_sorted:
+                    insort(self.words, word)
+            posting.setdefault(weight, set()).add(member_id)
+        for prefix, weight in prefixes.items():
+            self.short_prefixes.setdefault(prefix, {}).setdefault(weight, set()).add(member_id)
+
+    def _remove(self, member_id: str) -> Set[str]:
+        """Drop a member, leaving emptied postings for apply_one to prune"""
+        document = self.documents.pop(member_id, None)
+        if document is None:
+            return set()
+        del self.sort_keys[member_id]
+        for word, weight in document["weights"].items():
+            posting = self.postings[word]
+            posting[weight].discard(member_id)
+            if not posting[weight]:
+                del posting[weight]
+        for prefix, weight in document["prefixes"].items():
+            levels = self.short_prefixes[prefix]
+            levels[weight].discard(member_id)
+            if not levels[weight]:
+                del levels[weight]
+        return set(document["weights"])
+
+    def prefixed(self, term: str) -> List[str]:
+        """Indexed words starting with ``term``"""
+        start = bisect_left(self.words, term)
+        stop = bisect_left(self.words, term + "\uffff", start)
+        return self.words[start:stop]
+
+    def term_levels(self, term: str) -> List[Level]:
+        """Members matching ``term`` by score, best first, each member only at its best score"""
+        grouped: Dict[float, List[Set[str]]] = {}
+        if len(term) <= SHORT_PREFIX:
+            exact = self.postings.get(term, {})
+            if not exact:
+                return sorted(self.short_prefixes.get(term, {}).items(), key=lambda level: -level[0])
+            for weight, members in exact.items():
+                grouped.setdefault(weight * EXACT_BONUS, []).append(members)
+            for weight, members in self.short_prefixes.get(term, {}).items():
+                grouped.setdefault(weight, []).append(members)
+        else:
+            for word in self.prefixed(term):
+                bonus = EXACT_BONUS if word == term else 1.0
+                for weight, members in self.postings[word].items():
+                    grouped.setdefault(weight * bonus, []).append(members)
+        levels: List[Level] = []
+        seen: Set[str] = set()
+        for score in sorted(grouped, reverse=True):
+            members = set().union(*grouped[score]) - seen
+            if members:
+                levels.append((score, members))
+                seen |= members
+        return levels
+
+    def combined_levels(self, terms: List[str]) -> List[Level]:
+        """Members matching every term by summed score, best first.
+
+        Levels of successive terms are intersected pairwise; a term has a
+        handful of levels, so this is a few set intersections per term.
+        """
+        per_term = sorted((self.term_levels(term) for term in terms), key=lambda levels: sum(len(members) for _, members in levels))
+        combined = per_term[0]
+        for levels in per_term[1:]:
+            by_score: Dict[float, Set[str]] = {}
+            for score, members in combined:
+                for term_score, term_members in levels:
+                    both = members & term_members
+                    if both:
+                        by_score.setdefault(score + term_score, set()).update(both)
+            combined = sorted(by_score.items(), key=lambda level: -level[0])
+        return combined
+
+    def first_by_name(self, members: Set[str], count: int) -> List[str]:
+        """The first ``count`` of ``members`` by name"""
+        keys = heapq.nsmallest(count, map(self.sort_keys.__getitem__, members))
+        return [key.rpartition("\0")[2] for key in keys]
+
+    def search(self, terms: List[str], offset: int, limit: int) -> Tuple[int, List[Dict[str, Any]]]:
+        """Total matches and one page of them, best score first, then by name and id"""
+        levels = self.combined_levels(terms)
+        rows: List[Dict[str, Any]] = []
+        skip = offset
+        for score, members in levels:
+            if len(rows) == limit:
+                break
+            if skip >= len(members):
+                skip -= len(members)
+                continue
+            page = self.first_by_name(members, skip + limit - len(rows))[skip:]
+            skip = 0
+            rows.extend({**self.documents[member_id]["row"], "score": score} for member_id in page)
+        return sum(len(members) for _, members in levels), rows
+
+class CommitteeSearchIndexes(CommitteeIndexes[SearchIndex]):
+    """A SearchIndex per committee"""
+
+    def __init__(self):
+        super().__init__(SearchIndex)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters exposed on /api/admin/search"""
+        return {
+            **self.load_stats(),
+            "members": sum(len(index) for index in self.committees.values()),
+            "words": sum(len(index.words) for index in self.committees.values()),
+        }
+
+async def search(database: AsyncIOMotorDatabase, committee_id: str, query: str, offset: int, limit: int) -> Dict[str, Any]:
+    """A page of a committee's members matching ``query``"""
+    terms = parse_query(query)
+    index = await search_index.loaded(database, committee_id)
+    total, rows = index.search(terms, offset, limit)
+    return {"query": query, "terms": terms, "total": total, "offset": offset, "members": rows}
+
+# Process-wide search indexes kept in sync by the member write path
+search_index = CommitteeSearchIndexes()
+response_cache.on_remote_invalidation(search_index.invalidate)
@@ -0,0 +1,159 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from database import get_db
+from models.committee_member import CommitteeMemberUpdate
+from services import history, summary
+from services.analytics import TOTAL_TASKS_EXPR, VERSION_EXPR
+from services.columnar import member_columns
+from services.committees import committee_of, committees_of
+from services.leaderboard import leaderboard
+from services.member_search import search_index
+from services.response_cache import response_cache
+from datetime import datetime
+import logging
+
+logger = logging.getLogger(__name__)
+
+MemberChange = Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]
+
+class InvalidPrecondition(ValueError):
+    """Raised for an If-Match header that is not a member ETag"""
+
+def build_member_update(member_update: CommitteeMemberUpdate) -> Dict[str, Any]:
+    """Fields to set for an update; totalTasks and version come from member_update_pipeline"""
+    update_data = {k: v for k, v in member_update.dict().items() if v is not None}
+    # BSON dates hold milliseconds; truncating keeps updated_document equal to what is stored
+    now = datetime.utcnow()
+    update_data["updatedAt"] = now.replace(microsecond=now.microsecond // 1000 * 1000)
+    return update_data
+
+def member_update_pipeline(update_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Update pipeline setting ``update_data`` and deriving totalTasks and version server-side.
+
+    totalTasks is computed in a second stage so it sees the new task counts;
+    values are wrapped in $literal so strings starting with "$" stay strings.
+    """
+    return [
+        {"$set": {field: {"$literal": value} for field, value in update_data.items()}},
+        {"$set": {"totalTasks": TOTAL_TASKS_EXPR, "version": {"$add": [VERSION_EXPR, 1]}}},
+    ]
+
+def updated_document(before: Dict[str, Any], update_data: Dict[str, Any]) -> Dict[str, Any]:
+    """The document member_update_pipeline produced from the pre-image ``before``"""
+    after = {**before, **update_data}
+    after["totalTasks"] = (after.get("tasksCompleted") or 0) + (after.get("tasksPending") or 0)
+    after["version"] = (before.get("version") or 0) + 1
+    return after
+
+def member_etag(version: int) -> str:
+    return f'"{version}"'
+
+def parse_if_match(if_match: Optional[str]) -> Optional[List[int]]:
+    """Versions an If-Match header accepts; None when absent or ``*``"""
+    if if_match is None or if_match.strip() == "*":
+        return None
+    versions = []
+    for tag in if_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        try:
+            versions.append(int(tag.strip('"')))
+        except ValueError:
+            raise InvalidPrecondition(f"If-Match must hold member ETags, got {tag}")
+    return versions
+
+def version_filter(versions: List[int]) -> Dict[str, Any]:
+    """Filter matching members at one of ``versions``; version 0 also matches unversioned ones"""
+    if 0 in versions:
+        return {"$or": [{"version": {"$in": versions}}, {"version": {"$exists": False}}]}
+    return {"version": {"$in": versions}}
+
+def split_performance_history(document: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+    """Remove performanceHistory from a document about to be written.
+
+    History lives in the time-series collection, so member documents stay
+    constant-size. Returns None when the write does not touch history.
+    """
+    entries = document.pop("performanceHistory", None)
+    if entries is None:
+        return None
+    return [entry if isinstance(entry, dict) else entry.dict() for entry in entries]
+
+async def store_scores(database: AsyncIOMotorDatabase, committee_id: str, member_id: str, performance_history: List[Dict[str, Any]]) -> None:
+    """Replace a written member's score history, logging failures.
+
+    The member write already succeeded, so its derived state must still be
+    updated; the scores can be sent again with the next update.
+    """
+    try:
+        await history.replace_scores(database, committee_id, member_id, performance_history)
+    except Exception as e:
+        logger.error(f"Error storing performance history of member {member_id}: {str(e)}")
+
+def registration_changes(changes: Iterable[MemberChange]) -> List[Dict[str, Any]]:
+    """Registration deltas implied by a batch of member writes"""
+    deltas = []
+    for old, new in changes:
+        if new is None:
+            continue  # Registrations already recorded stay in the history
+        delta = (new.get("registrationsBrought") or 0) - ((old or {}).get("registrationsBrought") or 0)
+        if delta:
+            timestamp = new.get("updatedAt")
+            deltas.append({
+                "committeeId": committee_of((old, new)),
+                "memberId": new["_id"],
+                "delta": delta,
+                "timestamp": timestamp if isinstance(timestamp, datetime) else datetime.utcnow(),
+            })
+    return deltas
+
+async def apply_member_writes(changes: Iterable[MemberChange]) -> None:
+    """Propagate a batch of member writes to derived state.
+
+    Each change is ``(old, new)``: the document before the write (None for
+    inserts) and after it (None for deletes).
+    """
+    changes = list(changes)
+    db = get_db()
+    try:
+        await summary.apply_member_deltas(db, changes)
+    except Exception as e:
+        # The member writes already succeeded; drift is repaired by `cli.py rebuild-summary`
+        logger.error(f"Error updating analytics summary: {str(e)}")
+    
+    try:
+        await history.record_registrations(db, registration_changes(changes))
+    except Exception as e:
+        logger.error(f"Error recording registration history: {str(e)}")
+
+    try:
+        # Points of deleted members would keep counting in rollups
+        deleted: Dict[str, List[str]] = {}
+        for old, new in changes:
+            if new is None:
+                deleted.setdefault(committee_of((old, new)), []).append(old["_id"])
+        for committee_id, member_ids in deleted.items():
+            await history.delete_member_points(db, committee_id, member_ids)
+    except Exception as e:
+        logger.error(f"Error deleting history of deleted members: {str(e)}")
+    
+    for name, indexes in (("leaderboard", leaderboard), ("search index", search_index), ("member columns", member_columns)):
+        try:
+            indexes.apply(changes)
+        except Exception as e:
+            # The affected committees' indexes are dropped, so their next query reloads them
+            logger.error(f"Error updating {name}: {str(e)}")
+            for committee_id in committees_of(changes):
+                indexes.invalidate(committee_id)
+    
+    # A committee's cached member lists and analytics are stale once any of its members changes
+    for committee_id in committees_of(changes):
+        try:
+            await response_cache.invalidate(committee_id)
+        except Exception as e:
+            logger.error(f"Error invalidating cached responses of committee {committee_id}: {str(e)}")
+
+async def apply_member_write(old: Optional[Dict[str, Any]], new: Optional[Dict[str, Any]]) -> None:
+    """Propagate a single member write to derived state"""
+    await apply_member_writes([(old, new)])
@@ -0,0 +1,181 @@
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from pymongo import monitoring
+from starlette.routing import Match, Router
+from services.mongo_metrics import pool_metrics
+import threading
+
+# Request latency buckets in seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# ASGI scope of the request being handled, read by the Mongo command listener
+current_scope: ContextVar[Optional[Dict[str, Any]]] = ContextVar("current_scope", default=None)
+
+def escape_label(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    """Prometheus label set, e.g. ``{method="GET",route="/api"}``"""
+    pairs = [f'{name}="{escape_label(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+class Counter:
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: Tuple[str, ...] = (), amount: float = 1) -> None:
+        with self._lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self.values.items()):
+                lines.append(f"{self.name}{format_labels(self.label_names, labels)} {value}")
+        return lines
+
+class Gauge(Counter):
+    def dec(self, labels: Tuple[str, ...] = (), amount: float = 1) -> None:
+        self.inc(labels, -amount)
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        lines[1] = f"# TYPE {self.name} gauge"
+        return lines
+
+class Histogram:
+    """Fixed-bucket histogram; observations are one bisect and three increments"""
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts (+Inf last), sum, count]
+        self.series: Dict[Tuple[str, ...], List[Any]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: Tuple[str, ...], value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self.series.get(labels)
+            if series is None:
+                series = self.series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = [(labels, list(series[0]), series[1], series[2]) for labels, series in sorted(self.series.items())]
+        for labels, counts, total, count in snapshot:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                bucket_labels = format_labels(self.label_names, labels, 'le="' + le + '"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{format_labels(self.label_names, labels)} {total}")
+            lines.append(f"{self.name}_count{format_labels(self.label_names, labels)} {count}")
+        return lines
+
+http_requests = Counter("http_requests_total", "HTTP requests by route and status code", ("method", "route", "status"))
+http_latency = Histogram("http_request_duration_seconds", "HTTP request latency by route", ("method", "route"))
+http_in_flight = Gauge("http_requests_in_flight", "HTTP requests currently being handled")
+mongo_commands = Histogram("mongo_command_duration_seconds", "MongoDB command latency by route and command", ("route", "command"))
+mongo_command_failures = Counter("mongo_command_failures_total", "Failed MongoDB commands by route and command", ("route", "command"))
+
+def route_label(scope: Optional[Dict[str, Any]]) -> str:
+    """Route template of a request (``/api/members/{member_id}``), not the raw path"""
+    if scope is None:
+        return "background"
+    route = scope.get("route")
+    return getattr(route, "path_format", None) or getattr(route, "path", None) or "unmatched"
+
+class RouteMatcher:
+    """Route templates of requests, matching ``router`` for those that never reached it.
+
+    Requests answered before routing (cache hits, 304s) have no route in
+    their scope. Matches are remembered per path, up to MATCH_CACHE_SIZE paths.
+    """
+
+    MATCH_CACHE_SIZE = 4096
+
+    def __init__(self, router: Optional[Router] = None):
+        self.router = router
+        self.matched: Dict[Tuple[str, str], str] = {}
+
+    def label(self, scope: Dict[str, Any]) -> str:
+        if "route" in scope or self.router is None:
+            return route_label(scope)
+        key = (scope["method"], scope["path"])
+        label = self.matched.get(key)
+        if label is None:
+            label = "unmatched"
+            for route in self.router.routes:
+                match, child_scope = route.matches(scope)
+                if match == Match.FULL:
+                    label = route_label(child_scope)
+                    break
+            if len(self.matched) >= self.MATCH_CACHE_SIZE:
+                self.matched.clear()
+            self.matched[key] = label
+        return label
+
+class RouteCommandListener(monitoring.CommandListener):
+    """Times each Mongo command under the route that issued it.
+
+    Motor runs driver calls with a copy of the caller's context, so the
+    request scope set by MetricsMiddleware is visible here.
+    """
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        mongo_commands.observe((route_label(current_scope.get()), event.command_name), event.duration_micros / 1_000_000)
+
+    def failed(self, event):
+        labels = (route_label(current_scope.get()), event.command_name)
+        mongo_commands.observe(labels, event.duration_micros / 1_000_000)
+        mongo_command_failures.inc(labels)
+
+def render_pool_metrics() -> List[str]:
+    """Connection pool gauges from services.mongo_metrics"""
+    stats = pool_metrics.stats()
+    wait = stats["checkoutWait"]
+    lines = [
+        "# HELP mongo_pool_connections Open pooled MongoDB connections",
+        "# TYPE mongo_pool_connections gauge",
+        f"mongo_pool_connections {stats['open']}",
+        "# HELP mongo_pool_connections_in_use Pooled MongoDB connections checked out",
+        "# TYPE mongo_pool_connections_in_use gauge",
+        f"mongo_pool_connections_in_use {stats['inUse']}",
+        "# HELP mongo_pool_checkout_wait_seconds Time spent waiting for a pooled connection",
+        "# TYPE mongo_pool_checkout_wait_seconds summary",
+        f"mongo_pool_checkout_wait_seconds_sum {wait['totalMs'] / 1000}",
+        f"mongo_pool_checkout_wait_seconds_count {wait['count']}",
+        "# HELP mongo_pool_checkout_failures_total Failed connection checkouts by reason",
+        "# TYPE mongo_pool_checkout_failures_total counter",
+    ]
+    for reason, count in sorted(stats["checkoutFailures"].items()):
+        lines.append(f"mongo_pool_checkout_failures_total{format_labels(('reason',), (reason,))} {count}")
+    return lines
+
+def render() -> str:
+    """Every metric in the Prometheus text exposition format"""
+    lines: List[str] = []
+    for metric in (http_requests, http_latency, http_in_flight, mongo_commands, mongo_command_failures):
+        lines.extend(metric.render())
+    lines.extend(render_pool_metrics())
+    return "\n".join(lines) + "\n"
+
+route_command_listener = RouteCommandListener()
@@ -0,0 +1,155 @@
+from collections import deque
+from typing import Any, Deque, Dict
+from pymongo import monitoring
+import threading
+import time
+
+# Recent samples kept for percentiles
+SAMPLE_WINDOW = 1024
+
+class LatencyStats:
+    """Count, total and max of a latency, plus a window of recent samples"""
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.recent: Deque[float] = deque(maxlen=SAMPLE_WINDOW)
+
+    def observe(self, ms: float) -> None:
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        self.recent.append(ms)
+
+    def snapshot(self) -> Dict[str, float]:
+        recent = sorted(self.recent)
+
+        def percentile(fraction: float) -> float:
+            return round(recent[min(len(recent) - 1, int(len(recent) * fraction))], 3) if recent else 0
+
+        return {
+            "count": self.count,
+            "totalMs": round(self.total_ms, 3),
+            "avgMs": round(self.total_ms / self.count, 3) if self.count else 0,
+            "maxMs": round(self.max_ms, 3),
+            "p50Ms": percentile(0.5),
+            "p99Ms": percentile(0.99),
+        }
+
+class PoolMetrics(monitoring.ConnectionPoolListener):
+    """Connection pool gauges and checkout wait times.
+
+    PyMongo runs each operation's checkout on one thread, so the wait is the
+    time between CheckOutStarted and CheckedOut/CheckOutFailed on that thread.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._started = threading.local()
+        self.open = 0
+        self.in_use = 0
+        self.created = 0
+        self.closed = 0
+        self.cleared = 0
+        self.checkout_failures: Dict[str, int] = {}
+        self.wait = LatencyStats()
+
+    def _waited(self) -> float:
+        started = getattr(self._started, "at", None)
+        self._started.at = None
+        return (time.perf_counter() - started) * 1000 if started is not None else 0.0
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self.cleared += 1
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        with self._lock:
+            self.open += 1
+            self.created += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.open -= 1
+            self.closed += 1
+
+    def connection_check_out_started(self, event):
+        self._started.at = time.perf_counter()
+
+    def connection_check_out_failed(self, event):
+        waited = self._waited()
+        with self._lock:
+            self.wait.observe(waited)
+            reason = str(event.reason)
+            self.checkout_failures[reason] = self.checkout_failures.get(reason, 0) + 1
+
+    def connection_checked_out(self, event):
+        waited = self._waited()
+        with self._lock:
+            self.in_use += 1
+            self.wait.observe(waited)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.in_use -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "open": self.open,
+                "inUse": self.in_use,
+                "created": self.created,
+                "closed": self.closed,
+                "cleared": self.cleared,
+                "checkoutWait": self.wait.snapshot(),
+                "checkoutFailures": dict(self.checkout_failures),
+            }
+
+class CommandMetrics(monitoring.CommandListener):
+    """Latency and failures per command name"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.commands: Dict[str, LatencyStats] = {}
+        self.failures: Dict[str, int] = {}
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self._observe(event.command_name, event.duration_micros / 1000)
+
+    def failed(self, event):
+        self._observe(event.command_name, event.duration_micros / 1000)
+        with self._lock:
+            self.failures[event.command_name] = self.failures.get(event.command_name, 0) + 1
+
+    def _observe(self, command: str, ms: float) -> None:
+        with self._lock:
+            if command not in self.commands:
+                self.commands[command] = LatencyStats()
+            self.commands[command].observe(ms)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                command: {**latency.snapshot(), "failures": self.failures.get(command, 0)}
+                for command, latency in sorted(self.commands.items())
+            }
+
+# Registered on the Motor client in database.py
+pool_metrics = PoolMetrics()
+command_metrics = CommandMetrics()
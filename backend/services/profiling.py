@@ -0,0 +1,229 @@
+from collections import deque
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from bson import json_util
+from pymongo import monitoring
+import cProfile
+import itertools
+import json
+import os
+import pstats
+import threading
+
+# Commands the server can explain
+EXPLAINABLE_COMMANDS = {"find", "aggregate", "count", "distinct", "update", "delete", "findAndModify"}
+
+# Driver-added fields that explain rejects or that only add noise to the log
+SESSION_FIELDS = {"lsid", "txnNumber", "$clusterTime", "$db", "$readPreference", "readConcern", "autocommit", "startTransaction"}
+
+# Profile time is grouped by where the code lives
+PROFILE_GROUPS = (
+    ("routes", ("/routes/",)),
+    ("services", ("/services/",)),
+    ("models", ("/models/",)),
+    ("pydantic", ("/pydantic/", "/pydantic_core/")),
+    ("driver", ("/motor/", "/pymongo/", "/bson/")),
+    ("framework", ("/fastapi/", "/starlette/", "/anyio/")),
+    ("serialization", ("/orjson", "/json/")),
+    ("asyncio", ("/asyncio/",)),
+)
+
+# Groups holding this repo's code
+PROJECT_GROUPS = {"routes", "services", "models"}
+
+# Rows listed per profile table
+PROFILE_TOP = 25
+
+class RequestTrace:
+    """Mongo activity of one request, filled in by SlowQueryListener"""
+
+    __slots__ = ("commands", "mongo_ms", "slow_queries")
+
+    def __init__(self):
+        self.commands = 0
+        self.mongo_ms = 0.0
+        self.slow_queries: List[int] = []
+
+# Trace of the request being handled; Motor copies it into its executor threads
+current_trace: ContextVar[Optional[RequestTrace]] = ContextVar("current_trace", default=None)
+
+def clean_command(command: Dict[str, Any]) -> Dict[str, Any]:
+    """Command document without session and cluster bookkeeping"""
+    return {key: value for key, value in command.items() if key not in SESSION_FIELDS}
+
+def to_json(value: Any) -> Any:
+    """Command documents and plans may hold BSON types; relaxed Extended JSON is readable"""
+    return json.loads(json_util.dumps(value))
+
+def query_view(entry: Dict[str, Any], with_explain: bool) -> Dict[str, Any]:
+    view = {key: value for key, value in entry.items() if key not in ("document", "explain")}
+    view["document"] = to_json(entry["document"])
+    if with_explain:
+        view["explain"] = to_json(entry.get("explain"))
+    else:
+        view["explained"] = "explain" in entry
+    return view
+
+def profile_group(filename: str) -> str:
+    normalized = filename.replace("\\", "/")
+    for group, markers in PROFILE_GROUPS:
+        if any(marker in normalized for marker in markers):
+            return group
+    return "builtins" if filename == "~" else "other"
+
+def summarize_profile(profiler: cProfile.Profile) -> Dict[str, Any]:
+    """Own time per code group, project functions by cumulative time, and hotspots by own time"""
+    stats = pstats.Stats(profiler).stats
+    groups: Dict[str, float] = {}
+    functions = []
+    for (filename, line, name), (_, calls, own, cumulative, _) in stats.items():
+        group = profile_group(filename)
+        groups[group] = groups.get(group, 0.0) + own
+        functions.append({
+            "function": f"{filename.rsplit('/backend/', 1)[-1]}:{line}({name})",
+            "group": group,
+            "calls": calls,
+            "ownMs": round(own * 1000, 3),
+            "cumulativeMs": round(cumulative * 1000, 3),
+        })
+    project = sorted((row for row in functions if row["group"] in PROJECT_GROUPS), key=lambda row: -row["cumulativeMs"])
+    return {
+        "groupsMs": {group: round(seconds * 1000, 3) for group, seconds in sorted(groups.items(), key=lambda item: -item[1])},
+        "functions": project[:PROFILE_TOP],
+        "hotspots": sorted(functions, key=lambda row: -row["ownMs"])[:PROFILE_TOP],
+    }
+
+class RequestProfiler:
+    """Sampled cProfile runs, slow request and slow query ring buffers.
+
+    A request is profiled when it wins the ``sample_rate`` draw or, with
+    ``allow_header``, sends ``X-Profile: 1``. cProfile hooks the whole thread,
+    so only one request is profiled at a time and the profile also contains
+    whatever other requests ran while it awaited.
+
+    Requests slower than ``slow_request_ms`` and profiled requests are kept in
+    a ring buffer of ``max_entries``; Mongo commands slower than
+    ``slow_query_ms`` go into a second one. Explain plans are fetched when
+    asked for, not when the slow command is recorded.
+    """
+
+    def __init__(self, sample_rate: float, allow_header: bool, slow_request_ms: float, slow_query_ms: float, max_entries: int):
+        self.sample_rate = sample_rate
+        self.allow_header = allow_header
+        self.slow_request_ms = slow_request_ms
+        self.slow_query_ms = slow_query_ms
+        self.requests: Deque[Dict[str, Any]] = deque(maxlen=max_entries)
+        self.queries: Deque[Dict[str, Any]] = deque(maxlen=max_entries)
+        self.profiling = False
+        self.profiled = 0
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def next_id(self) -> int:
+        with self._lock:
+            return next(self._ids)
+
+    def record_request(self, entry: Dict[str, Any]) -> None:
+        self.requests.append(entry)
+
+    def record_query(self, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self.queries.append(entry)
+
+    def find(self, buffer: Deque[Dict[str, Any]], entry_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return next((entry for entry in buffer if entry["id"] == entry_id), None)
+
+    def recent_requests(self) -> List[Dict[str, Any]]:
+        """Newest first, without profile function tables"""
+        return [
+            {key: value for key, value in entry.items() if key != "profile"} | {"profiled": "profile" in entry}
+            for entry in reversed(list(self.requests))
+        ]
+
+    def recent_queries(self) -> List[Dict[str, Any]]:
+        """Newest first, without explain plans"""
+        with self._lock:
+            entries = list(self.queries)
+        return [query_view(entry, with_explain=False) for entry in reversed(entries)]
+
+    async def explain(self, database: AsyncIOMotorDatabase, query_id: int) -> Optional[Dict[str, Any]]:
+        """Query planner output for a recorded slow command, cached on the entry"""
+        entry = self.find(self.queries, query_id)
+        if entry is None:
+            return None
+        if "explain" not in entry:
+            if entry["document"] is None or entry["command"] not in EXPLAINABLE_COMMANDS:
+                raise ValueError(f"{entry['command']} commands cannot be explained")
+            plan = await database.client[entry["database"]].command(
+                {"explain": entry["document"], "verbosity": "queryPlanner"}
+            )
+            entry["explain"] = {key: value for key, value in plan.items() if key in ("queryPlanner", "stages", "command")}
+        return query_view(entry, with_explain=True)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.requests.clear()
+            self.queries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "sampleRate": self.sample_rate,
+            "allowHeader": self.allow_header,
+            "slowRequestMs": self.slow_request_ms,
+            "slowQueryMs": self.slow_query_ms,
+            "profiled": self.profiled,
+            "slowRequests": len(self.requests),
+            "slowQueries": len(self.queries),
+        }
+
+class SlowQueryListener(monitoring.CommandListener):
+    """Adds every command's time to the current request and records slow ones"""
+
+    def __init__(self, profiler: RequestProfiler):
+        self.profiler = profiler
+        self._started: Dict[Any, Dict[str, Any]] = {}
+
+    def started(self, event):
+        if event.command_name in EXPLAINABLE_COMMANDS:
+            self._started[(event.connection_id, event.request_id)] = event.command
+
+    def succeeded(self, event):
+        self._finished(event, None)
+
+    def failed(self, event):
+        self._finished(event, str(event.failure.get("errmsg", event.failure)))
+
+    def _finished(self, event, error: Optional[str]) -> None:
+        command = self._started.pop((event.connection_id, event.request_id), None)
+        ms = event.duration_micros / 1000
+        trace = current_trace.get()
+        if trace is not None:
+            trace.commands += 1
+            trace.mongo_ms += ms
+        if ms < self.profiler.slow_query_ms:
+            return
+        entry = {
+            "id": self.profiler.next_id(),
+            "at": datetime.utcnow().isoformat(),
+            "command": event.command_name,
+            "database": event.database_name,
+            "durationMs": round(ms, 3),
+            "error": error,
+            "document": clean_command(command) if command is not None else None,
+        }
+        self.profiler.record_query(entry)
+        if trace is not None:
+            trace.slow_queries.append(entry["id"])
+
+request_profiler = RequestProfiler(
+    sample_rate=float(os.getenv('PROFILING_SAMPLE_RATE', '0')),
+    allow_header=os.getenv('PROFILING_ALLOW_HEADER', 'false').lower() == 'true',
+    slow_request_ms=float(os.getenv('SLOW_REQUEST_MS', '500')),
+    slow_query_ms=float(os.getenv('SLOW_QUERY_MS', '100')),
+    max_entries=int(os.getenv('SLOW_LOG_SIZE', '100')),
+)
+# Registered on the Motor client in database.py
+slow_query_listener = SlowQueryListener(request_profiler)
@@ -0,0 +1,281 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import CursorType
+from pymongo.errors import CollectionInvalid
+from datetime import datetime
+import asyncio
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class CachedResponse:
+    status_code: int
+    headers: List[Tuple[str, str]]
+    body: bytes
+    etag: str
+    expires_at: float = field(default=0.0)
+
+# Cache position of a committee: (installation-wide generation, committee generation)
+Generation = Tuple[int, int]
+
+class CacheBackend:
+    """Interface the response cache middleware and write path rely on.
+
+    Entries belong to a committee; a write invalidates its own committee's
+    entries, ``invalidate()`` without a committee drops everything.
+    """
+
+    name = "base"
+
+    def __init__(self):
+        self.remote_listeners: List[Callable[[Optional[str]], None]] = []
+        self.local_listeners: List[Callable[[Optional[str]], None]] = []
+
+    def on_invalidation(self, callback: Callable[[Optional[str]], None]) -> None:
+        """Call ``callback(committee_id)`` after every write handled by this worker; None means every committee"""
+        self.local_listeners.append(callback)
+
+    def on_remote_invalidation(self, callback: Callable[[Optional[str]], None]) -> None:
+        """Call ``callback(committee_id)`` whenever another worker reports a write; None means every committee"""
+        self.remote_listeners.append(callback)
+
+    async def start(self, database: AsyncIOMotorDatabase) -> None:
+        """Begin any background work the backend needs"""
+
+    async def stop(self) -> None:
+        """Stop background work"""
+
+    def generation_of(self, committee_id: str) -> Generation:
+        raise NotImplementedError
+
+    def get(self, committee_id: str, key: str) -> Optional[CachedResponse]:
+        raise NotImplementedError
+
+    def set(self, committee_id: str, key: str, entry: CachedResponse, generation: Generation) -> bool:
+        raise NotImplementedError
+
+    def record_not_modified(self) -> None:
+        raise NotImplementedError
+
+    async def invalidate(self, committee_id: Optional[str] = None) -> None:
+        raise NotImplementedError
+
+    def invalidate_local(self, committee_id: Optional[str] = None) -> None:
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, float]:
+        raise NotImplementedError
+
+class MemoryCacheBackend(CacheBackend):
+    """Bounded LRU of rendered GET responses with a TTL, local to this process.
+
+    Each committee has a generation that increases when it is invalidated,
+    and ``generation`` increases when everything is; a response computed
+    while its committee was written to is not stored, so a slow read cannot
+    re-insert data from before the write.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 30.0):
+        super().__init__()
+        self.name = "memory"
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.generation = 0
+        self.committee_generations: Dict[str, int] = {}
+        self._entries: "OrderedDict[Tuple[str, str], CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def generation_of(self, committee_id: str) -> Generation:
+        """Token to pass to ``set`` for a response computed from now on"""
+        with self._lock:
+            return self.generation, self.committee_generations.get(committee_id, 0)
+
+    def get(self, committee_id: str, key: str) -> Optional[CachedResponse]:
+        """Return a fresh entry for a committee's ``key``, counting the hit or miss"""
+        key = (committee_id, key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, committee_id: str, key: str, entry: CachedResponse, generation: Generation) -> bool:
+        """Store ``entry`` unless the committee was invalidated since ``generation``"""
+        with self._lock:
+            if generation != (self.generation, self.committee_generations.get(committee_id, 0)):
+                return False
+            entry.expires_at = time.monotonic() + self.ttl_seconds
+            key = (committee_id, key)
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            return True
+
+    async def invalidate(self, committee_id: Optional[str] = None) -> None:
+        """Drop a committee's entries, or every entry; called after writes"""
+        self.invalidate_local(committee_id)
+        self._notify_local(committee_id)
+
+    def _notify_local(self, committee_id: Optional[str]) -> None:
+        for callback in self.local_listeners:
+            callback(committee_id)
+
+    def invalidate_local(self, committee_id: Optional[str] = None) -> None:
+        """Drop a committee's entries, or every entry, held by this process"""
+        with self._lock:
+            self.invalidations += 1
+            if committee_id is None:
+                self.generation += 1
+                self._entries.clear()
+                return
+            self.committee_generations[committee_id] = self.committee_generations.get(committee_id, 0) + 1
+            for key in [key for key in self._entries if key[0] == committee_id]:
+                del self._entries[key]
+
+    def record_not_modified(self) -> None:
+        """Count a request answered with 304 Not Modified"""
+        with self._lock:
+            self.not_modified += 1
+
+    def stats(self) -> Dict[str, float]:
+        """Counters exposed on /api/admin/cache"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": self.name,
+                "entries": len(self._entries),
+                "maxEntries": self.max_entries,
+                "ttlSeconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRate": round(self.hits / lookups, 3) if lookups else 0,
+                "notModified": self.not_modified,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "committees": len({committee_id for committee_id, _ in self._entries}),
+            }
+
+class MongoCacheBackend(MemoryCacheBackend):
+    """Per-process LRU whose invalidations are broadcast to every worker.
+
+    Invalidations are appended to a capped collection that each worker
+    tails with an awaitable tailable cursor, so a write handled by one
+    uvicorn worker clears the cached responses of all of them. Hits are
+    still served from process memory without a database round-trip.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 30.0, channel: str = "cache_invalidations"):
+        super().__init__(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self.name = "mongo"
+        self.channel = channel
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.remote_invalidations = 0
+        self._events = None
+        self._listener: Optional[asyncio.Task] = None
+
+    async def start(self, database: AsyncIOMotorDatabase) -> None:
+        try:
+            await database.create_collection(self.channel, capped=True, size=1024 * 1024, max=1000)
+        except CollectionInvalid:
+            pass  # Already created by another worker
+        self._events = database[self.channel]
+        self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    async def invalidate(self, committee_id: Optional[str] = None) -> None:
+        """Drop local entries and tell the other workers to do the same"""
+        self.invalidate_local(committee_id)
+        self._notify_local(committee_id)
+        if self._events is not None:
+            await self._events.insert_one({"source": self.worker_id, "committeeId": committee_id, "at": datetime.utcnow()})
+
+    async def _listen(self) -> None:
+        """Tail the invalidation channel, clearing local entries on remote events"""
+        last_id = None
+        positioned = False
+        while True:
+            try:
+                if not positioned:
+                    # Only events published after this worker started are relevant
+                    latest = await self._events.find_one(sort=[("$natural", -1)])
+                    last_id = latest["_id"] if latest else None
+                    positioned = True
+                query = {"_id": {"$gt": last_id}} if last_id else {}
+                cursor = self._events.find(query, cursor_type=CursorType.TAILABLE_AWAIT)
+                async for event in cursor:
+                    last_id = event["_id"]
+                    if event.get("source") != self.worker_id:
+                        self.remote_invalidations += 1
+                        self.invalidate_local(event.get("committeeId"))
+                        self._notify_remote(event.get("committeeId"))
+                # A tailable cursor on an empty capped collection dies immediately
+                await asyncio.sleep(0.5)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Cache invalidation listener error: {str(e)}")
+                # Anything may have changed while the channel was unavailable
+                self.invalidate_local()
+                self._notify_remote(None)
+                await asyncio.sleep(1)
+
+    def _notify_remote(self, committee_id: Optional[str]) -> None:
+        for callback in self.remote_listeners:
+            callback(committee_id)
+
+    def stats(self) -> Dict[str, float]:
+        stats = super().stats()
+        stats["remoteInvalidations"] = self.remote_invalidations
+        stats["workerId"] = self.worker_id
+        return stats
+
+CACHE_BACKENDS = {
+    "memory": MemoryCacheBackend,
+    "mongo": MongoCacheBackend,
+}
+
+def create_response_cache() -> CacheBackend:
+    """Build the cache backend selected by RESPONSE_CACHE_BACKEND"""
+    backend = os.getenv('RESPONSE_CACHE_BACKEND', 'memory').lower()
+    if backend not in CACHE_BACKENDS:
+        raise ValueError(f"Unknown RESPONSE_CACHE_BACKEND: {backend}")
+    return CACHE_BACKENDS[backend](
+        max_entries=int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', '256')),
+        ttl_seconds=float(os.getenv('RESPONSE_CACHE_TTL_SECONDS', '30')),
+    )
+
+# Process-wide cache shared by the middleware and the member write path
+response_cache = create_response_cache()
@@ -0,0 +1,59 @@
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+import asyncio
+import os
+
+class SingleFlight:
+    """Share one in-flight call among concurrent callers with the same key.
+
+    The first caller for a key runs it; callers arriving before it finishes
+    wait and receive the same result instead of repeating the work. A call
+    that fails or returns None is not shared: each waiting caller then runs
+    it alone, so a cancelled first request does not fail the others.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._flights: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        self.calls = 0
+        self.shared = 0
+        self.retried = 0
+
+    async def run(self, key: Hashable, call: Callable[[], Awaitable[Optional[Any]]]) -> Optional[Any]:
+        if not self.enabled:
+            self.calls += 1
+            return await call()
+        flight = self._flights.get(key)
+        if flight is not None:
+            self.shared += 1
+            # Shielded, so a waiting caller going away leaves the flight to the others
+            result = await asyncio.shield(flight)
+            if result is not None:
+                return result
+            self.retried += 1
+            self.calls += 1
+            return await call()
+
+        flight = self._flights[key] = asyncio.get_running_loop().create_future()
+        self.calls += 1
+        result = None
+        try:
+            result = await call()
+            return result
+        finally:
+            del self._flights[key]
+            flight.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters exposed on /api/admin/single-flight"""
+        requests = self.calls + self.shared - self.retried
+        return {
+            "enabled": self.enabled,
+            "inFlight": len(self._flights),
+            "calls": self.calls,
+            "shared": self.shared,
+            "retried": self.retried,
+            "sharedRate": round((self.shared - self.retried) / requests, 3) if requests else 0,
+        }
+
+# Process-wide, used by SingleFlightMiddleware
+request_flights = SingleFlight(enabled=os.getenv('SINGLE_FLIGHT_ENABLED', 'true').lower() == 'true')
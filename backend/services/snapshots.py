@@ -0,0 +1,308 @@
+from typing import Any, Dict, List, Optional, Set, Tuple
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from bson import Binary
+from pymongo import DESCENDING
+from pymongo.errors import DuplicateKeyError
+from services import dashboard, history
+from services.response_cache import response_cache
+from datetime import datetime, timedelta
+import asyncio
+import logging
+import orjson
+import os
+import time
+import zlib
+
+logger = logging.getLogger(__name__)
+
+# Versioned analytics payloads, one document per committee and version
+SNAPSHOTS_COLLECTION = "analytics_snapshots"
+
+# Analytics endpoints served from snapshots, built by the dashboard section builders
+SECTIONS = ("overview", "tasks", "registrations")
+
+# Same options as ORJSONResponse, so stored bytes are what the endpoints used to send
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+# Scalar figures kept on every snapshot, by section, including ones whose payloads were pruned
+TOTAL_FIELDS = [
+    ("overview", "totalMembers"),
+    ("overview", "totalTasksCompleted"),
+    ("overview", "totalTasksPending"),
+    ("tasks", "completionRate"),
+    ("overview", "avgEfficiency"),
+    ("registrations", "totalRegistrations"),
+    ("registrations", "avgRegistrationsPerMember"),
+]
+
+def snapshot_totals(payloads: Dict[str, Any]) -> Dict[str, Any]:
+    """The totals of the sections that were built"""
+    return {field: payloads[name][field] for name, field in TOTAL_FIELDS if name in payloads}
+
+def month_changes(months: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Month rows with the change of every total since the previous month"""
+    rows = []
+    previous = None
+    for month in months:
+        totals = month["totals"]
+        rows.append({
+            "month": month["_id"],
+            "version": month["version"],
+            "computedAt": month["computedAt"],
+            **totals,
+            "change": {field: round(value - previous[field], 1) for field, value in totals.items() if field in previous} if previous else None,
+        })
+        previous = totals
+    return rows
+
+class AnalyticsSnapshots:
+    """Latest analytics payloads per committee, recomputed in the background.
+
+    GET /analytics/overview, /tasks and /registrations return the encoded
+    payloads of the committee's latest snapshot from memory. A write to a
+    committee schedules a recompute ``debounce_seconds`` later; writes
+    arriving meanwhile join that recompute, so a burst costs one or two.
+    Writes reported by other workers are picked up after twice the delay,
+    adopting the writing worker's snapshot when it is already stored.
+
+    No snapshot older than ``max_age_seconds`` is served: committees read
+    since the last pass are refreshed in the background every half of it,
+    and a request finding an older one recomputes it first.
+
+    Snapshots are stored zlib-compressed with increasing versions. The
+    last ``keep`` stay whole; before those, the last snapshot of every
+    month keeps its totals for /analytics/trends and the rest are deleted.
+    """
+
+    def __init__(self, debounce_seconds: float = 1.0, max_age_seconds: float = 300.0, keep: int = 20, enabled: bool = True):
+        self.debounce_seconds = debounce_seconds
+        self.max_age_seconds = max_age_seconds
+        self.keep = keep
+        self.enabled = enabled
+        self.database: Optional[AsyncIOMotorDatabase] = None
+        self.analytics_database: Optional[AsyncIOMotorDatabase] = None
+        # committee -> {version, computedAt, sections: name -> encoded JSON}
+        self.latest: Dict[str, Dict[str, Any]] = {}
+        self.computes = 0
+        self.compute_ms = 0.0
+        self.coalesced = 0
+        self.stale_refreshes = 0
+        self.adopted = 0
+        self._scheduled: Dict[str, asyncio.Task] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._read: Set[str] = set()
+        self._refresher: Optional[asyncio.Task] = None
+
+    def ensure_started(self, database: AsyncIOMotorDatabase, analytics_database: AsyncIOMotorDatabase) -> None:
+        """Start the periodic refresh on first use; later calls are no-ops"""
+        self.database = database
+        self.analytics_database = analytics_database
+        if self._refresher is None or self._refresher.done():
+            self._refresher = asyncio.create_task(self._refresh_periodically())
+
+    async def stop(self) -> None:
+        """Cancel the periodic refresh and pending recomputes"""
+        tasks = list(self._scheduled.values()) + ([self._refresher] if self._refresher else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._scheduled.clear()
+        self._refresher = None
+
+    async def section(self, database: AsyncIOMotorDatabase, analytics_database: AsyncIOMotorDatabase, committee_id: str, name: str) -> Tuple[bytes, Dict[str, Any]]:
+        """Encoded payload of one section of a committee's latest fresh snapshot, and the snapshot"""
+        self.ensure_started(database, analytics_database)
+        self._read.add(committee_id)
+        snapshot = self.latest.get(committee_id)
+        if snapshot is None:
+            snapshot = await self._load(committee_id)
+        if snapshot is None or self._age(snapshot) > self.max_age_seconds:
+            self.stale_refreshes += 1
+            snapshot = await self.refresh(committee_id, datetime.utcnow() - timedelta(seconds=self.max_age_seconds))
+        if name not in snapshot["sections"]:
+            # It failed to build with the snapshot; build it per request until a recompute succeeds
+            reads = dashboard.SharedReads(database, analytics_database, committee_id, 0)
+            return orjson.dumps(await dashboard.SECTION_BUILDERS[name](reads), option=ORJSON_OPTIONS), snapshot
+        return snapshot["sections"][name], snapshot
+
+    def mark_dirty(self, committee_id: Optional[str], delay: Optional[float] = None) -> None:
+        """Recompute a committee's snapshot (every loaded one for None) once its writes settle"""
+        if self.database is None:
+            return  # Nothing served yet; the first request computes a snapshot
+        for committee in list(self.latest) if committee_id is None else [committee_id]:
+            if committee in self._scheduled:
+                self.coalesced += 1
+                continue
+            self._scheduled[committee] = asyncio.create_task(
+                self._recompute_later(committee, datetime.utcnow(), self.debounce_seconds if delay is None else delay)
+            )
+
+    def mark_remote(self, committee_id: Optional[str]) -> None:
+        """A write handled by another worker, which stores its own snapshot"""
+        self.mark_dirty(committee_id, self.debounce_seconds * 2)
+
+    async def refresh(self, committee_id: str, since: Optional[datetime] = None) -> Dict[str, Any]:
+        """Compute and store a new snapshot, unless one computed after ``since`` appears while waiting for another"""
+        async with self._locks.setdefault(committee_id, asyncio.Lock()):
+            latest = self.latest.get(committee_id)
+            if since is not None and latest is not None and latest["computedAt"] >= since:
+                return latest
+            return await self._compute(committee_id)
+
+    def forget(self) -> None:
+        """Drop loaded snapshots; the next request loads the latest stored one"""
+        self.latest.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters exposed on /api/admin/snapshots"""
+        return {
+            "enabled": self.enabled,
+            "debounceSeconds": self.debounce_seconds,
+            "maxAgeSeconds": self.max_age_seconds,
+            "committees": len(self.latest),
+            "pending": len(self._scheduled),
+            "computes": self.computes,
+            "avgComputeMs": round(self.compute_ms / self.computes, 1) if self.computes else 0,
+            "coalesced": self.coalesced,
+            "staleRefreshes": self.stale_refreshes,
+            "adopted": self.adopted,
+            "versions": {committee_id: snapshot["version"] for committee_id, snapshot in self.latest.items()},
+        }
+
+    def _age(self, snapshot: Dict[str, Any]) -> float:
+        return (datetime.utcnow() - snapshot["computedAt"]).total_seconds()
+
+    async def _compute(self, committee_id: str) -> Dict[str, Any]:
+        start = time.perf_counter()
+        computed_at = datetime.utcnow()
+        reads = dashboard.SharedReads(self.database, self.analytics_database, committee_id, 0)
+        results = await asyncio.gather(*(dashboard.SECTION_BUILDERS[name](reads) for name in SECTIONS), return_exceptions=True)
+        payloads = {}
+        for name, result in zip(SECTIONS, results):
+            if isinstance(result, Exception):
+                # Left out rather than failing the snapshot, e.g. registrations without $dateTrunc (MongoDB < 5.0)
+                logger.error(f"Error building analytics snapshot section {name} of committee {committee_id}: {str(result)}")
+            else:
+                payloads[name] = result
+        if not payloads:
+            raise results[0]
+        sections = {name: orjson.dumps(payload, option=ORJSON_OPTIONS) for name, payload in payloads.items()}
+
+        collection = self.database[SNAPSHOTS_COLLECTION]
+        previous = await collection.find_one({"committeeId": committee_id}, {"version": 1}, sort=[("version", DESCENDING)])
+        version = (previous["version"] if previous else 0) + 1
+        try:
+            await collection.insert_one({
+                "committeeId": committee_id,
+                "version": version,
+                "month": computed_at.strftime("%Y-%m"),
+                # BSON dates hold milliseconds
+                "computedAt": computed_at.replace(microsecond=computed_at.microsecond // 1000 * 1000),
+                "totals": snapshot_totals(payloads),
+                "sections": {name: Binary(zlib.compress(body)) for name, body in sections.items()},
+            })
+        except DuplicateKeyError:
+            # Another worker stored this version first; its snapshot is at least as recent
+            stored = await self._load(committee_id)
+            if stored is not None:
+                return stored
+        self.computes += 1
+        self.compute_ms += (time.perf_counter() - start) * 1000
+        snapshot = self.latest[committee_id] = {"version": version, "computedAt": computed_at, "sections": sections}
+        # Responses cached since the write still hold the previous snapshot
+        response_cache.invalidate_local(committee_id)
+        try:
+            await self._prune(committee_id, version)
+        except Exception as e:
+            logger.error(f"Error pruning analytics snapshots of committee {committee_id}: {str(e)}")
+        return snapshot
+
+    async def _load(self, committee_id: str) -> Optional[Dict[str, Any]]:
+        """The committee's latest stored snapshot, decompressed into ``latest``"""
+        document = await self.database[SNAPSHOTS_COLLECTION].find_one(
+            {"committeeId": committee_id, "sections": {"$exists": True}},
+            {"version": 1, "computedAt": 1, "sections": 1},
+            sort=[("version", DESCENDING)],
+        )
+        if document is None:
+            return None
+        current = self.latest.get(committee_id)
+        if current is not None and current["version"] >= document["version"]:
+            return current
+        snapshot = self.latest[committee_id] = {
+            "version": document["version"],
+            "computedAt": document["computedAt"],
+            "sections": {name: zlib.decompress(body) for name, body in document["sections"].items()},
+        }
+        if current is not None:
+            response_cache.invalidate_local(committee_id)
+        return snapshot
+
+    async def _prune(self, committee_id: str, version: int) -> None:
+        """Keep the last ``keep`` snapshots whole and each earlier month's last one as totals"""
+        collection = self.database[SNAPSHOTS_COLLECTION]
+        cutoff = version - self.keep
+        if cutoff < 1:
+            return
+        month_ends = [
+            row["version"]
+            async for row in collection.aggregate([
+                {"$match": {"committeeId": committee_id, "version": {"$lte": cutoff}}},
+                {"$group": {"_id": "$month", "version": {"$max": "$version"}}},
+            ])
+        ]
+        await collection.delete_many({"committeeId": committee_id, "version": {"$lte": cutoff, "$nin": month_ends}})
+        await collection.update_many(
+            {"committeeId": committee_id, "version": {"$lte": cutoff}, "sections": {"$exists": True}},
+            {"$unset": {"sections": ""}},
+        )
+
+    async def _recompute_later(self, committee_id: str, marked_at: datetime, delay: float) -> None:
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            self._scheduled.pop(committee_id, None)
+        try:
+            # Writes reported by other workers: their snapshot may already be stored
+            if delay > self.debounce_seconds:
+                stored = await self._load(committee_id)
+                if stored is not None and stored["computedAt"] >= marked_at:
+                    self.adopted += 1
+                    return
+            await self.refresh(committee_id, marked_at)
+        except Exception as e:
+            logger.error(f"Error recomputing analytics snapshot of committee {committee_id}: {str(e)}")
+
+    async def _refresh_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.max_age_seconds / 2)
+            read, self._read = self._read, set()
+            for committee_id in read:
+                snapshot = self.latest.get(committee_id)
+                if snapshot is not None and self._age(snapshot) < self.max_age_seconds / 2:
+                    continue
+                try:
+                    await self.refresh(committee_id, datetime.utcnow() - timedelta(seconds=self.max_age_seconds / 2))
+                except Exception as e:
+                    logger.error(f"Error refreshing analytics snapshot of committee {committee_id}: {str(e)}")
+
+async def monthly_trends(database: AsyncIOMotorDatabase, committee_id: str, months: int) -> List[Dict[str, Any]]:
+    """Totals of the last snapshot of each of a committee's recent months, oldest first, with monthly changes"""
+    start = history.month_start(datetime.utcnow(), months - 1).strftime("%Y-%m")
+    pipeline = [
+        {"$match": {"committeeId": committee_id, "month": {"$gte": start}}},
+        {"$sort": {"version": -1}},
+        {"$group": {"_id": "$month", "version": {"$first": "$version"}, "computedAt": {"$first": "$computedAt"}, "totals": {"$first": "$totals"}}},
+        {"$sort": {"_id": 1}},
+    ]
+    return month_changes(await database[SNAPSHOTS_COLLECTION].aggregate(pipeline).to_list(None))
+
+# Process-wide snapshots; writes handled here or by other workers schedule recomputes
+analytics_snapshots = AnalyticsSnapshots(
+    debounce_seconds=float(os.getenv('ANALYTICS_SNAPSHOT_DEBOUNCE_SECONDS', '1')),
+    max_age_seconds=float(os.getenv('ANALYTICS_SNAPSHOT_MAX_AGE_SECONDS', '300')),
+    keep=int(os.getenv('ANALYTICS_SNAPSHOT_KEEP', '20')),
+    enabled=os.getenv('ANALYTICS_SNAPSHOTS_ENABLED', 'true').lower() == 'true',
+)
+response_cache.on_invalidation(analytics_snapshots.mark_dirty)
+response_cache.on_remote_invalidation(analytics_snapshots.mark_remote)
@@ -0,0 +1,157 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from services.analytics import fetch_tier_counts, fetch_totals, tier_for
+from services.committees import committee_of, scoped_id
+from services.tiers import load_tiers, tier_config
+from pymongo.errors import DuplicateKeyError
+from datetime import datetime
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Each committee's summary is stored as scoped_id(SUMMARY_ID, committee_id)
+SUMMARY_ID = "committee_members"
+
+# Recounts a rebuild makes before it stops waiting for concurrent deltas
+REBUILD_ATTEMPTS = 5
+
+# Running counters kept on the summary document
+COUNTER_FIELDS = [
+    "totalMembers",
+    "tasksCompleted",
+    "tasksPending",
+    "totalTasks",
+    "efficiencySum",
+    "registrations",
+]
+
+def member_contribution(member: Optional[Dict[str, Any]], tiers: List[Dict[str, Any]]) -> Dict[str, int]:
+    """Counters a single member document adds to the summary"""
+    if not member:
+        return {}
+    tasks_completed = member.get("tasksCompleted") or 0
+    tasks_pending = member.get("tasksPending") or 0
+    registrations = member.get("registrationsBrought") or 0
+    return {
+        "totalMembers": 1,
+        "tasksCompleted": tasks_completed,
+        "tasksPending": tasks_pending,
+        "totalTasks": tasks_completed + tasks_pending,
+        "efficiencySum": member.get("efficiency") or 0,
+        "registrations": registrations,
+        f"tierCounts.{tier_for(registrations, tiers)['tier']}": 1,
+    }
+
+def summary_delta(old: Optional[Dict[str, Any]], new: Optional[Dict[str, Any]], tiers: List[Dict[str, Any]]) -> Dict[str, int]:
+    """$inc document turning the summary for ``old`` into the summary for ``new``"""
+    delta = member_contribution(new, tiers)
+    for field, value in member_contribution(old, tiers).items():
+        delta[field] = delta.get(field, 0) - value
+    return {field: value for field, value in delta.items() if value}
+
+async def apply_member_deltas(database: AsyncIOMotorDatabase, changes: Iterable[Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]]) -> None:
+    """Atomically fold a batch of (old, new) member writes into their committees' summaries"""
+    by_committee: Dict[str, List[Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]]] = {}
+    for change in changes:
+        by_committee.setdefault(committee_of(change), []).append(change)
+    for committee_id, committee_changes in by_committee.items():
+        await apply_committee_deltas(database, committee_id, committee_changes)
+
+async def apply_committee_deltas(database: AsyncIOMotorDatabase, committee_id: str, changes: List[Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]]) -> None:
+    """Fold one committee's member writes into its summary document"""
+    settings = await tier_config.current(database, committee_id)
+    delta: Dict[str, int] = {}
+    for old, new in changes:
+        for field, value in summary_delta(old, new, settings["tiers"]).items():
+            delta[field] = delta.get(field, 0) + value
+    delta = {field: value for field, value in delta.items() if value}
+    if not delta:
+        return
+    result = await database.analytics_summary.update_one(
+        {"_id": scoped_id(SUMMARY_ID, committee_id), "tierConfigVersion": settings["version"]},
+        {"$inc": {**delta, "epoch": 1}, "$set": {"updatedAt": datetime.utcnow()}}
+    )
+    if result.matched_count == 0:
+        # No summary yet, or it was built with other tier settings: rebuild it
+        # from the collection, which already holds these writes
+        tier_config.invalidate(committee_id)
+        await rebuild_summary(database, committee_id)
+
+async def compute_summary(database: AsyncIOMotorDatabase, committee_id: str) -> Dict[str, Any]:
+    """Recompute a committee's summary counters from the member collection"""
+    settings = await load_tiers(database, committee_id)
+    totals, tier_counts = await asyncio.gather(
+        fetch_totals(database.committee_members, committee_id),
+        fetch_tier_counts(database.committee_members, committee_id, settings["tiers"]),
+    )
+    summary = {field: totals[field] for field in COUNTER_FIELDS}
+    summary["tierCounts"] = tier_counts
+    summary["tierConfigVersion"] = settings["version"]
+    return summary
+
+async def rebuild_summary(database: AsyncIOMotorDatabase, committee_id: str) -> Dict[str, Any]:
+    """Replace a committee's summary document with freshly computed counters.
+
+    Every delta folded in by apply_committee_deltas bumps the document's
+    epoch. The replacement only lands if the epoch is the one read before
+    recounting, so a delta folded in meanwhile is recounted instead of
+    overwritten; the last of REBUILD_ATTEMPTS is written regardless.
+    """
+    summary_id = scoped_id(SUMMARY_ID, committee_id)
+    for attempt in range(1, REBUILD_ATTEMPTS + 1):
+        stored = await database.analytics_summary.find_one({"_id": summary_id}, {"epoch": 1})
+        summary = await compute_summary(database, committee_id)
+        document = {**summary, "committeeId": committee_id, "updatedAt": datetime.utcnow()}
+        if attempt == REBUILD_ATTEMPTS:
+            logger.warning(f"Summary of committee {committee_id} kept changing while it was rebuilt; replacing it anyway")
+            epoch = (stored or {}).get("epoch") or 0
+            await database.analytics_summary.replace_one({"_id": summary_id}, {**document, "epoch": epoch + 1}, upsert=True)
+            return summary
+        if stored is None:
+            try:
+                await database.analytics_summary.insert_one({"_id": summary_id, **document, "epoch": 0})
+                return summary
+            except DuplicateKeyError:
+                continue
+        # Summaries written before epochs existed have none, which {"epoch": None} matches
+        result = await database.analytics_summary.replace_one(
+            {"_id": summary_id, "epoch": stored.get("epoch")},
+            {**document, "epoch": (stored.get("epoch") or 0) + 1}
+        )
+        if result.matched_count:
+            return summary
+
+async def get_summary(database: AsyncIOMotorDatabase, committee_id: str) -> Dict[str, Any]:
+    """Fetch a committee's summary document, building it on first use or after a tier change"""
+    summary, settings = await asyncio.gather(
+        database.analytics_summary.find_one({"_id": scoped_id(SUMMARY_ID, committee_id)}),
+        tier_config.current(database, committee_id),
+    )
+    if summary is not None and summary.get("tierConfigVersion") != settings["version"]:
+        # The cached settings may be the stale ones, e.g. changed by another
+        # worker; without reloading them every read would rebuild
+        tier_config.invalidate(committee_id)
+        settings = await tier_config.current(database, committee_id)
+    if summary is None or summary.get("tierConfigVersion") != settings["version"]:
+        summary = await rebuild_summary(database, committee_id)
+    return summary
+
+async def verify_summary(database: AsyncIOMotorDatabase, committee_id: str) -> Dict[str, Dict[str, int]]:
+    """Compare a committee's stored summary with a fresh recompute, returning drifted counters"""
+    stored, actual = await asyncio.gather(
+        database.analytics_summary.find_one({"_id": scoped_id(SUMMARY_ID, committee_id)}),
+        compute_summary(database, committee_id),
+    )
+    stored = stored or {}
+    drift = {}
+    for field in COUNTER_FIELDS:
+        if stored.get(field, 0) != actual[field]:
+            drift[field] = {"stored": stored.get(field, 0), "actual": actual[field]}
+    stored_tiers = stored.get("tierCounts", {})
+    for name in sorted(set(stored_tiers) | set(actual["tierCounts"])):
+        if stored_tiers.get(name, 0) != actual["tierCounts"].get(name, 0):
+            drift[f"tierCounts.{name}"] = {"stored": stored_tiers.get(name, 0), "actual": actual["tierCounts"].get(name, 0)}
+    if stored.get("tierConfigVersion") != actual["tierConfigVersion"]:
+        drift["tierConfigVersion"] = {"stored": stored.get("tierConfigVersion"), "actual": actual["tierConfigVersion"]}
+    return drift
@@ -0,0 +1,173 @@
+from typing import Any, Dict, List, Optional
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument, UpdateMany, UpdateOne
+from services import summary
+from services.committees import committee_of
+from services.member_writes import apply_member_writes
+from services.response_cache import response_cache
+from datetime import datetime
+import uuid
+
+# One counter document per (committeeId, category)
+CATEGORY_STATS = "task_category_stats"
+
+# Member counter incremented for each task status
+MEMBER_STATUS_FIELDS = {
+    "completed": "tasksCompleted",
+    "pending": "tasksPending",
+}
+
+# Category totals of the sample data (category, completed, pending)
+SAMPLE_CATEGORIES = [
+    ("Event Planning", 25, 8),
+    ("Marketing", 18, 5),
+    ("Outreach", 22, 4),
+    ("Administration", 15, 7),
+]
+
+def counter_delta(old: Optional[Dict[str, Any]], new: Optional[Dict[str, Any]], key: str) -> Dict[Any, Dict[str, int]]:
+    """Per-``key`` status count changes between two versions of a task"""
+    delta: Dict[Any, Dict[str, int]] = {}
+    for task, sign in ((old, -1), (new, 1)):
+        if task and task.get(key):
+            counts = delta.setdefault(task[key], {})
+            counts[task["status"]] = counts.get(task["status"], 0) + sign
+    return {
+        owner: {status: value for status, value in counts.items() if value}
+        for owner, counts in delta.items()
+        if any(counts.values())
+    }
+
+async def apply_task_change(database: AsyncIOMotorDatabase, old: Optional[Dict[str, Any]], new: Optional[Dict[str, Any]]) -> None:
+    """Fold a task write into the category counters and the assignees' task counts"""
+    committee_id = committee_of((old, new))
+    category_updates = []
+    for category, counts in counter_delta(old, new, "category").items():
+        increments = dict(counts)
+        increments["total"] = sum(counts.values())
+        # Upserts on the unique (committeeId, category) index are retried by the server on a duplicate key
+        category_updates.append(UpdateOne({"committeeId": committee_id, "category": category}, {"$inc": increments}, upsert=True))
+    if category_updates:
+        await database[CATEGORY_STATS].bulk_write(category_updates, ordered=False)
+
+    member_changes = []
+    for member_id, counts in counter_delta(old, new, "assigneeId").items():
+        increments = {MEMBER_STATUS_FIELDS[status]: value for status, value in counts.items()}
+        increments["totalTasks"] = sum(counts.values())
+        # A changed task count is a new member version (and ETag)
+        increments["version"] = 1
+        updated = await database.committee_members.find_one_and_update(
+            {"_id": member_id, "committeeId": committee_id},
+            {"$inc": increments, "$set": {"updatedAt": datetime.utcnow()}},
+            return_document=ReturnDocument.AFTER
+        )
+        if updated is None:
+            continue  # Assignee no longer exists
+        previous = dict(updated)
+        for field, value in increments.items():
+            previous[field] = (previous.get(field) or 0) - value
+        member_changes.append((previous, updated))
+
+    if member_changes:
+        # Also invalidates the committee's cached responses
+        await apply_member_writes(member_changes)
+    else:
+        # Cached task lists and GET /tasks/{id} are stale even when no counter moved, e.g. after a rename
+        await response_cache.invalidate(committee_id)
+
+async def category_stats(database: AsyncIOMotorDatabase, committee_id: str) -> List[Dict[str, Any]]:
+    """A committee's per-category completed/pending/total counters, one document per category"""
+    cursor = database[CATEGORY_STATS].find({"committeeId": committee_id, "total": {"$gt": 0}}, sort=[("category", 1)])
+    return [
+        {
+            "category": stats["category"],
+            "completed": stats.get("completed", 0),
+            "pending": stats.get("pending", 0),
+            "total": stats.get("total", 0),
+        }
+        async for stats in cursor
+    ]
+
+async def rebuild_task_counters(database: AsyncIOMotorDatabase, committee_id: str) -> Dict[str, int]:
+    """Recompute a committee's category counters and assignee task counts from the tasks collection"""
+    pipeline = [
+        {"$match": {"committeeId": committee_id}},
+        {
+            "$group": {
+                "_id": {"category": "$category", "assigneeId": "$assigneeId"},
+                "completed": {"$sum": {"$cond": [{"$eq": ["$status", "completed"]}, 1, 0]}},
+                "pending": {"$sum": {"$cond": [{"$eq": ["$status", "pending"]}, 1, 0]}},
+            }
+        }
+    ]
+    categories: Dict[str, Dict[str, int]] = {}
+    members: Dict[str, Dict[str, int]] = {}
+    async for group in database.tasks.aggregate(pipeline, allowDiskUse=True):
+        for owner, totals in ((group["_id"].get("category"), categories), (group["_id"].get("assigneeId"), members)):
+            if owner is None:
+                continue
+            counts = totals.setdefault(owner, {"completed": 0, "pending": 0})
+            counts["completed"] += group["completed"]
+            counts["pending"] += group["pending"]
+
+    await database[CATEGORY_STATS].delete_many({"committeeId": committee_id})
+    if categories:
+        await database[CATEGORY_STATS].insert_many([
+            {"committeeId": committee_id, "category": category, **counts, "total": counts["completed"] + counts["pending"]}
+            for category, counts in categories.items()
+        ])
+
+    # Members without tasks are reset to zero
+    member_updates = [
+        UpdateOne({"_id": member_id, "committeeId": committee_id}, {"$set": {
+            "tasksCompleted": counts["completed"],
+            "tasksPending": counts["pending"],
+            "totalTasks": counts["completed"] + counts["pending"],
+        }, "$inc": {"version": 1}})
+        for member_id, counts in members.items()
+    ]
+    member_updates.append(UpdateMany(
+        {"committeeId": committee_id, "_id": {"$nin": list(members)}},
+        {"$set": {"tasksCompleted": 0, "tasksPending": 0, "totalTasks": 0}, "$inc": {"version": 1}}
+    ))
+    await database.committee_members.bulk_write(member_updates, ordered=False)
+    await summary.rebuild_summary(database, committee_id)
+
+    return {"categories": len(categories), "members": len(members)}
+
+def sample_tasks(committee_id: str, members: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Tasks reproducing the sample members' counts and the SAMPLE_CATEGORIES totals.
+
+    Tasks are handed out category by category; any left over stay unassigned.
+    """
+    now = datetime.utcnow()
+    remaining = {
+        "completed": [[category, completed] for category, completed, _ in SAMPLE_CATEGORIES],
+        "pending": [[category, pending] for category, _, pending in SAMPLE_CATEGORIES],
+    }
+    owners = {
+        task_status: [
+            member["_id"]
+            for member in members
+            for _ in range(member.get(MEMBER_STATUS_FIELDS[task_status]) or 0)
+        ]
+        for task_status in remaining
+    }
+    tasks = []
+    for task_status, categories in remaining.items():
+        assignees = iter(owners[task_status])
+        for category, count in categories:
+            for number in range(count):
+                tasks.append({
+                    "_id": str(uuid.uuid4()),
+                    "committeeId": committee_id,
+                    "title": f"{category} task {number + 1}",
+                    "category": category,
+                    "assigneeId": next(assignees, None),
+                    "status": task_status,
+                    "dueDate": None,
+                    "createdAt": now,
+                    "updatedAt": now,
+                    "completedAt": now if task_status == "completed" else None,
+                })
+    return tasks
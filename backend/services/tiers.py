@@ -0,0 +1,83 @@
+from typing import Any, Dict, List, Optional
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+from services.committees import scoped_id
+from services.response_cache import response_cache
+from datetime import datetime
+
+SETTINGS_ID = "registration_tiers"
+
+# Used until tiers are saved through PUT /api/settings/registration-tiers
+DEFAULT_TIERS = [
+    {"tier": "Platinum", "min": 15, "tierColor": "bg-purple-100 text-purple-800"},
+    {"tier": "Gold", "min": 12, "tierColor": "bg-yellow-100 text-yellow-800"},
+    {"tier": "Silver", "min": 8, "tierColor": "bg-gray-100 text-gray-800"},
+    {"tier": "Bronze", "min": 0, "tierColor": "bg-orange-100 text-orange-800"},
+]
+
+class InvalidTierConfig(ValueError):
+    """Raised when a tier list cannot be used for bucketing"""
+
+def normalize_tiers(tiers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Order tiers highest threshold first and check they cover every count"""
+    tiers = sorted(tiers, key=lambda tier: tier["min"], reverse=True)
+    names = [tier["tier"] for tier in tiers]
+    if len(set(names)) != len(names):
+        raise InvalidTierConfig("Tier names must be unique")
+    thresholds = [tier["min"] for tier in tiers]
+    if len(set(thresholds)) != len(thresholds):
+        raise InvalidTierConfig("Tier thresholds must be unique")
+    if thresholds[-1] != 0:
+        raise InvalidTierConfig("The lowest tier must start at 0")
+    return tiers
+
+async def load_tiers(database: AsyncIOMotorDatabase, committee_id: str) -> Dict[str, Any]:
+    """Read a committee's stored tier settings, falling back to DEFAULT_TIERS"""
+    settings = await database.settings.find_one({"_id": scoped_id(SETTINGS_ID, committee_id)})
+    if settings is None:
+        return {"tiers": DEFAULT_TIERS, "version": 0, "updatedAt": None}
+    return {
+        "tiers": settings["tiers"],
+        "version": settings.get("version", 0),
+        "updatedAt": settings.get("updatedAt"),
+    }
+
+async def save_tiers(database: AsyncIOMotorDatabase, committee_id: str, tiers: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Store a committee's new tier list, bumping its settings version"""
+    settings = await database.settings.find_one_and_update(
+        {"_id": scoped_id(SETTINGS_ID, committee_id)},
+        {"$set": {"tiers": normalize_tiers(tiers), "updatedAt": datetime.utcnow()}, "$inc": {"version": 1}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+    tier_config.invalidate(committee_id)
+    return {"tiers": settings["tiers"], "version": settings["version"], "updatedAt": settings["updatedAt"]}
+
+class TierConfig:
+    """Tier settings of each committee, cached in this process.
+
+    A committee's summary document records the settings version its tier
+    counts were built with; a mismatch makes the summary rebuild, so a
+    worker holding stale settings cannot corrupt the counts.
+    """
+
+    def __init__(self):
+        self.settings: Dict[str, Dict[str, Any]] = {}
+
+    async def current(self, database: AsyncIOMotorDatabase, committee_id: str) -> Dict[str, Any]:
+        """Cached ``{"tiers", "version", "updatedAt"}``, loaded on first use"""
+        settings = self.settings.get(committee_id)
+        if settings is None:
+            settings = self.settings[committee_id] = await load_tiers(database, committee_id)
+        return settings
+
+    def invalidate(self, committee_id: Optional[str] = None) -> None:
+        """Reload one committee's settings, or every committee's, on next use"""
+        if committee_id is None:
+            self.settings.clear()
+        else:
+            self.settings.pop(committee_id, None)
+
+# Process-wide tier settings; other workers' changes arrive as cache invalidations
+tier_config = TierConfig()
+response_cache.on_remote_invalidation(tier_config.invalidate)
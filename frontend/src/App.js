@@ -11,6 +11,12 @@ const BACKEND_URL = process.env.REACT_APP_BACKEND_URL ||
   (process.env.NODE_ENV === 'development' ? 'http://localhost:8001' : '');
 const API = `${BACKEND_URL}/api`;
 
+// Every request is scoped to one committee; the backend default applies when unset
+const COMMITTEE_ID = process.env.REACT_APP_COMMITTEE_ID;
+if (COMMITTEE_ID) {
+  axios.defaults.headers.common['X-Committee-Id'] = COMMITTEE_ID;
+}
+
 const Home = () => {
   const helloWorldApi = async () => {
     try {
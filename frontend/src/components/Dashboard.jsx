@@ -14,6 +14,7 @@ const Dashboard = () => {
   const [members, setMembers] = useState([]);
   const [isAddDialogOpen, setIsAddDialogOpen] = useState(false);
   const [loading, setLoading] = useState(true);
+  const [nextCursor, setNextCursor] = useState(null);
 
   // Use environment variable for backend URL
   // In development, falls back to localhost if not set
@@ -21,16 +22,49 @@ const Dashboard = () => {
     (process.env.NODE_ENV === 'development' ? 'http://localhost:8001' : '');
   const API = `${BACKEND_URL}/api`;
 
+  // Members are fetched a page at a time, without performanceHistory
+  const MEMBER_PAGE_SIZE = 200;
+  const MEMBER_FIELDS = 'name,role,contact,phone,tasksCompleted,tasksPending,totalTasks,efficiency,registrationsBrought,version';
+
   // Fetch members on component mount
   useEffect(() => {
     fetchMembers();
   }, []);
 
-  const fetchMembers = async () => {
+  // Apply member changes pushed by the server instead of refetching
+  useEffect(() => {
+    // EventSource cannot send headers, so the committee goes in the query string
+    const committeeId = process.env.REACT_APP_COMMITTEE_ID;
+    const events = new EventSource(committeeId ? `${API}/stream?committeeId=${encodeURIComponent(committeeId)}` : `${API}/stream`);
+
+    events.addEventListener('member.upserted', (event) => {
+      const member = JSON.parse(event.data);
+      setMembers((previous) => {
+        const exists = previous.some((existing) => existing.id === member.id);
+        return exists
+          ? previous.map((existing) => (existing.id === member.id ? { ...existing, ...member } : existing))
+          : [...previous, member];
+      });
+    });
+
+    events.addEventListener('member.deleted', (event) => {
+      const { id } = JSON.parse(event.data);
+      setMembers((previous) => previous.filter((member) => member.id !== id));
+    });
+
+    return () => events.close();
+  }, []);
+
+  const fetchMembers = async (cursor = null) => {
     try {
       setLoading(true);
-      const response = await axios.get(`${API}/members`);
-      setMembers(response.data);
+      const params = { limit: MEMBER_PAGE_SIZE, fields: MEMBER_FIELDS };
+      if (cursor) {
+        params.cursor = cursor;
+      }
+      const response = await axios.get(`${API}/members`, { params });
+      setMembers(cursor ? (previous) => [...previous, ...response.data] : response.data);
+      setNextCursor(response.headers['x-next-cursor'] || null);
     } catch (error) {
       console.error('Error fetching members:', error);
     } finally {
@@ -41,7 +75,9 @@ const Dashboard = () => {
   const handleAddMember = async (newMember) => {
     try {
       const response = await axios.post(`${API}/members`, newMember);
-      setMembers([...members, response.data]);
+      setMembers((previous) =>
+        previous.some((member) => member.id === response.data.id) ? previous : [...previous, response.data]
+      );
     } catch (error) {
       console.error('Error adding member:', error);
     }
@@ -49,11 +85,25 @@ const Dashboard = () => {
 
   const handleUpdateMember = async (updatedMember) => {
     try {
-      const response = await axios.put(`${API}/members/${updatedMember.id}`, updatedMember);
+      const headers = updatedMember.version != null ? { 'If-Match': `"${updatedMember.version}"` } : {};
+      const response = await axios.put(`${API}/members/${updatedMember.id}`, updatedMember, { headers });
       setMembers(members.map(member => 
         member.id === updatedMember.id ? response.data : member
       ));
     } catch (error) {
+      if (error.response?.status === 412) {
+        // Someone else saved first; show their version so the edit can be redone
+        console.warn('Member was changed by someone else; reloading it');
+        try {
+          const latest = await axios.get(`${API}/members/${updatedMember.id}`);
+          setMembers(members.map(member => 
+            member.id === updatedMember.id ? latest.data : member
+          ));
+        } catch (reloadError) {
+          console.error('Error reloading member:', reloadError);
+        }
+        return;
+      }
       console.error('Error updating member:', error);
     }
   };
@@ -124,6 +174,18 @@ const Dashboard = () => {
           </TabsContent>
         </Tabs>
 
+        {nextCursor && (
+          <div className="flex justify-center">
+            <Button
+              variant="outline"
+              onClick={() => fetchMembers(nextCursor)}
+              disabled={loading}
+            >
+              Load more members
+            </Button>
+          </div>
+        )}
+
         <AddMemberDialog 
           isOpen={isAddDialogOpen}
           onClose={() => setIsAddDialogOpen(false)}
@@ -18,8 +18,6 @@ const EditMemberDialog = ({ isOpen, onClose, member, onUpdateMember }) => {
     role: '',
     contact: '',
     phone: '',
-    tasksCompleted: 0,
-    tasksPending: 0,
     efficiency: 0,
     registrationsBrought: 0
   });
@@ -42,8 +40,6 @@ const EditMemberDialog = ({ isOpen, onClose, member, onUpdateMember }) => {
         role: member.role || '',
         contact: member.contact || '',
         phone: member.phone || '',
-        tasksCompleted: member.tasksCompleted || 0,
-        tasksPending: member.tasksPending || 0,
         efficiency: member.efficiency || 0,
         registrationsBrought: member.registrationsBrought || 0
       });
@@ -53,10 +49,11 @@ const EditMemberDialog = ({ isOpen, onClose, member, onUpdateMember }) => {
   const handleSubmit = (e) => {
     e.preventDefault();
     if (formData.name && formData.role && formData.contact) {
+      // Task counts follow the member's tasks, so only the editable fields are sent
       const updatedMember = {
-        ...member,
-        ...formData,
-        totalTasks: formData.tasksCompleted + formData.tasksPending
+        id: member.id,
+        version: member.version,
+        ...formData
       };
       onUpdateMember(updatedMember);
     }
@@ -154,29 +151,13 @@ const EditMemberDialog = ({ isOpen, onClose, member, onUpdateMember }) => {
             
             <div className="grid grid-cols-2 gap-4">
               <div className="space-y-2">
-                <Label htmlFor="tasksCompleted" className="text-sm font-medium text-gray-700">
-                  Tasks Completed
-                </Label>
-                <Input
-                  id="tasksCompleted"
-                  type="number"
-                  min="0"
-                  value={formData.tasksCompleted}
-                  onChange={(e) => handleChange('tasksCompleted', parseInt(e.target.value) || 0)}
-                />
+                <Label className="text-sm font-medium text-gray-700">Tasks Completed</Label>
+                <p className="text-lg font-bold text-emerald-700">{member.tasksCompleted || 0}</p>
               </div>
 
               <div className="space-y-2">
-                <Label htmlFor="tasksPending" className="text-sm font-medium text-gray-700">
-                  Tasks Pending
-                </Label>
-                <Input
-                  id="tasksPending"
-                  type="number"
-                  min="0"
-                  value={formData.tasksPending}
-                  onChange={(e) => handleChange('tasksPending', parseInt(e.target.value) || 0)}
-                />
+                <Label className="text-sm font-medium text-gray-700">Tasks Pending</Label>
+                <p className="text-lg font-bold text-amber-700">{member.tasksPending || 0}</p>
               </div>
             </div>
 
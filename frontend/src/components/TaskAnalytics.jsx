@@ -30,12 +30,15 @@ const TaskAnalytics = ({ members, loading }) => {
   const fetchTaskData = async () => {
     try {
       setCategoriesLoading(true);
-      const [categoriesResponse, analyticsResponse] = await Promise.all([
-        axios.get(`${API}/task-categories`),
-        axios.get(`${API}/analytics/tasks`)
-      ]);
-      setTaskCategories(categoriesResponse.data);
-      setTaskAnalytics(analyticsResponse.data);
+      // One request for both sections; they share the backend's ranking scan
+      const response = await axios.get(`${API}/dashboard`, {
+        params: { sections: 'tasks,categories' }
+      });
+      if (response.data.errors.tasks || response.data.errors.categories) {
+        console.error('Error fetching task data:', response.data.errors);
+      }
+      setTaskCategories(response.data.categories || []);
+      setTaskAnalytics(response.data.tasks || null);
     } catch (error) {
       console.error('Error fetching task data:', error);
     } finally {
@@ -0,0 +1,69 @@
+"""Shared fixtures: the FastAPI app against an in-memory mongomock-motor database.
+
+Run from the repository root with ``python -m pytest -q``. The app's
+lifespan is not run; each test gets a fresh database and empty
+per-process caches and indexes.
+"""
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "performance_manager_test")
+# mongomock lacks $dateTrunc, which snapshots need for the registrations section
+os.environ.setdefault("ANALYTICS_SNAPSHOTS_ENABLED", "false")
+
+def reset_process_state():
+    """Forget everything the previous test left in process-wide caches and indexes"""
+    from services.columnar import member_columns
+    from services.leaderboard import leaderboard
+    from services.member_search import search_index
+    from services.response_cache import response_cache
+    from services.snapshots import analytics_snapshots
+    from services.tiers import tier_config
+    response_cache.invalidate_local()
+    leaderboard.invalidate()
+    search_index.invalidate()
+    member_columns.invalidate()
+    analytics_snapshots.forget()
+    tier_config.invalidate()
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+@pytest.fixture
+async def db():
+    from mongomock_motor import AsyncMongoMockClient
+    import database
+    database.connect(AsyncMongoMockClient())
+    reset_process_state()
+    yield database.get_db()
+    database.close()
+
+@pytest.fixture
+async def client(db):
+    import httpx
+    import server
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+MEMBER = {
+    "name": "Sarah Johnson",
+    "role": "Team Lead",
+    "contact": "sarah.johnson@email.com",
+    "phone": "+1 (555) 123-4567",
+    "efficiency": 85,
+    "registrationsBrought": 12,
+}
+
+@pytest.fixture
+async def member(client):
+    """A member of the default committee"""
+    response = await client.post("/api/members/", json=MEMBER)
+    assert response.status_code == 201, response.text
+    return response.json()
@@ -0,0 +1,24 @@
+import pytest
+
+from services import analytics
+from services.tiers import DEFAULT_TIERS
+from tests.conftest import MEMBER
+
+pytestmark = pytest.mark.anyio
+
+def test_registration_metrics_without_rows_have_no_top_performer():
+    # A summary counting members the (possibly lagging) ranking read did not return
+    totals = {"totalMembers": 2, "registrations": 9}
+    metrics = analytics.registration_metrics_from(totals, DEFAULT_TIERS, {"Silver": 1}, [], [])
+    assert metrics["topPerformer"] is None
+    assert metrics["registrationTiers"] == []
+    assert metrics["avgRegistrationsPerMember"] == 4
+
+async def test_overview_top_performer_is_a_member_row(client, member):
+    best = (await client.post("/api/members/", json={**MEMBER, "contact": "best@email.com", "efficiency": 97})).json()
+    overview = (await client.get("/api/analytics/overview")).json()
+    top_performer = overview["topPerformer"]
+    assert top_performer["id"] == best["id"] and "_id" not in top_performer
+    assert top_performer == (await client.get(f"/api/members/{best['id']}")).json()
+    dashboard = (await client.get("/api/dashboard", params={"sections": "overview"})).json()
+    assert dashboard["overview"] == overview
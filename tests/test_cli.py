@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+from typer.testing import CliRunner
+
+import cli
+import database
+from services import fixtures, history
+from services.committees import DEFAULT_COMMITTEE_ID
+
+runner = CliRunner()
+
+@pytest.fixture
+def db(monkeypatch):
+    """A mongomock database kept across commands, which close the client after each run"""
+    from mongomock_motor import AsyncMongoMockClient
+    database.connect(AsyncMongoMockClient())
+    monkeypatch.setattr(cli, "close", lambda: None)
+
+    async def create_history_collection(db):
+        """mongomock lacks time-series collections; history points go to a plain one"""
+
+    monkeypatch.setattr(history, "create_history_collection", create_history_collection)
+    yield database.get_db()
+    database.close()
+
+def counts(db):
+    async def count():
+        return {
+            collection: await db[collection].count_documents({"committeeId": DEFAULT_COMMITTEE_ID})
+            for collection in ("committee_members", "tasks")
+        }
+
+    return asyncio.run(count())
+
+def test_seed_loads_an_empty_committee_once(db):
+    result = runner.invoke(cli.app, ["seed", "--members", "12", "--batch-size", "5"])
+    assert result.exit_code == 0, result.output
+    assert f"{DEFAULT_COMMITTEE_ID}: loaded 12 members" in result.output
+    seeded = counts(db)
+    assert seeded["committee_members"] == 12 and seeded["tasks"] > 0
+
+    # A second run leaves the committee as it was
+    result = runner.invoke(cli.app, ["seed", "--members", "12"])
+    assert result.exit_code == 1
+    assert f"Committee {DEFAULT_COMMITTEE_ID} already has members" in result.output
+    assert counts(db) == seeded
+
+def test_seed_fills_other_committees(db):
+    assert runner.invoke(cli.app, ["seed"]).exit_code == 0
+    result = runner.invoke(cli.app, ["seed", "--committee", "beta"])
+    assert result.exit_code == 0, result.output
+    assert f"beta: loaded {len(fixtures.SAMPLE_MEMBERS)} members" in result.output
@@ -0,0 +1,68 @@
+import pytest
+
+from services import history
+from services.columnar import member_columns
+from services.response_cache import response_cache
+from tests.conftest import MEMBER
+
+pytestmark = pytest.mark.anyio
+
+ENDPOINTS = ("/api/analytics/overview", "/api/analytics/tasks", "/api/dashboard?sections=overview,tasks,registrations")
+
+@pytest.fixture(autouse=True)
+def no_monthly_rollup(monkeypatch):
+    """mongomock lacks $dateTrunc; monthlyData is read the same way by both engines"""
+    async def monthly_registrations(database, committee_id, months=3):
+        return []
+
+    monkeypatch.setattr(history, "monthly_registrations", monthly_registrations)
+
+async def read_with(client, monkeypatch, enabled: bool):
+    monkeypatch.setattr(member_columns, "enabled", enabled)
+    response_cache.invalidate_local()
+    responses = {}
+    for path in ENDPOINTS:
+        response = await client.get(path)
+        assert response.status_code == 200, response.text
+        assert not response.json().get("errors"), response.text
+        responses[path] = response.json()
+    return responses
+
+async def assert_engines_agree(client, monkeypatch):
+    mongo = await read_with(client, monkeypatch, False)
+    columnar = await read_with(client, monkeypatch, True)
+    for path in ENDPOINTS:
+        assert columnar[path] == mongo[path], path
+
+async def test_columnar_engine_matches_mongo_through_writes(client, monkeypatch):
+    operations = [
+        {"op": "create", "data": {**MEMBER, "name": f"Member {i}", "contact": f"member{i}@email.com", "efficiency": 40 + i * 7 % 60, "registrationsBrought": i * 3 % 20}}
+        for i in range(12)
+    ]
+    created = (await client.post("/api/members/bulk", json={"operations": operations})).json()["results"]
+    ids = [result["id"] for result in created]
+    for i, member_id in enumerate(ids[:6]):
+        task = (await client.post("/api/tasks/", json={"title": f"Task {i}", "category": "Marketing", "assigneeId": member_id})).json()
+        if i % 2:
+            await client.put(f"/api/tasks/{task['id']}", json={"status": "completed"})
+    # Columns are loaded from here on, so later writes are applied incrementally
+    await assert_engines_agree(client, monkeypatch)
+
+    await client.put(f"/api/members/{ids[0]}", json={"efficiency": 100, "registrationsBrought": 25})
+    await client.post("/api/members/", json={**MEMBER, "contact": "late@email.com", "efficiency": 99})
+    await assert_engines_agree(client, monkeypatch)
+
+    await client.delete(f"/api/members/{ids[0]}")
+    await client.post("/api/members/bulk", json={"operations": [
+        {"op": "delete", "id": ids[1]},
+        {"op": "update", "id": ids[2], "data": {"registrationsBrought": 0, "efficiency": 41}},
+    ]})
+    await assert_engines_agree(client, monkeypatch)
+
+    loads = member_columns.load_stats()["loads"]
+    assert loads >= 1
+    await assert_engines_agree(client, monkeypatch)
+    assert member_columns.load_stats()["loads"] == loads
+
+async def test_engines_agree_on_an_empty_committee(client, monkeypatch):
+    await assert_engines_agree(client, monkeypatch)
@@ -0,0 +1,125 @@
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+
+from middleware.compression import CompressionMiddleware
+from services import dashboard, history, summary
+from tests.conftest import MEMBER
+
+pytestmark = pytest.mark.anyio
+
+# Section -> the standalone endpoint it has the shape of
+STANDALONE = {
+    "overview": "/api/analytics/overview",
+    "tasks": "/api/analytics/tasks",
+    "registrations": "/api/analytics/registrations",
+    "categories": "/api/task-categories/",
+}
+
+@pytest.fixture(autouse=True)
+def no_monthly_rollup(monkeypatch):
+    """mongomock lacks $dateTrunc, which monthlyData needs"""
+    async def monthly_registrations(database, committee_id, months=3):
+        return []
+
+    monkeypatch.setattr(history, "monthly_registrations", monthly_registrations)
+
+@pytest.fixture
+async def members(client):
+    created = []
+    for i, (efficiency, registrations) in enumerate(((70, 3), (95, 0), (85, 9))):
+        response = await client.post("/api/members/", json={
+            **MEMBER, "name": f"Member {i}", "contact": f"member{i}@email.com", "efficiency": efficiency, "registrationsBrought": registrations,
+        })
+        created.append(response.json())
+    task = (await client.post("/api/tasks/", json={"title": "Flyers", "category": "Marketing", "assigneeId": created[0]["id"]})).json()
+    await client.put(f"/api/tasks/{task['id']}", json={"status": "completed"})
+    return created
+
+async def test_sections_match_their_standalone_endpoints(client, members):
+    response = await client.get("/api/dashboard")
+    assert response.status_code == 200, response.text
+    payload = response.json()
+    assert payload["sections"] == list(dashboard.SECTIONS) and payload["errors"] == {}
+    for section, path in STANDALONE.items():
+        assert payload[section] == (await client.get(path)).json(), section
+
+    page = await client.get("/api/members/")
+    assert payload["members"] == {"items": page.json(), "nextCursor": None}
+
+async def test_sections_share_one_summary_read(client, members, monkeypatch):
+    get_summary = summary.get_summary
+    reads = []
+
+    async def counted(database, committee_id):
+        reads.append(committee_id)
+        return await get_summary(database, committee_id)
+
+    monkeypatch.setattr(summary, "get_summary", counted)
+    assert not (await client.get("/api/dashboard", params={"sections": "overview,tasks,registrations"})).json()["errors"]
+    assert len(reads) == 1
+
+async def test_requested_sections_in_response_order(client, members):
+    payload = (await client.get("/api/dashboard", params={"sections": "categories, overview"})).json()
+    assert payload["sections"] == ["overview", "categories"]
+    assert set(payload) == {"sections", "errors", "overview", "categories"}
+    assert (await client.get("/api/dashboard", params={"sections": "overview,charts"})).status_code == 400
+
+async def test_members_section_pages_with_the_cursor_in_the_body(client, members):
+    payload = (await client.get("/api/dashboard", params={"sections": "members", "membersLimit": 2})).json()
+    page = await client.get("/api/members/", params={"limit": 2})
+    assert payload["members"]["items"] == page.json()
+    assert payload["members"]["nextCursor"] == page.headers["X-Next-Cursor"]
+
+async def test_failed_section_is_reported_without_failing_the_others(client, members, monkeypatch):
+    async def failing(reads):
+        raise RuntimeError("boom")
+
+    monkeypatch.setitem(dashboard.SECTION_BUILDERS, "tasks", failing)
+    response = await client.get("/api/dashboard", params={"sections": "overview,tasks"})
+    assert response.status_code == 200
+    assert response.json()["errors"] == {"tasks": "Failed to fetch tasks"}
+    assert response.json()["overview"]["totalMembers"] == 3
+
+def compressed_app(minimum_size):
+    async def text(request):
+        return PlainTextResponse("x" * int(request.query_params["size"]))
+
+    async def chunks(request):
+        async def stream():
+            for _ in range(int(request.query_params["count"])):
+                yield b"x" * 100
+
+        return StreamingResponse(stream())
+
+    async def events(request):
+        async def stream():
+            yield b"data: " + b"x" * 2000 + b"\n\n"
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    app = Starlette(routes=[Route("/api/text", text), Route("/api/chunks", chunks), Route("/api/stream/", events)])
+    return CompressionMiddleware(app, minimum_size=minimum_size, excluded_prefixes=["/api/stream"])
+
+async def get_raw(app, path):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get(path, headers={"Accept-Encoding": "gzip"})
+        return response.headers.get("content-encoding"), len(response.content)
+
+async def test_compression_minimum_size():
+    app = compressed_app(1000)
+    assert await get_raw(app, "/api/text?size=999") == (None, 999)
+    assert await get_raw(app, "/api/text?size=5000") == ("gzip", 5000)
+    # Streamed bodies are measured as a whole
+    assert await get_raw(app, "/api/chunks?count=3") == (None, 300)
+    assert await get_raw(app, "/api/chunks?count=30") == ("gzip", 3000)
+
+async def test_event_stream_is_never_compressed():
+    assert (await get_raw(compressed_app(100), "/api/stream/"))[0] is None
+
+async def test_app_compresses_large_reads(client, members):
+    response = await client.get("/api/members/", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip" and len(response.json()) == 3
+    assert "content-encoding" not in (await client.get("/api/", headers={"Accept-Encoding": "gzip"})).headers
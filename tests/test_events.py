@@ -0,0 +1,100 @@
+import asyncio
+import json
+
+import pytest
+
+from services.events import ChangeStreamWatcher, EventBroadcaster
+
+pytestmark = pytest.mark.anyio
+
+class FakeStream:
+    """Change events as an async iterator, like a Motor change stream"""
+
+    def __init__(self, changes):
+        self.changes = changes
+        self.resume_token = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.changes:
+            await asyncio.Event().wait()  # An idle stream
+        self.resume_token = {"_data": len(self.changes)}
+        return self.changes.pop(0)
+
+class FakeCollection:
+    def __init__(self, changes):
+        self.changes = changes
+        self.options = None
+
+    def watch(self, **options):
+        self.options = options
+        return FakeStream(self.changes)
+
+class FakeDatabase:
+    def __init__(self, changes, pre_images: bool):
+        self.committee_members = FakeCollection(changes)
+        self.pre_images = pre_images
+
+    async def command(self, *args, **kwargs):
+        if not self.pre_images:
+            raise RuntimeError("unknown option changeStreamPreAndPostImages")
+
+class Watcher(ChangeStreamWatcher):
+    async def overview(self, committee_id):
+        return {"committee": committee_id}
+
+def events(subscriber):
+    received = []
+    while not subscriber.queue.empty():
+        event, data = subscriber.queue.get_nowait().decode().strip().split("\n")
+        received.append((event.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+    return received
+
+async def run_watcher(changes, pre_images: bool):
+    broadcaster = EventBroadcaster()
+    alpha, beta = broadcaster.subscribe("alpha"), broadcaster.subscribe("beta")
+    watcher = Watcher(broadcaster, overview_delay=0)
+    database = FakeDatabase(changes, pre_images)
+    watcher.ensure_started(database)
+    for _ in range(20):
+        await asyncio.sleep(0)
+    await watcher.stop()
+    return watcher, database, events(alpha), events(beta)
+
+async def test_delete_goes_to_the_committee_of_the_pre_image():
+    delete = {"operationType": "delete", "documentKey": {"_id": "m1"}, "fullDocumentBeforeChange": {"_id": "m1", "committeeId": "alpha"}}
+    watcher, database, alpha, beta = await run_watcher([delete], pre_images=True)
+    assert database.committee_members.options["full_document_before_change"] == "whenAvailable"
+    assert alpha == [("member.deleted", {"id": "m1"}), ("overview", {"committee": "alpha"})]
+    assert beta == []
+
+async def test_delete_without_pre_image_is_not_broadcast():
+    delete = {"operationType": "delete", "documentKey": {"_id": "m1"}}
+    watcher, database, alpha, beta = await run_watcher([delete], pre_images=False)
+    assert "full_document_before_change" not in database.committee_members.options
+    assert alpha == [("overview", {"committee": "alpha"})]
+    assert beta == [("overview", {"committee": "beta"})]
+    assert watcher.unrouted_deletes == 1
+
+async def test_stop_cancels_pending_overviews():
+    broadcaster = EventBroadcaster()
+    alpha = broadcaster.subscribe("alpha")
+    change = {"operationType": "insert", "fullDocument": {"_id": "m1", "committeeId": "alpha", "name": "Ann"}}
+    watcher = Watcher(broadcaster, overview_delay=60)
+    watcher.ensure_started(FakeDatabase([change], pre_images=True))
+    for _ in range(20):
+        await asyncio.sleep(0)
+    assert set(watcher._overviews) == {"alpha"}
+    pending = watcher._overviews["alpha"]
+
+    await watcher.stop()
+    assert pending.cancelled() and watcher._overviews == {}
+    assert [event for event, _ in events(alpha)] == ["member.upserted"]
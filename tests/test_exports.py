@@ -0,0 +1,92 @@
+import csv
+import gzip
+import io
+import json
+
+import pytest
+
+from services import exports
+from tests.conftest import MEMBER
+
+pytestmark = pytest.mark.anyio
+
+@pytest.fixture
+async def members(client):
+    created = []
+    for i, (efficiency, registrations) in enumerate(((70, 3), (95, 0), (85, 9), (60, 12), (90, 5))):
+        response = await client.post("/api/members/", json={
+            **MEMBER, "name": f"Member {i}", "contact": f"member{i}@email.com", "efficiency": efficiency, "registrationsBrought": registrations,
+        })
+        assert response.status_code == 201, response.text
+        created.append(response.json())
+    return created
+
+@pytest.fixture(autouse=True)
+def small_batches(monkeypatch):
+    """Rows split across several encoded chunks"""
+    monkeypatch.setattr(exports, "EXPORT_BATCH_SIZE", 2)
+
+async def export(client, path, **params):
+    response = await client.get(f"/api/export/{path}", params=params)
+    assert response.status_code == 200, response.text
+    return response
+
+def ndjson(response):
+    return [json.loads(line) for line in response.text.splitlines()]
+
+async def test_members_as_ndjson_in_id_order(client, members):
+    response = await export(client, "members")
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.headers["content-disposition"] == 'attachment; filename="members.ndjson"'
+    rows = ndjson(response)
+    assert [row["id"] for row in rows] == sorted(member["id"] for member in members)
+    assert all("performanceHistory" not in row for row in rows)
+    by_id = {member["id"]: member for member in members}
+    assert all(row["efficiency"] == by_id[row["id"]]["efficiency"] for row in rows)
+
+async def test_members_as_csv_with_selected_fields(client, members):
+    response = await export(client, "members", format="csv", fields="name,efficiency")
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.headers["content-disposition"] == 'attachment; filename="members.csv"'
+    lines = response.text.splitlines()
+    assert lines[0] == "id,name,efficiency"
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 5
+    assert sorted((row["name"], row["efficiency"]) for row in rows)[0] == ("Member 0", "70")
+
+    rows = ndjson(await export(client, "members", fields="name"))
+    assert all(set(row) == {"id", "name"} for row in rows)
+
+async def test_unknown_fields_are_rejected(client):
+    response = await client.get("/api/export/members", params={"fields": "name,password"})
+    assert response.status_code == 400
+
+async def test_rankings_follow_efficiency(client, members):
+    rows = ndjson(await export(client, "rankings"))
+    assert [(row["rank"], row["efficiency"]) for row in rows] == [(1, 95), (2, 90), (3, 85), (4, 70), (5, 60)]
+
+    response = await export(client, "rankings", format="csv")
+    assert response.text.splitlines()[0] == ",".join(exports.RANKING_COLUMNS)
+    assert [row["name"] for row in csv.DictReader(io.StringIO(response.text))] == ["Member 1", "Member 4", "Member 2", "Member 0", "Member 3"]
+
+async def test_registration_tiers(client, members):
+    rows = ndjson(await export(client, "registration-tiers"))
+    assert [row["registrationsBrought"] for row in rows] == [12, 9, 5, 3, 0]
+    assert all(set(exports.TIER_COLUMNS) <= set(row) for row in rows)
+    # Shares of the 29 registrations
+    assert [row["percentage"] for row in rows] == [41.4, 31.0, 17.2, 10.3, 0.0]
+
+@pytest.mark.parametrize("export_format", ["ndjson", "csv"])
+async def test_gzip_stream_matches_the_plain_one(client, members, export_format):
+    plain = await export(client, "rankings", format=export_format)
+    async with client.stream("GET", "/api/export/rankings", params={"format": export_format, "gzip": "true"}) as response:
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        compressed = b"".join([chunk async for chunk in response.aiter_raw()])
+    assert gzip.decompress(compressed) == plain.content
+
+async def test_empty_committee_exports_only_the_csv_header(client):
+    assert (await export(client, "members")).content == b""
+    assert (await export(client, "rankings", format="csv")).text.splitlines() == [",".join(exports.RANKING_COLUMNS)]
+    compressed = await client.get("/api/export/rankings", params={"gzip": "true"})
+    assert compressed.status_code == 200 and compressed.content == b""
@@ -0,0 +1,51 @@
+import pytest
+
+import database
+import server
+
+pytestmark = pytest.mark.anyio
+
+@pytest.fixture(autouse=True)
+def not_prepared(monkeypatch):
+    """Each test starts where the lifespan leaves the app: preparation still running"""
+    monkeypatch.setattr(server.app.state, "ready", False, raising=False)
+    monkeypatch.setattr(server, "STARTUP_RETRY_SECONDS", 0)
+
+async def test_ready_only_once_the_database_is_prepared(db, client):
+    response = await client.get("/health/ready")
+    assert response.status_code == 503
+    assert (response.json()["startup"], response.json()["database"], response.json()["ready"]) == ("pending", "connected", False)
+    # Live and the plain health check do not gate on preparation
+    assert (await client.get("/health/live")).status_code == 200
+    assert (await client.get("/health")).json()["status"] == "healthy"
+
+    await server.prepare_database(server.app)
+    response = await client.get("/health/ready")
+    assert response.status_code == 200
+    assert (response.json()["status"], response.json()["startup"]) == ("ready", "complete")
+
+async def test_preparation_retries_until_mongo_answers(db, client, monkeypatch):
+    create_indexes = database.create_indexes
+    attempts = []
+
+    async def unreachable_at_first():
+        attempts.append(len(attempts))
+        if len(attempts) < 3:
+            raise ConnectionError("No servers available")
+        await create_indexes()
+
+    monkeypatch.setattr(database, "create_indexes", unreachable_at_first)
+    await server.prepare_database(server.app)
+    assert len(attempts) == 3
+    assert (await client.get("/health/ready")).status_code == 200
+
+async def test_unreachable_database_is_not_ready(db, client, monkeypatch):
+    server.app.state.ready = True
+
+    async def ping(self, *args, **kwargs):
+        raise ConnectionError("No servers available")
+
+    monkeypatch.setattr(type(db), "command", ping)
+    response = await client.get("/health/ready")
+    assert response.status_code == 503
+    assert (response.json()["startup"], response.json()["database"]) == ("complete", "disconnected")
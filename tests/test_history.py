@@ -0,0 +1,63 @@
+import pytest
+
+from services import history, summary
+from services.committees import DEFAULT_COMMITTEE_ID
+from tests.conftest import MEMBER
+
+pytestmark = pytest.mark.anyio
+
+BAD_HISTORY = [{"month": "Week 1", "score": 50}]
+
+async def test_unknown_month_is_rejected_before_any_write(db, client, member):
+    response = await client.post("/api/members/", json={**MEMBER, "contact": "sam@email.com", "performanceHistory": BAD_HISTORY})
+    assert response.status_code == 422
+    response = await client.put(f"/api/members/{member['id']}", json={"performanceHistory": BAD_HISTORY, "efficiency": 10})
+    assert response.status_code == 422
+    response = await client.post("/api/members/bulk", json={"operations": [
+        {"op": "create", "data": {**MEMBER, "contact": "sam@email.com", "performanceHistory": BAD_HISTORY}},
+    ]})
+    assert response.json()["results"][0]["status"] == 422
+
+    assert await db.committee_members.count_documents({}) == 1
+    assert (await summary.verify_summary(db, DEFAULT_COMMITTEE_ID)) == {}
+
+async def test_failed_history_write_still_updates_the_summary(db, client, member, monkeypatch):
+    async def unavailable(*args, **kwargs):
+        raise ConnectionError("history collection unavailable")
+
+    monkeypatch.setattr(history, "replace_scores", unavailable)
+    scores = [{"month": "2024-03", "score": 70}]
+    created = await client.post("/api/members/", json={**MEMBER, "contact": "sam@email.com", "performanceHistory": scores})
+    assert created.status_code == 201
+    updated = await client.put(f"/api/members/{member['id']}", json={"performanceHistory": scores, "efficiency": 10})
+    assert updated.status_code == 200
+    bulk = await client.post("/api/members/bulk", json={"operations": [
+        {"op": "create", "data": {**MEMBER, "contact": "kim@email.com", "performanceHistory": scores}},
+    ]})
+    assert bulk.json()["created"] == 1
+
+    assert (await summary.verify_summary(db, DEFAULT_COMMITTEE_ID)) == {}
+    assert (await summary.get_summary(db, DEFAULT_COMMITTEE_ID))["totalMembers"] == 3
+
+async def test_deleting_members_removes_their_points(db, client, member):
+    other = (await client.post("/api/members/", json={**MEMBER, "contact": "sam@email.com", "performanceHistory": [{"month": "2024-03", "score": 70}]})).json()
+    await client.put(f"/api/members/{member['id']}", json={"registrationsBrought": 20, "performanceHistory": [{"month": "2024-02", "score": 60}]})
+    points = db[history.HISTORY_COLLECTION]
+    assert await points.count_documents({"meta.memberId": member["id"]}) > 0
+
+    assert (await client.delete(f"/api/members/{member['id']}")).status_code == 204
+    assert await points.count_documents({"meta.memberId": member["id"]}) == 0
+    assert await points.count_documents({"meta.memberId": other["id"]}) > 0
+
+    await client.post("/api/members/bulk", json={"operations": [{"op": "delete", "id": other["id"]}]})
+    assert await points.count_documents({}) == 0
+
+async def test_history_months_keep_their_year(db, client, member):
+    scores = [{"month": "2023-03", "score": 60}, {"month": "2024-03", "score": 80}]
+    await client.put(f"/api/members/{member['id']}", json={"performanceHistory": scores})
+    histories = await history.performance_history(db, DEFAULT_COMMITTEE_ID, [member["id"]])
+    assert histories[member["id"]] == scores
+
+    # Sent back unchanged, the history stays the same
+    await client.put(f"/api/members/{member['id']}", json={"performanceHistory": histories[member["id"]]})
+    assert (await history.performance_history(db, DEFAULT_COMMITTEE_ID, [member["id"]]))[member["id"]] == scores
@@ -0,0 +1,76 @@
+import pytest
+
+from services.committees import DEFAULT_COMMITTEE_ID
+from services.leaderboard import RankedIndex
+
+pytestmark = pytest.mark.anyio
+
+# Ties on efficiency, which are ordered by id and share a competition rank
+EFFICIENCIES = {"m1": 70, "m2": 90, "m3": 70, "m4": 85, "m5": 90, "m6": 60}
+REGISTRATIONS = {"m1": 3, "m2": 1, "m3": 9, "m4": 9, "m5": 0, "m6": 12}
+
+@pytest.fixture
+async def members(db):
+    await db.committee_members.insert_many([
+        {
+            "_id": member_id, "committeeId": DEFAULT_COMMITTEE_ID, "name": f"Member {member_id}", "role": "Team Lead",
+            "efficiency": efficiency, "registrationsBrought": REGISTRATIONS[member_id], "version": 1,
+        }
+        for member_id, efficiency in EFFICIENCIES.items()
+    ])
+    await db.committee_members.insert_one({"_id": "other", "committeeId": "beta", "name": "Other", "efficiency": 99})
+
+async def get(client, path, **params):
+    response = await client.get(f"/api/leaderboard/{path}", params=params)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+def ranks(rows):
+    return [(row["id"], row["rank"], row["competitionRank"]) for row in rows]
+
+async def test_top_orders_ties_by_id_and_shares_competition_ranks(client, members):
+    page = await get(client, "efficiency")
+    assert page["total"] == 6
+    assert ranks(page["members"]) == [("m2", 1, 1), ("m5", 2, 1), ("m4", 3, 3), ("m1", 4, 4), ("m3", 5, 4), ("m6", 6, 6)]
+    assert page["members"][0]["name"] == "Member m2" and page["members"][0]["value"] == 90
+
+    page = await get(client, "efficiency", offset=2, limit=2)
+    assert ranks(page["members"]) == [("m4", 3, 3), ("m1", 4, 4)]
+    assert (await get(client, "efficiency", offset=6))["members"] == []
+
+async def test_metrics_are_ranked_separately(client, members):
+    page = await get(client, "registrationsBrought", limit=3)
+    assert ranks(page["members"]) == [("m6", 1, 1), ("m3", 2, 2), ("m4", 3, 2)]
+
+async def test_rank_of_a_member(client, members):
+    rank = await get(client, "efficiency/members/m3")
+    assert (rank["rank"], rank["competitionRank"], rank["value"], rank["total"]) == (5, 4, 70, 6)
+    assert (await client.get("/api/leaderboard/efficiency/members/missing")).status_code == 404
+    # Members of other committees are not ranked here
+    assert (await client.get("/api/leaderboard/efficiency/members/other")).status_code == 404
+
+async def test_members_around_are_clamped_to_the_board(client, members):
+    around = await get(client, "efficiency/members/m4/around", before=1, after=2)
+    assert [row["id"] for row in around["members"]] == ["m5", "m4", "m1", "m3"]
+    assert [row["id"] for row in (await get(client, "efficiency/members/m5/around", before=3, after=0))["members"]] == ["m2", "m5"]
+    assert [row["id"] for row in (await get(client, "efficiency/members/m3/around", before=0, after=5))["members"]] == ["m3", "m6"]
+    assert (await client.get("/api/leaderboard/efficiency/members/missing/around")).status_code == 404
+
+async def test_board_follows_member_writes(client, members):
+    await get(client, "efficiency")
+    assert (await client.put("/api/members/m6", json={"efficiency": 90})).status_code == 200
+    await client.delete("/api/members/m2")
+    page = await get(client, "efficiency", limit=3)
+    assert page["total"] == 5
+    assert ranks(page["members"]) == [("m5", 1, 1), ("m6", 2, 1), ("m4", 3, 3)]
+    assert (await get(client, "registrationsBrought/members/m6"))["rank"] == 1
+
+def test_ranked_index_moves_and_forgets_members():
+    index = RankedIndex("efficiency")
+    index.load([("a", 10), ("b", 20), ("c", 10)])
+    index.upsert("c", 30)
+    index.upsert("c", 30)
+    index.remove("missing")
+    assert [entry["id"] for entry in index.entries(0, 10)] == ["c", "b", "a"]
+    index.remove("b")
+    assert (index.position("a"), index.position("b"), len(index)) == (1, None, 2)
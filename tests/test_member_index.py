@@ -0,0 +1,45 @@
+import pytest
+
+from services import leaderboard as leaderboards
+from services.committees import DEFAULT_COMMITTEE_ID
+
+pytestmark = pytest.mark.anyio
+
+async def test_unreported_write_is_seen_after_max_age(db, member):
+    board = leaderboards.leaderboard.get(DEFAULT_COMMITTEE_ID)
+    expirations = board.expirations
+    assert (await leaderboards.top(db, DEFAULT_COMMITTEE_ID, "efficiency", 0, 10))["total"] == 1
+
+    # As written by cli.py or a worker this one hears nothing from
+    await db.committee_members.insert_one({"_id": "outside", "committeeId": DEFAULT_COMMITTEE_ID, "name": "Outside", "efficiency": 99})
+    assert (await leaderboards.top(db, DEFAULT_COMMITTEE_ID, "efficiency", 0, 10))["total"] == 1
+
+    board.loaded_at -= board.max_age
+    page = await leaderboards.top(db, DEFAULT_COMMITTEE_ID, "efficiency", 0, 10)
+    assert page["total"] == 2 and page["members"][0]["id"] == "outside"
+    assert board.expirations == expirations + 1
+
+async def test_max_age_zero_keeps_index_until_invalidated(db, member, monkeypatch):
+    board = leaderboards.leaderboard.get(DEFAULT_COMMITTEE_ID)
+    monkeypatch.setattr(board, "max_age", 0)
+    await leaderboards.top(db, DEFAULT_COMMITTEE_ID, "efficiency", 0, 10)
+    await db.committee_members.insert_one({"_id": "outside", "committeeId": DEFAULT_COMMITTEE_ID, "name": "Outside", "efficiency": 99})
+    board.loaded_at = 0.0
+    assert (await leaderboards.top(db, DEFAULT_COMMITTEE_ID, "efficiency", 0, 10))["total"] == 1
+    leaderboards.leaderboard.invalidate(DEFAULT_COMMITTEE_ID)
+    assert (await leaderboards.top(db, DEFAULT_COMMITTEE_ID, "efficiency", 0, 10))["total"] == 2
+
+async def test_failed_index_update_drops_the_index_instead_of_the_write(db, client, member, monkeypatch):
+    board = leaderboards.leaderboard.get(DEFAULT_COMMITTEE_ID)
+    await leaderboards.top(db, DEFAULT_COMMITTEE_ID, "efficiency", 0, 10)
+
+    def broken(member_id, member):
+        raise RuntimeError("index bug")
+
+    monkeypatch.setattr(board, "apply_one", broken)
+    response = await client.put(f"/api/members/{member['id']}", json={"efficiency": 12})
+    assert response.status_code == 200
+    assert not board.loaded
+    monkeypatch.undo()
+    page = await leaderboards.top(db, DEFAULT_COMMITTEE_ID, "efficiency", 0, 10)
+    assert page["members"][0]["efficiency"] == 12
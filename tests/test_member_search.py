@@ -0,0 +1,89 @@
+import pytest
+
+from services.member_search import SearchIndex, parse_query
+from tests.conftest import MEMBER
+
+pytestmark = pytest.mark.anyio
+
+# "sarah" is a name word of the first member, a role word of the second
+# and only prefixes a contact word of the third
+PEOPLE = [
+    {"name": "Sarah Johnson", "role": "Team Lead", "contact": "sarah.johnson@email.com"},
+    {"name": "Lena Ortiz", "role": "Sarah Liaison", "contact": "lena@email.com"},
+    {"name": "Mike Chen", "role": "Sales Lead", "contact": "mike@sarahs.com"},
+]
+
+async def create(client, **fields):
+    response = await client.post("/api/members/", json={**MEMBER, **fields})
+    assert response.status_code == 201, response.text
+    return response.json()
+
+async def search(client, q, **params):
+    response = await client.get("/api/members/search", params={"q": q, **params})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+@pytest.fixture
+async def people(client):
+    return [await create(client, **person) for person in PEOPLE]
+
+def names(page):
+    return [row["name"] for row in page["members"]]
+
+async def test_every_term_must_prefix_a_word(client, people):
+    page = await search(client, "sar joh")
+    assert names(page) == ["Sarah Johnson"] and page["total"] == 1
+    assert page["terms"] == ["sar", "joh"]
+    assert (await search(client, "arah"))["total"] == 0
+
+async def test_name_scores_over_role_over_contact(client, people):
+    page = await search(client, "sarah")
+    assert names(page) == ["Sarah Johnson", "Lena Ortiz", "Mike Chen"]
+    scores = [row["score"] for row in page["members"]]
+    assert scores == sorted(scores, reverse=True) and len(set(scores)) == 3
+
+async def test_whole_words_score_over_prefixes(client, people):
+    page = await search(client, "lead")
+    assert [row["score"] for row in page["members"]] == [4.0, 4.0]
+    assert [row["score"] for row in (await search(client, "lea"))["members"]] == [2.0, 2.0]
+
+async def test_short_prefixes_rank_like_longer_ones(client, people):
+    # Best field of a word starting with "s": name, then role for the other two, ordered by name
+    assert names(await search(client, "s")) == ["Sarah Johnson", "Lena Ortiz", "Mike Chen"]
+
+async def test_offset_and_limit_page_through_equal_scores_by_name(client):
+    for name in ("Alex Young", "Alex Baker", "Alex Moss", "Alex Ford", "Alexis Hart"):
+        await create(client, name=name, contact=f"{name.split()[1].lower()}@email.com")
+    first = await search(client, "alex", limit=2)
+    second = await search(client, "alex", offset=2, limit=2)
+    last = await search(client, "alex", offset=4, limit=2)
+    assert first["total"] == second["total"] == 5
+    # Whole-word matches before the prefix match, each level by name
+    assert names(first) + names(second) + names(last) == ["Alex Baker", "Alex Ford", "Alex Moss", "Alex Young", "Alexis Hart"]
+
+async def test_index_follows_member_writes(client, people):
+    assert (await search(client, "ortiz"))["total"] == 1
+    lena = people[1]
+    await client.put(f"/api/members/{lena['id']}", json={"name": "Lena Park"})
+    assert (await search(client, "ortiz"))["total"] == 0
+    assert names(await search(client, "park")) == ["Lena Park"]
+
+    await client.delete(f"/api/members/{lena['id']}")
+    assert (await search(client, "lena"))["total"] == 0
+    added = await create(client, name="Zoe Ortiz", contact="zoe@email.com")
+    assert [row["id"] for row in (await search(client, "ortiz"))["members"]] == [added["id"]]
+
+async def test_accents_and_committees(client, people):
+    await create(client, name="José Álvarez", contact="jose@email.com")
+    assert names(await search(client, "alvarez jose")) == ["José Álvarez"]
+    assert (await client.get("/api/members/search", params={"q": "sarah"}, headers={"X-Committee-Id": "beta"})).json()["total"] == 0
+
+async def test_query_without_terms_is_rejected(client):
+    assert (await client.get("/api/members/search", params={"q": "@.!"})).status_code == 400
+
+def test_emptied_words_are_pruned():
+    index = SearchIndex("alpha")
+    index.load([{"_id": "m1", **PEOPLE[0]}, {"_id": "m2", **PEOPLE[1]}])
+    index.apply_one("m2", None)
+    assert "ortiz" not in index.words and "ortiz" not in index.postings
+    assert index.search(parse_query("sarah"), 0, 10)[0] == 1
@@ -0,0 +1,144 @@
+import asyncio
+
+import pytest
+
+from services import summary
+from services.committees import DEFAULT_COMMITTEE_ID
+from tests.conftest import MEMBER
+
+pytestmark = pytest.mark.anyio
+
+async def test_create_rejects_task_counts(client):
+    response = await client.post("/api/members/", json={**MEMBER, "tasksCompleted": 5})
+    assert response.status_code == 422
+    assert (await client.get("/api/members/")).json() == []
+
+async def test_update_rejects_task_counts(client, member):
+    response = await client.put(f"/api/members/{member['id']}", json={"tasksPending": 3, "efficiency": 90})
+    assert response.status_code == 422
+    current = (await client.get(f"/api/members/{member['id']}")).json()
+    assert (current["tasksPending"], current["efficiency"]) == (0, 85)
+
+async def test_bulk_rejects_task_counts_per_item(client, member):
+    response = await client.post("/api/members/bulk", json={"operations": [
+        {"op": "update", "id": member["id"], "data": {"totalTasks": 9}},
+        {"op": "create", "data": {**MEMBER, "tasksCompleted": 2}},
+        {"op": "create", "data": {**MEMBER, "contact": "sam@email.com"}},
+    ]})
+    assert response.status_code == 200, response.text
+    results = response.json()["results"]
+    assert [result["status"] for result in results] == [422, 422, 201]
+    assert "totalTasks" in results[0]["error"]
+    created = (await client.get(f"/api/members/{results[2]['id']}")).json()
+    assert (created["tasksCompleted"], created["totalTasks"]) == (0, 0)
+
+async def test_concurrent_if_match_increments_are_not_lost(db, client, member):
+    workers, increments = 8, 3
+    barrier = asyncio.Barrier(workers)
+    retries = 0
+
+    async def increment(first: bool) -> None:
+        nonlocal retries
+        while True:
+            current = await client.get(f"/api/members/{member['id']}")
+            if first:
+                # Every worker reads the same version, so all but one first write conflict
+                await barrier.wait()
+                first = False
+            response = await client.put(
+                f"/api/members/{member['id']}",
+                json={"registrationsBrought": current.json()["registrationsBrought"] + 1},
+                headers={"If-Match": current.headers["etag"]},
+            )
+            if response.status_code == 412:
+                retries += 1
+                continue
+            assert response.status_code == 200, response.text
+            return
+
+    async def worker() -> None:
+        for i in range(increments):
+            await increment(first=i == 0)
+
+    await asyncio.gather(*(worker() for _ in range(workers)))
+
+    final = await client.get(f"/api/members/{member['id']}")
+    assert final.json()["registrationsBrought"] == member["registrationsBrought"] + workers * increments
+    assert final.headers["etag"] == f'"{member["version"] + workers * increments}"'
+    assert retries >= workers - 1
+    totals = await summary.get_summary(db, DEFAULT_COMMITTEE_ID)
+    assert totals["registrations"] == member["registrationsBrought"] + workers * increments
+
+async def test_bulk_deltas_come_from_each_write(db, client, member):
+    other = (await client.post("/api/members/", json={**MEMBER, "contact": "mike.chen@email.com", "registrationsBrought": 4})).json()
+    response = await client.post("/api/members/bulk", json={"operations": [
+        {"op": "update", "id": member["id"], "data": {"registrationsBrought": 20}},
+        {"op": "delete", "id": other["id"]},
+        {"op": "update", "id": "missing", "data": {"efficiency": 10}},
+        {"op": "create", "data": {**MEMBER, "contact": "sam@email.com", "registrationsBrought": 1}},
+    ]})
+    body = response.json()
+    assert [result["status"] for result in body["results"]] == [200, 200, 404, 201]
+    assert (body["updated"], body["deleted"], body["created"], body["failed"]) == (1, 1, 1, 1)
+
+    assert (await summary.verify_summary(db, DEFAULT_COMMITTEE_ID)) == {}
+    totals = await summary.get_summary(db, DEFAULT_COMMITTEE_ID)
+    assert (totals["registrations"], totals["totalMembers"]) == (21, 2)
+    updated = await client.get(f"/api/members/{member['id']}")
+    assert updated.headers["etag"] == f'"{member["version"] + 1}"'
+
+async def test_single_write_landing_during_a_bulk_keeps_the_summary_exact(db, client, member, monkeypatch):
+    collection_type = type(db.committee_members)
+    landed = False
+
+    def single_write_first(method):
+        """Run a single-member PUT just before the bulk's first write reaches the collection"""
+        async def write(self, *args, **kwargs):
+            nonlocal landed
+            if not landed:
+                landed = True
+                response = await client.put(f"/api/members/{member['id']}", json={"registrationsBrought": 5})
+                assert response.status_code == 200, response.text
+            return await method(self, *args, **kwargs)
+        return write
+
+    monkeypatch.setattr(collection_type, "bulk_write", single_write_first(collection_type.bulk_write))
+    response = await client.post("/api/members/bulk", json={"operations": [
+        {"op": "update", "id": member["id"], "data": {"registrationsBrought": 30}},
+    ]})
+    assert response.json()["updated"] == 1 and landed
+
+    assert (await summary.verify_summary(db, DEFAULT_COMMITTEE_ID)) == {}
+    assert (await summary.get_summary(db, DEFAULT_COMMITTEE_ID))["registrations"] == 30
+
+async def test_bulk_retries_writes_whose_member_changed_after_its_pre_image(db, client, member, monkeypatch):
+    collection_type = type(db.committee_members)
+    other = (await client.post("/api/members/", json={**MEMBER, "contact": "mike.chen@email.com", "registrationsBrought": 4})).json()
+    bulk_write = collection_type.bulk_write
+    rounds = []
+
+    async def count_rounds(self, requests, **kwargs):
+        rounds.append(len(requests))
+        if len(rounds) == 1:
+            # Both members change between the pre-image read and the bulk's writes
+            await client.put(f"/api/members/{member['id']}", json={"registrationsBrought": 5})
+            await client.put(f"/api/members/{other['id']}", json={"efficiency": 10})
+        return await bulk_write(self, requests, **kwargs)
+
+    monkeypatch.setattr(collection_type, "bulk_write", count_rounds)
+    response = await client.post("/api/members/bulk", json={"operations": [
+        {"op": "update", "id": member["id"], "data": {"registrationsBrought": 30}},
+        {"op": "delete", "id": other["id"]},
+        {"op": "create", "data": {**MEMBER, "contact": "sam@email.com", "registrationsBrought": 1}},
+    ]})
+    body = response.json()
+    assert [result["status"] for result in body["results"]] == [200, 200, 201]
+    # The create went through with the first round; only the two guarded writes were sent again
+    assert rounds == [3, 2]
+
+    updated = await client.get(f"/api/members/{member['id']}")
+    assert updated.json()["registrationsBrought"] == 30
+    assert updated.headers["etag"] == f'"{member["version"] + 2}"'
+    assert (await client.get(f"/api/members/{other['id']}")).status_code == 404
+    assert (await summary.verify_summary(db, DEFAULT_COMMITTEE_ID)) == {}
+    assert (await summary.get_summary(db, DEFAULT_COMMITTEE_ID))["registrations"] == 31
@@ -0,0 +1,72 @@
+import pytest
+
+from services import metrics
+
+pytestmark = pytest.mark.anyio
+
+MEMBER_ROUTE = "/api/members/{member_id}"
+
+def requests_of(route, status):
+    return metrics.http_requests.values.get(("GET", route, status), 0)
+
+def test_histogram_buckets_are_cumulative_with_sum_and_count():
+    histogram = metrics.Histogram("test_seconds", "Test latency", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(("/a",), value)
+    assert histogram.render() == [
+        "# HELP test_seconds Test latency",
+        "# TYPE test_seconds histogram",
+        'test_seconds_bucket{route="/a",le="0.1"} 2',
+        'test_seconds_bucket{route="/a",le="1.0"} 3',
+        'test_seconds_bucket{route="/a",le="+Inf"} 4',
+        'test_seconds_sum{route="/a"} 3.65',
+        'test_seconds_count{route="/a"} 4',
+    ]
+
+def test_counter_and_gauge_lines():
+    counter = metrics.Counter("test_total", "Test counter", ("route",))
+    counter.inc(('/say "hi"\\',))
+    assert counter.render()[1:] == ["# TYPE test_total counter", 'test_total{route="/say \\"hi\\"\\\\"} 1']
+    gauge = metrics.Gauge("test_in_flight", "Test gauge")
+    gauge.inc()
+    gauge.dec()
+    assert gauge.render()[1:] == ["# TYPE test_in_flight gauge", "test_in_flight 0"]
+
+async def test_exposition_endpoint(client, member):
+    response = await client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "text/plain; version=0.0.4; charset=utf-8"
+    lines = response.text.splitlines()
+    for name, kind in (
+        ("http_requests_total", "counter"),
+        ("http_request_duration_seconds", "histogram"),
+        ("http_requests_in_flight", "gauge"),
+        ("mongo_command_duration_seconds", "histogram"),
+        ("mongo_pool_connections", "gauge"),
+    ):
+        assert f"# TYPE {name} {kind}" in lines
+    # Every sample line is a name, optional labels and a number
+    for line in lines:
+        if not line.startswith("#"):
+            float(line.rsplit(" ", 1)[1])
+    # Only the scrape itself is in flight
+    assert "http_requests_in_flight 1" in lines
+
+async def test_cache_hits_and_not_modified_are_labelled_with_the_route(client, member):
+    ok, not_modified = requests_of(MEMBER_ROUTE, "200"), requests_of(MEMBER_ROUTE, "304")
+    path = f"/api/members/{member['id']}"
+    assert (await client.get(path)).headers["X-Cache"] == "MISS"
+    hit = await client.get(path)
+    assert hit.headers["X-Cache"] == "HIT"
+    assert (await client.get(path, headers={"If-None-Match": hit.headers["ETag"]})).status_code == 304
+
+    assert requests_of(MEMBER_ROUTE, "200") == ok + 2
+    assert requests_of(MEMBER_ROUTE, "304") == not_modified + 1
+    assert not any(member["id"] in labels[1] for labels in metrics.http_requests.values)
+    assert metrics.http_latency.series[("GET", MEMBER_ROUTE)][2] >= 3
+
+async def test_unknown_paths_share_one_label(client):
+    unmatched = requests_of("unmatched", "404")
+    await client.get("/api/nothing-here")
+    await client.get("/api/nothing-else")
+    assert requests_of("unmatched", "404") == unmatched + 2
@@ -0,0 +1,50 @@
+import pytest
+
+from services.committees import DEFAULT_COMMITTEE_ID
+
+pytestmark = pytest.mark.anyio
+
+# Ties on efficiency, so pages must break them by id
+EFFICIENCIES = {"m1": 70, "m2": 90, "m3": 70, "m4": 85, "m5": 90, "m6": 70, "m7": 60}
+
+@pytest.fixture
+async def members(db):
+    await db.committee_members.insert_many([
+        {"_id": member_id, "committeeId": DEFAULT_COMMITTEE_ID, "name": member_id, "role": "Team Lead", "efficiency": efficiency, "version": 1}
+        for member_id, efficiency in EFFICIENCIES.items()
+    ])
+    await db.committee_members.insert_one({"_id": "other", "committeeId": "beta", "name": "other", "efficiency": 80})
+
+async def walk(client, **params):
+    """Ids of every page, following X-Next-Cursor until it is absent"""
+    ids, cursor, pages = [], None, 0
+    while True:
+        response = await client.get("/api/members/", params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200, response.text
+        ids.extend(row["id"] for row in response.json())
+        pages += 1
+        cursor = response.headers.get("x-next-cursor")
+        if cursor is None:
+            return ids, pages
+
+@pytest.mark.parametrize("order", ["asc", "desc"])
+async def test_pages_by_efficiency_cover_every_member_once(client, members, order):
+    ids, pages = await walk(client, sort="efficiency", order=order, limit=2, fields="efficiency")
+    expected = sorted(EFFICIENCIES, key=lambda member_id: (-EFFICIENCIES[member_id], member_id))
+    assert ids == (expected if order == "desc" else expected[::-1])
+    assert pages == 4
+
+async def test_pages_by_id_stay_in_the_committee(client, members):
+    ids, _ = await walk(client, limit=3)
+    assert ids == sorted(EFFICIENCIES)
+
+async def test_last_full_page_has_no_cursor(client, members):
+    response = await client.get("/api/members/", params={"limit": len(EFFICIENCIES)})
+    assert len(response.json()) == len(EFFICIENCIES)
+    assert "x-next-cursor" not in response.headers
+
+async def test_cursor_of_another_sort_is_rejected(client, members):
+    response = await client.get("/api/members/", params={"sort": "efficiency", "limit": 2})
+    cursor = response.headers["x-next-cursor"]
+    assert (await client.get("/api/members/", params={"cursor": cursor})).status_code == 400
+    assert (await client.get("/api/members/", params={"cursor": "not-a-cursor"})).status_code == 400
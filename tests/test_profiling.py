@@ -0,0 +1,105 @@
+from collections import deque
+from types import SimpleNamespace
+
+import pytest
+
+from middleware import profiling as profiling_middleware
+from services.profiling import RequestTrace, SlowQueryListener, current_trace, request_profiler
+
+pytestmark = pytest.mark.anyio
+
+@pytest.fixture(autouse=True)
+def profiler(monkeypatch):
+    """Nothing slow or sampled unless a test says so, and empty logs"""
+    monkeypatch.setattr(request_profiler, "sample_rate", 0)
+    monkeypatch.setattr(request_profiler, "allow_header", False)
+    monkeypatch.setattr(request_profiler, "slow_request_ms", 60_000)
+    monkeypatch.setattr(request_profiler, "slow_query_ms", 100)
+    monkeypatch.setattr(request_profiler, "requests", deque(maxlen=3))
+    monkeypatch.setattr(request_profiler, "queries", deque(maxlen=3))
+    monkeypatch.setattr(request_profiler, "profiled", 0)
+    return request_profiler
+
+async def slow_log(client):
+    response = await client.get("/api/admin/slow-requests")
+    assert response.status_code == 200
+    return response.json()
+
+async def test_only_requests_over_the_threshold_are_logged(client, member, profiler):
+    await client.get(f"/api/members/{member['id']}")
+    assert (await slow_log(client))["requests"] == []
+
+    profiler.slow_request_ms = 0
+    response = await client.get(f"/api/members/{member['id']}", params={"fields": "name"})
+    assert "X-Profile-Id" not in response.headers
+    entry = (await slow_log(client))["requests"][0]
+    assert (entry["method"], entry["route"], entry["path"], entry["query"], entry["status"]) == (
+        "GET", "/api/members/{member_id}", f"/api/members/{member['id']}", "fields=name", 200,
+    )
+    assert entry["profiled"] is False and "profile" not in entry
+    assert {"durationMs", "mongoMs", "mongoCommands", "slowQueries"} <= set(entry)
+
+async def test_log_keeps_the_newest_entries_first(client, profiler):
+    profiler.slow_request_ms = 0
+    for path in ("/api/", "/api/members/", "/api/tasks/", "/api/task-categories/"):
+        await client.get(path)
+    # The listing itself is logged once it has answered
+    assert [entry["path"] for entry in (await slow_log(client))["requests"]] == ["/api/task-categories/", "/api/tasks/", "/api/members/"]
+    assert (await slow_log(client))["slowRequests"] == 3
+
+    assert (await client.delete("/api/admin/slow-requests")).status_code == 204
+    assert [entry["path"] for entry in (await slow_log(client))["requests"]] == ["/api/admin/slow-requests"]
+
+async def test_sampled_request_is_profiled(client, member, profiler, monkeypatch):
+    profiler.sample_rate = 0.5
+    monkeypatch.setattr(profiling_middleware.random, "random", lambda: 0.7)
+    assert "X-Profile-Id" not in (await client.get("/api/members/")).headers
+
+    monkeypatch.setattr(profiling_middleware.random, "random", lambda: 0.2)
+    response = await client.get("/api/members/")
+    profile_id = int(response.headers["X-Profile-Id"])
+    log = await slow_log(client)
+    assert log["profiled"] == 1
+    assert [(entry["id"], entry["profiled"]) for entry in log["requests"]] == [(profile_id, True)]
+
+    entry = (await client.get(f"/api/admin/slow-requests/{profile_id}")).json()
+    assert entry["route"] == "/api/members/" and entry["status"] == 200
+    assert {"groupsMs", "functions", "hotspots"} <= set(entry["profile"])
+    assert entry["profile"]["functions"] and all(row["group"] in ("routes", "services", "models") for row in entry["profile"]["functions"])
+
+async def test_profile_header_needs_to_be_allowed(client, profiler):
+    assert "X-Profile-Id" not in (await client.get("/api/", headers={"X-Profile": "1"})).headers
+    profiler.allow_header = True
+    assert "X-Profile-Id" in (await client.get("/api/", headers={"X-Profile": "1"})).headers
+
+async def test_one_request_is_profiled_at_a_time(client, profiler, monkeypatch):
+    profiler.allow_header = True
+    monkeypatch.setattr(profiler, "profiling", True)
+    assert "X-Profile-Id" not in (await client.get("/api/", headers={"X-Profile": "1"})).headers
+    assert profiler.profiled == 0
+
+async def test_unknown_entry(client):
+    assert (await client.get("/api/admin/slow-requests/999999")).status_code == 404
+
+def command_event(name, micros, request_id):
+    return SimpleNamespace(
+        command_name=name, command={name: "committee_members", "filter": {}, "lsid": {"id": 1}, "$db": "test"},
+        connection_id=("localhost", 27017), request_id=request_id, duration_micros=micros, database_name="test",
+    )
+
+def test_slow_commands_are_timed_against_the_request(profiler):
+    listener = SlowQueryListener(profiler)
+    trace = RequestTrace()
+    token = current_trace.set(trace)
+    try:
+        for request_id, micros in ((1, 20_000), (2, 150_000)):
+            event = command_event("find", micros, request_id)
+            listener.started(event)
+            listener.succeeded(event)
+    finally:
+        current_trace.reset(token)
+    assert (trace.commands, trace.mongo_ms) == (2, 170.0)
+    query = profiler.recent_queries()[0]
+    assert trace.slow_queries == [query["id"]] and query["durationMs"] == 150.0
+    # Session bookkeeping is dropped from the logged command
+    assert query["document"] == {"find": "committee_members", "filter": {}}
@@ -0,0 +1,123 @@
+import asyncio
+import time
+
+import pytest
+
+from services.response_cache import CachedResponse, MemoryCacheBackend, MongoCacheBackend
+
+pytestmark = pytest.mark.anyio
+
+def entry(body: bytes = b"{}") -> CachedResponse:
+    return CachedResponse(status_code=200, headers=[], body=body, etag='"e"')
+
+async def test_invalidation_is_per_committee():
+    cache = MemoryCacheBackend()
+    cache.set("alpha", "/a", entry(), cache.generation_of("alpha"))
+    cache.set("beta", "/a", entry(), cache.generation_of("beta"))
+    await cache.invalidate("alpha")
+    assert cache.get("alpha", "/a") is None
+    assert cache.get("beta", "/a") is not None
+    await cache.invalidate()
+    assert cache.get("beta", "/a") is None
+
+async def test_response_computed_before_a_write_is_not_stored():
+    cache = MemoryCacheBackend()
+    generation = cache.generation_of("alpha")
+    await cache.invalidate("alpha")
+    assert not cache.set("alpha", "/a", entry(), generation)
+    assert cache.get("alpha", "/a") is None
+
+async def test_invalidation_notifies_local_listeners():
+    cache = MemoryCacheBackend()
+    seen = []
+    cache.on_invalidation(seen.append)
+    await cache.invalidate("alpha")
+    cache.invalidate_local("beta")
+    assert seen == ["alpha"]
+
+def test_least_recently_used_entry_is_evicted():
+    cache = MemoryCacheBackend(max_entries=2)
+    for key in ("/a", "/b"):
+        cache.set("alpha", key, entry(), cache.generation_of("alpha"))
+    cache.get("alpha", "/a")
+    cache.set("alpha", "/c", entry(), cache.generation_of("alpha"))
+    assert cache.get("alpha", "/b") is None
+    assert cache.get("alpha", "/a") is not None
+    assert cache.stats()["evictions"] == 1
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    cache = MemoryCacheBackend(ttl_seconds=30)
+    cache.set("alpha", "/a", entry(), cache.generation_of("alpha"))
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 31)
+    assert cache.get("alpha", "/a") is None
+    assert cache.stats()["expirations"] == 1
+
+async def test_cached_member_list_is_revalidated_and_invalidated_by_writes(client, member):
+    first = await client.get("/api/members/")
+    assert first.headers["x-cache"] == "MISS"
+    second = await client.get("/api/members/")
+    assert second.headers["x-cache"] == "HIT"
+    assert second.content == first.content
+
+    not_modified = await client.get("/api/members/", headers={"If-None-Match": first.headers["etag"]})
+    assert not_modified.status_code == 304
+
+    await client.put(f"/api/members/{member['id']}", json={"efficiency": 40})
+    after = await client.get("/api/members/", headers={"If-None-Match": first.headers["etag"]})
+    assert after.status_code == 200 and after.headers["x-cache"] == "MISS"
+    assert after.json()[0]["efficiency"] == 40
+
+async def test_committees_have_separate_entries(client, member):
+    await client.get("/api/members/")
+    other = await client.get("/api/members/", headers={"X-Committee-Id": "beta"})
+    assert other.headers["x-cache"] == "MISS"
+    assert other.json() == []
+
+class FlakyChannel:
+    """Invalidation channel whose first positioning query fails, then yields one remote event per find"""
+
+    def __init__(self):
+        self.positioning_attempts = 0
+        self.queries = []
+
+    async def find_one(self, sort=None):
+        self.positioning_attempts += 1
+        if self.positioning_attempts == 1:
+            raise ConnectionError("not primary")
+        return {"_id": 1}
+
+    def find(self, query, cursor_type=None):
+        self.queries.append(query)
+        return self.events(len(self.queries) + 1)
+
+    async def events(self, event_id):
+        yield {"_id": event_id, "source": "other-worker", "committeeId": "alpha"}
+
+async def test_listener_retries_a_failed_positioning_query(monkeypatch):
+    cache = MongoCacheBackend()
+    cache._events = FlakyChannel()
+    cache.set("alpha", "/a", entry(), cache.generation_of("alpha"))
+    remote = []
+    cache.remote_listeners = [remote.append]
+    sleep = asyncio.sleep
+
+    async def fast_sleep(seconds):
+        await sleep(0)
+        if len(cache._events.queries) >= 2:
+            raise asyncio.CancelledError
+
+    monkeypatch.setattr(asyncio, "sleep", fast_sleep)
+    with pytest.raises(asyncio.CancelledError):
+        await cache._listen()
+    # The failure is treated like any other channel outage: everything is dropped, then tailing starts after the latest event
+    assert remote == [None, "alpha", "alpha"]
+    assert cache._events.positioning_attempts == 2
+    assert cache._events.queries == [{"_id": {"$gt": 1}}, {"_id": {"$gt": 2}}]
+    assert cache.get("alpha", "/a") is None
+
+def test_listeners_belong_to_their_backend():
+    first, second = MemoryCacheBackend(), MemoryCacheBackend()
+    first.on_invalidation(print)
+    first.on_remote_invalidation(print)
+    assert (second.local_listeners, second.remote_listeners) == ([], [])
@@ -0,0 +1,88 @@
+import json
+
+import pytest
+
+from services import summary
+from services.committees import DEFAULT_COMMITTEE_ID
+from services.tiers import DEFAULT_TIERS, save_tiers, tier_config
+from tests.conftest import MEMBER
+
+pytestmark = pytest.mark.anyio
+
+# Sent lowest first; stored and returned highest threshold first
+TIERS = [
+    {"tier": "Starter", "min": 0, "tierColor": "bg-gray-100 text-gray-800"},
+    {"tier": "Core", "min": 5, "tierColor": "bg-blue-100 text-blue-800"},
+    {"tier": "Star", "min": 20, "tierColor": "bg-purple-100 text-purple-800"},
+]
+
+@pytest.fixture
+async def members(client):
+    for i, registrations in enumerate((3, 7, 12, 25)):
+        response = await client.post("/api/members/", json={**MEMBER, "contact": f"member{i}@email.com", "registrationsBrought": registrations})
+        assert response.status_code == 201, response.text
+
+async def test_default_tiers_until_saved(client):
+    response = await client.get("/api/settings/registration-tiers")
+    assert response.status_code == 200
+    assert response.json()["tiers"] == DEFAULT_TIERS
+    assert response.json()["version"] == 0
+
+async def test_saving_tiers_recounts_the_summary(db, client, members):
+    await summary.get_summary(db, DEFAULT_COMMITTEE_ID)
+    response = await client.put("/api/settings/registration-tiers", json={"tiers": TIERS})
+    assert response.status_code == 200, response.text
+    assert [tier["tier"] for tier in response.json()["tiers"]] == ["Star", "Core", "Starter"]
+    assert response.json()["version"] == 1
+    assert (await client.get("/api/settings/registration-tiers")).json()["tiers"] == response.json()["tiers"]
+
+    totals = await summary.get_summary(db, DEFAULT_COMMITTEE_ID)
+    assert totals["tierConfigVersion"] == 1
+    assert totals["tierCounts"] == {"Star": 1, "Core": 2, "Starter": 1}
+    assert (await summary.verify_summary(db, DEFAULT_COMMITTEE_ID)) == {}
+
+async def test_exported_tiers_use_the_saved_settings(client, members):
+    await client.put("/api/settings/registration-tiers", json={"tiers": TIERS})
+    response = await client.get("/api/export/registration-tiers")
+    assert response.status_code == 200
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [(row["registrationsBrought"], row["tier"]) for row in rows] == [(25, "Star"), (12, "Core"), (7, "Core"), (3, "Starter")]
+    # Shares of the 47 registrations, rounded to one decimal after the aggregation
+    assert [row["percentage"] for row in rows] == [53.2, 25.5, 14.9, 6.4]
+
+@pytest.mark.parametrize("tiers", [
+    [{"tier": "Core", "min": 5}, {"tier": "Star", "min": 20}],
+    [{"tier": "Core", "min": 0}, {"tier": "Core", "min": 20}],
+    [{"tier": "Core", "min": 0}, {"tier": "Star", "min": 0}],
+])
+async def test_unusable_tiers_are_rejected(client, tiers):
+    response = await client.put("/api/settings/registration-tiers", json={"tiers": tiers})
+    assert response.status_code == 400
+    assert (await client.get("/api/settings/registration-tiers")).json()["version"] == 0
+
+async def test_tier_names_must_be_field_names(client):
+    response = await client.put("/api/settings/registration-tiers", json={"tiers": [{"tier": "Gold.Plus", "min": 0}]})
+    assert response.status_code == 422
+
+async def test_tiers_are_per_committee(client):
+    await client.put("/api/settings/registration-tiers", json={"tiers": TIERS})
+    other = await client.get("/api/settings/registration-tiers", headers={"X-Committee-Id": "beta"})
+    assert other.json()["tiers"] == DEFAULT_TIERS
+
+async def test_summary_counted_with_stale_tiers_is_rebuilt_once_they_reload(db, client, members):
+    await summary.get_summary(db, DEFAULT_COMMITTEE_ID)
+    # Another worker saves new tiers; this one still has the old ones cached
+    await save_tiers(db, DEFAULT_COMMITTEE_ID, TIERS)
+    tier_config.settings[DEFAULT_COMMITTEE_ID] = {"tiers": DEFAULT_TIERS, "version": 0, "updatedAt": None}
+
+    response = await client.post("/api/members/", json={**MEMBER, "contact": "late@email.com", "registrationsBrought": 30})
+    assert response.status_code == 201
+    # The write is counted with the tiers the summary was built with...
+    stored = await db.analytics_summary.find_one({"committeeId": DEFAULT_COMMITTEE_ID})
+    assert stored["tierConfigVersion"] == 0 and stored["totalMembers"] == 5
+    # ...until the settings change reaches this worker through the invalidation channel
+    tier_config.invalidate(DEFAULT_COMMITTEE_ID)
+    totals = await summary.get_summary(db, DEFAULT_COMMITTEE_ID)
+    assert totals["tierConfigVersion"] == 1
+    assert totals["tierCounts"] == {"Star": 2, "Core": 2, "Starter": 1}
+    assert (await summary.verify_summary(db, DEFAULT_COMMITTEE_ID)) == {}
@@ -0,0 +1,106 @@
+import asyncio
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from middleware.single_flight import SingleFlightMiddleware
+from services.committees import DEFAULT_COMMITTEE_ID
+from services.response_cache import MemoryCacheBackend
+from services.single_flight import SingleFlight
+
+pytestmark = pytest.mark.anyio
+
+class SlowReads:
+    """A read endpoint that holds every request until ``release`` is set and reports the data version it saw"""
+
+    def __init__(self):
+        self.runs = 0
+        self.version = 0
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def endpoint(self, request):
+        self.runs += 1
+        version = self.version
+        self.started.set()
+        await self.release.wait()
+        return JSONResponse({"version": version})
+
+@pytest.fixture
+def reads():
+    return SlowReads()
+
+@pytest.fixture
+def cache():
+    return MemoryCacheBackend()
+
+@pytest.fixture
+def flights():
+    return SingleFlight()
+
+@pytest.fixture
+async def client(reads, cache, flights):
+    app = Starlette(routes=[Route("/api/analytics/overview", reads.endpoint)])
+    app.add_middleware(SingleFlightMiddleware, flights=flights, cache=cache, path_prefixes=["/api/analytics"])
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+async def test_concurrent_identical_reads_run_the_handler_once(client, reads, flights):
+    requests = [asyncio.create_task(client.get("/api/analytics/overview")) for _ in range(10)]
+    await reads.started.wait()
+    await asyncio.sleep(0.01)  # Let the other requests join the flight
+    reads.release.set()
+    responses = await asyncio.gather(*requests)
+
+    assert [response.json() for response in responses] == [{"version": 0}] * 10
+    assert reads.runs == 1
+    assert flights.stats()["shared"] == 9
+
+async def test_read_started_after_a_write_is_not_shared(client, reads, cache, flights):
+    before = asyncio.create_task(client.get("/api/analytics/overview"))
+    await reads.started.wait()
+
+    # A member write lands while the first read is still running
+    reads.version = 1
+    await cache.invalidate(DEFAULT_COMMITTEE_ID)
+    after = asyncio.create_task(client.get("/api/analytics/overview"))
+    await asyncio.sleep(0.01)
+    reads.release.set()
+
+    assert (await before).json() == {"version": 0}
+    assert (await after).json() == {"version": 1}
+    assert reads.runs == 2
+    assert flights.stats()["shared"] == 0
+
+async def test_other_committees_and_queries_are_not_shared(client, reads):
+    requests = [
+        asyncio.create_task(client.get("/api/analytics/overview")),
+        asyncio.create_task(client.get("/api/analytics/overview?months=3")),
+        asyncio.create_task(client.get("/api/analytics/overview", headers={"X-Committee-Id": "beta"})),
+    ]
+    await reads.started.wait()
+    await asyncio.sleep(0.01)
+    reads.release.set()
+    await asyncio.gather(*requests)
+    assert reads.runs == 3
+
+async def test_failed_flight_is_retried_by_each_waiter(flights):
+    calls = 0
+    started = asyncio.Event()
+
+    async def failing():
+        nonlocal calls
+        calls += 1
+        started.set()
+        await asyncio.sleep(0.01)
+        return None
+
+    first = asyncio.create_task(flights.run("key", failing))
+    await started.wait()
+    waiters = [asyncio.create_task(flights.run("key", failing)) for _ in range(2)]
+    assert await asyncio.gather(first, *waiters) == [None] * 3
+    assert calls == 3
+    assert flights.stats()["retried"] == 2
@@ -0,0 +1,112 @@
+import asyncio
+import json
+from datetime import timedelta
+
+import pytest
+
+import database
+from services import history
+from services.committees import DEFAULT_COMMITTEE_ID
+from services.snapshots import SNAPSHOTS_COLLECTION, AnalyticsSnapshots
+
+pytestmark = pytest.mark.anyio
+
+@pytest.fixture(autouse=True)
+def no_monthly_rollup(monkeypatch):
+    """mongomock lacks $dateTrunc, which the registrations section's monthlyData needs"""
+    async def monthly_registrations(database, committee_id, months=3):
+        return []
+
+    monkeypatch.setattr(history, "monthly_registrations", monthly_registrations)
+
+@pytest.fixture
+async def snapshots(db):
+    await database.create_indexes()
+    snapshots = AnalyticsSnapshots(debounce_seconds=0.01, max_age_seconds=60, keep=2)
+    yield snapshots
+    await snapshots.stop()
+
+async def overview(snapshots, db):
+    body, snapshot = await snapshots.section(db, db, DEFAULT_COMMITTEE_ID, "overview")
+    return json.loads(body), snapshot
+
+async def stored_versions(db):
+    return [
+        (document["version"], "sections" in document)
+        for document in await db[SNAPSHOTS_COLLECTION].find({"committeeId": DEFAULT_COMMITTEE_ID}).sort("version", 1).to_list(None)
+    ]
+
+async def test_write_burst_is_coalesced_into_one_recompute(db, client, member, snapshots):
+    payload, snapshot = await overview(snapshots, db)
+    assert (payload["totalRegistrations"], snapshot["version"], snapshots.computes) == (12, 1, 1)
+
+    # Long enough for the whole burst to land before the recompute
+    snapshots.debounce_seconds = 0.5
+    for registrations in (20, 21, 22):
+        await client.put(f"/api/members/{member['id']}", json={"registrationsBrought": registrations})
+        snapshots.mark_dirty(DEFAULT_COMMITTEE_ID)
+    assert snapshots.coalesced == 2
+    await snapshots._scheduled[DEFAULT_COMMITTEE_ID]
+
+    payload, snapshot = await overview(snapshots, db)
+    assert (payload["totalRegistrations"], snapshot["version"], snapshots.computes) == (22, 2, 2)
+    assert snapshots.stats()["pending"] == 0
+
+async def test_snapshot_older_than_max_age_is_recomputed_before_serving(db, client, member, snapshots):
+    await overview(snapshots, db)
+    # A write whose recompute never reached these snapshots
+    await client.put(f"/api/members/{member['id']}", json={"efficiency": 10})
+    assert (await overview(snapshots, db))[0]["avgEfficiency"] == 85
+
+    snapshots.latest[DEFAULT_COMMITTEE_ID]["computedAt"] -= timedelta(seconds=61)
+    payload, snapshot = await overview(snapshots, db)
+    assert (payload["avgEfficiency"], snapshot["version"], snapshots.stale_refreshes) == (10, 2, 2)
+
+async def test_version_stored_first_by_another_worker_is_adopted(db, member, snapshots, monkeypatch):
+    snapshots.database = snapshots.analytics_database = db
+    await snapshots.refresh(DEFAULT_COMMITTEE_ID)
+    other = AnalyticsSnapshots()
+    other.database = other.analytics_database = db
+    collection_type = type(db[SNAPSHOTS_COLLECTION])
+    insert_one = collection_type.insert_one
+    raced = []
+
+    async def other_worker_first(self, document, *args, **kwargs):
+        if self.name == SNAPSHOTS_COLLECTION and not raced:
+            # The other worker read the same latest version and stores the next one first
+            raced.append(None)
+            raced[0] = await other._compute(DEFAULT_COMMITTEE_ID)
+        return await insert_one(self, document, *args, **kwargs)
+
+    monkeypatch.setattr(collection_type, "insert_one", other_worker_first)
+    snapshot = await snapshots.refresh(DEFAULT_COMMITTEE_ID)
+    assert raced[0]["version"] == snapshot["version"] == 2
+    assert snapshots.latest[DEFAULT_COMMITTEE_ID]["version"] == 2 and snapshots.computes == 1
+    assert await stored_versions(db) == [(1, True), (2, True)]
+
+    # The next compute goes past the adopted version
+    assert (await snapshots.refresh(DEFAULT_COMMITTEE_ID))["version"] == 3
+
+async def test_pruning_keeps_the_latest_whole_and_each_month_end_as_totals(db, member, snapshots):
+    snapshots.database = snapshots.analytics_database = db
+    for version, month in ((1, "2024-08"), (2, "2024-08"), (3, "2024-09"), (4, None), (5, None), (6, None)):
+        assert (await snapshots.refresh(DEFAULT_COMMITTEE_ID))["version"] == version
+        if month:
+            await db[SNAPSHOTS_COLLECTION].update_one({"committeeId": DEFAULT_COMMITTEE_ID, "version": version}, {"$set": {"month": month}})
+    # Version 1 was not its month's last; 2 to 4 keep only totals
+    assert await stored_versions(db) == [(2, False), (3, False), (4, False), (5, True), (6, True)]
+    totals = await db[SNAPSHOTS_COLLECTION].find_one({"version": 2})
+    assert totals["totals"]["totalRegistrations"] == 12
+
+    snapshots.forget()
+    assert (await overview(snapshots, db))[1]["version"] == 6
+    assert snapshots.computes == 6
+
+async def test_stop_cancels_scheduled_recomputes(db, member, snapshots):
+    await overview(snapshots, db)
+    snapshots.debounce_seconds = 60
+    snapshots.mark_dirty(DEFAULT_COMMITTEE_ID)
+    scheduled = snapshots._scheduled[DEFAULT_COMMITTEE_ID]
+    await snapshots.stop()
+    await asyncio.sleep(0)
+    assert scheduled.cancelled() and snapshots.stats()["pending"] == 0
@@ -0,0 +1,76 @@
+import pytest
+
+from services import summary
+from services.committees import DEFAULT_COMMITTEE_ID
+from services.tiers import DEFAULT_TIERS, save_tiers, tier_config
+from tests.conftest import MEMBER
+
+pytestmark = pytest.mark.anyio
+
+@pytest.fixture
+def rebuilds(monkeypatch):
+    """Committees whose summary get_summary rebuilt"""
+    calls = []
+    rebuild_summary = summary.rebuild_summary
+
+    async def counting_rebuild(database, committee_id):
+        calls.append(committee_id)
+        return await rebuild_summary(database, committee_id)
+
+    monkeypatch.setattr(summary, "rebuild_summary", counting_rebuild)
+    return calls
+
+async def test_stale_tier_settings_are_reloaded_instead_of_rebuilding(db, member, rebuilds):
+    tiers = [{**tier, "min": tier["min"] * 2} for tier in DEFAULT_TIERS]
+    await save_tiers(db, DEFAULT_COMMITTEE_ID, tiers)
+    await summary.rebuild_summary(db, DEFAULT_COMMITTEE_ID)
+    # Settings this worker cached before another worker saved the new tiers
+    tier_config.settings[DEFAULT_COMMITTEE_ID] = {"tiers": DEFAULT_TIERS, "version": 0, "updatedAt": None}
+    rebuilds.clear()
+    for _ in range(3):
+        totals = await summary.get_summary(db, DEFAULT_COMMITTEE_ID)
+        assert totals["tierConfigVersion"] == 1
+    assert rebuilds == []
+    assert (await tier_config.current(db, DEFAULT_COMMITTEE_ID))["version"] == 1
+
+async def test_summary_built_with_old_tiers_is_rebuilt_once(db, member, rebuilds):
+    await summary.get_summary(db, DEFAULT_COMMITTEE_ID)
+    await save_tiers(db, DEFAULT_COMMITTEE_ID, DEFAULT_TIERS)
+    rebuilds.clear()
+    for _ in range(3):
+        assert (await summary.get_summary(db, DEFAULT_COMMITTEE_ID))["tierConfigVersion"] == 1
+    assert rebuilds == [DEFAULT_COMMITTEE_ID]
+
+async def test_rebuild_recounts_when_a_delta_lands_during_the_recount(db, client, member, monkeypatch):
+    await summary.get_summary(db, DEFAULT_COMMITTEE_ID)
+    compute_summary = summary.compute_summary
+    recounts = []
+
+    async def write_during_first_recount(database, committee_id):
+        counted = await compute_summary(database, committee_id)
+        recounts.append(counted["totalMembers"])
+        if len(recounts) == 1:
+            # Lands after this recount read the members; replacing the summary now would drop its delta
+            response = await client.post("/api/members/", json={**MEMBER, "contact": "late@email.com"})
+            assert response.status_code == 201
+        return counted
+
+    monkeypatch.setattr(summary, "compute_summary", write_during_first_recount)
+    rebuilt = await summary.rebuild_summary(db, DEFAULT_COMMITTEE_ID)
+    assert recounts == [1, 2]
+    assert rebuilt["totalMembers"] == 2
+    assert (await summary.verify_summary(db, DEFAULT_COMMITTEE_ID)) == {}
+
+async def test_rebuild_stops_waiting_after_its_last_attempt(db, member, monkeypatch):
+    await summary.get_summary(db, DEFAULT_COMMITTEE_ID)
+    compute_summary = summary.compute_summary
+
+    async def always_moving(database, committee_id):
+        counted = await compute_summary(database, committee_id)
+        await db.analytics_summary.update_one({"committeeId": committee_id}, {"$inc": {"epoch": 1}})
+        return counted
+
+    monkeypatch.setattr(summary, "compute_summary", always_moving)
+    assert (await summary.rebuild_summary(db, DEFAULT_COMMITTEE_ID))["totalMembers"] == 1
+    monkeypatch.undo()
+    assert (await summary.verify_summary(db, DEFAULT_COMMITTEE_ID)) == {}
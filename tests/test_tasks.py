@@ -0,0 +1,59 @@
+import pytest
+
+from tests.conftest import MEMBER
+
+pytestmark = pytest.mark.anyio
+
+async def create_task(client, member, **fields):
+    response = await client.post("/api/tasks/", json={"title": "Flyers", "category": "Marketing", "assigneeId": member["id"], **fields})
+    assert response.status_code in (200, 201), response.text
+    return response.json()
+
+async def test_title_change_is_not_served_from_cache(client, member):
+    task = await create_task(client, member)
+    first = await client.get(f"/api/tasks/{task['id']}")
+    assert first.json()["title"] == "Flyers"
+
+    response = await client.put(f"/api/tasks/{task['id']}", json={"title": "renamed"})
+    assert response.status_code == 200, response.text
+
+    second = await client.get(f"/api/tasks/{task['id']}")
+    assert second.headers["x-cache"] == "MISS"
+    assert second.json()["title"] == "renamed"
+
+async def test_status_change_updates_member_counters(client, member):
+    task = await create_task(client, member, status="pending")
+    await client.put(f"/api/tasks/{task['id']}", json={"status": "completed"})
+    updated = (await client.get(f"/api/members/{member['id']}")).json()
+    assert (updated["tasksCompleted"], updated["tasksPending"]) == (1, 0)
+
+    await client.delete(f"/api/tasks/{task['id']}")
+    updated = (await client.get(f"/api/members/{member['id']}")).json()
+    assert (updated["tasksCompleted"], updated["tasksPending"], updated["totalTasks"]) == (0, 0, 0)
+
+async def test_reassignment_moves_counts_between_members(client, member):
+    other = (await client.post("/api/members/", json={**MEMBER, "name": "Mike Chen", "contact": "mike.chen@email.com"})).json()
+    task = await create_task(client, member, status="pending")
+    await client.put(f"/api/tasks/{task['id']}", json={"assigneeId": other["id"]})
+    old = (await client.get(f"/api/members/{member['id']}")).json()
+    new = (await client.get(f"/api/members/{other['id']}")).json()
+    assert (old["tasksPending"], new["tasksPending"]) == (0, 1)
+
+    await client.put(f"/api/tasks/{task['id']}", json={"assigneeId": None})
+    new = (await client.get(f"/api/members/{other['id']}")).json()
+    assert new["totalTasks"] == 0
+
+async def test_category_counters_follow_task_writes(client, member):
+    first = await create_task(client, member, status="pending")
+    await create_task(client, member, status="completed")
+    await create_task(client, member, category="Outreach")
+    await client.put(f"/api/tasks/{first['id']}", json={"category": "Outreach"})
+
+    categories = {row["category"]: row for row in (await client.get("/api/task-categories/")).json()}
+    assert (categories["Marketing"]["completed"], categories["Marketing"]["pending"]) == (1, 0)
+    assert categories["Outreach"]["total"] == 2
+
+async def test_tasks_of_other_committees_are_invisible(client, member):
+    task = await create_task(client, member)
+    response = await client.get(f"/api/tasks/{task['id']}", headers={"X-Committee-Id": "beta"})
+    assert response.status_code == 404